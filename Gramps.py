@@ -27,4 +27,6 @@ From this position, import gramps works great
 """
 import gramps.grampsapp as app
 
-app.main()
+# Guarded, so that worker processes can import this module
+if __name__ == "__main__":
+    app.main()
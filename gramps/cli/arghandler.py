@@ -46,7 +46,11 @@ import re
 from gramps.gen.recentfiles import recent_files
 from gramps.gen.utils.file import rm_tempdir, get_empty_tempdir
 from .clidbman import CLIDbManager, NAME_FILE, find_locker_name
-from gramps.gen.db.utils import make_database
+from gramps.gen.db.utils import (
+    make_database,
+    get_dbid_from_path,
+    set_profile_for_path,
+)
 from gramps.gen.db.dbconst import DBBACKEND
 from gramps.gen.plug import BasePluginManager
 from gramps.gen.plug.report import CATEGORY_BOOK, CATEGORY_CODE, BookList
@@ -185,8 +189,11 @@ class ArgHandler:
         self.removes = parser.removes
         self.username = parser.username
         self.password = parser.password
+        self.db_profile = parser.db_profile
 
         self.open = self.__handle_open_option(parser.open, parser.create)
+        if self.open:
+            self.__handle_profile_option(self.open)
         self.sanitize_args(parser.imports, parser.exports)
 
     def __error(self, msg1, msg2=None):
@@ -253,6 +260,23 @@ class ArgHandler:
             )
             sys.exit(1)
 
+    def __handle_profile_option(self, db_path):
+        """
+        Handle the "--db-profile" option: store the tuning profile of the
+        Family Tree, to be applied when it is opened.
+        """
+        if self.db_profile is None:
+            return
+        profiles = make_database(get_dbid_from_path(db_path)).get_profiles()
+        if self.db_profile not in profiles:
+            self.__error(
+                _("Error: Unknown tuning profile '%(profile)s'.")
+                % {"profile": self.db_profile},
+                _("Valid profiles are: %s") % ", ".join(profiles),
+            )
+            sys.exit(1)
+        set_profile_for_path(db_path, self.db_profile)
+
     def __handle_import_option(self, value, family_tree_format):
         """
         Handle the "-i" or "--import" option.
@@ -525,6 +549,7 @@ class ArgHandler:
                     versionpath = os.path.join(self.imp_db_path, str(DBBACKEND))
                     with open(versionpath, "w") as version_file:
                         version_file.write(dbid)
+                self.__handle_profile_option(self.imp_db_path)
 
                 try:
                     self.smgr.open_activate(
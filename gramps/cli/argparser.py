@@ -77,6 +77,7 @@ Application options
   -U, --username=USERNAME                Database username
   -P, --password=PASSWORD                Database password
   -C, --create=FAMILY_TREE               Create on open if new Family Tree
+  --db-profile=PROFILE                   Set the tuning profile of the Family Tree
   -i, --import=FILENAME                  Import file
   -e, --export=FILENAME                  Export file
   -r, --remove=FAMILY_TREE_PATTERN       Remove matching Family Tree(s) (use regular expressions)
@@ -167,6 +168,7 @@ class ArgParser:
     -U, --username=USERNAME         Database username
     -P, --password=PASSWORD         Database password
     -C, --create=FAMILY_TREE        Create on open if new Family Tree
+    --db-profile=PROFILE            Set the tuning profile of the Family Tree
     -i, --import=FILENAME           Import file
     -e, --export=FILENAME           Export file
     -r, --remove=PATTERN            Remove matching Family Tree(s)
@@ -239,6 +241,7 @@ class ArgParser:
         self.usage = False
         self.force_unlock = False
         self.create = None
+        self.db_profile = None
         self.quiet = False
         self.auto_accept = False
 
@@ -294,6 +297,8 @@ class ArgParser:
                 self.open = value
             elif option in ["-C", "--create"]:
                 self.create = value
+            elif option in ["--db-profile"]:
+                self.db_profile = value
             elif option in ["-U", "--username"]:
                 self.username = value
             elif option in ["-P", "--password"]:
@@ -159,6 +159,9 @@ register("behavior.do-not-show-previously-seen-addon-updates", True)
 register("behavior.date-about-range", 50)
 register("behavior.date-after-range", 50)
 register("behavior.date-before-range", 50)
+register("behavior.export-processes", 0)
+register("behavior.filter-processes", 0)
+register("behavior.report-processes", 0)
 register("behavior.generation-depth", 15)
 register("behavior.max-age-prob-alive", 110)
 register("behavior.max-sib-age-diff", 20)
@@ -200,6 +203,10 @@ register("database.backup-path", USER_HOME)
 register("database.backup-on-exit", True)
 register("database.autobackup", 0)
 register("database.path", os.path.join(USER_DATA, "grampsdb"))
+register("database.profile", "default")
+register("database.undo-depth", 1000)
+register("database.undo-memory", 64)
+register("database.closure-table", False)
 register("database.host", "")
 register("database.port", "")
 
@@ -329,6 +329,7 @@ LONGOPTS = [
     "username=",
     "password=",
     "create=",
+    "db-profile=",
     "options=",
     "safe",
     "screen=",
@@ -48,6 +48,9 @@ from ..lib.childreftype import ChildRefType
 from ..lib.childref import ChildRef
 from .txn import DbTxn
 from .exceptions import DbTransactionCancel, DbException
+from .projection import project_object
+from .summary import person_summary
+from . import closure
 
 _LOG = logging.getLogger(DBLOGNAME)
 
@@ -1265,6 +1268,15 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def iter_sorted_raw_data(self, class_name):
+        """
+        Return an iterator over (handle, raw data) pairs for the objects of a
+        primary class, e.g. 'Person', in the order of their handles.
+        """
+        get_raw_data = self.method("get_raw_%s_data", class_name)
+        for handle in sorted(self.method("get_%s_handles", class_name)()):
+            yield (handle, get_raw_data(handle))
+
     def load(
         self,
         name,
@@ -1441,6 +1453,152 @@ class DbReadBase:
         """
         return False
 
+    def get_projected_values(self, class_name, handle):
+        """
+        Return a dictionary of the projected field values of a primary object.
+
+        See :mod:`.projection` for the fields available for each class.
+        Backends that store projected fields may return them without
+        unserializing the object.
+
+        :param class_name: primary object class name, e.g. "Person"
+        :type class_name: str
+        :param handle: handle of the object
+        :type handle: str
+        """
+        obj = self.method("get_%s_from_handle", class_name)(handle)
+        return project_object(self, obj)
+
+    def get_cursor_handles(self, class_name):
+        """
+        Return the handles of the primary objects of a class, in the order
+        of the cursor of the class.  Backends may read them without the data
+        of the objects.
+
+        :param class_name: primary object class name, e.g. "Person"
+        :type class_name: str
+        """
+        with self.method("get_%s_cursor", class_name)() as cursor:
+            return [handle for handle, dummy in cursor]
+
+    def select_handles(self, class_name, where, args):
+        """
+        Return the handles of the primary objects of a class whose table row
+        satisfies an SQL condition, in the order of the cursor of the class.
+
+        Returns None if the database cannot evaluate SQL conditions, in which
+        case the caller must examine the objects itself.
+
+        :param class_name: primary object class name, e.g. "Person"
+        :type class_name: str
+        :param where: SQL condition using ? placeholders
+        :type where: str
+        :param args: values for the placeholders
+        :type args: list
+        """
+        return None
+
+    def get_result_cache(self):
+        """
+        Return a dictionary in which results computed from the data of the
+        database may be kept until the data changes, or None if results must
+        not be kept, e.g. for a proxy whose view of the data can change.
+        """
+        return None
+
+    def get_reader_source(self):
+        """
+        Return a (backend id, directory) tuple from which another process can
+        open its own read-only copy of this database, or None if that is not
+        possible, e.g. for an in-memory database or a proxy.
+        """
+        return None
+
+    def get_person_summary(self, handle):
+        """
+        Return a dictionary of the vital summary of a person.
+
+        See :mod:`.summary` for the fields.  Backends that store the summary
+        may return it without looking at the events, families and notes of
+        the person.
+
+        :param handle: handle of the person
+        :type handle: str
+        """
+        return person_summary(self, self.get_person_from_handle(handle))
+
+    def iter_person_summaries(self, order_by=None):
+        """
+        Return an iterator over (handle, summary) tuples of all the people,
+        sorted by the summary field order_by, if given.
+
+        :param order_by: summary field to sort on, or None
+        :type order_by: str
+        """
+        summaries = (
+            (person.handle, person_summary(self, person))
+            for person in self.iter_people()
+        )
+        if order_by is None:
+            return summaries
+        return iter(sorted(summaries, key=lambda item: item[1][order_by]))
+
+    def iter_ancestors(self, handle, main_only=False, max_generations=None):
+        """
+        Return an iterator over (handle, generation, paths) tuples of the
+        ancestors of a person, by increasing generation.
+
+        See :mod:`.closure` for the meaning of the tuples.  Backends that
+        store a closure table may read them from it instead of walking the
+        families.
+
+        :param handle: handle of the person
+        :type handle: str
+        :param main_only: only follow the links to the main parent families
+        :type main_only: bool
+        :param max_generations: furthest generation to report, or None
+        :type max_generations: int
+        """
+        return closure.iter_ancestors(self, handle, main_only, max_generations)
+
+    def iter_descendants(self, handle, main_only=False, max_generations=None):
+        """
+        Return an iterator over (handle, generation, paths) tuples of the
+        descendants of a person, by increasing generation.
+
+        See :mod:`.closure` for the meaning of the tuples.
+
+        :param handle: handle of the person
+        :type handle: str
+        :param main_only: only follow the links from main parent families
+        :type main_only: bool
+        :param max_generations: furthest generation to report, or None
+        :type max_generations: int
+        """
+        return closure.iter_descendants(self, handle, main_only, max_generations)
+
+    def get_ancestor_handles(self, handles):
+        """
+        Return the set of the handles of the ancestors of some people.
+
+        Each ancestor is found once, whatever the number of paths to it.
+
+        :param handles: handles of the people
+        :type handles: list
+        """
+        return closure.find_ancestors(self, handles)
+
+    def get_descendant_handles(self, handles):
+        """
+        Return the set of the handles of the descendants of some people.
+
+        Each descendant is found once, whatever the number of paths to it.
+
+        :param handles: handles of the people
+        :type handles: list
+        """
+        return closure.find_descendants(self, handles)
+
     def method(self, fmt, *args):
         """
         Convenience function to return database methods.
@@ -1607,6 +1765,13 @@ class DbWriteBase(DbReadBase):
         """
         raise NotImplementedError
 
+    def commit_many(self, objs, transaction, change_time=None):
+        """
+        Commit several primary objects to the database, storing the changes
+        as part of the transaction.  The objects may be of different classes.
+        """
+        raise NotImplementedError
+
     def commit_note(self, note, transaction, change_time=None):
         """
         Commit the specified Note to the database, storing the changes as part
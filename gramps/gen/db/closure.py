@@ -0,0 +1,320 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Ancestors and descendants of a person.
+
+A person is linked to the father and the mother of each of the families in
+which it is a child.  The link is "main" when the family is the main parent
+family of the person, the first one of its list.  The ancestors of a person
+are the people reached by following the links from child to parent; the
+descendants are those reached from parent to child.
+
+Each ancestor or descendant is reported as ``(handle, generation, paths)``
+tuples, one for each distance at which it is found: generation 1 holds the
+parents or the children, and paths counts the distinct ways of reaching the
+person at that distance, so that pedigree collapse can be measured.  With
+``main_only``, only the paths made of main links are considered.
+
+:func:`iter_ancestors` and :func:`iter_descendants` walk the objects of a
+database; :func:`find_ancestors` and :func:`find_descendants` only find the
+people, each once, from several people at a time.  :func:`compute_closure`
+computes the ancestors of many people at once from their links, for backends
+which store them in a closure table.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ..errors import HandleError
+
+__all__ = (
+    "compute_closure",
+    "find_ancestors",
+    "find_descendants",
+    "iter_ancestors",
+    "iter_descendants",
+    "parent_links",
+)
+
+
+# -------------------------------------------------------------------------
+#
+# Helper functions
+#
+# -------------------------------------------------------------------------
+def _get(func, handle):
+    """
+    Return the object with the handle, or None if it does not exist.
+    """
+    try:
+        return func(handle)
+    except HandleError:
+        return None
+
+
+def _child_links(db, handle):
+    """
+    Return the (child handle, main) tuples of the links from a person to its
+    children.
+    """
+    person = _get(db.get_person_from_handle, handle)
+    if not person:
+        return []
+    links = []
+    for family_handle in person.get_family_handle_list():
+        family = _get(db.get_family_from_handle, family_handle)
+        if not family:
+            continue
+        for child_ref in family.get_child_ref_list():
+            child = _get(db.get_person_from_handle, child_ref.ref)
+            if child:
+                main = child.get_main_parents_family_handle() == family_handle
+                links.append((child.handle, main))
+    return links
+
+
+def _walk(db, handle, get_links, main_only, max_generations):
+    """
+    Walk the links from a person one generation at a time, counting the
+    paths to each person found.
+    """
+    level = {handle: 1}
+    seen = set()
+    generation = 0
+    while level and (max_generations is None or generation < max_generations):
+        generation += 1
+        following = {}
+        for person_handle, paths in level.items():
+            for relative, main in get_links(db, person_handle):
+                if main or not main_only:
+                    following[relative] = following.get(relative, 0) + paths
+        for relative, paths in following.items():
+            yield (relative, generation, paths)
+        seen.update(following)
+        if generation > len(seen):
+            # Without a loop in the tree, a path cannot be longer than the
+            # number of people found
+            break
+        level = following
+
+
+def _reach(db, handles, get_relatives):
+    """
+    Return the set of the people reached by following the links from some
+    people, each person being looked at once.
+    """
+    found = set()
+    todo = list(handles)
+    while todo:
+        for relative in get_relatives(db, todo.pop()):
+            if relative not in found:
+                found.add(relative)
+                todo.append(relative)
+    return found
+
+
+def _parent_links(db, handle):
+    """
+    Return the (parent handle, main) tuples of the links from a person to
+    its parents.
+    """
+    person = _get(db.get_person_from_handle, handle)
+    return parent_links(db, person) if person else []
+
+
+def _parents(db, handle):
+    """
+    Return the handles of the parents of a person which exist.
+    """
+    return [parent for parent, main in _parent_links(db, handle)]
+
+
+def _children(db, handle):
+    """
+    Return the handles of the children of a person which exist.
+    """
+    person = _get(db.get_person_from_handle, handle)
+    if not person:
+        return []
+    children = []
+    for family_handle in person.get_family_handle_list():
+        family = _get(db.get_family_from_handle, family_handle)
+        if family:
+            children.extend(
+                child_ref.ref
+                for child_ref in family.get_child_ref_list()
+                if db.has_person_handle(child_ref.ref)
+            )
+    return children
+
+
+def _combine(handle, handles, links, known, result):
+    """
+    Return the ancestors of a person from those of its parents.
+    """
+    ancestors = {}
+    for parent, main in links.get(handle, ()):
+        if parent in handles:
+            if parent not in result:
+                # The link closes a loop
+                continue
+            above = result[parent]
+        else:
+            above = known.get(parent, {})
+        entry = ancestors.setdefault((parent, 1), [0, 0])
+        entry[0] += 1
+        if main:
+            entry[1] += 1
+        for (ancestor, generation), (paths, main_paths) in above.items():
+            entry = ancestors.setdefault((ancestor, generation + 1), [0, 0])
+            entry[0] += paths
+            if main:
+                entry[1] += main_paths
+    return ancestors
+
+
+# -------------------------------------------------------------------------
+#
+# Functions
+#
+# -------------------------------------------------------------------------
+def parent_links(db, person):
+    """
+    Return the (parent handle, main) tuples of the links from a person to
+    the parents which exist.
+
+    :param db: database used to look up the families and parents
+    :type db: DbReadBase
+    :param person: the child
+    :type person: Person
+    """
+    links = []
+    for index, family_handle in enumerate(person.get_parent_family_handle_list()):
+        family = _get(db.get_family_from_handle, family_handle)
+        if not family:
+            continue
+        for parent_handle in (family.get_father_handle(), family.get_mother_handle()):
+            if parent_handle and db.has_person_handle(parent_handle):
+                links.append((parent_handle, index == 0))
+    return links
+
+
+def iter_ancestors(db, handle, main_only=False, max_generations=None):
+    """
+    Return an iterator over the (handle, generation, paths) tuples of the
+    ancestors of a person, by increasing generation.
+
+    :param db: database to walk
+    :type db: DbReadBase
+    :param handle: handle of the person
+    :type handle: str
+    :param main_only: only follow the links to the main parent family
+    :type main_only: bool
+    :param max_generations: furthest generation to report, or None
+    :type max_generations: int
+    """
+
+    return _walk(db, handle, _parent_links, main_only, max_generations)
+
+
+def iter_descendants(db, handle, main_only=False, max_generations=None):
+    """
+    Return an iterator over the (handle, generation, paths) tuples of the
+    descendants of a person, by increasing generation.
+
+    The children are found from the families of which the person is a
+    parent.
+
+    :param db: database to walk
+    :type db: DbReadBase
+    :param handle: handle of the person
+    :type handle: str
+    :param main_only: only follow the links from a main parent family
+    :type main_only: bool
+    :param max_generations: furthest generation to report, or None
+    :type max_generations: int
+    """
+    return _walk(db, handle, _child_links, main_only, max_generations)
+
+
+def find_ancestors(db, handles):
+    """
+    Return the set of the handles of the ancestors of some people.
+
+    :param db: database to walk
+    :type db: DbReadBase
+    :param handles: handles of the people
+    :type handles: list
+    """
+    return _reach(db, handles, _parents)
+
+
+def find_descendants(db, handles):
+    """
+    Return the set of the handles of the descendants of some people.
+
+    :param db: database to walk
+    :type db: DbReadBase
+    :param handles: handles of the people
+    :type handles: list
+    """
+    return _reach(db, handles, _children)
+
+
+def compute_closure(handles, links, known):
+    """
+    Compute the ancestors of a set of people.
+
+    Return a dictionary mapping each handle to a dictionary of its
+    ancestors, which maps (ancestor handle, generation) tuples to
+    [paths, main paths] lists.  A link which closes a loop in the tree is
+    ignored.
+
+    :param handles: handles of the people to compute
+    :type handles: set
+    :param links: maps the handles to lists of (parent handle, main) tuples
+    :type links: dict
+    :param known: maps the handles of parents which are not in handles to
+                  their ancestors, as returned by this function
+    :type known: dict
+    """
+    result = {}
+    for start in handles:
+        if start in result:
+            continue
+        # Depth first, so that the parents are done before their children
+        stack = [(start, iter(links.get(start, ())))]
+        active = {start}
+        while stack:
+            handle, todo = stack[-1]
+            for parent, main in todo:
+                if parent in handles and parent not in result:
+                    if parent not in active:
+                        active.add(parent)
+                        stack.append((parent, iter(links.get(parent, ()))))
+                        break
+            else:
+                stack.pop()
+                active.discard(handle)
+                result[handle] = _combine(handle, handles, links, known, result)
+    return result
@@ -46,6 +46,7 @@ __all__ = (
     "SCHVERSFN",
     "PCKVERSFN",
     "DBBACKEND",
+    "DBPROFILE",
     "PERSON_KEY",
     "FAMILY_KEY",
     "SOURCE_KEY",
@@ -71,6 +72,7 @@ DBLOCKFN = "lock"  # File name of lock file
 DBRECOVFN = "need_recover"  # File name of recovery file
 BDBVERSFN = "bdbversion.txt"  # File name of Berkeley DB version file
 DBBACKEND = "database.txt"  # File name of Database backend file
+DBPROFILE = "profile.txt"  # File name of Database tuning profile file
 SCHVERSFN = "schemaversion.txt"  # File name of schema version file
 PCKVERSFN = "pickleupgrade.txt"  # Indicator that pickle has been upgrade t Python3
 DBLOGNAME = ".Db"  # Name of logger
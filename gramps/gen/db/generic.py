@@ -35,6 +35,9 @@ import ast
 import sys
 import datetime
 import glob
+import itertools
+import sqlite3
+import tempfile
 from pathlib import Path
 
 # ------------------------------------------------------------------------
@@ -62,6 +65,7 @@ from . import (
     TXNADD,
     TXNUPD,
     TXNDEL,
+    CLASS_TO_KEY_MAP,
     KEY_TO_NAME_MAP,
     DBMODE_R,
     DBMODE_W,
@@ -112,50 +116,171 @@ SIGBASE = (
 
 
 class DbGenericUndo(DbUndo):
+    """
+    Undo manager of the generic backend.
+
+    The most recent undo records are kept in memory, up to the limit set by
+    "database.undo-memory" (in MiB).  Older records are moved to a SQLite
+    file next to the tree (or a temporary file for trees in memory), which
+    is removed again when the tree is closed.  At most "database.undo-depth"
+    transactions are kept in the undo queue; the oldest are forgotten, with
+    their records.
+    """
+
     def __init__(self, grampsdb, path):
         super(DbGenericUndo, self).__init__(grampsdb)
-        self.undodb = []
+        self.path = path
+        self.undodb = {}
+        self.memory_size = 0
+        self.memory_limit = max(0, config.get("database.undo-memory")) << 20
+        self.depth = config.get("database.undo-depth")
+        self.next_recno = 0
+        self.spill = None
+        self.spill_path = None
 
     def open(self, value=None):
         """
-        Open the backing storage.  Needs to be overridden in the derived
-        class.
+        Open the backing storage.  The spill file is only created once the
+        memory limit is reached.
         """
         pass
 
     def close(self):
         """
-        Close the backing storage.  Needs to be overridden in the derived
-        class.
+        Close the backing storage, and remove the spill file.
         """
-        pass
+        self.undodb = {}
+        self.memory_size = 0
+        if self.spill is not None:
+            self.spill.close()
+            self.spill = None
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+            self.spill_path = None
+
+    def clear(self):
+        """
+        Clear the undo/redo list and the records of its transactions.
+        """
+        super().clear()
+        self.__discard(0, self.next_recno)
 
     def append(self, value):
         """
-        Add a new entry on the end.  Needs to be overridden in the derived
-        class.
+        Add a new entry on the end, and return its record number.
         """
-        self.undodb.append(value)
+        recno = self.next_recno
+        self.next_recno += 1
+        self.undodb[recno] = value
+        self.memory_size += len(value)
+        if self.memory_size > self.memory_limit:
+            self.__spill()
+        return recno
 
     def __getitem__(self, index):
         """
-        Returns an entry by index number.  Needs to be overridden in the
-        derived class.
+        Returns an entry by index number.
         """
-        return self.undodb[index]
+        value = self.undodb.get(index)
+        if value is None and self.spill is not None:
+            row = self.spill.execute(
+                "SELECT data FROM undo WHERE recno = ?", [index]
+            ).fetchone()
+            if row is not None:
+                value = row[0]
+        if value is None:
+            raise IndexError("undo record %s is not available" % index)
+        return value
 
     def __setitem__(self, index, value):
         """
-        Set an entry to a value.  Needs to be overridden in the derived class.
+        Set an entry to a value.
         """
-        self.undodb[index] = value
+        if index in self.undodb:
+            self.memory_size += len(value) - len(self.undodb[index])
+            self.undodb[index] = value
+        elif self.spill is not None:
+            self.spill.execute(
+                "UPDATE undo SET data = ? WHERE recno = ?", [value, index]
+            )
+            self.spill.commit()
+        else:
+            raise IndexError("undo record %s is not available" % index)
 
     def __len__(self):
         """
-        Returns the number of entries.  Needs to be overridden in the derived
-        class.
+        Returns the number of entries appended so far.  Record numbers are
+        never reused, even if old records were discarded.
+        """
+        return self.next_recno
+
+    def _after_commit(self, transaction):
+        """
+        Forget the oldest transactions beyond the undo depth.
+        """
+        if self.depth <= 0:
+            return
+        while len(self.undoq) > self.depth:
+            txn = self.undoq.popleft()
+            if txn.first is not None:
+                self.__discard(txn.first, txn.last + 1)
+
+    def __spill(self):
+        """
+        Move the oldest records from memory to the spill file, until half
+        the memory limit is used.
+        """
+        if self.spill is None:
+            self.__open_spill()
+        rows = []
+        target = self.memory_limit // 2
+        for recno in list(self.undodb):
+            if self.memory_size <= target:
+                break
+            value = self.undodb.pop(recno)
+            self.memory_size -= len(value)
+            rows.append((recno, value))
+        self.spill.executemany("INSERT INTO undo (recno, data) VALUES (?, ?)", rows)
+        self.spill.commit()
+
+    def __open_spill(self):
+        """
+        Create the spill file.
+        """
+        if self.path:
+            self.spill_path = self.path
+            if os.path.exists(self.spill_path):
+                # left over from a session that did not close the tree
+                os.remove(self.spill_path)
+        else:
+            handle, self.spill_path = tempfile.mkstemp(suffix=".db", prefix="undo")
+            os.close(handle)
+        self.spill = sqlite3.connect(self.spill_path)
+        self.spill.execute("PRAGMA journal_mode = OFF")
+        self.spill.execute("PRAGMA synchronous = OFF")
+        self.spill.execute(
+            "CREATE TABLE IF NOT EXISTS undo (recno INTEGER PRIMARY KEY, data BLOB)"
+        )
+
+    def __discard(self, first, last):
+        """
+        Remove the records with numbers in the range [first, last).
         """
-        return len(self.undodb)
+        if last - first < len(self.undodb):
+            recnos = range(first, last)
+        else:
+            recnos = [recno for recno in self.undodb if first <= recno < last]
+        for recno in recnos:
+            value = self.undodb.pop(recno, None)
+            if value is not None:
+                self.memory_size -= len(value)
+        if self.spill is not None:
+            self.spill.execute(
+                "DELETE FROM undo WHERE recno >= ? AND recno < ?", [first, last]
+            )
+            self.spill.commit()
 
     def _redo(self, update_history):
         """
@@ -175,7 +300,7 @@ class DbGenericUndo(DbUndo):
             self.db._txn_begin()
             for record_id in subitems:
                 (key, trans_type, handle, old_data, new_data) = pickle.loads(
-                    self.undodb[record_id]
+                    self[record_id]
                 )
 
                 if key == REFERENCE_KEY:
@@ -183,6 +308,8 @@ class DbGenericUndo(DbUndo):
                 else:
                     self.db.undo_data(new_data, handle, key)
                     sigs[key][trans_type].append(handle)
+            # count the change before the listeners look at the data
+            self.db.has_changed += 1
             # now emit the signals
             self.undo_sigs(sigs, False)
 
@@ -224,7 +351,7 @@ class DbGenericUndo(DbUndo):
             self.db._txn_begin()
             for record_id in subitems:
                 (key, trans_type, handle, old_data, new_data) = pickle.loads(
-                    self.undodb[record_id]
+                    self[record_id]
                 )
 
                 if key == REFERENCE_KEY:
@@ -232,6 +359,8 @@ class DbGenericUndo(DbUndo):
                 else:
                     self.db.undo_data(old_data, handle, key)
                     sigs[key][trans_type].append(handle)
+            # count the change before the listeners look at the data
+            self.db.has_changed += 1
             # now emit the signals
             self.undo_sigs(sigs, True)
 
@@ -370,7 +499,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
     __callback_map = {}
 
-    VERSION = (20, 0, 0)
+    VERSION = (24, 0, 0)
 
     def __init__(self, directory=None):
         DbReadBase.__init__(self)
@@ -586,7 +715,10 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         self.abort_possible = True
         self._bm_changes = 0
         self.has_changed = 0  # Also gives commits since startup
+        self._result_cache = {}
+        self._result_cache_changed = 0
         self.surname_list = []
+        self.name_group = {}
         self.genderStats = GenderStats()  # can pass in loaded stats as dict
         self.owner = Researcher()
         if directory:
@@ -687,6 +819,9 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         # surname list
         self.surname_list = self.get_surname_list()
 
+        # name groups
+        self.name_group = self._get_name_group_map()
+
         self._set_save_path(directory)
 
         if self._directory and self._directory != ":memory:":
@@ -729,6 +864,14 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
                 self.close()
                 raise DbUpgradeRequiredError(dbversion, self.VERSION[0])
 
+    def _get_name_group_map(self):
+        """
+        Return a dictionary mapping the surnames that have a default grouping
+        to that grouping.  Backends that keep the name groups in memory
+        override this to load them.
+        """
+        return {}
+
     def _create_undo_manager(self):
         """
         Create the undo manager.
@@ -809,12 +952,27 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             except IOError:
                 pass
 
+        if self.undodb is not None:
+            self.undodb.close()
         self.db_is_open = False
         self._directory = None
+        self._result_cache.clear()
 
     def is_open(self):
         return self.db_is_open
 
+    def get_result_cache(self):
+        """
+        Return a dictionary in which results computed from the data of the
+        database may be kept.  It is emptied when a transaction is committed,
+        undone or redone, so that its entries belong to the current value of
+        the change counter.
+        """
+        if self._result_cache_changed != self.has_changed:
+            self._result_cache.clear()
+            self._result_cache_changed = self.has_changed
+        return self._result_cache
+
     def get_dbid(self):
         """
         We use the file directory name as the unique ID for
@@ -1718,6 +1876,16 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         """
         raise NotImplementedError
 
+    def _iter_sorted_raw_data(self, obj_key):
+        """
+        Return an iterator over raw data in the order of the handles.
+        """
+        for handle in sorted(self._iter_handles(obj_key)):
+            yield (handle, self._get_raw_data(obj_key, handle))
+
+    def iter_sorted_raw_data(self, class_name):
+        return self._iter_sorted_raw_data(CLASS_TO_KEY_MAP[class_name])
+
     ################################################################
     #
     # get_raw_*_data methods
@@ -1885,13 +2053,47 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         """
         raise NotImplementedError
 
+    def _commit_base_many(self, objs, obj_key, trans, change_time):
+        """
+        Commit a list of objects of the same class to the database, storing
+        the changes as part of the transaction.  Return the list of their
+        old serialized data, None for new objects.
+
+        Backends may override this to write the objects in bulk.
+        """
+        return [self._commit_base(obj, obj_key, trans, change_time) for obj in objs]
+
+    def commit_many(self, objs, trans, change_time=None):
+        """
+        Commit several primary objects to the database, storing the changes
+        as part of the transaction.
+
+        The result, including the signals and the undo data, is the same as
+        committing each object in turn with its own commit method.
+        """
+        for class_name, group in itertools.groupby(
+            objs, lambda obj: obj.__class__.__name__
+        ):
+            group = list(group)
+            obj_key = CLASS_TO_KEY_MAP[class_name]
+            old_list = self._commit_base_many(group, obj_key, trans, change_time)
+            commit_misc = self.method("_commit_%s_misc", KEY_TO_NAME_MAP[obj_key])
+            if commit_misc:
+                for obj, old_data in zip(group, old_list):
+                    commit_misc(obj, old_data, trans)
+
     def commit_person(self, person, trans, change_time=None):
         """
         Commit the specified Person to the database, storing the changes as
         part of the transaction.
         """
         old_data = self._commit_base(person, PERSON_KEY, trans, change_time)
+        self._commit_person_misc(person, old_data, trans)
 
+    def _commit_person_misc(self, person, old_data, trans):
+        """
+        Update the data derived from a committed Person.
+        """
         if old_data:
             old_person = Person(old_data)
             # Update gender statistics if necessary
@@ -1955,9 +2157,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         Commit the specified Family to the database, storing the changes as
         part of the transaction.
         """
-        self._commit_base(family, FAMILY_KEY, trans, change_time)
+        old_data = self._commit_base(family, FAMILY_KEY, trans, change_time)
+        self._commit_family_misc(family, old_data, trans)
 
-        # Misc updates:
+    def _commit_family_misc(self, family, old_data, trans):
+        """
+        Update the data derived from a committed Family.
+        """
         self.family_attributes.update(
             [
                 str(attr.type)
@@ -1995,9 +2201,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         Commit the specified Citation to the database, storing the changes as
         part of the transaction.
         """
-        self._commit_base(citation, CITATION_KEY, trans, change_time)
+        old_data = self._commit_base(citation, CITATION_KEY, trans, change_time)
+        self._commit_citation_misc(citation, old_data, trans)
 
-        # Misc updates:
+    def _commit_citation_misc(self, citation, old_data, trans):
+        """
+        Update the data derived from a committed Citation.
+        """
         attr_list = []
         for mref in citation.media_list:
             attr_list += [
@@ -2020,9 +2230,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         Commit the specified Source to the database, storing the changes as
         part of the transaction.
         """
-        self._commit_base(source, SOURCE_KEY, trans, change_time)
+        old_data = self._commit_base(source, SOURCE_KEY, trans, change_time)
+        self._commit_source_misc(source, old_data, trans)
 
-        # Misc updates:
+    def _commit_source_misc(self, source, old_data, trans):
+        """
+        Update the data derived from a committed Source.
+        """
         self.source_media_types.update(
             [
                 str(ref.media_type)
@@ -2052,9 +2266,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         Commit the specified Repository to the database, storing the changes
         as part of the transaction.
         """
-        self._commit_base(repository, REPOSITORY_KEY, trans, change_time)
+        old_data = self._commit_base(repository, REPOSITORY_KEY, trans, change_time)
+        self._commit_repository_misc(repository, old_data, trans)
 
-        # Misc updates:
+    def _commit_repository_misc(self, repository, old_data, trans):
+        """
+        Update the data derived from a committed Repository.
+        """
         if repository.type.is_custom():
             self.repository_types.add(str(repository.type))
 
@@ -2067,9 +2285,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         Commit the specified Note to the database, storing the changes as part
         of the transaction.
         """
-        self._commit_base(note, NOTE_KEY, trans, change_time)
+        old_data = self._commit_base(note, NOTE_KEY, trans, change_time)
+        self._commit_note_misc(note, old_data, trans)
 
-        # Misc updates:
+    def _commit_note_misc(self, note, old_data, trans):
+        """
+        Update the data derived from a committed Note.
+        """
         if note.type.is_custom():
             self.note_types.add(str(note.type))
 
@@ -2078,9 +2300,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         Commit the specified Place to the database, storing the changes as
         part of the transaction.
         """
-        self._commit_base(place, PLACE_KEY, trans, change_time)
+        old_data = self._commit_base(place, PLACE_KEY, trans, change_time)
+        self._commit_place_misc(place, old_data, trans)
 
-        # Misc updates:
+    def _commit_place_misc(self, place, old_data, trans):
+        """
+        Update the data derived from a committed Place.
+        """
         if place.get_type().is_custom():
             self.place_types.add(str(place.get_type()))
 
@@ -2102,9 +2328,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         Commit the specified Event to the database, storing the changes as
         part of the transaction.
         """
-        self._commit_base(event, EVENT_KEY, trans, change_time)
+        old_data = self._commit_base(event, EVENT_KEY, trans, change_time)
+        self._commit_event_misc(event, old_data, trans)
 
-        # Misc updates:
+    def _commit_event_misc(self, event, old_data, trans):
+        """
+        Update the data derived from a committed Event.
+        """
         self.event_attributes.update(
             [
                 str(attr.type)
@@ -2135,9 +2365,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         Commit the specified Media to the database, storing the changes
         as part of the transaction.
         """
-        self._commit_base(media, MEDIA_KEY, trans, change_time)
+        old_data = self._commit_base(media, MEDIA_KEY, trans, change_time)
+        self._commit_media_misc(media, old_data, trans)
 
-        # Misc updates:
+    def _commit_media_misc(self, media, old_data, trans):
+        """
+        Update the data derived from a committed Media.
+        """
         self.media_attributes.update(
             [
                 str(attr.type)
@@ -2559,6 +2793,19 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             _("Schema version"): ".".join([str(v) for v in self.VERSION]),
         }
 
+    def get_profiles(self):
+        """
+        Return the names of the tuning profiles supported by the backend.
+        A backend without tuning profiles returns an empty list.
+        """
+        return []
+
+    def set_profile(self, profile):
+        """
+        Apply a tuning profile to the open database.
+        """
+        pass
+
     def _order_by_person_key(self, person):
         """
         All non pa/matronymic surnames are used in indexing.
@@ -2622,6 +2869,10 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             gramps_upgrade_18,
             gramps_upgrade_19,
             gramps_upgrade_20,
+            gramps_upgrade_21,
+            gramps_upgrade_22,
+            gramps_upgrade_23,
+            gramps_upgrade_24,
         )
 
         if version < 14:
@@ -2638,6 +2889,14 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             gramps_upgrade_19(self)
         if version < 20:
             gramps_upgrade_20(self)
+        if version < 21:
+            gramps_upgrade_21(self)
+        if version < 22:
+            gramps_upgrade_22(self)
+        if version < 23:
+            gramps_upgrade_23(self)
+        if version < 24:
+            gramps_upgrade_24(self)
 
         self.rebuild_secondary(callback)
         self.reindex_reference_map(callback)
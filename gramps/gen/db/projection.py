@@ -0,0 +1,155 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Projected fields of primary objects.
+
+A projected field is a value derived from a primary object which a database
+backend may store alongside the serialized object, so that filters, sorters
+and views can read it without unserializing the whole object.
+
+:data:`PROJECTIONS` maps a primary object class name to a list of
+``(field, schema_type, func)`` tuples.  ``schema_type`` uses the same names
+as the object schemas; an ``"array"`` is a list of handles.  ``func`` is
+called with the database and the object and returns the field value.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ..errors import HandleError
+
+__all__ = ("PROJECTIONS", "get_projection_fields", "project_object")
+
+
+# -------------------------------------------------------------------------
+#
+# Field functions
+#
+# -------------------------------------------------------------------------
+def _event_ref_handle(event_ref):
+    """
+    Return the handle of the event referenced by an EventRef, or "".
+    """
+    if event_ref:
+        return event_ref.ref
+    return ""
+
+
+def _event_sortval(db, event_ref):
+    """
+    Return the date sort value of the event referenced by an EventRef.
+    """
+    if event_ref:
+        try:
+            event = db.get_event_from_handle(event_ref.ref)
+        except HandleError:
+            # The event may not have been committed yet
+            event = None
+        if event:
+            return event.get_date_object().get_sort_value()
+    return 0
+
+
+def _tag_list(db, obj):
+    return obj.get_tag_list()
+
+
+PROJECTIONS = {
+    "Person": [
+        (
+            "birth_ref_handle",
+            "string",
+            lambda db, obj: _event_ref_handle(obj.get_birth_ref()),
+        ),
+        (
+            "death_ref_handle",
+            "string",
+            lambda db, obj: _event_ref_handle(obj.get_death_ref()),
+        ),
+        (
+            "birth_sortval",
+            "integer",
+            lambda db, obj: _event_sortval(db, obj.get_birth_ref()),
+        ),
+        (
+            "death_sortval",
+            "integer",
+            lambda db, obj: _event_sortval(db, obj.get_death_ref()),
+        ),
+        ("family_list", "array", lambda db, obj: obj.get_family_handle_list()),
+        (
+            "parent_family_list",
+            "array",
+            lambda db, obj: obj.get_parent_family_handle_list(),
+        ),
+        ("tag_list", "array", _tag_list),
+    ],
+    "Family": [("tag_list", "array", _tag_list)],
+    "Event": [
+        (
+            "date_sortval",
+            "integer",
+            lambda db, obj: obj.get_date_object().get_sort_value(),
+        ),
+        ("tag_list", "array", _tag_list),
+    ],
+    "Place": [("tag_list", "array", _tag_list)],
+    "Repository": [("tag_list", "array", _tag_list)],
+    "Source": [("tag_list", "array", _tag_list)],
+    "Citation": [("tag_list", "array", _tag_list)],
+    "Media": [("tag_list", "array", _tag_list)],
+    "Note": [("tag_list", "array", _tag_list)],
+}
+
+
+# -------------------------------------------------------------------------
+#
+# Functions
+#
+# -------------------------------------------------------------------------
+def get_projection_fields(class_name):
+    """
+    Return a list of (field, schema_type) tuples projected for a class.
+
+    :param class_name: primary object class name, e.g. "Person"
+    :type class_name: str
+    """
+    return [
+        (field, schema_type)
+        for field, schema_type, func in PROJECTIONS.get(class_name, [])
+    ]
+
+
+def project_object(db, obj):
+    """
+    Return a dictionary of the projected field values of an object.
+
+    :param db: database used to look up related objects
+    :type db: DbReadBase
+    :param obj: primary object
+    :type obj: TableObject
+    """
+    return {
+        field: func(db, obj)
+        for field, schema_type, func in PROJECTIONS.get(obj.__class__.__name__, [])
+    }
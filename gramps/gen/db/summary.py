@@ -0,0 +1,192 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Vital summary of a person.
+
+The summary holds the values shown in the person views which depend on other
+objects than the person: the events used for the birth and death columns,
+their sort values and places, and the parent, marriage, child and to do
+counts.  It is computed by :func:`person_summary`; a database backend may
+store it and keep it up to date when the person, or one of its events,
+families or notes, changes.
+
+:data:`PERSON_SUMMARY_FIELDS` lists the ``(field, schema_type)`` tuples of
+the summary.  An event or place handle is "" when there is none.  The
+``*_fallback`` fields are True when a fallback event (a baptism for the
+birth, a burial for the death, ...) is used.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ..errors import HandleError
+from ..lib import ChildRefType, EventRoleType, FamilyRelType, NoteType
+
+__all__ = ("PERSON_SUMMARY_FIELDS", "person_summary")
+
+PERSON_SUMMARY_FIELDS = [
+    ("birth_handle", "string"),
+    ("birth_fallback", "boolean"),
+    ("birth_sortval", "integer"),
+    ("birth_valid", "boolean"),
+    ("birth_place_event", "string"),
+    ("birth_place_handle", "string"),
+    ("birth_place_fallback", "boolean"),
+    ("death_handle", "string"),
+    ("death_fallback", "boolean"),
+    ("death_sortval", "integer"),
+    ("death_valid", "boolean"),
+    ("death_place_event", "string"),
+    ("death_place_handle", "string"),
+    ("death_place_fallback", "boolean"),
+    ("parents", "integer"),
+    ("marriages", "integer"),
+    ("children", "integer"),
+    ("todo", "integer"),
+]
+
+
+# -------------------------------------------------------------------------
+#
+# Helper functions
+#
+# -------------------------------------------------------------------------
+def _get(func, handle):
+    """
+    Return the object with the handle, or None if it does not exist.
+    """
+    try:
+        return func(handle)
+    except HandleError:
+        return None
+
+
+def _vital(db, person, event_ref, is_fallback):
+    """
+    Return the summary fields of the birth or the death of a person, with
+    "birth" or "death" left out of the names.
+    """
+    result = {
+        "handle": "",
+        "fallback": False,
+        "sortval": 0,
+        "valid": True,
+        "place_event": "",
+        "place_handle": "",
+        "place_fallback": False,
+    }
+    event = _get(db.get_event_from_handle, event_ref.ref) if event_ref else None
+    if event:
+        # The birth or death event is used even if it has no date
+        date = event.get_date_object()
+        result["handle"] = event.handle
+        result["sortval"] = date.get_sort_value()
+        result["valid"] = date.get_valid()
+        if event.get_place_handle():
+            result["place_event"] = event.handle
+            result["place_handle"] = event.get_place_handle()
+
+    if result["handle"] and result["place_event"]:
+        return result
+    for ref in person.get_event_ref_list():
+        if ref.get_role() != EventRoleType.PRIMARY:
+            continue
+        event = _get(db.get_event_from_handle, ref.ref)
+        if not event or not is_fallback(event.get_type()):
+            continue
+        date = event.get_date_object()
+        if not result["handle"] and not date.is_empty():
+            result["handle"] = event.handle
+            result["fallback"] = True
+            result["sortval"] = date.get_sort_value()
+            result["valid"] = date.get_valid()
+        if not result["place_event"] and event.get_place_handle():
+            result["place_event"] = event.handle
+            result["place_handle"] = event.get_place_handle()
+            result["place_fallback"] = True
+        if result["handle"] and result["place_event"]:
+            break
+    return result
+
+
+# -------------------------------------------------------------------------
+#
+# Functions
+#
+# -------------------------------------------------------------------------
+def person_summary(db, person):
+    """
+    Return a dictionary of the summary fields of a person.
+
+    Objects referenced by the person which do not exist are ignored.
+
+    :param db: database used to look up related objects
+    :type db: DbReadBase
+    :param person: person to summarize
+    :type person: Person
+    """
+    summary = {}
+    birth = _vital(
+        db, person, person.get_birth_ref(), lambda etype: etype.is_birth_fallback()
+    )
+    death = _vital(
+        db, person, person.get_death_ref(), lambda etype: etype.is_death_fallback()
+    )
+    for field, value in birth.items():
+        summary["birth_" + field] = value
+    for field, value in death.items():
+        summary["death_" + field] = value
+
+    parents = 0
+    for family_handle in person.get_parent_family_handle_list():
+        family = _get(db.get_family_from_handle, family_handle)
+        if family:
+            parents += bool(family.get_father_handle())
+            parents += bool(family.get_mother_handle())
+
+    marriages = 0
+    children = 0
+    for family_handle in person.get_family_handle_list():
+        family = _get(db.get_family_from_handle, family_handle)
+        if not family:
+            continue
+        if int(family.get_relationship()) == FamilyRelType.MARRIED:
+            marriages += 1
+        for child_ref in family.get_child_ref_list():
+            if (
+                child_ref.get_father_relation() == ChildRefType.BIRTH
+                and child_ref.get_mother_relation() == ChildRefType.BIRTH
+            ):
+                children += 1
+
+    todo = 0
+    for note_handle in person.get_note_list():
+        note = _get(db.get_note_from_handle, note_handle)
+        if note and int(note.get_type()) == NoteType.TODO:
+            todo += 1
+
+    summary["parents"] = parents
+    summary["marriages"] = marriages
+    summary["children"] = children
+    summary["todo"] = todo
+    return summary
@@ -58,6 +58,73 @@ _ = glocale.translation.gettext
 LOG = logging.getLogger(".upgrade")
 
 
+def gramps_upgrade_24(self):
+    """
+    Upgrade database from version 23 to 24.
+    """
+    # Add the surname table, and make the given names of the gender
+    # statistics unique.  The surnames are counted by rebuild_secondary at
+    # the end of the upgrade.
+    self._txn_begin()
+    self.dbapi.execute("SELECT given_name, female, male, unknown FROM gender_stats")
+    rows = {row[0]: row for row in self.dbapi.fetchall()}
+    self.dbapi.execute("DELETE FROM gender_stats")
+    self.dbapi.executemany(
+        "INSERT INTO gender_stats (given_name, female, male, unknown) "
+        "VALUES (?, ?, ?, ?)",
+        list(rows.values()),
+    )
+    self._create_surname_table()
+    self._txn_commit()
+    # Bump up database version. Separate transaction to save metadata.
+    self._set_metadata("version", 24)
+
+
+def gramps_upgrade_23(self):
+    """
+    Upgrade database from version 22 to 23.
+    """
+    # Add the person summary table.  It is filled in by rebuild_secondary
+    # at the end of the upgrade.
+    self._txn_begin()
+    self._create_person_summary_table()
+    self._txn_commit()
+    # Bump up database version. Separate transaction to save metadata.
+    self._set_metadata("version", 23)
+
+
+def gramps_upgrade_22(self):
+    """
+    Upgrade database from version 21 to 22.
+    """
+    # Add the projection columns.  They are filled in by rebuild_secondary
+    # at the end of the upgrade.
+    self._txn_begin()
+    self._create_projection_columns()
+    self._txn_commit()
+    # Bump up database version. Separate transaction to save metadata.
+    self._set_metadata("version", 22)
+
+
+def gramps_upgrade_21(self):
+    """
+    Upgrade database from version 20 to 21.
+    """
+    # Make (obj_handle, ref_handle) unique in the reference table.  The
+    # table is emptied here and refilled by reindex_reference_map at the
+    # end of the upgrade.
+    self._txn_begin()
+    self.dbapi.execute("DELETE FROM reference")
+    self.dbapi.execute("DROP INDEX IF EXISTS reference_obj_handle")
+    self.dbapi.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS reference_obj_ref "
+        "ON reference(obj_handle, ref_handle)"
+    )
+    self._txn_commit()
+    # Bump up database version. Separate transaction to save metadata.
+    self._set_metadata("version", 21)
+
+
 def gramps_upgrade_20(self):
     """
     Placeholder update.
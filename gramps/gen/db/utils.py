@@ -41,7 +41,7 @@ from ..plug import BasePluginManager
 from ..const import PLUGINS_DIR, USER_PLUGINS
 from ..constfunc import win, get_env_var
 from ..config import config
-from .dbconst import DBLOGNAME, DBLOCKFN, DBBACKEND
+from .dbconst import DBLOGNAME, DBLOCKFN, DBBACKEND, DBPROFILE
 from ..const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
@@ -147,6 +147,30 @@ def get_dbid_from_path(dirpath):
     return dbid
 
 
+def get_profile_from_path(dirpath):
+    """
+    Return the name of the tuning profile of a database directory.
+
+    Trees without a profile of their own use the "database.profile" setting.
+    """
+    profile = config.get("database.profile")
+    profile_path = os.path.join(dirpath, DBPROFILE)
+    if os.path.isfile(profile_path):
+        with open(profile_path, encoding="utf8") as file:
+            profile = file.read().strip()
+    return profile
+
+
+def set_profile_for_path(dirpath, profile):
+    """
+    Set the name of the tuning profile of a database directory.  The profile
+    is applied the next time the database is opened.
+    """
+    profile_path = os.path.join(dirpath, DBPROFILE)
+    with open(profile_path, "w", encoding="utf8") as file:
+        file.write(profile)
+
+
 def import_as_dict(filename, user, skp_imp_adds=True):
     """
     Import the filename into a InMemoryDB and return it.
@@ -29,6 +29,8 @@ Package providing filtering framework for Gramps.
 # Gramps imports
 #
 # ------------------------------------------------------------------------
+import copy
+
 from ..lib.person import Person
 from ..lib.family import Family
 from ..lib.src import Source
@@ -39,7 +41,9 @@ from ..lib.repo import Repository
 from ..lib.media import Media
 from ..lib.note import Note
 from ..lib.tag import Tag
+from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
+from ._parallel import parallel_apply
 
 _ = glocale.translation.gettext
 
@@ -197,6 +201,80 @@ class GenericFilter:
             user.end_progress()
         return final_list
 
+    def select_sql(self, db, id_list, tupleind=None):
+        """
+        Select the candidates with the SQL conditions of the rules that
+        provide one.  The rules must have been prepared.
+
+        Returns None if no rule can be expressed in SQL, or the database
+        cannot evaluate SQL conditions.  Otherwise returns the candidates,
+        the index of the handle in them, and the rules left to apply.  The
+        candidates keep the order of id_list, or of the cursor if id_list
+        is None.
+        """
+        where = []
+        args = []
+        residual = []
+        for rule in self.flist:
+            condition = rule.to_sql()
+            if condition is None:
+                residual.append(rule)
+            else:
+                where.append("(%s)" % condition[0])
+                args.extend(condition[1])
+        if not where:
+            return None
+        class_name = self.make_obj().__class__.__name__
+        handles = db.select_handles(class_name, " AND ".join(where), args)
+        if handles is None:
+            return None
+
+        if id_list is None:
+            # the handles come in the order of the cursor
+            id_list = handles
+            tupleind = None
+        else:
+            handles = set(handles)
+            id_list = [
+                data
+                for data in id_list
+                if (data if tupleind is None else data[tupleind]) in handles
+            ]
+        return id_list, tupleind, residual
+
+    def check_and_sql(self, db, id_list, user=None, tupleind=None):
+        """
+        Apply an "and" filter by selecting candidates with the SQL conditions
+        of the rules that provide one, and applying the remaining rules to
+        the candidates only.  The rules must have been prepared.
+
+        Returns None if no rule can be expressed in SQL, or the database
+        cannot evaluate SQL conditions.
+        """
+        selected = self.select_sql(db, id_list, tupleind)
+        if selected is None:
+            return None
+        id_list, tupleind, residual = selected
+        if not residual:
+            return id_list
+
+        final_list = []
+        if user:
+            user.begin_progress(_("Filter"), _("Applying ..."), len(id_list))
+        for data in id_list:
+            if tupleind is None:
+                handle = data
+            else:
+                handle = data[tupleind]
+            obj = self.find_from_handle(db, handle)
+            if user:
+                user.step_progress()
+            if obj and all(rule.apply(db, obj) for rule in residual):
+                final_list.append(data)
+        if user:
+            user.end_progress()
+        return final_list
+
     def check_or(self, db, id_list, user=None, tupleind=None, tree=False):
         return self.check_func(db, id_list, self.or_test, user, tupleind, tree=False)
 
@@ -246,19 +324,65 @@ class GenericFilter:
 
         user is optional. If present it must be an instance of a User class.
 
+        The rules that can be expressed in SQL select the candidates first.
+        If the "behavior.filter-processes" preference is greater than one and
+        the database can be opened by other processes, the candidates are
+        then examined by that many worker processes.
+
         :Returns: if id_list given, it is returned with the items that
                 do not match the filter, filtered out.
                 if id_list not given, all items in the database that
                 match the filter are returned as a list of handles
         """
+        processes = config.get("behavior.filter-processes")
+        if processes > 1 and not tree:
+            res = self.parallel_apply(db, id_list, processes, user, tupleind)
+            if res is not None:
+                return res
+
         m = self.get_check_func()
         for rule in self.flist:
             rule.requestprepare(db, user)
-        res = m(db, id_list, user, tupleind, tree)
+        res = None
+        if m == self.check_and and not self.invert and not tree:
+            res = self.check_and_sql(db, id_list, user, tupleind)
+        if res is None:
+            res = m(db, id_list, user, tupleind, tree)
         for rule in self.flist:
             rule.requestreset()
         return res
 
+    def parallel_apply(self, db, id_list, processes, user=None, tupleind=None):
+        """
+        Apply the filter in worker processes, after selecting the candidates
+        with the SQL conditions of the rules that provide one: only the
+        remaining rules are sent to the workers.
+
+        Returns None if the filter cannot be applied in parallel.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .rules import Rule
+
+        filt = self
+        if self.get_check_func() == self.check_and and not self.invert:
+            # only the rules that can be expressed in SQL are prepared here
+            sql_rules = [
+                rule for rule in self.flist if type(rule).to_sql is not Rule.to_sql
+            ]
+            if sql_rules:
+                for rule in sql_rules:
+                    rule.requestprepare(db, user)
+                selected = self.select_sql(db, id_list, tupleind)
+                for rule in sql_rules:
+                    rule.requestreset()
+                if selected is not None:
+                    id_list, tupleind, residual = selected
+                    if not residual:
+                        return id_list
+                    filt = copy.copy(self)
+                    filt.flist = residual
+        return parallel_apply(filt, db, id_list, processes, user, tupleind)
+
 
 class GenericFamilyFilter(GenericFilter):
     def __init__(self, source=None):
@@ -0,0 +1,170 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Apply a filter in a pool of worker processes.
+
+The handles to examine are split into shards.  Each worker process opens its
+own read-only copy of the database, prepares the rules once, and returns the
+handles of its shards that match.  The results are merged in the order of the
+original list.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import logging
+import multiprocessing
+import pickle
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ..const import GRAMPS_LOCALE as glocale
+
+_ = glocale.translation.gettext
+LOG = logging.getLogger(".filter")
+
+# Number of handles sent to a worker at a time
+SHARD_SIZE = 250
+
+# State of a worker process
+_WORKER = {}
+
+
+# -------------------------------------------------------------------------
+#
+# Worker functions
+#
+# -------------------------------------------------------------------------
+def _init_worker(dbid, directory, data):
+    """
+    Remember what the worker needs.  The database is opened on the first
+    shard, so that an error reaches the parent instead of killing the worker.
+    """
+    _WORKER.clear()
+    _WORKER.update(dbid=dbid, directory=directory, data=data)
+
+
+def _open_worker():
+    """
+    Open the database and prepare the filter of a worker process.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ..db.dbconst import DBMODE_R
+    from ..db.utils import make_database
+    from . import reload_custom_filters
+
+    reload_custom_filters()
+    db = make_database(_WORKER["dbid"])
+    db.load(_WORKER["directory"], mode=DBMODE_R, update=False)
+    filt = pickle.loads(_WORKER["data"])
+    for rule in filt.flist:
+        rule.requestprepare(db, None)
+    _WORKER["db"] = db
+    _WORKER["filter"] = filt
+
+
+def _check_shard(handles):
+    """
+    Return the handles of a shard that match the filter.
+    """
+    if "db" not in _WORKER:
+        _open_worker()
+    filt = _WORKER["filter"]
+    return len(handles), filt.get_check_func()(_WORKER["db"], handles)
+
+
+# -------------------------------------------------------------------------
+#
+# parallel_apply
+#
+# -------------------------------------------------------------------------
+def parallel_apply(filt, db, id_list, processes, user=None, tupleind=None):
+    """
+    Apply a filter using a pool of worker processes.
+
+    Returns None if the filter cannot be applied in parallel, in which case
+    the caller must apply it itself.  The rules must not have been prepared.
+
+    :param filt: the filter to apply
+    :type filt: GenericFilter
+    :param db: the database; it must provide a reader source
+    :type db: DbReadBase
+    :param id_list: the handles, or tuples holding the handles, to examine;
+                    all objects of the filter's class if None
+    :type id_list: list
+    :param processes: the number of worker processes
+    :type processes: int
+    """
+    source = db.get_reader_source()
+    if source is None:
+        return None
+
+    if id_list is None:
+        id_list = db.get_cursor_handles(filt.make_obj().__class__.__name__)
+        tupleind = None
+    if tupleind is None:
+        handles = list(id_list)
+    else:
+        handles = [data[tupleind] for data in id_list]
+    if len(handles) < 2 * SHARD_SIZE:
+        return None
+
+    try:
+        data = pickle.dumps(filt)
+    except (pickle.PicklingError, TypeError, AttributeError) as err:
+        LOG.debug("filter '%s' cannot be sent to workers: %s", filt.get_name(), err)
+        return None
+
+    shards = [
+        handles[index : index + SHARD_SIZE]
+        for index in range(0, len(handles), SHARD_SIZE)
+    ]
+    matches = set()
+    if user:
+        user.begin_progress(_("Filter"), _("Applying ..."), len(handles))
+    try:
+        # Forking a process that runs a GUI is unsafe
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(
+            min(processes, len(shards)),
+            initializer=_init_worker,
+            initargs=(source[0], source[1], data),
+        ) as pool:
+            for count, matched in pool.imap_unordered(_check_shard, shards):
+                matches.update(matched)
+                if user:
+                    for dummy in range(count):
+                        user.step_progress()
+    except Exception as err:  # pylint: disable=broad-except
+        LOG.warning("parallel filter failed, applying it serially: %s", err)
+        return None
+    finally:
+        if user:
+            user.end_progress()
+
+    if tupleind is None:
+        return [handle for handle in id_list if handle in matches]
+    return [data for data in id_list if data[tupleind] in matches]
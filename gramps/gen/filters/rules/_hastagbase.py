@@ -69,3 +69,9 @@ class HasTagBase(Rule):
         if self.tag_handle is None:
             return False
         return self.tag_handle in obj.get_tag_list()
+
+    def to_sql(self):
+        if self.tag_handle is None:
+            return ("1 = 0", [])
+        # tag_list holds the tag handles separated by spaces
+        return ("(' ' || tag_list || ' ') LIKE ?", ["% " + self.tag_handle + " %"])
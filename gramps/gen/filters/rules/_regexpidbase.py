@@ -58,3 +58,16 @@ class RegExpIdBase(Rule):
 
     def apply(self, db, obj):
         return self.match_substring(0, obj.gramps_id)
+
+    def to_sql(self):
+        if not self.list[0]:
+            return ("1 = 1", [])
+        if self.use_regex:
+            pattern = self.regex[0].pattern
+            flags = self.regex[0].flags
+        else:
+            pattern = re.escape(self.list[0])
+            flags = re.I
+        if flags & re.I:
+            pattern = "(?i)" + pattern
+        return ("gramps_id REGEXP ?", [pattern])
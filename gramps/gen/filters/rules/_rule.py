@@ -28,6 +28,7 @@ Base class for filter rules.
 # Standard Python modules
 #
 # -------------------------------------------------------------------------
+import copy
 import re
 
 from ...errors import FilterError
@@ -58,6 +59,11 @@ class Rule:
     category = _("Miscellaneous filters")
     description = _("No description")
     allow_regex = False
+    # Attributes set by prepare that depend only on the values of the rule
+    # and on the data of the database.  They are kept in the result cache of
+    # the database, and restored instead of preparing the rule again while
+    # the data is unchanged.
+    prepared_attributes = ()
 
     def __init__(self, arg, use_regex=False, use_case=False):
         self.list = []
@@ -95,7 +101,9 @@ class Rule:
                         except re.error:
                             self.regex[index] = re.compile("")
                 self.match_substring = self.match_regex
-            self.prepare(db, user)
+            if not self.__restore_prepared(db):
+                self.prepare(db, user)
+                self.__store_prepared(db)
         self.nrprepare += 1
         if self.nrprepare > 20:  # more references to a filter than expected
             raise FilterError(
@@ -106,10 +114,57 @@ class Rule:
                 ),
             )
 
+    def __getstate__(self):
+        """
+        Return the state to pickle, to send the rule to worker processes.
+        The bound match_substring method is replaced by its name, as a
+        private method cannot be found again by name when unpickled.
+        """
+        state = self.__dict__.copy()
+        state["match_substring"] = self.match_substring.__name__
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.match_substring == "match_regex":
+            self.match_substring = self.match_regex
+        else:
+            self.match_substring = self.__match_substring
+
     def prepare(self, db, user):
         """prepare so the rule can be executed efficiently"""
         pass
 
+    def __cache_key(self):
+        """Return the key of the prepared attributes in the result cache."""
+        return (self.__class__, repr(self.list), self.use_regex, self.use_case)
+
+    def __restore_prepared(self, db):
+        """
+        Restore the prepared attributes from the result cache of the
+        database.  Return True if they were found.
+        """
+        if not self.prepared_attributes:
+            return False
+        cache = db.get_result_cache()
+        if cache is None or self.__cache_key() not in cache:
+            return False
+        for name, value in cache[self.__cache_key()].items():
+            # reset may empty the attribute in place, so use a copy
+            setattr(self, name, copy.copy(value))
+        return True
+
+    def __store_prepared(self, db):
+        """Keep the prepared attributes in the result cache of the database."""
+        if not self.prepared_attributes:
+            return
+        cache = db.get_result_cache()
+        if cache is not None:
+            cache[self.__cache_key()] = {
+                name: copy.copy(getattr(self, name))
+                for name in self.prepared_attributes
+            }
+
     def requestreset(self):
         """
         Request that the reset method of the rule is executed if possible
@@ -154,6 +209,17 @@ class Rule:
         """Apply the rule to some database entry; must be overwritten."""
         return True
 
+    def to_sql(self):
+        """
+        Return an SQL condition equivalent to :meth:`apply`, or None if the
+        rule cannot be expressed in SQL.
+
+        The condition is a (where, args) tuple over the columns of the
+        primary object table.  It is only requested after the rule has been
+        prepared.
+        """
+        return None
+
     def display_values(self):
         """Return the labels and values of this rule."""
         l_v = (
@@ -54,3 +54,7 @@ class HasSourceIdOf(HasGrampsId):
         if HasGrampsId.apply(self, dbase, source):
             return True
         return False
+
+    def to_sql(self):
+        # The Gramps ID is that of the source, not the citation
+        return None
@@ -59,3 +59,7 @@ class RegExpSourceIdOf(RegExpIdBase):
         if RegExpIdBase.apply(self, dbase, source):
             return True
         return False
+
+    def to_sql(self):
+        # The Gramps ID is that of the source, not the citation
+        return None
@@ -33,7 +33,7 @@ _ = glocale.translation.gettext
 #
 # -------------------------------------------------------------------------
 from .. import RegExpIdBase
-from ._memberbase import child_base
+from ._memberbase import child_base, no_sql
 
 
 # -------------------------------------------------------------------------
@@ -50,3 +50,4 @@ class ChildHasIdOf(RegExpIdBase):
     category = _("Child filters")
     base_class = RegExpIdBase
     apply = child_base
+    to_sql = no_sql
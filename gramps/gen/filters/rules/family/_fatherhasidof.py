@@ -33,7 +33,7 @@ _ = glocale.translation.gettext
 #
 # -------------------------------------------------------------------------
 from .. import RegExpIdBase
-from ._memberbase import father_base
+from ._memberbase import father_base, no_sql
 
 
 # -------------------------------------------------------------------------
@@ -50,3 +50,4 @@ class FatherHasIdOf(RegExpIdBase):
     category = _("Father filters")
     base_class = RegExpIdBase
     apply = father_base
+    to_sql = no_sql
@@ -25,6 +25,8 @@ Any rule that matches family based on personal rule applied
 to father, mother, or any child, just needs to do two things:
 > Set the class attribute 'base_class' to the personal rule
 > Set apply method to be an appropriate wrapper below
+If the personal rule can be expressed in SQL, also set the to_sql method to
+no_sql, as the condition applies to the person and not the family.
 Example:
 in the class body, outside any method:
 >    base_class = SearchName
@@ -32,6 +34,10 @@ in the class body, outside any method:
 """
 
 
+def no_sql(self):
+    return None
+
+
 def father_base(self, db, family):
     father_handle = family.get_father_handle()
     if father_handle:
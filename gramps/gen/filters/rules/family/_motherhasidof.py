@@ -33,7 +33,7 @@ _ = glocale.translation.gettext
 #
 # -------------------------------------------------------------------------
 from .. import RegExpIdBase
-from ._memberbase import mother_base
+from ._memberbase import mother_base, no_sql
 
 
 # -------------------------------------------------------------------------
@@ -50,3 +50,4 @@ class MotherHasIdOf(RegExpIdBase):
     category = _("Mother filters")
     base_class = RegExpIdBase
     apply = mother_base
+    to_sql = no_sql
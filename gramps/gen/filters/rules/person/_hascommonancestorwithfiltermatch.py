@@ -53,18 +53,16 @@ class HasCommonAncestorWithFilterMatch(HasCommonAncestorWith):
     )
     category = _("Ancestral filters")
 
+    # The matches depend on the definition of the filter, too
+    prepared_attributes = ()
+
     def __init__(self, list, use_regex=False):
         HasCommonAncestorWith.__init__(self, list, use_regex)
-        self.ancestor_cache = {}
+        self.map = set()
 
     def prepare(self, db, user):
         self.db = db
-        # For each(!) person we keep track of who their ancestors
-        # are, in a set(). So we only have to compute a person's
-        # ancestor list once.
-        # Start with filling the cache for root person (gramps_id in self.list[0])
-        self.ancestor_cache = {}
-        self.with_people = []
+        self.map = set()
         self.filt = MatchesFilter(self.list)
         self.filt.requestprepare(db, user)
         if user:
@@ -73,19 +71,17 @@ class HasCommonAncestorWithFilterMatch(HasCommonAncestorWith):
                 _("Retrieving all sub-filter matches"),
                 db.get_number_of_people(),
             )
+        matches = []
         for handle in db.iter_person_handles():
             person = db.get_person_from_handle(handle)
             if user:
                 user.step_progress()
             if person and self.filt.apply(db, person):
-                # store all people in the filter so as to compare later
-                self.with_people.append(person.handle)
-                # fill list of ancestor of person if not present yet
-                if handle not in self.ancestor_cache:
-                    self.add_ancs(db, person)
+                matches.append(person)
         if user:
             user.end_progress()
+        self.add_ancs(db, matches)
 
     def reset(self):
         self.filt.requestreset()
-        self.ancestor_cache = {}
+        self.map.clear()
@@ -48,6 +48,8 @@ class IsAncestorOf(Rule):
     category = _("Ancestral filters")
     description = _("Matches people that are ancestors of a specified person")
 
+    prepared_attributes = ("map",)
+
     def prepare(self, db, user):
         """Assume that if 'Inclusive' not defined, assume inclusive"""
         self.db = db
@@ -72,17 +74,11 @@ class IsAncestorOf(Rule):
         if not person:
             return
         if person.handle in self.map:
+            # its ancestors are there already
             return
         if not first:
             self.map.add(person.handle)
-        fam_id = person.get_main_parents_family_handle()
-        if fam_id:
-            fam = db.get_family_from_handle(fam_id)
-            if fam:
-                f_id = fam.get_father_handle()
-                m_id = fam.get_mother_handle()
-
-                if f_id:
-                    self.init_ancestor_list(db, db.get_person_from_handle(f_id), 0)
-                if m_id:
-                    self.init_ancestor_list(db, db.get_person_from_handle(m_id), 0)
+        self.map.update(
+            handle
+            for handle, gen, paths in db.iter_ancestors(person.handle, main_only=True)
+        )
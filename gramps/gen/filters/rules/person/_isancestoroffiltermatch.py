@@ -52,6 +52,9 @@ class IsAncestorOfFilterMatch(IsAncestorOf):
         "Matches people that are ancestors " "of anybody matched by a filter"
     )
 
+    # The matches depend on the definition of the filter, too
+    prepared_attributes = ()
+
     def prepare(self, db, user):
         self.db = db
         self.map = set()
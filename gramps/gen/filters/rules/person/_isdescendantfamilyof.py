@@ -56,6 +56,8 @@ class IsDescendantFamilyOf(Rule):
         "of a descendant of a specified person"
     )
 
+    prepared_attributes = ("matches",)
+
     def prepare(self, db, user):
         self.db = db
         self.matches = set()
@@ -53,6 +53,9 @@ class IsDescendantFamilyOfFilterMatch(IsDescendantFamilyOf):
         "of anybody matched by a filter"
     )
 
+    # The matches depend on the definition of the filter, too
+    prepared_attributes = ()
+
     def prepare(self, db, user):
         self.db = db
         self.matches = set()
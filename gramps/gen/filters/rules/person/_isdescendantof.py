@@ -49,6 +49,8 @@ class IsDescendantOf(Rule):
     category = _("Descendant filters")
     description = _("Matches all descendants for the specified person")
 
+    prepared_attributes = ("map",)
+
     def prepare(self, db, user):
         self.db = db
         self.map = set()
@@ -75,8 +77,6 @@ class IsDescendantOf(Rule):
         if not first:
             self.map.add(person.handle)
 
-        for fam_id in person.get_family_handle_list():
-            fam = self.db.get_family_from_handle(fam_id)
-            if fam:
-                for child_ref in fam.get_child_ref_list():
-                    self.init_list(self.db.get_person_from_handle(child_ref.ref), 0)
+        self.map.update(
+            handle for handle, gen, paths in self.db.iter_descendants(person.handle)
+        )
@@ -52,6 +52,9 @@ class IsDescendantOfFilterMatch(IsDescendantOf):
         "Matches people that are descendants " "of anybody matched by a filter"
     )
 
+    # The matches depend on the definition of the filter, too
+    prepared_attributes = ()
+
     def prepare(self, db, user):
         self.db = db
         self.map = set()
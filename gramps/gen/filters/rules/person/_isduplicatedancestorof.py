@@ -52,6 +52,8 @@ class IsDuplicatedAncestorOf(Rule):
         "Matches people that are ancestors twice or more " "of a specified person"
     )
 
+    prepared_attributes = ("map", "map2")
+
     def prepare(self, db, user):
         self.db = db
         self.map = set()
@@ -68,22 +70,16 @@ class IsDuplicatedAncestorOf(Rule):
         return person.handle in self.map2
 
     def init_ancestor_list(self, db, person):
-        fam_id = person.get_main_parents_family_handle()
-        if fam_id:
-            fam = db.get_family_from_handle(fam_id)
-            if fam:
-                f_id = fam.get_father_handle()
-                m_id = fam.get_mother_handle()
-                if m_id:
-                    self.go_deeper(db, db.get_person_from_handle(m_id))
-                if f_id:
-                    self.go_deeper(db, db.get_person_from_handle(f_id))
-
-    def go_deeper(self, db, person):
-        if person and person.handle in self.map:
-            self.map2.add((person.handle))
-            # the following keeps from scanning same parts of tree multiple
-            # times and avoids crash on tree loops.
-            return
-        self.map.add((person.handle))
-        self.init_ancestor_list(db, person)
+        # A person is duplicated when it is the parent of two of the
+        # ancestors, or of an ancestor and the root person; each ancestor
+        # is looked at once, which also avoids looping on a loop in the tree
+        todo = [person.handle]
+        while todo:
+            for handle, gen, paths in db.iter_ancestors(
+                todo.pop(), main_only=True, max_generations=1
+            ):
+                if handle in self.map or paths > 1:
+                    self.map2.add(handle)
+                if handle not in self.map:
+                    self.map.add(handle)
+                    todo.append(handle)
@@ -52,6 +52,8 @@ class IsLessThanNthGenerationAncestorOf(Rule):
         "of a specified person not more than N generations away"
     )
 
+    prepared_attributes = ("map",)
+
     def prepare(self, db, user):
         self.db = db
         self.map = set()
@@ -62,27 +64,17 @@ class IsLessThanNthGenerationAncestorOf(Rule):
                 self.init_ancestor_list(root_handle)
 
     def init_ancestor_list(self, root_handle):
-        queue = [(root_handle, 1)]  # generation 1 is root
-        while queue:
-            handle, gen = queue.pop(0)  # pop off front of queue
-            if handle in self.map:
-                # if we have been here before, skip
-                continue
-            self.map.add(handle)
-            gen += 1
-            if gen <= int(self.list[1]):
-                p = self.db.get_person_from_handle(handle)
-                fam_id = p.get_main_parents_family_handle()
-                if fam_id:
-                    fam = self.db.get_family_from_handle(fam_id)
-                    if fam:
-                        f_id = fam.get_father_handle()
-                        m_id = fam.get_mother_handle()
-                        # append to back of queue:
-                        if f_id:
-                            queue.append((f_id, gen))
-                        if m_id:
-                            queue.append((m_id, gen))
+        # generation 1 is root
+        self.map.add(root_handle)
+        max_gen = int(self.list[1]) - 1
+        if max_gen < 1:
+            return
+        self.map.update(
+            handle
+            for handle, gen, paths in self.db.iter_ancestors(
+                root_handle, main_only=True, max_generations=max_gen
+            )
+        )
 
     def reset(self):
         self.map.clear()
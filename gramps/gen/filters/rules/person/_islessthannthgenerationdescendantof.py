@@ -52,6 +52,8 @@ class IsLessThanNthGenerationDescendantOf(Rule):
         "specified person not more than N generations away"
     )
 
+    prepared_attributes = ("map",)
+
     def prepare(self, db, user):
         self.db = db
         self.map = set()
@@ -52,6 +52,8 @@ class IsMoreThanNthGenerationAncestorOf(Rule):
         "of a specified person at least N generations away"
     )
 
+    prepared_attributes = ("map",)
+
     def prepare(self, db, user):
         self.db = db
         self.map = set()
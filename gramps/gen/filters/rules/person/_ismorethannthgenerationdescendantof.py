@@ -52,6 +52,8 @@ class IsMoreThanNthGenerationDescendantOf(Rule):
         "person at least N generations away"
     )
 
+    prepared_attributes = ("map",)
+
     def prepare(self, db, user):
         self.db = db
         self.map = set()
@@ -70,13 +72,12 @@ class IsMoreThanNthGenerationDescendantOf(Rule):
     def init_list(self, person, gen):
         if not person:
             return
-        if gen >= int(self.list[1]):
+        min_gen = int(self.list[1])
+        if gen >= min_gen:
             self.map.add(person.handle)
-
-        for fam_id in person.get_family_handle_list():
-            fam = self.db.get_family_from_handle(fam_id)
-            if fam:
-                for child_ref in fam.get_child_ref_list():
-                    self.init_list(
-                        self.db.get_person_from_handle(child_ref.ref), gen + 1
-                    )
+        # a descendant found at several distances matches if one is enough
+        self.map.update(
+            handle
+            for handle, dist, paths in self.db.iter_descendants(person.handle)
+            if gen + dist >= min_gen
+        )
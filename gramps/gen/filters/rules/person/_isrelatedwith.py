@@ -48,6 +48,8 @@ class IsRelatedWith(Rule):
     category = _("Relationship filters")
     description = _("Matches people related to a specified person")
 
+    prepared_attributes = ("relatives",)
+
     def prepare(self, db, user):
         """prepare so the rule can be executed efficiently
         we build the list of people related to <person> here,
@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from ....utils.alive import probably_alive
+from ....utils.alive import get_probably_alive_ranges
 from .. import Rule
 from ....datehandler import parser
 
@@ -53,6 +53,10 @@ class ProbablyAlive(Rule):
             self.current_date = parser.parse(str(self.list[0]))
         except:
             self.current_date = None
+        self.alive_ranges = get_probably_alive_ranges(db)
+
+    def reset(self):
+        self.alive_ranges = None
 
     def apply(self, db, person):
-        return probably_alive(person, db, self.current_date)
+        return self.alive_ranges.probably_alive(person, self.current_date)
@@ -53,6 +53,8 @@ class RelationshipPathBetween(Rule):
         "path between two persons."
     )
 
+    prepared_attributes = ("map",)
+
     def prepare(self, db, user):
         self.db = db
         self.map = set()
@@ -23,14 +23,17 @@ Unittest that tests person-specific filter rules
 """
 import unittest
 import os
+import tempfile
 from time import perf_counter
 import inspect
 
 from ....filters import reload_custom_filters
 
 reload_custom_filters()
-from ....db.utils import import_as_dict
+from ....db import DbTxn
+from ....db.utils import import_as_dict, import_from_filename, make_database
 from ....filters import GenericFilter, CustomFilters
+from ....filters._parallel import parallel_apply
 from ....const import DATA_DIR
 from ....user import User
 from ....utils.unittest import localize_date
@@ -94,6 +97,7 @@ from ..person import (
     PeoplePublic,
     PersonWithIncompleteEvent,
     ProbablyAlive,
+    RegExpIdOf,
     RegExpName,
     RelationshipPathBetweenBookmarks,
 )
@@ -195,6 +199,20 @@ class BaseTest(unittest.TestCase):
         res = self.filter_with_rule(rule)
         self.assertEqual(len(res), 85)
 
+    def test_prepared_cache(self):
+        """Test that a prepared rule is reused until the data changes"""
+        rule = IsDescendantOf(["I0610", 0])
+        res = self.filter_with_rule(rule)
+        cache = self.db.get_result_cache()
+        count = len(cache)
+        self.assertGreater(count, 0)
+        self.assertEqual(self.filter_with_rule(IsDescendantOf(["I0610", 0])), res)
+        self.assertEqual(len(cache), count)
+        with DbTxn("Test", self.db):
+            pass
+        self.assertEqual(len(self.db.get_result_cache()), 0)
+        self.assertEqual(self.filter_with_rule(rule), res)
+
     def test_IsMoreThanNthGenerationDescendantOf(self):
         """Test the rule"""
         rule = IsMoreThanNthGenerationDescendantOf(["I0610", 3])
@@ -1270,6 +1288,71 @@ class BaseTest(unittest.TestCase):
         )
         self.assertEqual(self.filter_with_rule(rule), set(["GNUJQCL9MD64AM56OH"]))
 
+    def test_sql_pushdown(self):
+        """
+        Test that rules evaluated in SQL give the same result as in Python.
+        """
+        for rules in (
+            [IsMale([])],
+            [IsFemale([]), HasIdOf(["I0044"])],
+            [RegExpIdOf(["i00[0-4]"], use_regex=True), HasUnknownGender([])],
+            [RegExpIdOf(["I004"]), IsMale([]), HasNameOf(["", "Garner"] + [""] * 9)],
+            [PeoplePublic([]), HaveChildren([])],
+        ):
+            filter_ = GenericFilter()
+            filter_.set_rules(rules)
+            for rule in rules:
+                rule.requestprepare(self.db, None)
+            in_sql = filter_.check_and_sql(self.db, None)
+            in_python = filter_.check_and(self.db, None)
+            for rule in rules:
+                rule.requestreset()
+            self.assertIsNotNone(in_sql)
+            # the order of the cursor is kept
+            self.assertEqual(in_sql, in_python)
+
+    def test_parallel_apply(self):
+        """
+        Test that a filter applied by worker processes gives the same result,
+        in the same order, as when applied serially.
+        """
+        filter_ = GenericFilter()
+        filter_.set_rules([IsMale([]), HaveChildren([])])
+        self.assertIsNone(parallel_apply(filter_, self.db, None, 2))
+        with tempfile.TemporaryDirectory() as dirpath:
+            db = make_database("sqlite")
+            db.load(dirpath)
+            self.assertTrue(import_from_filename(db, EXAMPLE, User()))
+            handles = db.get_person_handles(sort_handles=True)
+            in_parallel = parallel_apply(filter_, db, handles, 2)
+            serially = filter_.apply(db, handles)
+            db.close()
+        self.assertIsNotNone(in_parallel)
+        self.assertEqual(in_parallel, serially)
+
+    def test_parallel_apply_sql(self):
+        """
+        Test that the rules expressed in SQL select the candidates before the
+        remaining rules are sent to worker processes, and that the order of
+        the cursor is kept.
+        """
+        filter_ = GenericFilter()
+        filter_.set_rules([IsMale([])])
+        # no worker is needed when all the rules are expressed in SQL
+        self.assertEqual(
+            filter_.parallel_apply(self.db, None, 2), filter_.apply(self.db)
+        )
+        filter_.set_rules([IsMale([]), HaveChildren([])])
+        with tempfile.TemporaryDirectory() as dirpath:
+            db = make_database("sqlite")
+            db.load(dirpath)
+            self.assertTrue(import_from_filename(db, EXAMPLE, User()))
+            in_parallel = filter_.parallel_apply(db, None, 2)
+            serially = filter_.apply(db)
+            db.close()
+        self.assertIsNotNone(in_parallel)
+        self.assertEqual(in_parallel, serially)
+
 
 if __name__ == "__main__":
     unittest.main()
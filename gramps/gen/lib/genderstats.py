@@ -42,6 +42,9 @@ class GenderStats:
 
     This allows the tracking of the liklihood of a person's given name
     indicating the gender of the person.
+
+    The names counted since the statistics were loaded or last saved are
+    tracked, so that a database only needs to store those.
     """
 
     def __init__(self, stats=None):
@@ -50,14 +53,36 @@ class GenderStats:
         else:
             # Current use of GenderStats is such that a shallow copy suffices.
             self.stats = stats
+        self.changed = set()
+        self.cleared = False
 
     def save_stats(self):
         return self.stats
 
     def clear_stats(self):
         self.stats = {}
+        self.changed.clear()
+        self.cleared = True
         return self.stats
 
+    def get_changes(self):
+        """
+        Return a tuple (cleared, changes).  cleared is True if all the
+        statistics were cleared, and changes is a dictionary of the
+        statistics of the names counted since the last save.
+        """
+        return (
+            self.cleared,
+            {name: self.stats[name] for name in self.changed if name in self.stats},
+        )
+
+    def mark_saved(self):
+        """
+        Forget the changes, after the statistics have been saved.
+        """
+        self.changed.clear()
+        self.cleared = False
+
     def name_stats(self, name):
         if name in self.stats:
             return self.stats[name]
@@ -106,6 +131,7 @@ class GenderStats:
                 unknown = 0
 
         self.stats[keyname] = (male, female, unknown)
+        self.changed.add(keyname)
 
     def uncount_person(self, person):
         return self.count_person(person, undo=1)
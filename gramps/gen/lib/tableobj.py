@@ -48,6 +48,9 @@ from ..const import GRAMPS_LOCALE as glocale
 
 CODESET = glocale.encoding
 
+# The secondary fields of each class, which do not depend on the locale
+_SECONDARY_FIELDS = {}
+
 
 # -------------------------------------------------------------------------
 #
@@ -162,14 +165,16 @@ class TableObject(BaseObject):
         """
         Return all secondary fields and their types
         """
-        result = []
-        for key, value in cls.get_schema()["properties"].items():
-            schema_type = value.get("type")
-            if isinstance(schema_type, list):
-                schema_type.remove("null")
-                schema_type = schema_type[0]
-            elif isinstance(schema_type, dict):
-                schema_type = None
-            if schema_type in ("string", "integer", "number", "boolean"):
-                result.append((key.lower(), schema_type, value.get("maxLength")))
-        return result
+        if cls not in _SECONDARY_FIELDS:
+            result = []
+            for key, value in cls.get_schema()["properties"].items():
+                schema_type = value.get("type")
+                if isinstance(schema_type, list):
+                    schema_type.remove("null")
+                    schema_type = schema_type[0]
+                elif isinstance(schema_type, dict):
+                    schema_type = None
+                if schema_type in ("string", "integer", "number", "boolean"):
+                    result.append((key.lower(), schema_type, value.get("maxLength")))
+            _SECONDARY_FIELDS[cls] = result
+        return list(_SECONDARY_FIELDS[cls])
@@ -22,33 +22,136 @@
 Proxy class for the Gramps databases. Caches lookups from handles.
 """
 
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import weakref
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ..utils.callback import Callback
 from ..utils.lru import LRU
 
+# Signal prefix of each primary object type
+SIGNAL_NAMES = {
+    "Person": "person",
+    "Family": "family",
+    "Event": "event",
+    "Place": "place",
+    "Source": "source",
+    "Citation": "citation",
+    "Repository": "repository",
+    "Media": "media",
+    "Note": "note",
+    "Tag": "tag",
+}
+
+
+# -------------------------------------------------------------------------
+#
+# Invalidator
+#
+# -------------------------------------------------------------------------
+class _Invalidator:
+    """
+    Evicts the objects changed in a database from all the cache proxies of
+    that database.
+
+    There is one per database, so that short lived proxies do not leave
+    callbacks behind in the database.
+    """
+
+    def __init__(self, database):
+        self.proxies = weakref.WeakSet()
+        for obj_type, name in SIGNAL_NAMES.items():
+            for action in ("update", "delete"):
+                database.connect(
+                    name + "-" + action,
+                    lambda handles, obj_type=obj_type: self.evict(obj_type, handles),
+                )
+            database.connect(
+                name + "-rebuild",
+                lambda obj_type=obj_type: self.evict(obj_type, None),
+            )
+
+    def evict(self, obj_type, handles):
+        """
+        Evict objects of a type, all of them if handles is None.
+        """
+        for proxy in list(self.proxies):
+            proxy.evict(obj_type, handles)
+
+
+_INVALIDATORS = weakref.WeakKeyDictionary()
+_MISSING = object()
+
 
+# -------------------------------------------------------------------------
+#
+# CacheProxyDb
+#
+# -------------------------------------------------------------------------
 class CacheProxyDb:
     """
     A Proxy for a database with cached lookups on handles.
 
-    Does not invalid caches. Should be used only in read-only
-    places, and not where caches are altered.
+    Each primary object type has its own cache.  Objects are evicted when
+    the database signals that they were updated or deleted, and all caches
+    are emptied after changes that do not emit signals, such as batch
+    transactions.  Writes go straight to the database.
+
+    Objects are shared between the callers of a proxy: an object obtained
+    from it must not be modified unless it is committed afterwards.
     """
 
-    def __init__(self, database):
+    # Maximum number of cached objects of each type
+    CAPACITY = {
+        "Person": 32767,
+        "Family": 16383,
+        "Event": 32767,
+        "Place": 16383,
+        "Source": 4095,
+        "Citation": 16383,
+        "Repository": 1023,
+        "Media": 4095,
+        "Note": 16383,
+        "Tag": 1023,
+    }
+
+    def __init__(self, database, capacity=None):
         """
         CacheProxy will cache items based on their handle.
 
-        Assumes all handles (regardless of type) are unique.
         Database is called self.db for consistency with other
         proxies.
+
+        :param database: the database to read from
+        :type database: DbReadBase
+        :param capacity: maximum number of cached objects of some types,
+                         overriding :attr:`CAPACITY`
+        :type capacity: dict
         """
         self.db = database
-        # Memory allocation is power of 2 where slots has to fit.
-        # LRU uses one extra slot in its work, so set max to 2^17-1
-        # otherwise we are just wasting memory
-        self.cache_handle = LRU(131071)
+        limits = dict(self.CAPACITY, **(capacity or {}))
+        self.cache_handle = {
+            obj_type: LRU(limits[obj_type]) for obj_type in SIGNAL_NAMES
+        }
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._changed = self._change_count()
+        if isinstance(database, Callback):
+            if database not in _INVALIDATORS:
+                _INVALIDATORS[database] = _Invalidator(database)
+            _INVALIDATORS[database].proxies.add(self)
 
     def __del__(self):
-        self.cache_handle.clear()
+        self.clear_cache()
 
     def __getattr__(self, attr):
         """
@@ -57,102 +160,130 @@ class CacheProxyDb:
         """
         return getattr(self.db, attr)
 
+    def _change_count(self):
+        """
+        Return the number of changes made to the database, if it counts
+        them.
+        """
+        return getattr(self.db, "has_changed", None)
+
+    def evict(self, obj_type, handles=None):
+        """
+        Evict objects of a type from the cache, all of them if handles is
+        None.
+        """
+        cache = self.cache_handle[obj_type]
+        if handles is None:
+            self.evictions += len(cache)
+            cache.clear()
+        else:
+            for handle in handles:
+                if handle in cache:
+                    del cache[handle]
+                    self.evictions += 1
+        # The signals follow the change they report
+        self._changed = self._change_count()
+
     def clear_cache(self, handle=None):
         """
         Clears all caches if handle is None, or
         specific entry.
         """
-        if handle:
-            del self.cache_handle[handle]
-        else:
-            self.cache_handle.clear()
+        for cache in self.cache_handle.values():
+            if handle is None:
+                self.evictions += len(cache)
+                cache.clear()
+            elif handle in cache:
+                del cache[handle]
+                self.evictions += 1
+
+    def get_cache_stats(self):
+        """
+        Return a dictionary with the number of cache hits, misses and
+        evictions, including those made to respect the capacities.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+            + sum(cache.evictions for cache in self.cache_handle.values()),
+        }
+
+    def _get_from_handle(self, obj_type, handle):
+        """
+        Gets item from cache if it exists, otherwise from the database.
+        """
+        changed = self._change_count()
+        if changed != self._changed:
+            # Changed without signals
+            self.clear_cache()
+            self._changed = changed
+        cache = self.cache_handle[obj_type]
+        obj = cache.get(handle, _MISSING)
+        if obj is not _MISSING:
+            self.hits += 1
+            return obj
+        self.misses += 1
+        obj = self.db.method("get_%s_from_handle", obj_type)(handle)
+        cache[handle] = obj
+        return obj
 
     def get_person_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_person_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle("Person", handle)
 
     def get_event_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_event_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle("Event", handle)
 
     def get_family_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_family_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle("Family", handle)
 
     def get_repository_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_repository_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle("Repository", handle)
 
     def get_place_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_place_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle("Place", handle)
 
     def get_citation_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_citation_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle("Citation", handle)
 
     def get_source_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_source_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle("Source", handle)
 
     def get_note_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_note_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle("Note", handle)
 
     def get_media_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_media_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle("Media", handle)
 
     def get_tag_from_handle(self, handle):
         """
-        Gets item from cache if it exists. Converts
-        handles to string, for uniformity.
+        Gets item from cache if it exists.
         """
-        if handle not in self.cache_handle:
-            self.cache_handle[handle] = self.db.get_tag_from_handle(handle)
-        return self.cache_handle[handle]
+        return self._get_from_handle("Tag", handle)
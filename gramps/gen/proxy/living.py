@@ -45,7 +45,7 @@ from ..lib import (
     Note,
     Tag,
 )
-from ..utils.alive import probably_alive
+from ..utils.alive import get_probably_alive_ranges
 from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 
@@ -108,6 +108,7 @@ class LivingProxyDb(ProxyDbBase):
         else:
             self.current_date = None
         self.years_after_death = years_after_death
+        self.__alive_ranges = None
         self._ = llocale.translation.gettext
         self._p_f_n = self._(config.get("preferences.private-given-text"))
         self._p_s_n = self._(config.get("preferences.private-surname-text"))
@@ -258,8 +259,11 @@ class LivingProxyDb(ProxyDbBase):
         """
         person_handle = person.get_handle()
         unfil_person = self.get_unfiltered_person(person_handle)
-        return probably_alive(
-            unfil_person, self.db, self.current_date, self.years_after_death
+        if self.__alive_ranges is None:
+            # the dates of everybody, computed once for this proxy
+            self.__alive_ranges = get_probably_alive_ranges(self.db)
+        return self.__alive_ranges.probably_alive(
+            unfil_person, self.current_date, self.years_after_death
         )
 
     def __remove_living_from_family(self, family):
@@ -0,0 +1,119 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the cache proxy.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ...db import DbTxn
+from ...db.utils import make_database
+from ...lib import Note, Person
+from ..cache import CacheProxyDb
+
+
+# -------------------------------------------------------------------------
+#
+# CacheProxyTest class
+#
+# -------------------------------------------------------------------------
+class CacheProxyTest(unittest.TestCase):
+    """
+    Test that the cache proxy follows the changes made to the database.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.person = Person()
+        self.note = Note("original")
+        with DbTxn("Add test objects", self.db) as trans:
+            self.db.add_person(self.person, trans)
+            self.db.add_note(self.note, trans)
+        self.proxy = CacheProxyDb(self.db, {"Note": 2})
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_hits(self):
+        handle = self.person.handle
+        person = self.proxy.get_person_from_handle(handle)
+        self.assertIs(self.proxy.get_person_from_handle(handle), person)
+        self.assertEqual(self.proxy.get_cache_stats()["misses"], 1)
+        self.assertEqual(self.proxy.get_cache_stats()["hits"], 1)
+
+    def test_update(self):
+        handle = self.note.handle
+        self.assertEqual(self.proxy.get_note_from_handle(handle).get(), "original")
+        with DbTxn("Edit note", self.db) as trans:
+            self.note.set("edited")
+            self.db.commit_note(self.note, trans)
+        self.assertEqual(self.proxy.get_note_from_handle(handle).get(), "edited")
+        self.assertEqual(self.proxy.get_cache_stats()["evictions"], 1)
+
+        # The person cache is not affected by a note update
+        self.proxy.get_person_from_handle(self.person.handle)
+        with DbTxn("Edit note", self.db) as trans:
+            self.db.commit_note(self.note, trans)
+        self.proxy.get_person_from_handle(self.person.handle)
+        self.assertEqual(self.proxy.get_cache_stats()["hits"], 1)
+
+    def test_undo(self):
+        handle = self.note.handle
+        with DbTxn("Edit note", self.db) as trans:
+            self.note.set("edited")
+            self.db.commit_note(self.note, trans)
+        self.assertEqual(self.proxy.get_note_from_handle(handle).get(), "edited")
+        self.db.undo()
+        self.assertEqual(self.proxy.get_note_from_handle(handle).get(), "original")
+
+    def test_batch(self):
+        handle = self.note.handle
+        self.proxy.get_person_from_handle(self.person.handle)
+        self.assertEqual(self.proxy.get_note_from_handle(handle).get(), "original")
+        with DbTxn("Edit note", self.db, batch=True) as trans:
+            self.note.set("edited")
+            self.db.commit_note(self.note, trans)
+        self.assertEqual(self.proxy.get_note_from_handle(handle).get(), "edited")
+        self.assertEqual(self.proxy.get_cache_stats()["evictions"], 2)
+
+    def test_capacity(self):
+        notes = [Note(str(index)) for index in range(3)]
+        with DbTxn("Add notes", self.db) as trans:
+            for note in notes:
+                self.db.add_note(note, trans)
+        for note in notes:
+            self.proxy.get_note_from_handle(note.handle)
+        self.assertEqual(len(self.proxy.cache_handle["Note"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -46,6 +46,9 @@ UNKNOWN = Person.UNKNOWN
 LOG = logging.getLogger("gen.relationship")
 LOG.addHandler(logging.StreamHandler())
 
+# number of ancestor maps kept by a relationship calculator
+_KEPT_MAPS = 8
+
 # -------------------------------------------------------------------------
 #
 #
@@ -945,9 +948,7 @@ class RelationshipCalculator:
         self.state_signal_key = None
         self.storemap = False
         self.dirtymap = True
-        self.stored_map = None
-        self.map_handle = None
-        self.map_meta = None
+        self.stored_maps = {}
         self.__db_connected = False
         self.depth = 15
         try:
@@ -1345,6 +1346,12 @@ class RelationshipCalculator:
         reached via a different branch too. Path (firstRel_str and
         secondRel_str) will of course be different.
 
+        With all_dist, the map of the ancestors of orig_person is kept when
+        possible, see :meth:`connect_db_signals`, so that it is computed
+        once for many other people.  Without all_dist, the ancestors of both
+        people are searched at once, one generation at a time, until the
+        first common ancestors are found.
+
         :param db: database to work on
         :param orig_person: first person
         :type orig_person: Person Obj
@@ -1369,45 +1376,18 @@ class RelationshipCalculator:
         self.__all_dist = all_dist
         self.__only_birth = only_birth
         self.__crosslinks = False  # no crosslinks
-
-        first_rel = -1
-        second_rel = -1
         self.__msg = []
 
         common = []
-        first_map = {}
         second_map = {}
-        rank = 9999999
+
+        if not self.__all_dist:
+            shortest = self.__search_shortest(db, orig_person, other_person)
+            self.__add_depth_message()
+            return shortest, self.__msg
 
         try:
-            if (
-                self.storemap
-                and self.stored_map is not None
-                and self.map_handle == orig_person.handle
-                and not self.dirtymap
-            ):
-                first_map = self.stored_map
-                (
-                    self.__max_depth_reached,
-                    self.__loop_detected,
-                    self.__all_families,
-                    self.__all_dist,
-                    self.__only_birth,
-                    self.__crosslinks,
-                    self.__msg,
-                ) = self.map_meta
-                self.__msg = list(self.__msg)
-            else:
-                self.__apply_filter(db, orig_person, "", [], first_map)
-                self.map_meta = (
-                    self.__max_depth_reached,
-                    self.__loop_detected,
-                    self.__all_families,
-                    self.__all_dist,
-                    self.__only_birth,
-                    self.__crosslinks,
-                    list(self.__msg),
-                )
+            first_map = self.__get_ancestor_map(db, orig_person)
             self.__apply_filter(
                 db, other_person, "", [], second_map, stoprecursemap=first_map
             )
@@ -1416,11 +1396,6 @@ class RelationshipCalculator:
                 _("Relationship loop detected")
             ] + self.__msg
 
-        if self.storemap:
-            self.stored_map = first_map
-            self.dirtymap = False
-            self.map_handle = orig_person.handle
-
         for person_handle in second_map:
             if person_handle in first_map:
                 com = []
@@ -1484,40 +1459,13 @@ class RelationshipCalculator:
                         deletelist.reverse()
                         for index in deletelist:
                             del common[index]
-        # check for extra messages
-        if self.__max_depth_reached:
-            self.__msg += [
-                _(
-                    "Family Tree reaches back more than the maximum "
-                    "%d generations searched.\nIt is possible that "
-                    "relationships have been missed"
-                )
-                % (self.__max_depth)
-            ]
+        self.__add_depth_message()
 
-        if common and not self.__all_dist:
-            rank = common[0][0]
-            person_handle = common[0][1]
-            first_rel = common[0][2]
-            first_fam = common[0][3]
-            second_rel = common[0][4]
-            second_fam = common[0][5]
-            return (
-                rank,
-                person_handle,
-                first_rel,
-                first_fam,
-                second_rel,
-                second_fam,
-            ), self.__msg
         if common:
             # list with tuples (rank, handle person,rel_str_orig,rel_fam_orig,
             #       rel_str_other,rel_fam_str) and messages
             return common, self.__msg
-        if not self.__all_dist:
-            return (-1, None, "", [], "", []), self.__msg
-        else:
-            return [(-1, None, "", [], "", [])], self.__msg
+        return [(-1, None, "", [], "", [])], self.__msg
 
     def __apply_filter(
         self, db, person, rel_str, rel_fam, pmap, depth=1, stoprecursemap=None
@@ -1592,88 +1540,19 @@ class RelationshipCalculator:
             # don't continue search, great speedup!
             return
 
-        family_handles = []
-        main = person.get_main_parents_family_handle()
-        if main:
-            family_handles = [main]
-        if self.__all_families:
-            family_handles = person.get_parent_family_handle_list()
-
         try:
-            parentstodo = {}
-            fam = 0
-            for family_handle in family_handles:
-                rel_fam_new = rel_fam + [fam]
-                family = db.get_family_from_handle(family_handle)
-                if not family:
-                    continue
-                # obtain childref for this person
-                childrel = [
-                    (ref.get_mother_relation(), ref.get_father_relation())
-                    for ref in family.get_child_ref_list()
-                    if ref.ref == person.handle
-                ]
-                fhandle = family.father_handle
-                mhandle = family.mother_handle
-                for data in [
-                    (
-                        fhandle,
-                        self.REL_FATHER,
-                        self.REL_FATHER_NOTBIRTH,
-                        childrel[0][1],
-                    ),
-                    (
-                        mhandle,
-                        self.REL_MOTHER,
-                        self.REL_MOTHER_NOTBIRTH,
-                        childrel[0][0],
-                    ),
-                ]:
-                    if data[0] and data[0] not in parentstodo:
-                        persontodo = db.get_person_from_handle(data[0])
-                        if data[3] == ChildRefType.BIRTH:
-                            addstr = data[1]
-                        elif not self.__only_birth:
-                            addstr = data[2]
-                        else:
-                            addstr = ""
-                        if addstr:
-                            parentstodo[data[0]] = (
-                                persontodo,
-                                rel_str + addstr,
-                                rel_fam_new,
-                            )
-                    elif data[0] and data[0] in parentstodo:
-                        # this person is already scheduled to research
-                        # update family list
-                        famlist = parentstodo[data[0]][2]
-                        if not isinstance(famlist[-1], list) and fam != famlist[-1]:
-                            famlist = famlist[:-1] + [[famlist[-1]]]
-                        if isinstance(famlist[-1], list) and fam not in famlist[-1]:
-                            famlist = famlist[:-1] + [famlist[-1] + [fam]]
-                            parentstodo[data[0]] = (
-                                parentstodo[data[0]][0],
-                                parentstodo[data[0]][1],
-                                famlist,
-                            )
-                if not fhandle and not mhandle and stoprecursemap is None:
-                    # family without parents, add brothers for orig person
-                    # other person has recusemap, and will stop when seeing
-                    # the brother.
-                    child_list = [
-                        ref.ref
-                        for ref in family.get_child_ref_list()
-                        if ref.ref != person.handle
-                    ]
-                    addstr = self.REL_SIBLING
-                    for chandle in child_list:
-                        if chandle in pmap:
-                            pmap[chandle][0] += [rel_str + addstr]
-                            pmap[chandle][1] += [rel_fam_new]
-                            # person is already a grandparent in another branch
-                        else:
-                            pmap[chandle] = [[rel_str + addstr], [rel_fam_new]]
-                fam += 1
+            parentstodo, siblings = self.__get_parents(db, person, rel_str, rel_fam)
+            if stoprecursemap is None:
+                # families without parents, add brothers for orig person
+                # other person has recusemap, and will stop when seeing
+                # the brother.
+                for chandle, sib_str, sib_fam in siblings:
+                    if chandle in pmap:
+                        pmap[chandle][0] += [sib_str]
+                        pmap[chandle][1] += [sib_fam]
+                        # person is already a grandparent in another branch
+                    else:
+                        pmap[chandle] = [[sib_str], [sib_fam]]
 
             for handle, data in parentstodo.items():
                 self.__apply_filter(
@@ -1685,6 +1564,255 @@ class RelationshipCalculator:
             traceback.print_exc()
             return
 
+    def __get_parents(self, db, person, rel_str, rel_fam):
+        """
+        Return the parents of a person to look up, as a dictionary of
+        (person, rel_str, rel_fam) tuples by handle, and the list of the
+        (handle, rel_str, rel_fam) tuples of the brothers of the person in
+        the families without parents.
+        """
+        family_handles = []
+        main = person.get_main_parents_family_handle()
+        if main:
+            family_handles = [main]
+        if self.__all_families:
+            family_handles = person.get_parent_family_handle_list()
+
+        parentstodo = {}
+        siblings = []
+        fam = 0
+        for family_handle in family_handles:
+            rel_fam_new = rel_fam + [fam]
+            family = db.get_family_from_handle(family_handle)
+            if not family:
+                continue
+            # obtain childref for this person
+            childrel = [
+                (ref.get_mother_relation(), ref.get_father_relation())
+                for ref in family.get_child_ref_list()
+                if ref.ref == person.handle
+            ]
+            fhandle = family.father_handle
+            mhandle = family.mother_handle
+            for data in [
+                (
+                    fhandle,
+                    self.REL_FATHER,
+                    self.REL_FATHER_NOTBIRTH,
+                    childrel[0][1],
+                ),
+                (
+                    mhandle,
+                    self.REL_MOTHER,
+                    self.REL_MOTHER_NOTBIRTH,
+                    childrel[0][0],
+                ),
+            ]:
+                if data[0] and data[0] not in parentstodo:
+                    persontodo = db.get_person_from_handle(data[0])
+                    if data[3] == ChildRefType.BIRTH:
+                        addstr = data[1]
+                    elif not self.__only_birth:
+                        addstr = data[2]
+                    else:
+                        addstr = ""
+                    if addstr:
+                        parentstodo[data[0]] = (
+                            persontodo,
+                            rel_str + addstr,
+                            rel_fam_new,
+                        )
+                elif data[0] and data[0] in parentstodo:
+                    # this person is already scheduled to research
+                    # update family list
+                    famlist = parentstodo[data[0]][2]
+                    if not isinstance(famlist[-1], list) and fam != famlist[-1]:
+                        famlist = famlist[:-1] + [[famlist[-1]]]
+                    if isinstance(famlist[-1], list) and fam not in famlist[-1]:
+                        famlist = famlist[:-1] + [famlist[-1] + [fam]]
+                        parentstodo[data[0]] = (
+                            parentstodo[data[0]][0],
+                            parentstodo[data[0]][1],
+                            famlist,
+                        )
+            if not fhandle and not mhandle:
+                siblings.extend(
+                    (ref.ref, rel_str + self.REL_SIBLING, rel_fam_new)
+                    for ref in family.get_child_ref_list()
+                    if ref.ref != person.handle
+                )
+            fam += 1
+        return parentstodo, siblings
+
+    def __get_ancestor_map(self, db, person):
+        """
+        Return the map of the ancestors of a person, as built by
+        __apply_filter, reusing a kept map when possible.
+        """
+        key = (
+            self.__class__,
+            person.handle,
+            self.__all_families,
+            self.__only_birth,
+            self.__max_depth,
+        )
+        maps = self.__get_kept_maps(db)
+        if maps is not None and key in maps:
+            pmap, meta = maps[key]
+            (
+                self.__max_depth_reached,
+                self.__loop_detected,
+                self.__crosslinks,
+                msg,
+            ) = meta
+            self.__msg = list(msg)
+            return pmap
+
+        pmap = {}
+        self.__apply_filter(db, person, "", [], pmap)
+        if maps is not None:
+            while len(maps) >= _KEPT_MAPS:
+                # forget the oldest map
+                del maps[next(iter(maps))]
+            maps[key] = (
+                pmap,
+                (
+                    self.__max_depth_reached,
+                    self.__loop_detected,
+                    self.__crosslinks,
+                    list(self.__msg),
+                ),
+            )
+        return pmap
+
+    def __get_kept_maps(self, db):
+        """
+        Return the dictionary in which the ancestor maps are kept, or None if
+        they cannot be kept.
+
+        The maps are kept by the calculator while it is connected to the
+        database signals, and otherwise in the result cache of the database,
+        which is emptied when the data changes.
+        """
+        if self.storemap:
+            if self.dirtymap:
+                self.stored_maps.clear()
+                self.dirtymap = False
+            return self.stored_maps
+        cache = db.get_result_cache()
+        if cache is None:
+            return None
+        return cache.setdefault((RelationshipCalculator, "ancestor maps"), {})
+
+    def __search_shortest(self, db, orig_person, other_person):
+        """
+        Return the (rank, person handle, firstRel_str, firstRel_fam,
+        secondRel_str, secondRel_fam) tuple of the shortest relationship
+        between two people.
+
+        The ancestors of both people are looked up one generation at a time,
+        on the side which has the fewest people to look up, so that the
+        search stops as soon as no shorter relationship can be found.
+        """
+        if orig_person is None or other_person is None:
+            return (-1, None, "", [], "", [])
+        # the paths to the people found on each side and the people whose
+        # parents are to be looked up next.  The paths are ordered as the
+        # recursion of __apply_filter visits them, to choose between common
+        # ancestors at the same distance as get_relationship_distance_new
+        # does with all_dist
+        found = (
+            {orig_person.handle: ("", [], ())},
+            {other_person.handle: ("", [], ())},
+        )
+        todo = ([(orig_person, "", [], ())], [(other_person, "", [], ())])
+        generations = [0, 0]
+        best = None
+        if orig_person.handle == other_person.handle:
+            best = (0, orig_person.handle, "", [], "", [])
+            order = ()
+
+        while True:
+            sides = [
+                side
+                for side in (0, 1)
+                if todo[side] and generations[side] < self.__max_depth - 1
+            ]
+            if not sides:
+                break
+            # a relationship not found yet is at least this long, and one
+            # as long may come first in the order of the paths
+            if best is not None and best[0] < min(
+                generations[side] + 1 for side in sides
+            ):
+                break
+            side = min(sides, key=lambda side: len(todo[side]))
+            other = 1 - side
+            following = []
+            for person, rel_str, rel_fam, key in todo[side]:
+                if person is None:
+                    continue
+                parentstodo, siblings = self.__get_parents(db, person, rel_str, rel_fam)
+                newfound = []
+                if side == 0:
+                    # the brothers are only added for orig person, before
+                    # the parents are looked up
+                    newfound.extend(
+                        (handle, new_str, new_fam, key + (-1, index))
+                        for index, (handle, new_str, new_fam) in enumerate(siblings)
+                    )
+                newfound.extend(
+                    (handle, data[1], data[2], key + (index,))
+                    for index, (handle, data) in enumerate(parentstodo.items())
+                )
+                for handle, new_str, new_fam, new_key in newfound:
+                    if handle in found[side]:
+                        # already found on a path which is not longer
+                        continue
+                    found[side][handle] = (new_str, new_fam, new_key)
+                    if handle in parentstodo:
+                        following.append(parentstodo[handle] + (new_key,))
+                    if handle in found[other]:
+                        # a common ancestor
+                        paths = [None, None]
+                        paths[side] = (new_str, new_fam, new_key)
+                        paths[other] = found[other][handle]
+                        rank = len(paths[0][0]) + len(paths[1][0])
+                        if best is None or (rank, paths[1][2]) < (best[0], order):
+                            best = (rank, handle) + paths[0][:2] + paths[1][:2]
+                            order = paths[1][2]
+            todo[side][:] = following
+            generations[side] += 1
+
+        # the search stopped at the maximum depth
+        for side in (0, 1):
+            if (
+                generations[side] >= self.__max_depth - 1
+                and (best is None or best[0] > generations[side] + 1)
+                and any(
+                    person and person.get_parent_family_handle_list()
+                    for person, rel_str, rel_fam, key in todo[side]
+                )
+            ):
+                self.__max_depth_reached = True
+        if best is None:
+            return (-1, None, "", [], "", [])
+        return best
+
+    def __add_depth_message(self):
+        """
+        Add a message if the maximum depth was reached.
+        """
+        if self.__max_depth_reached:
+            self.__msg += [
+                _(
+                    "Family Tree reaches back more than the maximum "
+                    "%d generations searched.\nIt is possible that "
+                    "relationships have been missed"
+                )
+                % (self.__max_depth)
+            ]
+
     def collapse_relations(self, relations):
         """
         Internal method to condense the relationships as returned by
@@ -2046,6 +2174,32 @@ class RelationshipCalculator:
         else:
             return rel_str
 
+    def get_one_relationships(
+        self, db, orig_person, other_people, extra_info=False, olocale=glocale
+    ):
+        """
+        Return the list of the results of :meth:`get_one_relationship`
+        between orig_person and each person of other_people, in the same
+        order.  The ancestors of orig_person are looked up only once.
+
+        :param other_people: the people to compare orig_person with
+        :type other_people: iterable of Person Obj
+        """
+        storemap = self.storemap
+        self.storemap = True
+        try:
+            return [
+                self.get_one_relationship(
+                    db, orig_person, other_person, extra_info, olocale
+                )
+                for other_person in other_people
+            ]
+        finally:
+            if not storemap:
+                self.storemap = False
+                self.stored_maps.clear()
+                self.dirtymap = True
+
     def get_all_relationships(self, db, orig_person, other_person):
         """
         Return a tuple, of which the first entry is a list with all
@@ -2554,7 +2708,7 @@ class RelationshipCalculator:
         dbstate.disconnect(self.state_signal_key)
         list(map(dbstate.db.disconnect, self.signal_keys))
         self.storemap = False
-        self.stored_map = None
+        self.stored_maps.clear()
 
     def _dbchange_callback(self, db):
         """
@@ -144,15 +144,19 @@ class Sort:
         Sort routine for comparing two people by birth dates. If the birth dates
         are equal, sorts by name
         """
-        first = self.database.get_person_from_handle(first_id)
-
-        birth1 = get_birth_or_fallback(self.database, first)
-        if birth1:
-            date1 = birth1.get_date_object()
+        values = self.database.get_projected_values("Person", first_id)
+        if values["birth_ref_handle"]:
+            dsv1 = values["birth_sortval"]
         else:
-            date1 = Date()
+            first = self.database.get_person_from_handle(first_id)
+
+            birth1 = get_birth_or_fallback(self.database, first)
+            if birth1:
+                date1 = birth1.get_date_object()
+            else:
+                date1 = Date()
 
-        dsv1 = date1.get_sort_value()
+            dsv1 = date1.get_sort_value()
         return "%08d" % dsv1 + str(self.by_last_name_key(first_id))
 
     ##    def by_date(self, a_id, b_id):
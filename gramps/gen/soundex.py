@@ -36,6 +36,7 @@ import unicodedata
 # -------------------------------------------------------------------------
 IGNORE = "HW~!@#$%^&*()_+=-`[]\\|;:'/?.,<>\" \t\f\v"
 TABLE = bytes.maketrans(b"ABCDEFGIJKLMNOPQRSTUVXYZ", b"012301202245501262301202")
+DELETE = str.maketrans("", "", IGNORE)
 
 
 # -------------------------------------------------------------------------
@@ -53,8 +54,7 @@ def soundex(strval):
         return "Z000"
     strval = strval.decode("ASCII", "ignore")
     str2 = strval[0]
-    translator = strval.maketrans("", "", IGNORE)
-    strval = strval.translate(translator)
+    strval = strval.translate(DELETE)
     strval = strval.translate(TABLE)
     if not strval:
         return "Z000"
@@ -0,0 +1,497 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""Unittest for relationship.py"""
+
+import random
+import unittest
+
+from ..const import GRAMPS_LOCALE as glocale
+from ..db import DbTxn
+from ..db.utils import make_database
+from ..lib import ChildRef, ChildRefType, Family, Person
+from ..relationship import RelationshipCalculator
+
+_ = glocale.translation.gettext
+
+
+class BaselineCalculator(RelationshipCalculator):
+    """
+    The relationship calculator with the search of Gramps 5.2, which walks
+    all the ancestors of both people, as the reference of the tests.
+    """
+
+    def get_relationship_distance_new(
+        self,
+        db,
+        orig_person,
+        other_person,
+        all_families=False,
+        all_dist=False,
+        only_birth=True,
+    ):
+        """
+        The search of the relationships as it was before the ancestor maps
+        were kept and the shortest relationship searched from both sides.
+        """
+        # data storage to communicate with recursive functions
+        self.__max_depth_reached = False
+        self.__loop_detected = False
+        self.__max_depth = self.get_depth()
+        self.__all_families = all_families
+        self.__all_dist = all_dist
+        self.__only_birth = only_birth
+        self.__crosslinks = False  # no crosslinks
+
+        first_rel = -1
+        second_rel = -1
+        self.__msg = []
+
+        common = []
+        first_map = {}
+        second_map = {}
+        rank = 9999999
+
+        try:
+            self.__apply_filter(db, orig_person, "", [], first_map)
+            self.__apply_filter(
+                db, other_person, "", [], second_map, stoprecursemap=first_map
+            )
+        except RuntimeError:
+            return (-1, None, -1, [], -1, []), [
+                _("Relationship loop detected")
+            ] + self.__msg
+
+        for person_handle in second_map:
+            if person_handle in first_map:
+                com = []
+                # a common ancestor
+                for rel1, fam1 in zip(
+                    first_map[person_handle][0], first_map[person_handle][1]
+                ):
+                    len1 = len(rel1)
+                    for rel2, fam2 in zip(
+                        second_map[person_handle][0], second_map[person_handle][1]
+                    ):
+                        len2 = len(rel2)
+                        # collect paths to arrive at common ancestor
+                        com.append((len1 + len2, person_handle, rel1, fam1, rel2, fam2))
+                # insert common ancestor in correct position,
+                #  if shorter links, check if not subset
+                #  if longer links, check if not superset
+                pos = 0
+                for ranknew, handlenew, rel1new, fam1new, rel2new, fam2new in com:
+                    insert = True
+                    for rank, handle, rel1, fam1, rel2, fam2 in common:
+                        if ranknew < rank:
+                            break
+                        elif ranknew >= rank:
+                            # check subset
+                            if (
+                                rel1 == rel1new[: len(rel1)]
+                                and rel2 == rel2new[: len(rel2)]
+                            ):
+                                # subset relation exists already
+                                insert = False
+                                break
+                        pos += 1
+                    if insert:
+                        if common:
+                            common.insert(
+                                pos,
+                                (
+                                    ranknew,
+                                    handlenew,
+                                    rel1new,
+                                    fam1new,
+                                    rel2new,
+                                    fam2new,
+                                ),
+                            )
+                        else:
+                            common = [
+                                (ranknew, handlenew, rel1new, fam1new, rel2new, fam2new)
+                            ]
+                        # now check if superset must be deleted from common
+                        deletelist = []
+                        index = pos + 1
+                        for rank, handle, rel1, fam1, rel2, fam2 in common[pos + 1 :]:
+                            if (
+                                rel1new == rel1[: len(rel1new)]
+                                and rel2new == rel2[: len(rel2new)]
+                            ):
+                                deletelist.append(index)
+                            index += 1
+                        deletelist.reverse()
+                        for index in deletelist:
+                            del common[index]
+        # check for extra messages
+        if self.__max_depth_reached:
+            self.__msg += [
+                _(
+                    "Family Tree reaches back more than the maximum "
+                    "%d generations searched.\nIt is possible that "
+                    "relationships have been missed"
+                )
+                % (self.__max_depth)
+            ]
+
+        if common and not self.__all_dist:
+            rank = common[0][0]
+            person_handle = common[0][1]
+            first_rel = common[0][2]
+            first_fam = common[0][3]
+            second_rel = common[0][4]
+            second_fam = common[0][5]
+            return (
+                rank,
+                person_handle,
+                first_rel,
+                first_fam,
+                second_rel,
+                second_fam,
+            ), self.__msg
+        if common:
+            # list with tuples (rank, handle person,rel_str_orig,rel_fam_orig,
+            #       rel_str_other,rel_fam_str) and messages
+            return common, self.__msg
+        if not self.__all_dist:
+            return (-1, None, "", [], "", []), self.__msg
+        else:
+            return [(-1, None, "", [], "", [])], self.__msg
+
+    def __apply_filter(
+        self, db, person, rel_str, rel_fam, pmap, depth=1, stoprecursemap=None
+    ):
+        """
+        Typically this method is called recursively in two ways:
+        First method is stoprecursemap= None
+        In this case a recursemap is builded by storing all data.
+
+        Second method is with a stoprecursemap given
+        In this case parents are recursively looked up. If present in
+        stoprecursemap, a common ancestor is found, and the method can
+        stop looking further. If however self.__crosslinks == True, the data
+        of first contains loops, and parents
+        will be looked up anyway an stored if common. At end the doubles
+        are filtered out
+        """
+        if person is None or not person.handle:
+            return
+
+        if depth > self.__max_depth:
+            self.__max_depth_reached = True
+            # print('Maximum ancestor generations ('+str(depth)+') reached', \
+            #            '(' + rel_str + ').',\
+            #            'Stopping relation algorithm.')
+            return
+        depth += 1
+
+        commonancestor = False
+        store = True  # normally we store all parents
+        if stoprecursemap:
+            store = False  # but not if a stop map given
+            if person.handle in stoprecursemap:
+                commonancestor = True
+                store = True
+
+        # add person to the map, take into account that person can be obtained
+        # from different sides
+        if person.handle in pmap:
+            # person is already a grandparent in another branch, we already have
+            # had lookup of all parents, we call that a crosslink
+            if not stoprecursemap:
+                self.__crosslinks = True
+            pmap[person.handle][0] += [rel_str]
+            pmap[person.handle][1] += [rel_fam]
+            # check if there is no loop father son of his son, ...
+            # loop means person is twice reached, same rel_str in begin
+            for rel1 in pmap[person.handle][0]:
+                for rel2 in pmap[person.handle][0]:
+                    if len(rel1) < len(rel2) and rel1 == rel2[: len(rel1)]:
+                        # loop, keep one message in storage!
+                        self.__loop_detected = True
+                        self.__msg += [
+                            _("Relationship loop detected:")
+                            + " "
+                            + _(
+                                "Person %(person)s connects to himself via %(relation)s"
+                            )
+                            % {
+                                "person": person.get_primary_name().get_name(),
+                                "relation": rel2[len(rel1) :],
+                            }
+                        ]
+                        return
+        elif store:
+            pmap[person.handle] = [[rel_str], [rel_fam]]
+
+        # having added person to the pmap, we only look up recursively to
+        # parents if this person is not common relative
+        # if however the first map has crosslinks, we need to continue reduced
+        if commonancestor and not self.__crosslinks:
+            # don't continue search, great speedup!
+            return
+
+        family_handles = []
+        main = person.get_main_parents_family_handle()
+        if main:
+            family_handles = [main]
+        if self.__all_families:
+            family_handles = person.get_parent_family_handle_list()
+
+        try:
+            parentstodo = {}
+            fam = 0
+            for family_handle in family_handles:
+                rel_fam_new = rel_fam + [fam]
+                family = db.get_family_from_handle(family_handle)
+                if not family:
+                    continue
+                # obtain childref for this person
+                childrel = [
+                    (ref.get_mother_relation(), ref.get_father_relation())
+                    for ref in family.get_child_ref_list()
+                    if ref.ref == person.handle
+                ]
+                fhandle = family.father_handle
+                mhandle = family.mother_handle
+                for data in [
+                    (
+                        fhandle,
+                        self.REL_FATHER,
+                        self.REL_FATHER_NOTBIRTH,
+                        childrel[0][1],
+                    ),
+                    (
+                        mhandle,
+                        self.REL_MOTHER,
+                        self.REL_MOTHER_NOTBIRTH,
+                        childrel[0][0],
+                    ),
+                ]:
+                    if data[0] and data[0] not in parentstodo:
+                        persontodo = db.get_person_from_handle(data[0])
+                        if data[3] == ChildRefType.BIRTH:
+                            addstr = data[1]
+                        elif not self.__only_birth:
+                            addstr = data[2]
+                        else:
+                            addstr = ""
+                        if addstr:
+                            parentstodo[data[0]] = (
+                                persontodo,
+                                rel_str + addstr,
+                                rel_fam_new,
+                            )
+                    elif data[0] and data[0] in parentstodo:
+                        # this person is already scheduled to research
+                        # update family list
+                        famlist = parentstodo[data[0]][2]
+                        if not isinstance(famlist[-1], list) and fam != famlist[-1]:
+                            famlist = famlist[:-1] + [[famlist[-1]]]
+                        if isinstance(famlist[-1], list) and fam not in famlist[-1]:
+                            famlist = famlist[:-1] + [famlist[-1] + [fam]]
+                            parentstodo[data[0]] = (
+                                parentstodo[data[0]][0],
+                                parentstodo[data[0]][1],
+                                famlist,
+                            )
+                if not fhandle and not mhandle and stoprecursemap is None:
+                    # family without parents, add brothers for orig person
+                    # other person has recusemap, and will stop when seeing
+                    # the brother.
+                    child_list = [
+                        ref.ref
+                        for ref in family.get_child_ref_list()
+                        if ref.ref != person.handle
+                    ]
+                    addstr = self.REL_SIBLING
+                    for chandle in child_list:
+                        if chandle in pmap:
+                            pmap[chandle][0] += [rel_str + addstr]
+                            pmap[chandle][1] += [rel_fam_new]
+                            # person is already a grandparent in another branch
+                        else:
+                            pmap[chandle] = [[rel_str + addstr], [rel_fam_new]]
+                fam += 1
+
+            for handle, data in parentstodo.items():
+                self.__apply_filter(
+                    db, data[0], data[1], data[2], pmap, depth, stoprecursemap
+                )
+        except:
+            import traceback
+
+
+class RelationshipTest(unittest.TestCase):
+    """
+    Tests of the searches of the relationship calculator.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.addCleanup(self.db.close)
+        self.calc = RelationshipCalculator()
+        self.people = {}
+        with DbTxn("Add", self.db) as trans:
+            for name in (
+                "grandfather",
+                "grandmother",
+                "father",
+                "uncle",
+                "me",
+                "sister",
+                "cousin",
+                "stranger",
+            ):
+                person = Person()
+                person.set_gender(Person.MALE)
+                self.db.add_person(person, trans)
+                self.people[name] = person
+            self.add_family("grandfather", "grandmother", ["father", "uncle"], trans)
+            self.add_family("father", None, ["me", "sister"], trans)
+            self.add_family("uncle", None, ["cousin"], trans)
+
+    def add_family(self, father, mother, children, trans):
+        family = Family()
+        for name, setter in (
+            (father, family.set_father_handle),
+            (mother, family.set_mother_handle),
+        ):
+            if name:
+                setter(self.people[name].handle)
+        for name in children:
+            ref = ChildRef()
+            ref.ref = self.people[name].handle
+            family.add_child_ref(ref)
+        self.db.add_family(family, trans)
+        for name in (father, mother):
+            if name:
+                self.people[name].add_family_handle(family.handle)
+                self.db.commit_person(self.people[name], trans)
+        for name in children:
+            self.people[name].add_parent_family_handle(family.handle)
+            self.db.commit_person(self.people[name], trans)
+        return family
+
+    def shortest(self, orig, other):
+        return self.calc.get_relationship_distance_new(
+            self.db, self.people[orig], self.people[other]
+        )[0]
+
+    def test_shortest(self):
+        rank, handle, rel1, fam1, rel2, fam2 = self.shortest("me", "cousin")
+        self.assertEqual(rank, 4)
+        self.assertEqual(handle, self.people["grandfather"].handle)
+        self.assertEqual((rel1, rel2), ("ff", "ff"))
+        self.assertEqual(
+            self.shortest("me", "father")[:3], (1, self.people["father"].handle, "f")
+        )
+        self.assertEqual(self.shortest("me", "me")[0], 0)
+        self.assertEqual(self.shortest("me", "stranger")[0], -1)
+        # the same relationships as before
+        baseline = BaselineCalculator()
+        for orig in self.people.values():
+            for other in self.people.values():
+                for all_dist in (False, True):
+                    self.assertEqual(
+                        self.calc.get_relationship_distance_new(
+                            self.db, orig, other, all_dist=all_dist
+                        ),
+                        baseline.get_relationship_distance_new(
+                            self.db, orig, other, all_dist=all_dist
+                        ),
+                    )
+
+    def test_shortest_ties(self):
+        """
+        Test that the common ancestor chosen among those at the same
+        distance is the one chosen before, in a tree with many ancestors
+        reached through several branches.
+        """
+        random.seed(0)
+        db = make_database("sqlite")
+        db.load(":memory:")
+        self.addCleanup(db.close)
+        with DbTxn("Add", db) as trans:
+            previous = []
+            for generation in range(5):
+                current = []
+                for index in range(20):
+                    person = Person()
+                    person.set_gender(index % 2)
+                    db.add_person(person, trans)
+                    current.append(person)
+                for child in current if previous else []:
+                    family = Family()
+                    family.set_father_handle(random.choice(previous[1::2]).handle)
+                    family.set_mother_handle(random.choice(previous[0::2]).handle)
+                    ref = ChildRef()
+                    ref.ref = child.handle
+                    family.add_child_ref(ref)
+                    db.add_family(family, trans)
+                    child.add_parent_family_handle(family.handle)
+                    db.commit_person(child, trans)
+                previous = current
+        people = list(db.iter_people())
+        baseline = BaselineCalculator()
+        for orig in people[-20:]:
+            for other in people:
+                self.assertEqual(
+                    self.calc.get_relationship_distance_new(db, orig, other)[0],
+                    baseline.get_relationship_distance_new(db, orig, other)[0],
+                )
+
+    def test_batch(self):
+        others = list(self.people.values())
+        expected = [
+            BaselineCalculator().get_one_relationship(self.db, self.people["me"], other)
+            for other in others
+        ]
+        self.assertEqual(
+            self.calc.get_one_relationships(self.db, self.people["me"], others),
+            expected,
+        )
+        self.assertIn("first cousin", expected)
+        self.assertFalse(self.calc.storemap)
+        self.assertEqual(self.calc.stored_maps, {})
+
+    def test_changes(self):
+        me = self.people["me"]
+        cousin = self.people["cousin"]
+        self.assertEqual(
+            self.calc.get_one_relationship(self.db, me, cousin), "first cousin"
+        )
+        # the uncle is no longer a child of the grandparents
+        with DbTxn("Change", self.db) as trans:
+            family = self.db.get_family_from_handle(
+                self.people["uncle"].get_main_parents_family_handle()
+            )
+            family.remove_child_handle(self.people["uncle"].handle)
+            self.db.commit_family(family, trans)
+            self.people["uncle"].remove_parent_family_handle(family.handle)
+            self.db.commit_person(self.people["uncle"], trans)
+        self.assertEqual(self.calc.get_one_relationship(self.db, me, cousin), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -103,6 +103,56 @@ class ProbablyAlive:
         if person is None:
             return (None, None, "", None)
         self.pset = set()
+        result = self._direct_range(person)
+        if result:
+            return result
+
+        # Neither birth nor death events are available. Try looking
+        # at siblings. If a sibling was born more than X years past,
+        # or more than Z future, then probably this person is
+        # not alive. If the sibling died more than X years
+        # past, or more than X years future, then probably not alive.
+        result = self._sibling_range(person)
+        if result:
+            return result
+
+        if not is_spouse:  # if you are not in recursion, let's recurse:
+            result = self._spouse_range(person)
+            if result:
+                return result
+
+        result = self._descendants_range(person) or self._ancestors_range(person)
+        if result:
+            return result
+
+        # If we can't find any reason to believe that they are dead we
+        # must assume they are alive.
+
+        return (None, None, "", None)
+
+    def _get_person(self, handle):
+        """
+        Return the person with the handle.
+        """
+        return self.db.get_person_from_handle(handle)
+
+    def _get_family(self, handle):
+        """
+        Return the family with the handle.
+        """
+        return self.db.get_family_from_handle(handle)
+
+    def _get_event(self, handle):
+        """
+        Return the event with the handle.
+        """
+        return self.db.get_event_from_handle(handle)
+
+    def _direct_range(self, person):
+        """
+        Return the dates estimated from the birth and death events of the
+        person, or None.
+        """
         birth_ref = person.get_birth_ref()
         death_ref = person.get_death_ref()
         death_date = None
@@ -112,7 +162,7 @@ class ProbablyAlive:
         # things are simple.
         if death_ref and death_ref.get_role().is_primary():
             if death_ref:
-                death = self.db.get_event_from_handle(death_ref.ref)
+                death = self._get_event(death_ref.ref)
                 if death:
                     death_date = death.get_date_object()
 
@@ -121,7 +171,7 @@ class ProbablyAlive:
         if not death_date:
             for ev_ref in person.get_primary_event_ref_list():
                 if ev_ref:
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
+                    ev = self._get_event(ev_ref.ref)
                     if ev and ev.type.is_death_fallback():
                         death_date = ev.get_date_object()
                         if not death_date.is_valid():
@@ -132,7 +182,7 @@ class ProbablyAlive:
         # assume they are alive (we already know they are not dead).
         if not birth_date:
             if birth_ref and birth_ref.get_role().is_primary():
-                birth = self.db.get_event_from_handle(birth_ref.ref)
+                birth = self._get_event(birth_ref.ref)
                 if birth and birth.get_date_object().get_start_date() != Date.EMPTY:
                     birth_date = birth.get_date_object()
 
@@ -140,7 +190,7 @@ class ProbablyAlive:
         # These are fairly good indications that someone's birth.
         if not birth_date:
             for ev_ref in person.get_primary_event_ref_list():
-                ev = self.db.get_event_from_handle(ev_ref.ref)
+                ev = self._get_event(ev_ref.ref)
                 if ev and ev.type.is_birth_fallback():
                     birth_date = ev.get_date_object()
 
@@ -159,302 +209,322 @@ class ProbablyAlive:
 
         if death_date and birth_date:
             return (birth_date, death_date, explain, person)  # direct self evidence
-
-        # Neither birth nor death events are available. Try looking
-        # at siblings. If a sibling was born more than X years past,
-        # or more than Z future, then probably this person is
-        # not alive. If the sibling died more than X years
-        # past, or more than X years future, then probably not alive.
-
-        family_list = person.get_parent_family_handle_list()
-        for family_handle in family_list:
-            family = self.db.get_family_from_handle(family_handle)
+        return None
+
+    def _sibling_range(self, person):
+        """
+        Return the dates estimated from the siblings of the person, or None.
+        """
+        for family_handle in person.get_parent_family_handle_list():
+            family = self._get_family(family_handle)
             if family is None:
                 continue
-            for child_ref in family.get_child_ref_list():
-                child_handle = child_ref.ref
-                child = self.db.get_person_from_handle(child_handle)
-                if child is None:
-                    continue
-                # Go through once looking for direct evidence:
-                for ev_ref in child.get_primary_event_ref_list():
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_birth():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling birth date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling birth date
-                                return (
-                                    Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling birth date"),
-                                    child,
-                                )
-                    elif ev and ev.type.is_death():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling death date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling death date
-                                return (
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling death date"),
-                                    child,
-                                )
-                # Go through again looking for fallback:
-                for ev_ref in child.get_primary_event_ref_list():
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_birth_fallback():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling birth date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling birth date
-                                return (
-                                    Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling birth-related date"),
-                                    child,
-                                )
-                    elif ev and ev.type.is_death_fallback():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling death date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling death date
-                                return (
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling death-related date"),
-                                    child,
-                                )
-
-        if not is_spouse:  # if you are not in recursion, let's recurse:
-            for family_handle in person.get_family_handle_list():
-                family = self.db.get_family_from_handle(family_handle)
-                if family:
-                    mother_handle = family.get_mother_handle()
-                    father_handle = family.get_father_handle()
-                    if mother_handle == person.handle and father_handle:
-                        father = self.db.get_person_from_handle(father_handle)
-                        date1, date2, explain, other = self.probably_alive_range(
-                            father, is_spouse=True
-                        )
-                        if date1 and date1.get_year() != 0:
+            result = self._children_range(family)
+            if result:
+                return result
+        return None
+
+    def _children_range(self, family):
+        """
+        Return the dates estimated from the first child of the family with
+        birth or death events, or None.
+        """
+        for child_ref in family.get_child_ref_list():
+            child_handle = child_ref.ref
+            child = self._get_person(child_handle)
+            if child is None:
+                continue
+            # Go through once looking for direct evidence:
+            for ev_ref in child.get_primary_event_ref_list():
+                ev = self._get_event(ev_ref.ref)
+                if ev and ev.type.is_birth():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling birth date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling birth date
                             return (
+                                Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
                                 Date().copy_ymd(
-                                    date1.get_year() - self.AVG_GENERATION_GAP
-                                ),
-                                Date().copy_ymd(
-                                    date1.get_year()
-                                    - self.AVG_GENERATION_GAP
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
                                     + self.MAX_AGE_PROB_ALIVE
                                 ),
-                                _("a spouse's birth-related date, ") + explain,
-                                other,
+                                _("sibling birth date"),
+                                child,
                             )
-                        elif date2 and date2.get_year() != 0:
+                elif ev and ev.type.is_death():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling death date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling death date
                             return (
                                 Date().copy_ymd(
-                                    date2.get_year()
-                                    + self.AVG_GENERATION_GAP
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
                                     - self.MAX_AGE_PROB_ALIVE
                                 ),
                                 Date().copy_ymd(
-                                    date2.get_year() + self.AVG_GENERATION_GAP
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    - self.MAX_AGE_PROB_ALIVE
+                                    + self.MAX_AGE_PROB_ALIVE
                                 ),
-                                _("a spouse's death-related date, ") + explain,
-                                other,
+                                _("sibling death date"),
+                                child,
                             )
-                    elif father_handle == person.handle and mother_handle:
-                        mother = self.db.get_person_from_handle(mother_handle)
-                        date1, date2, explain, other = self.probably_alive_range(
-                            mother, is_spouse=True
-                        )
-                        if date1 and date1.get_year() != 0:
+            # Go through again looking for fallback:
+            for ev_ref in child.get_primary_event_ref_list():
+                ev = self._get_event(ev_ref.ref)
+                if ev and ev.type.is_birth_fallback():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling birth date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling birth date
                             return (
+                                Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
                                 Date().copy_ymd(
-                                    date1.get_year() - self.AVG_GENERATION_GAP
-                                ),
-                                Date().copy_ymd(
-                                    date1.get_year()
-                                    - self.AVG_GENERATION_GAP
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
                                     + self.MAX_AGE_PROB_ALIVE
                                 ),
-                                _("a spouse's birth-related date, ") + explain,
-                                other,
+                                _("sibling birth-related date"),
+                                child,
                             )
-                        elif date2 and date2.get_year() != 0:
+                elif ev and ev.type.is_death_fallback():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling death date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling death date
                             return (
                                 Date().copy_ymd(
-                                    date2.get_year()
-                                    + self.AVG_GENERATION_GAP
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
                                     - self.MAX_AGE_PROB_ALIVE
                                 ),
                                 Date().copy_ymd(
-                                    date2.get_year() + self.AVG_GENERATION_GAP
-                                ),
-                                _("a spouse's death-related date, ") + explain,
-                                other,
-                            )
-                    # Let's check the family events and see if we find something
-                    for ref in family.get_event_ref_list():
-                        if ref:
-                            event = self.db.get_event_from_handle(ref.ref)
-                            if event:
-                                date = event.get_date_object()
-                                year = date.get_year()
-                                if year != 0:
-                                    other = None
-                                    if person.handle == mother_handle and father_handle:
-                                        other = self.db.get_person_from_handle(
-                                            father_handle
-                                        )
-                                    elif (
-                                        person.handle == father_handle and mother_handle
-                                    ):
-                                        other = self.db.get_person_from_handle(
-                                            mother_handle
-                                        )
-                                    return (
-                                        Date().copy_ymd(year - self.AVG_GENERATION_GAP),
-                                        Date().copy_ymd(
-                                            year
-                                            - self.AVG_GENERATION_GAP
-                                            + self.MAX_AGE_PROB_ALIVE
-                                        ),
-                                        _("event with spouse"),
-                                        other,
-                                    )
-
-        # Try looking for descendants that were born more than a lifespan
-        # ago.
-
-        def descendants_too_old(person, years):
-            if person.handle in self.pset:
-                return (None, None, "", None)
-            self.pset.add(person.handle)
-            for family_handle in person.get_family_handle_list():
-                family = self.db.get_family_from_handle(family_handle)
-                if not family:
-                    # can happen with LivingProxyDb(PrivateProxyDb(db))
-                    continue
-                for child_ref in family.get_child_ref_list():
-                    child_handle = child_ref.ref
-                    child = self.db.get_person_from_handle(child_handle)
-                    child_birth_ref = child.get_birth_ref()
-                    if child_birth_ref:
-                        child_birth = self.db.get_event_from_handle(child_birth_ref.ref)
-                        dobj = child_birth.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            d = Date(dobj)
-                            val = d.get_start_date()
-                            val = d.get_year() - years
-                            d.set_year(val)
-                            return (
-                                d,
-                                d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
-                                _("descendant birth date"),
-                                child,
-                            )
-                    child_death_ref = child.get_death_ref()
-                    if child_death_ref:
-                        child_death = self.db.get_event_from_handle(child_death_ref.ref)
-                        dobj = child_death.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            return (
-                                dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
-                                dobj.copy_offset_ymd(
-                                    -self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    - self.MAX_AGE_PROB_ALIVE
+                                    + self.MAX_AGE_PROB_ALIVE
                                 ),
-                                _("descendant death date"),
+                                _("sibling death-related date"),
                                 child,
                             )
-                    date1, date2, explain, other = descendants_too_old(
-                        child, years + self.AVG_GENERATION_GAP
+        return None
+
+    def _spouse_range(self, person):
+        """
+        Return the dates estimated from the spouses of the person and the
+        events of their families, or None.
+        """
+        for family_handle in person.get_family_handle_list():
+            family = self._get_family(family_handle)
+            if family:
+                mother_handle = family.get_mother_handle()
+                father_handle = family.get_father_handle()
+                if mother_handle == person.handle and father_handle:
+                    father = self._get_person(father_handle)
+                    date1, date2, explain, other = self.probably_alive_range(
+                        father, is_spouse=True
                     )
-                    if date1 and date2:
-                        return date1, date2, explain, other
-                    # Check fallback data:
-                    for ev_ref in child.get_primary_event_ref_list():
-                        ev = self.db.get_event_from_handle(ev_ref.ref)
-                        if ev and ev.type.is_birth_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                d = Date(dobj)
-                                val = d.get_start_date()
-                                val = d.get_year() - years
-                                d.set_year(val)
-                                return (
-                                    d,
-                                    d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
-                                    _("descendant birth-related date"),
-                                    child,
-                                )
-
-                        elif ev and ev.type.is_death_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
+                    if date1 and date1.get_year() != 0:
+                        return (
+                            Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP),
+                            Date().copy_ymd(
+                                date1.get_year()
+                                - self.AVG_GENERATION_GAP
+                                + self.MAX_AGE_PROB_ALIVE
+                            ),
+                            _("a spouse's birth-related date, ") + explain,
+                            other,
+                        )
+                    elif date2 and date2.get_year() != 0:
+                        return (
+                            Date().copy_ymd(
+                                date2.get_year()
+                                + self.AVG_GENERATION_GAP
+                                - self.MAX_AGE_PROB_ALIVE
+                            ),
+                            Date().copy_ymd(date2.get_year() + self.AVG_GENERATION_GAP),
+                            _("a spouse's death-related date, ") + explain,
+                            other,
+                        )
+                elif father_handle == person.handle and mother_handle:
+                    mother = self._get_person(mother_handle)
+                    date1, date2, explain, other = self.probably_alive_range(
+                        mother, is_spouse=True
+                    )
+                    if date1 and date1.get_year() != 0:
+                        return (
+                            Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP),
+                            Date().copy_ymd(
+                                date1.get_year()
+                                - self.AVG_GENERATION_GAP
+                                + self.MAX_AGE_PROB_ALIVE
+                            ),
+                            _("a spouse's birth-related date, ") + explain,
+                            other,
+                        )
+                    elif date2 and date2.get_year() != 0:
+                        return (
+                            Date().copy_ymd(
+                                date2.get_year()
+                                + self.AVG_GENERATION_GAP
+                                - self.MAX_AGE_PROB_ALIVE
+                            ),
+                            Date().copy_ymd(date2.get_year() + self.AVG_GENERATION_GAP),
+                            _("a spouse's death-related date, ") + explain,
+                            other,
+                        )
+                # Let's check the family events and see if we find something
+                for ref in family.get_event_ref_list():
+                    if ref:
+                        event = self._get_event(ref.ref)
+                        if event:
+                            date = event.get_date_object()
+                            year = date.get_year()
+                            if year != 0:
+                                other = None
+                                if person.handle == mother_handle and father_handle:
+                                    other = self._get_person(father_handle)
+                                elif person.handle == father_handle and mother_handle:
+                                    other = self._get_person(mother_handle)
                                 return (
-                                    dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
-                                    dobj.copy_offset_ymd(
-                                        -self.AVG_GENERATION_GAP
+                                    Date().copy_ymd(year - self.AVG_GENERATION_GAP),
+                                    Date().copy_ymd(
+                                        year
+                                        - self.AVG_GENERATION_GAP
                                         + self.MAX_AGE_PROB_ALIVE
                                     ),
-                                    _("descendant death-related date"),
-                                    child,
+                                    _("event with spouse"),
+                                    other,
                                 )
+        return None
 
-            return (None, None, "", None)
+    def _descendants_range(self, person):
+        """
+        Return the dates estimated from the descendants of the person, or
+        None.
+        """
+
+        # Try looking for descendants that were born more than a lifespan
+        # ago.
+
+        def descendants_too_old(person):
+            if person.handle in self.pset:
+                return None
+            self.pset.add(person.handle)
+            return self._descendant_evidence(person, descendants_too_old)
 
         # If there are descendants that are too old for the person to have
         # been alive in the current year then they must be dead.
 
-        date1, date2, explain, other = None, None, "", None
         try:
-            date1, date2, explain, other = descendants_too_old(
-                person, self.AVG_GENERATION_GAP
-            )
+            evidence = descendants_too_old(person)
         except RuntimeError:
             raise DatabaseError(
                 _("Database error: loop in %s's descendants")
                 % name_displayer.display(person)
             )
+        return self._evidence_range(evidence)
+
+    def _descendant_evidence(self, person, get_evidence):
+        """
+        Return the first evidence found in the descendants of the person, as
+        a (descendant handle, generation, date, is birth, explain) tuple, or
+        None.
+
+        :param get_evidence: function returning the evidence found in the
+                             descendants of a child of the person
+        """
+        for family_handle in person.get_family_handle_list():
+            family = self._get_family(family_handle)
+            if not family:
+                # can happen with LivingProxyDb(PrivateProxyDb(db))
+                continue
+            for child_ref in family.get_child_ref_list():
+                child_handle = child_ref.ref
+                child = self._get_person(child_handle)
+                child_birth_ref = child.get_birth_ref()
+                if child_birth_ref:
+                    child_birth = self._get_event(child_birth_ref.ref)
+                    dobj = child_birth.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        return (child_handle, 1, dobj, True, _("descendant birth date"))
+                child_death_ref = child.get_death_ref()
+                if child_death_ref:
+                    child_death = self._get_event(child_death_ref.ref)
+                    dobj = child_death.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        return (
+                            child_handle,
+                            1,
+                            dobj,
+                            False,
+                            _("descendant death date"),
+                        )
+                evidence = get_evidence(child)
+                if evidence:
+                    handle, generation, dobj, is_birth, explain = evidence
+                    return (handle, generation + 1, dobj, is_birth, explain)
+                # Check fallback data:
+                for ev_ref in child.get_primary_event_ref_list():
+                    ev = self._get_event(ev_ref.ref)
+                    if ev and ev.type.is_birth_fallback():
+                        dobj = ev.get_date_object()
+                        if dobj.get_start_date() != Date.EMPTY:
+                            return (
+                                child_handle,
+                                1,
+                                dobj,
+                                True,
+                                _("descendant birth-related date"),
+                            )
 
-        if date1 and date2:
-            return (date1, date2, explain, other)
+                    elif ev and ev.type.is_death_fallback():
+                        dobj = ev.get_date_object()
+                        if dobj.get_start_date() != Date.EMPTY:
+                            return (
+                                child_handle,
+                                1,
+                                dobj,
+                                False,
+                                _("descendant death-related date"),
+                            )
+        return None
+
+    def _evidence_range(self, evidence):
+        """
+        Return the dates estimated from an evidence found in the descendants
+        of a person, or None.
+        """
+        if evidence is None:
+            return None
+        handle, generation, dobj, is_birth, explain = evidence
+        child = self._get_person(handle)
+        if is_birth:
+            d = Date(dobj)
+            d.set_year(d.get_year() - generation * self.AVG_GENERATION_GAP)
+            return (d, d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE), explain, child)
+        return (
+            dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
+            dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
+            explain,
+            child,
+        )
+
+    def _ancestors_range(self, person):
+        """
+        Return the dates estimated from the ancestors of the person, or None.
+        """
 
         def ancestors_too_old(person, year):
             if person.handle in self.pset:
@@ -467,18 +537,16 @@ class ProbablyAlive:
             )
             family_handle = person.get_main_parents_family_handle()
             if family_handle:
-                family = self.db.get_family_from_handle(family_handle)
+                family = self._get_family(family_handle)
                 if not family:
                     # can happen with LivingProxyDb(PrivateProxyDb(db))
                     return (None, None, "", None)
                 father_handle = family.get_father_handle()
                 if father_handle:
-                    father = self.db.get_person_from_handle(father_handle)
+                    father = self._get_person(father_handle)
                     father_birth_ref = father.get_birth_ref()
                     if father_birth_ref and father_birth_ref.get_role().is_primary():
-                        father_birth = self.db.get_event_from_handle(
-                            father_birth_ref.ref
-                        )
+                        father_birth = self._get_event(father_birth_ref.ref)
                         dobj = father_birth.get_date_object()
                         if dobj.get_start_date() != Date.EMPTY:
                             return (
@@ -489,9 +557,7 @@ class ProbablyAlive:
                             )
                     father_death_ref = father.get_death_ref()
                     if father_death_ref and father_death_ref.get_role().is_primary():
-                        father_death = self.db.get_event_from_handle(
-                            father_death_ref.ref
-                        )
+                        father_death = self._get_event(father_death_ref.ref)
                         dobj = father_death.get_date_object()
                         if dobj.get_start_date() != Date.EMPTY:
                             return (
@@ -507,7 +573,7 @@ class ProbablyAlive:
 
                     # Check fallback data:
                     for ev_ref in father.get_primary_event_ref_list():
-                        ev = self.db.get_event_from_handle(ev_ref.ref)
+                        ev = self._get_event(ev_ref.ref)
                         if ev and ev.type.is_birth_fallback():
                             dobj = ev.get_date_object()
                             if dobj.get_start_date() != Date.EMPTY:
@@ -544,12 +610,10 @@ class ProbablyAlive:
 
                 mother_handle = family.get_mother_handle()
                 if mother_handle:
-                    mother = self.db.get_person_from_handle(mother_handle)
+                    mother = self._get_person(mother_handle)
                     mother_birth_ref = mother.get_birth_ref()
                     if mother_birth_ref and mother_birth_ref.get_role().is_primary():
-                        mother_birth = self.db.get_event_from_handle(
-                            mother_birth_ref.ref
-                        )
+                        mother_birth = self._get_event(mother_birth_ref.ref)
                         dobj = mother_birth.get_date_object()
                         if dobj.get_start_date() != Date.EMPTY:
                             return (
@@ -560,9 +624,7 @@ class ProbablyAlive:
                             )
                     mother_death_ref = mother.get_death_ref()
                     if mother_death_ref and mother_death_ref.get_role().is_primary():
-                        mother_death = self.db.get_event_from_handle(
-                            mother_death_ref.ref
-                        )
+                        mother_death = self._get_event(mother_death_ref.ref)
                         dobj = mother_death.get_date_object()
                         if dobj.get_start_date() != Date.EMPTY:
                             return (
@@ -578,7 +640,7 @@ class ProbablyAlive:
 
                     # Check fallback data:
                     for ev_ref in mother.get_primary_event_ref_list():
-                        ev = self.db.get_event_from_handle(ev_ref.ref)
+                        ev = self._get_event(ev_ref.ref)
                         if ev and ev.type.is_birth_fallback():
                             dobj = ev.get_date_object()
                             if dobj.get_start_date() != Date.EMPTY:
@@ -628,11 +690,199 @@ class ProbablyAlive:
             )
         if date1 and date2:
             return (date1, date2, explain, other)
+        return None
 
-        # If we can't find any reason to believe that they are dead we
-        # must assume they are alive.
 
-        return (None, None, "", None)
+# -------------------------------------------------------------------------
+#
+# ProbablyAliveRanges class
+#
+# -------------------------------------------------------------------------
+class ProbablyAliveRanges(ProbablyAlive):
+    """
+    The estimated birth and death dates of all the people of a database.
+
+    They are computed at once: the evidence in the descendants of each person
+    is looked up once, the children before their parents, and the dates
+    estimated from the siblings and from the spouses of a person are shared
+    with them.  Use :func:`get_probably_alive_ranges` to keep them until the
+    data changes.
+    """
+
+    def __init__(
+        self,
+        db,
+        max_sib_age_diff=None,
+        max_age_prob_alive=None,
+        avg_generation_gap=None,
+    ):
+        ProbablyAlive.__init__(
+            self, db, max_sib_age_diff, max_age_prob_alive, avg_generation_gap
+        )
+        # evidence found in the descendants of each person
+        self.__descendants = {}
+        # dates estimated from the children of each family
+        self.__children = {}
+        # dates of each (person handle, is_spouse), with the handle of the
+        # related person
+        self.__ranges = {}
+        # each object is read once while the dates are computed, and is not
+        # kept afterwards
+        from ..proxy.proxybase import ProxyDbBase
+
+        if isinstance(db, ProxyDbBase):
+            # the iterators of a proxy give the objects of the database below
+            # it, with the records that the proxy hides
+            people = map(db.get_person_from_handle, db.iter_person_handles())
+            families = map(db.get_family_from_handle, db.iter_family_handles())
+        else:
+            people = db.iter_people()
+            families = db.iter_families()
+        self.__people = {person.handle: person for person in people}
+        self.__families = {family.handle: family for family in families}
+        self.__events = {}
+        self.__find_descendant_evidence()
+        for person in self.__people.values():
+            self.__get_range(person, False)
+        self.__people = self.__families = self.__events = None
+
+    def probably_alive_range(self, person, is_spouse=False):
+        if person is None:
+            return (None, None, "", None)
+        birth, death, explain, handle = self.__get_range(person, is_spouse)
+        # copies, as the dates are shared
+        return (
+            Date(birth) if birth else None,
+            Date(death) if death else None,
+            explain,
+            self.__get_person(handle, person),
+        )
+
+    def probably_alive(self, person, current_date=None, limit=0, return_range=False):
+        """
+        Return true if the person may be alive on current_date, see
+        :func:`probably_alive`.
+        """
+        return _alive_on_date(
+            person,
+            self.probably_alive_range(person),
+            current_date,
+            limit,
+            return_range,
+        )
+
+    def _get_person(self, handle):
+        if self.__people is None:
+            return ProbablyAlive._get_person(self, handle)
+        return self.__people.get(handle)
+
+    def _get_family(self, handle):
+        if self.__families is None:
+            return ProbablyAlive._get_family(self, handle)
+        return self.__families.get(handle)
+
+    def _get_event(self, handle):
+        if self.__events is None:
+            return ProbablyAlive._get_event(self, handle)
+        if handle not in self.__events:
+            self.__events[handle] = ProbablyAlive._get_event(self, handle)
+        return self.__events[handle]
+
+    def _children_range(self, family):
+        if family.handle not in self.__children:
+            self.__children[family.handle] = self.__compact(
+                ProbablyAlive._children_range(self, family)
+            )
+        compact = self.__children[family.handle]
+        if compact is None:
+            return None
+        return compact[:3] + (self.__get_person(compact[3]),)
+
+    def _descendants_range(self, person):
+        if person.handle not in self.__descendants:
+            return ProbablyAlive._descendants_range(self, person)
+        return self._evidence_range(self.__descendants[person.handle])
+
+    def _ancestors_range(self, person):
+        # In ProbablyAlive.probably_alive_range, the person is already in
+        # pset when its ancestors are looked at, after its descendants, so
+        # that they never give any evidence.
+        return None
+
+    def __get_range(self, person, is_spouse):
+        """
+        Return the dates of a person, with the handle of the related person.
+        """
+        key = (person.handle, is_spouse)
+        if key not in self.__ranges:
+            self.__ranges[key] = self.__compact(
+                ProbablyAlive.probably_alive_range(self, person, is_spouse)
+            )
+        return self.__ranges[key]
+
+    def __get_person(self, handle, person=None):
+        """
+        Return the person with the handle, which may be the given person.
+        """
+        if handle is None:
+            return None
+        if person is not None and handle == person.handle:
+            return person
+        return self._get_person(handle)
+
+    @staticmethod
+    def __compact(result):
+        """
+        Return the dates with the handle of the related person instead of
+        the person, to keep them.
+        """
+        if result is None:
+            return None
+        birth, death, explain, other = result
+        return (birth, death, explain, other.handle if other else None)
+
+    def __iter_children(self, person):
+        """
+        Iterate over the handles of the children of the person.
+        """
+        for family_handle in person.get_family_handle_list():
+            family = self._get_family(family_handle)
+            if family:
+                for child_ref in family.get_child_ref_list():
+                    yield child_ref.ref
+
+    def __find_descendant_evidence(self):
+        """
+        Find the evidence in the descendants of all the people, depth first
+        so that the children are done before their parents.  A child which
+        closes a loop gives no evidence.
+        """
+        evidence = self.__descendants
+
+        def get_evidence(child):
+            return evidence.get(child.handle)
+
+        for person in self.__people.values():
+            if person.handle in evidence:
+                continue
+            stack = [(person, self.__iter_children(person))]
+            active = {person.handle}
+            while stack:
+                person, todo = stack[-1]
+                for child_handle in todo:
+                    if child_handle in evidence or child_handle in active:
+                        continue
+                    child = self._get_person(child_handle)
+                    if child:
+                        active.add(child_handle)
+                        stack.append((child, self.__iter_children(child)))
+                        break
+                else:
+                    stack.pop()
+                    active.discard(person.handle)
+                    evidence[person.handle] = self._descendant_evidence(
+                        person, get_evidence
+                    )
 
 
 # -------------------------------------------------------------------------
@@ -666,9 +916,18 @@ def probably_alive(
     """
     # First, get the real database to use all people
     # for determining alive status:
-    birth, death, explain, relative = probably_alive_range(
+    dates = probably_alive_range(
         person, db, max_sib_age_diff, max_age_prob_alive, avg_generation_gap
     )
+    return _alive_on_date(person, dates, current_date, limit, return_range)
+
+
+def _alive_on_date(person, dates, current_date, limit, return_range):
+    """
+    Return true if the person may be alive on current_date, from the
+    (birth_date, death_date, explain_text, related_person) estimated dates.
+    """
+    birth, death, explain, relative = dates
     if current_date is None:
         current_date = Today()
     LOG.debug(
@@ -712,6 +971,39 @@ def probably_alive_range(
     return pb.probably_alive_range(person)
 
 
+def get_probably_alive_ranges(
+    db, max_sib_age_diff=None, max_age_prob_alive=None, avg_generation_gap=None
+):
+    """
+    Return the :class:`ProbablyAliveRanges` of all the people of a database.
+
+    The dates are computed from the data that the database shows, so that
+    a proxy hiding private records also hides them from the estimates.
+    They are kept in the result cache of the underlying database, so that
+    they are only computed again when the data has changed; for a proxy,
+    only those of the last proxy asked for are kept.
+    """
+    from ..proxy.proxybase import ProxyDbBase
+
+    basedb = db
+    while isinstance(basedb, ProxyDbBase):
+        basedb = basedb.db
+    key = (
+        ProbablyAliveRanges,
+        db is not basedb,
+        _MAX_SIB_AGE_DIFF if max_sib_age_diff is None else max_sib_age_diff,
+        _MAX_AGE_PROB_ALIVE if max_age_prob_alive is None else max_age_prob_alive,
+        _AVG_GENERATION_GAP if avg_generation_gap is None else avg_generation_gap,
+    )
+    cache = basedb.get_result_cache()
+    if cache is not None and key in cache and cache[key][0] is db:
+        return cache[key][1]
+    ranges = ProbablyAliveRanges(db, *key[2:])
+    if cache is not None:
+        cache[key] = (db, ranges)
+    return ranges
+
+
 def update_constants():
     """
     Used to update the constants that are cached in this module.
@@ -25,35 +25,71 @@
 Least recently used algorithm
 """
 
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+from collections import OrderedDict
+import sys
+
 
-class Node:
+def sizeof(value):
     """
-    Node to be stored in the LRU structure
+    Return the approximate size in bytes of a value and of the items of a
+    container value.
     """
-
-    def __init__(self, prev, value):
-        self.prev = prev
-        self.value = value
-        self.next = None
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + sys.getsizeof(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            size += sys.getsizeof(item)
+    return size
 
 
 class LRU:
     """
     Implementation of a length-limited O(1) LRU cache
+
+    The entries are kept in an OrderedDict, least recently used first.
+    Optionally, the total size of the values can be limited too; the size
+    of a value is measured when it is stored, and must be measured again
+    with :meth:`update_size` when the value is changed in place.
     """
 
-    def __init__(self, count):
+    def __init__(self, count, max_bytes=0, size_func=sizeof):
         """
         Set count to 0 or 1 to disable.
+
+        :param count: maximum number of entries
+        :type count: int
+        :param max_bytes: maximum total size of the values, 0 for no limit
+        :type max_bytes: int
+        :param size_func: function returning the size of a value in bytes
+        :type size_func: callable
         """
         self.count = count
-        self.data = {}
-        self.first = None
-        self.last = None
+        self.max_bytes = max_bytes
+        self.size_func = size_func
+        self.data = OrderedDict()
+        self.sizes = {}
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """
+        Return the number of entries in the LRU
+        """
+        return len(self.data)
 
     def __contains__(self, obj):
         """
-        Return True if the object is contained in the LRU
+        Return True if the object is contained in the LRU; this is not
+        counted as a lookup
         """
         return obj in self.data
 
@@ -61,72 +97,80 @@ class LRU:
         """
         Return item associated with Obj
         """
-        return self.data[obj].value[1]
+        self.data.move_to_end(obj)
+        self.hits += 1
+        return self.data[obj]
+
+    def get(self, obj, default=None):
+        """
+        Return item associated with Obj, or default if there is none
+        """
+        try:
+            self.data.move_to_end(obj)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return self.data[obj]
 
     def __setitem__(self, obj, val):
         """
-        Set the item in the LRU, removing an old entry if needed
+        Set the item in the LRU, removing old entries if needed
         """
         if self.count <= 1:  # Disabled
             return
         if obj in self.data:
             del self[obj]
-        nobj = Node(self.last, (obj, val))
-        if self.first is None:
-            self.first = nobj
-        if self.last:
-            self.last.next = nobj
-        self.last = nobj
-        self.data[obj] = nobj
-        if len(self.data) > self.count:
-            if self.first == self.last:
-                self.first = None
-                self.last = None
-                return
-            lnk = self.first
-            lnk.next.prev = None
-            self.first = lnk.next
-            lnk.next = None
-            if lnk.value[0] in self.data:
-                del self.data[lnk.value[0]]
-            del lnk
+        self.data[obj] = val
+        if self.max_bytes:
+            size = self.size_func(val)
+            self.sizes[obj] = size
+            self.nbytes += size
+        self._evict()
+
+    def update_size(self, obj):
+        """
+        Measure again the size of the value of an entry, after the value
+        was changed in place, removing old entries if needed
+        """
+        if not self.max_bytes or obj not in self.data:
+            return
+        size = self.size_func(self.data[obj])
+        self.nbytes += size - self.sizes[obj]
+        self.sizes[obj] = size
+        self._evict()
+
+    def _evict(self):
+        """
+        Remove the least recently used entries while there are too many, or
+        while they are too large
+        """
+        while len(self.data) > self.count or (
+            self.max_bytes and self.nbytes > self.max_bytes and len(self.data) > 1
+        ):
+            oldest = next(iter(self.data))
+            del self[oldest]
+            self.evictions += 1
 
     def __delitem__(self, obj):
         """
         Delete the object from the LRU
         """
-        nobj = self.data[obj]
-        if nobj.prev:
-            nobj.prev.next = nobj.next
-        else:
-            self.first = nobj.next
-        if nobj.next:
-            nobj.next.prev = nobj.prev
-        else:
-            self.last = nobj.prev
         del self.data[obj]
+        if self.max_bytes:
+            self.nbytes -= self.sizes.pop(obj)
 
     def __iter__(self):
         """
         Iterate over the LRU
         """
-        cur = self.first
-        while cur is not None:
-            cur2 = cur.next
-            yield cur.value[1]
-            cur = cur2
-        raise StopIteration
+        return iter(list(self.data.values()))
 
     def iteritems(self):
         """
         Return items in the LRU using a generator
         """
-        cur = self.first
-        while cur is not None:
-            cur2 = cur.next
-            yield cur.value
-            cur = cur2
-        raise StopIteration
+        yield from list(self.data.items())
 
     def iterkeys(self):
         """
@@ -138,50 +182,38 @@ class LRU:
         """
         Return items and keys in the LRU using a generator
         """
-        for data in self.items():
-            yield data[1]
+        yield from list(self.data.values())
 
     def keys(self):
         """
         Return all keys
         """
-        return [data[0] for data in self.items()]
+        return list(self.data.keys())
 
     def values(self):
         """
         Return all values
         """
-        return [data[1] for data in self.items()]
+        return list(self.data.values())
 
     def items(self):
         """
         Return all items
         """
-        return [data[0] for data in self.items()]
+        return list(self.data.items())
+
+    def hit_rate(self):
+        """
+        Return the fraction of lookups that found their entry, or 0.0 if
+        there were none
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
 
     def clear(self):
         """
         Empties LRU
         """
-        # Step through the doubly linked list, setting prev and next to None.
-        # This ensures that each node is unreachable and therefore eligible for
-        # garbage collection. "del" is also called for each node, but it is
-        # unclear whether this actually has any effect, of just removes the
-        # binding to nobj
-        nobj = self.first
-        # The references first and last are removed so that the nodes are not
-        # reachable from these
-        self.first = None
-        self.last = None
-        # The references from self.data are removed
         self.data.clear()
-        while nobj is not None and nobj.next is not None:
-            # each node except the last is processed
-            nobj.next.prev = None
-            nextobj = nobj.next
-            nobj.next = None
-            del nobj
-            nobj = nextobj
-        if nobj is not None:
-            # The last node is processed
-            del nobj
+        self.sizes.clear()
+        self.nbytes = 0
@@ -0,0 +1,212 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the estimated dates of all the people of a database.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import random
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ...db import DbTxn
+from ...db.utils import make_database
+from ...lib import ChildRef, Date, Event, EventRef, EventType, Family, Person
+from ...proxy import LivingProxyDb, PrivateProxyDb
+from ..alive import (
+    ProbablyAlive,
+    ProbablyAliveRanges,
+    get_probably_alive_ranges,
+    probably_alive,
+)
+
+
+# -------------------------------------------------------------------------
+#
+# ProbablyAliveRangesTest class
+#
+# -------------------------------------------------------------------------
+class ProbablyAliveRangesTest(unittest.TestCase):
+    """
+    Compare the dates computed for the whole tree with those computed for
+    each person.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.addCleanup(self.db.close)
+
+    def add_events(self, obj, year, trans):
+        """
+        Add random birth, death and fallback events around year.
+        """
+        for event_type, chance, offset in (
+            (EventType.BIRTH, 0.2, 0),
+            (EventType.BAPTISM, 0.1, 1),
+            (EventType.DEATH, 0.15, 60),
+            (EventType.BURIAL, 0.1, 61),
+            (EventType.MARRIAGE, 0.1, 25),
+        ):
+            if random.random() > chance:
+                continue
+            event = Event()
+            event.set_type(event_type)
+            date = Date()
+            date.set_yr_mon_day(year + offset, 1, 1)
+            event.set_date_object(date)
+            self.db.add_event(event, trans)
+            ref = EventRef()
+            ref.ref = event.handle
+            obj.add_event_ref(ref)
+            if isinstance(obj, Person):
+                if event_type == EventType.BIRTH:
+                    obj.set_birth_ref(ref)
+                elif event_type == EventType.DEATH:
+                    obj.set_death_ref(ref)
+
+    def make_tree(self, generations=8, width=30):
+        """
+        Add generations of people, each the child of a random couple of the
+        previous generation.
+        """
+        random.seed(1)
+        with DbTxn("Add", self.db) as trans:
+            previous = []
+            for gen in range(generations):
+                year = 1700 + 25 * gen
+                current = []
+                for index in range(width):
+                    person = Person()
+                    person.set_gender(index % 2)
+                    self.add_events(person, year, trans)
+                    self.db.add_person(person, trans)
+                    current.append(person)
+                if previous:
+                    for index in range(0, width, 3):
+                        family = Family()
+                        family.set_father_handle(random.choice(previous[1::2]).handle)
+                        family.set_mother_handle(random.choice(previous[0::2]).handle)
+                        self.add_events(family, year - 25, trans)
+                        children = current[index : index + 3]
+                        for child in children:
+                            ref = ChildRef()
+                            ref.ref = child.handle
+                            family.add_child_ref(ref)
+                        self.db.add_family(family, trans)
+                        for handle in (family.father_handle, family.mother_handle):
+                            parent = self.db.get_person_from_handle(handle)
+                            parent.add_family_handle(family.handle)
+                            self.db.commit_person(parent, trans)
+                        for child in children:
+                            child.add_parent_family_handle(family.handle)
+                            self.db.commit_person(child, trans)
+                previous = current
+
+    def assertSameRange(self, range1, range2):
+        for date1, date2 in zip(range1[:2], range2[:2]):
+            if date1 is None or date2 is None:
+                self.assertIs(date1, date2)
+            else:
+                self.assertTrue(date1.is_equal(date2), (date1, date2))
+        self.assertEqual(range1[2], range2[2])
+        self.assertEqual(range1[3] and range1[3].handle, range2[3] and range2[3].handle)
+
+    def test_same_ranges(self):
+        self.make_tree()
+        ranges = ProbablyAliveRanges(self.db)
+        for person in self.db.iter_people():
+            for is_spouse in (False, True):
+                self.assertSameRange(
+                    ranges.probably_alive_range(person, is_spouse),
+                    ProbablyAlive(self.db).probably_alive_range(person, is_spouse),
+                )
+        explained = {
+            ranges.probably_alive_range(person)[2] for person in self.db.iter_people()
+        }
+        self.assertTrue(any("descendant" in text for text in explained))
+        self.assertIn("sibling birth date", explained)
+
+    def test_private_proxy(self):
+        self.make_tree()
+        with DbTxn("Hide", self.db) as trans:
+            for index, event in enumerate(list(self.db.iter_events())):
+                if index % 3 == 0:
+                    event.set_privacy(True)
+                    self.db.commit_event(event, trans)
+        private = PrivateProxyDb(self.db)
+        ranges = get_probably_alive_ranges(private)
+        self.assertIs(get_probably_alive_ranges(private), ranges)
+        self.assertIsNot(get_probably_alive_ranges(self.db), ranges)
+        for handle in private.iter_person_handles():
+            person = private.get_person_from_handle(handle)
+            self.assertSameRange(
+                ranges.probably_alive_range(person),
+                ProbablyAlive(private).probably_alive_range(person),
+            )
+
+    def test_private_living_proxy(self):
+        # the only evidence of the death of the person is private
+        with DbTxn("Add", self.db) as trans:
+            person = Person()
+            event = Event()
+            event.set_type(EventType.DEATH)
+            date = Date()
+            date.set_yr_mon_day(1900, 1, 1)
+            event.set_date_object(date)
+            event.set_privacy(True)
+            self.db.add_event(event, trans)
+            ref = EventRef()
+            ref.ref = event.handle
+            person.add_event_ref(ref)
+            person.set_death_ref(ref)
+            self.db.add_person(person, trans)
+        private = PrivateProxyDb(self.db)
+        self.assertFalse(get_probably_alive_ranges(self.db).probably_alive(person))
+        private_person = private.get_person_from_handle(person.handle)
+        self.assertTrue(probably_alive(private_person, private))
+        self.assertTrue(
+            get_probably_alive_ranges(private).probably_alive(private_person)
+        )
+        living = LivingProxyDb(private, LivingProxyDb.MODE_EXCLUDE_ALL)
+        self.assertIsNone(living.get_person_from_handle(person.handle))
+
+    def test_cache(self):
+        self.make_tree(generations=2)
+        ranges = get_probably_alive_ranges(self.db)
+        self.assertIs(get_probably_alive_ranges(self.db), ranges)
+        person = next(self.db.iter_people())
+        with DbTxn("Change", self.db) as trans:
+            self.add_events(person, 1900, trans)
+            self.db.commit_person(person, trans)
+        self.assertIsNot(get_probably_alive_ranges(self.db), ranges)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""Unittest for the LRU cache"""
+
+import unittest
+
+from ..lru import LRU
+
+
+class LRUTest(unittest.TestCase):
+    def test_count(self):
+        lru = LRU(3)
+        for key in "abcd":
+            lru[key] = key.upper()
+        self.assertEqual(lru.keys(), ["b", "c", "d"])
+        self.assertEqual(lru.evictions, 1)
+
+    def test_recently_used(self):
+        lru = LRU(3)
+        for key in "abc":
+            lru[key] = key.upper()
+        self.assertEqual(lru["a"], "A")
+        lru["d"] = "D"
+        self.assertNotIn("b", lru)
+        self.assertEqual(lru.items(), [("c", "C"), ("a", "A"), ("d", "D")])
+
+    def test_disabled(self):
+        lru = LRU(1)
+        lru["a"] = "A"
+        self.assertEqual(len(lru), 0)
+
+    def test_bytes(self):
+        lru = LRU(100, max_bytes=250, size_func=len)
+        for key in "abc":
+            lru[key] = key * 100
+        self.assertEqual(lru.keys(), ["b", "c"])
+        self.assertEqual(lru.nbytes, 200)
+        del lru["b"]
+        self.assertEqual(lru.nbytes, 100)
+        lru.clear()
+        self.assertEqual(lru.nbytes, 0)
+
+    def test_update_size(self):
+        lru = LRU(100, max_bytes=250, size_func=len)
+        lru["a"] = ["a"] * 100
+        lru["b"] = ["b"] * 100
+        self.assertEqual(lru.nbytes, 200)
+        # the value of "b" grows in place
+        lru["b"].extend(["b"] * 60)
+        lru.update_size("b")
+        self.assertEqual(lru.keys(), ["b"])
+        self.assertEqual(lru.nbytes, 160)
+        self.assertEqual(lru.evictions, 1)
+
+    def test_stats(self):
+        lru = LRU(10)
+        lru["a"] = "A"
+        self.assertIn("a", lru)
+        self.assertEqual(lru["a"], "A")
+        self.assertEqual(lru.get("a"), "A")
+        self.assertIsNone(lru.get("b"))
+        self.assertNotIn("c", lru)
+        # "in" is not counted as a lookup
+        self.assertEqual((lru.hits, lru.misses), (2, 1))
+        self.assertEqual(lru.hit_rate(), 2 / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -63,7 +63,13 @@ from .ddtargets import DdTargets
 from gramps.gen.recentfiles import rename_filename, remove_filename
 from .glade import Glade
 from gramps.gen.db.exceptions import DbException
-from gramps.gen.db.utils import make_database, open_database
+from gramps.gen.db.utils import (
+    make_database,
+    open_database,
+    get_dbid_from_path,
+    get_profile_from_path,
+    set_profile_for_path,
+)
 from gramps.gen.config import config
 from .listmodel import ListModel
 from gramps.gen.constfunc import win
@@ -185,6 +191,7 @@ class DbManager(CLIDbManager, ManagedWindow):
             "rename_btn",
             "convert_btn",
             "repair_btn",
+            "profile_btn",
             "rcs_btn",
             "msg",
             "close_btn",
@@ -251,6 +258,7 @@ class DbManager(CLIDbManager, ManagedWindow):
         self.info_btn.connect("clicked", self.__info_db)
         self.close_btn.connect("clicked", self.__close_db)
         self.repair_btn.connect("clicked", self.__repair_db)
+        self.profile_btn.connect("clicked", self.__profile_db)
         self.selection.connect("changed", self.__selection_changed)
         self.dblist.connect("button-press-event", self.__button_press)
         self.dblist.connect("key-press-event", self.__key_press)
@@ -320,6 +328,7 @@ class DbManager(CLIDbManager, ManagedWindow):
             self.close_btn.set_sensitive(False)
             self.rcs_btn.set_sensitive(False)
             self.repair_btn.set_sensitive(False)
+            self.profile_btn.set_sensitive(False)
             self.remove_btn.set_sensitive(False)
             return
 
@@ -366,6 +375,9 @@ class DbManager(CLIDbManager, ManagedWindow):
         else:
             self.repair_btn.set_sensitive(False)
 
+        self.profile_btn.set_sensitive(
+            not is_rev and store.get_value(node, BACKEND_COL) != UNAVAILABLE
+        )
         self.rename_btn.set_sensitive(True)
         self.info_btn.set_sensitive(True)
         self.remove_btn.set_sensitive(True)
@@ -948,6 +960,57 @@ class DbManager(CLIDbManager, ManagedWindow):
         summary = self.get_dbdir_summary(dirname, name)
         Information(self.uistate, summary, track=self.track)
 
+    def __profile_db(self, obj):
+        """
+        Select the tuning profile of the tree.  If the tree is open, the
+        profile is applied at once, otherwise when the tree is next opened.
+        """
+        store, node = self.selection.get_selected()
+        dirname = store[node][PATH_COL]
+        profiles = make_database(get_dbid_from_path(dirname)).get_profiles()
+        if not profiles:
+            ErrorDialog(
+                _("No tuning profiles"),
+                _("The database backend of this Family Tree has no tuning profiles."),
+                parent=self.top,
+            )
+            return
+
+        dialog = Gtk.Dialog(
+            title=_("Tuning Profile"), transient_for=self.top, modal=True
+        )
+        dialog.add_buttons(
+            _("_Cancel"), Gtk.ResponseType.CANCEL, _("_OK"), Gtk.ResponseType.OK
+        )
+        label = Gtk.Label(
+            label=_(
+                "The tuning profile sets how the database backend trades "
+                "memory and safety against a power failure for speed."
+            )
+        )
+        label.set_line_wrap(True)
+        label.set_max_width_chars(50)
+        combo = Gtk.ComboBoxText()
+        for profile in profiles:
+            combo.append(profile, profile)
+        if not combo.set_active_id(get_profile_from_path(dirname)):
+            combo.set_active(0)
+        box = dialog.get_content_area()
+        box.set_spacing(6)
+        box.set_border_width(12)
+        box.pack_start(label, False, False, 0)
+        box.pack_start(combo, False, False, 0)
+        dialog.show_all()
+        response = dialog.run()
+        profile = combo.get_active_id()
+        dialog.destroy()
+        if response != Gtk.ResponseType.OK or profile is None:
+            return
+
+        set_profile_for_path(dirname, profile)
+        if store[node][OPEN_COL]:
+            self.dbstate.db.set_profile(profile)
+
     def __repair_db(self, obj):
         """
         Start the repair process by calling the start_editing option on
@@ -62,9 +62,10 @@ class BaseModel:
         Get the value of a "col". col may be a number (position in a model)
         or a name (special value used by view).
         """
-        if handle in self.lru_data and col in self.lru_data[handle]:
+        data = self.lru_data.get(handle)
+        if data is not None and col in data:
             # print("hit", handle, col)
-            return (True, self.lru_data[handle][col])
+            return (True, data[col])
         # print("MISS", handle, col)
         return (False, None)
 
@@ -74,9 +75,11 @@ class BaseModel:
         """
         if not self._in_build:
             if self.lru_data.count > 0:
-                if handle not in self.lru_data:
-                    self.lru_data[handle] = {}
-                self.lru_data[handle][col] = data
+                values = self.lru_data.get(handle)
+                if values is None:
+                    values = self.lru_data[handle] = {}
+                values[col] = data
+                self.lru_data.update_size(handle)
 
     ## Cached Path's for TreeView:
     def get_cached_path(self, handle):
@@ -484,6 +484,8 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         # get the function that maps data to sort_keys
         self.sort_func = lambda x: glocale.sort_key(self.smap[col](x))
         self.sort_col = scol
+        # the model column of the sort column
+        self.sort_model_col = col
         self.skip = skip
         self._in_build = False
 
@@ -57,18 +57,11 @@ _LOG = logging.getLogger(".")
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
-from gramps.gen.lib import (
-    Name,
-    EventRef,
-    EventType,
-    EventRoleType,
-    FamilyRelType,
-    ChildRefType,
-    NoteType,
-)
+from gramps.gen.errors import HandleError
+from gramps.gen.lib import Name, EventType
 from gramps.gen.display.name import displayer as name_displayer
 from gramps.gen.display.place import displayer as place_displayer
-from gramps.gen.datehandler import format_time, get_date, get_date_valid
+from gramps.gen.datehandler import format_time, get_date
 from .flatbasemodel import FlatBaseModel
 from .treebasemodel import TreeBaseModel
 from .basemodel import BaseModel
@@ -233,305 +226,154 @@ class PeopleBaseModel(BaseModel):
     def column_gender(self, data):
         return PeopleBaseModel._GENDER[data[COLUMN_GENDER]]
 
-    def column_birth_day(self, data):
+    def _get_summary(self, data):
+        """
+        Return the vital summary of the person, see :mod:`gramps.gen.db.summary`.
+        """
         handle = data[0]
-        cached, value = self.get_cached_value(handle, "BIRTH_DAY")
+        cached, value = self.get_cached_value(handle, "SUMMARY")
         if not cached:
-            value = self._get_birth_data(data, False)
-            self.set_cached_value(handle, "BIRTH_DAY", value)
+            value = self.db.get_person_summary(handle)
+            self.set_cached_value(handle, "SUMMARY", value)
         return value
 
-    def sort_birth_day(self, data):
+    def column_birth_day(self, data):
         handle = data[0]
-        cached, value = self.get_cached_value(handle, "SORT_BIRTH_DAY")
+        cached, value = self.get_cached_value(handle, "BIRTH_DAY")
         if not cached:
-            value = self._get_birth_data(data, True)
-            self.set_cached_value(handle, "SORT_BIRTH_DAY", value)
+            value = self._get_vital_date(self._get_summary(data), "birth")
+            self.set_cached_value(handle, "BIRTH_DAY", value)
         return value
 
-    def _get_birth_data(self, data, sort_mode):
-        index = data[COLUMN_BIRTH]
-        if index != -1:
-            try:
-                local = data[COLUMN_EVENT][index]
-                b = EventRef()
-                b.unserialize(local)
-                birth = self.db.get_event_from_handle(b.ref)
-                if sort_mode:
-                    retval = "%09d" % birth.get_date_object().get_sort_value()
-                else:
-                    date_str = get_date(birth)
-                    if date_str != "":
-                        retval = escape(date_str)
-                if not get_date_valid(birth):
-                    return invalid_date_format % retval
-                else:
-                    return retval
-            except:
-                return ""
-
-        for event_ref in data[COLUMN_EVENT]:
-            er = EventRef()
-            er.unserialize(event_ref)
-            event = self.db.get_event_from_handle(er.ref)
-            etype = event.get_type()
-            date_str = get_date(event)
-            if (
-                etype.is_birth_fallback()
-                and er.get_role() == EventRoleType.PRIMARY
-                and date_str != ""
-            ):
-                if sort_mode:
-                    retval = "%09d" % event.get_date_object().get_sort_value()
-                else:
-                    retval = "<i>%s</i>" % escape(date_str)
-                if not get_date_valid(event):
-                    return invalid_date_format % retval
-                else:
-                    return retval
-
-        return ""
+    def sort_birth_day(self, data):
+        return self._sort_vital_date(self._get_summary(data), "birth")
 
     def column_death_day(self, data):
         handle = data[0]
         cached, value = self.get_cached_value(handle, "DEATH_DAY")
         if not cached:
-            value = self._get_death_data(data, False)
+            value = self._get_vital_date(self._get_summary(data), "death")
             self.set_cached_value(handle, "DEATH_DAY", value)
         return value
 
     def sort_death_day(self, data):
-        handle = data[0]
-        cached, value = self.get_cached_value(handle, "SORT_DEATH_DAY")
-        if not cached:
-            value = self._get_death_data(data, True)
-            self.set_cached_value(handle, "SORT_DEATH_DAY", value)
-        return value
+        return self._sort_vital_date(self._get_summary(data), "death")
+
+    def _get_vital_date(self, summary, vital):
+        """
+        Return the displayed date of the birth or death, or its fallback,
+        given in vital.
+        """
+        event_handle = summary[vital + "_handle"]
+        if not event_handle:
+            return ""
+        try:
+            event = self.db.get_event_from_handle(event_handle)
+        except HandleError:
+            return ""
+        date_str = get_date(event)
+        if date_str == "":
+            return ""
+        if summary[vital + "_fallback"]:
+            retval = "<i>%s</i>" % escape(date_str)
+        else:
+            retval = escape(date_str)
+        if not summary[vital + "_valid"]:
+            return invalid_date_format % retval
+        return retval
+
+    def _sort_vital_date(self, summary, vital):
+        """
+        Return the sort value of the birth or death, or its fallback, given
+        in vital.
+        """
+        if not summary[vital + "_handle"]:
+            return ""
+        retval = "%09d" % summary[vital + "_sortval"]
+        if not summary[vital + "_valid"]:
+            return invalid_date_format % retval
+        return retval
 
-    def _get_death_data(self, data, sort_mode):
-        index = data[COLUMN_DEATH]
-        if index != -1:
-            try:
-                local = data[COLUMN_EVENT][index]
-                ref = EventRef()
-                ref.unserialize(local)
-                event = self.db.get_event_from_handle(ref.ref)
-                if sort_mode:
-                    retval = "%09d" % event.get_date_object().get_sort_value()
-                else:
-                    date_str = get_date(event)
-                    if date_str != "":
-                        retval = escape(date_str)
-                if not get_date_valid(event):
-                    return invalid_date_format % retval
-                else:
-                    return retval
-            except:
-                return ""
-
-        for event_ref in data[COLUMN_EVENT]:
-            er = EventRef()
-            er.unserialize(event_ref)
-            event = self.db.get_event_from_handle(er.ref)
-            etype = event.get_type()
-            date_str = get_date(event)
-            if (
-                etype.is_death_fallback()
-                and er.get_role() == EventRoleType.PRIMARY
-                and date_str
-            ):
-                if sort_mode:
-                    retval = "%09d" % event.get_date_object().get_sort_value()
-                else:
-                    retval = "<i>%s</i>" % escape(date_str)
-                if not get_date_valid(event):
-                    return invalid_date_format % retval
-                else:
-                    return retval
-        return ""
+    def _get_vital_place(self, summary, vital):
+        """
+        Return the displayed place of the birth or death, or its fallback,
+        given in vital.
+        """
+        event_handle = summary[vital + "_place_event"]
+        if not event_handle:
+            return ""
+        try:
+            event = self.db.get_event_from_handle(event_handle)
+        except HandleError:
+            return ""
+        place_title = place_displayer.display_event(self.db, event)
+        if not place_title:
+            return ""
+        if summary[vital + "_place_fallback"]:
+            return "<i>%s</i>" % escape(place_title)
+        return escape(place_title)
 
     def column_birth_place(self, data):
         handle = data[0]
         cached, value = self.get_cached_value(handle, "BIRTH_PLACE")
-        if cached:
-            return value
-        else:
-            index = data[COLUMN_BIRTH]
-            if index != -1:
-                try:
-                    local = data[COLUMN_EVENT][index]
-                    br = EventRef()
-                    br.unserialize(local)
-                    event = self.db.get_event_from_handle(br.ref)
-                    if event:
-                        place_title = place_displayer.display_event(self.db, event)
-                        if place_title:
-                            value = escape(place_title)
-                            self.set_cached_value(handle, "BIRTH_PLACE", value)
-                            return value
-                except:
-                    value = ""
-                    self.set_cached_value(handle, "BIRTH_PLACE", value)
-                    return value
-
-            for event_ref in data[COLUMN_EVENT]:
-                er = EventRef()
-                er.unserialize(event_ref)
-                event = self.db.get_event_from_handle(er.ref)
-                etype = event.get_type()
-                if etype.is_birth_fallback() and er.get_role() == EventRoleType.PRIMARY:
-                    place_title = place_displayer.display_event(self.db, event)
-                    if place_title:
-                        value = "<i>%s</i>" % escape(place_title)
-                        self.set_cached_value(handle, "BIRTH_PLACE", value)
-                        return value
-            value = ""
+        if not cached:
+            value = self._get_vital_place(self._get_summary(data), "birth")
             self.set_cached_value(handle, "BIRTH_PLACE", value)
-            return value
+        return value
 
     def column_death_place(self, data):
         handle = data[0]
         cached, value = self.get_cached_value(handle, "DEATH_PLACE")
-        if cached:
-            return value
-        else:
-            index = data[COLUMN_DEATH]
-            if index != -1:
-                try:
-                    local = data[COLUMN_EVENT][index]
-                    dr = EventRef()
-                    dr.unserialize(local)
-                    event = self.db.get_event_from_handle(dr.ref)
-                    if event:
-                        place_title = place_displayer.display_event(self.db, event)
-                        if place_title:
-                            value = escape(place_title)
-                            self.set_cached_value(handle, "DEATH_PLACE", value)
-                            return value
-                except:
-                    value = ""
-                    self.set_cached_value(handle, "DEATH_PLACE", value)
-                    return value
-
-            for event_ref in data[COLUMN_EVENT]:
-                er = EventRef()
-                er.unserialize(event_ref)
-                event = self.db.get_event_from_handle(er.ref)
-                etype = event.get_type()
-                if etype.is_death_fallback() and er.get_role() == EventRoleType.PRIMARY:
-                    place_title = place_displayer.display_event(self.db, event)
-                    if place_title:
-                        value = "<i>%s</i>" % escape(place_title)
-                        self.set_cached_value(handle, "DEATH_PLACE", value)
-                        return value
-            value = ""
+        if not cached:
+            value = self._get_vital_place(self._get_summary(data), "death")
             self.set_cached_value(handle, "DEATH_PLACE", value)
-            return value
-
-    def _get_parents_data(self, data):
-        parents = 0
-        if data[COLUMN_PARENT]:
-            person = self.db.get_person_from_gramps_id(data[COLUMN_ID])
-            family_list = person.get_parent_family_handle_list()
-            for fam_hdle in family_list:
-                family = self.db.get_family_from_handle(fam_hdle)
-                if family.get_father_handle():
-                    parents += 1
-                if family.get_mother_handle():
-                    parents += 1
-        return parents
-
-    def _get_marriages_data(self, data):
-        marriages = 0
-        for family_handle in data[COLUMN_FAMILY]:
-            family = self.db.get_family_from_handle(family_handle)
-            if int(family.get_relationship()) == FamilyRelType.MARRIED:
-                marriages += 1
-        return marriages
-
-    def _get_children_data(self, data):
-        children = 0
-        for family_handle in data[COLUMN_FAMILY]:
-            family = self.db.get_family_from_handle(family_handle)
-            for child_ref in family.get_child_ref_list():
-                if (
-                    child_ref.get_father_relation() == ChildRefType.BIRTH
-                    and child_ref.get_mother_relation() == ChildRefType.BIRTH
-                ):
-                    children += 1
-        return children
-
-    def _get_todo_data(self, data):
-        todo = 0
-        for note_handle in data[COLUMN_NOTES]:
-            note = self.db.get_note_from_handle(note_handle)
-            if int(note.get_type()) == NoteType.TODO:
-                todo += 1
-        return todo
+        return value
 
     def column_parents(self, data):
-        handle = data[0]
-        cached, value = self.get_cached_value(handle, "PARENTS")
-        if not cached:
-            value = self._get_parents_data(data)
-            self.set_cached_value(handle, "PARENTS", value)
-        return str(value)
+        return str(self._get_summary(data)["parents"])
 
     def sort_parents(self, data):
-        handle = data[0]
-        cached, value = self.get_cached_value(handle, "SORT_PARENTS")
-        if not cached:
-            value = self._get_parents_data(data)
-            self.set_cached_value(handle, "SORT_PARENTS", value)
-        return "%06d" % value
+        return "%06d" % self._get_summary(data)["parents"]
 
     def column_marriages(self, data):
-        handle = data[0]
-        cached, value = self.get_cached_value(handle, "MARRIAGES")
-        if not cached:
-            value = self._get_marriages_data(data)
-            self.set_cached_value(handle, "MARRIAGES", value)
-        return str(value)
+        return str(self._get_summary(data)["marriages"])
 
     def sort_marriages(self, data):
-        handle = data[0]
-        cached, value = self.get_cached_value(handle, "SORT_MARRIAGES")
-        if not cached:
-            value = self._get_marriages_data(data)
-            self.set_cached_value(handle, "SORT_MARRIAGES", value)
-        return "%06d" % value
+        return "%06d" % self._get_summary(data)["marriages"]
 
     def column_children(self, data):
-        handle = data[0]
-        cached, value = self.get_cached_value(handle, "CHILDREN")
-        if not cached:
-            value = self._get_children_data(data)
-            self.set_cached_value(handle, "CHILDREN", value)
-        return str(value)
+        return str(self._get_summary(data)["children"])
 
     def sort_children(self, data):
-        handle = data[0]
-        cached, value = self.get_cached_value(handle, "SORT_CHILDREN")
-        if not cached:
-            value = self._get_children_data(data)
-            self.set_cached_value(handle, "SORT_CHILDREN", value)
-        return "%06d" % value
+        return "%06d" % self._get_summary(data)["children"]
 
     def column_todo(self, data):
-        handle = data[0]
-        cached, value = self.get_cached_value(handle, "TODO")
-        if not cached:
-            value = self._get_todo_data(data)
-            self.set_cached_value(handle, "TODO", value)
-        return str(value)
+        return str(self._get_summary(data)["todo"])
 
     def sort_todo(self, data):
-        handle = data[0]
-        cached, value = self.get_cached_value(handle, "SORT_TODO")
-        if not cached:
-            value = self._get_todo_data(data)
-            self.set_cached_value(handle, "SORT_TODO", value)
-        return "%06d" % value
+        return "%06d" % self._get_summary(data)["todo"]
+
+    def summary_sort(self, col):
+        """
+        Return (field, func) if the sort value of the model column col is
+        computed from the person summary alone, or None.  field is the
+        summary field that orders the values, and func returns the sort value
+        from a summary.
+        """
+        return {
+            3: (
+                "birth_sortval",
+                lambda summary: self._sort_vital_date(summary, "birth"),
+            ),
+            5: (
+                "death_sortval",
+                lambda summary: self._sort_vital_date(summary, "death"),
+            ),
+            8: ("parents", lambda summary: "%06d" % summary["parents"]),
+            9: ("marriages", lambda summary: "%06d" % summary["marriages"]),
+            10: ("children", lambda summary: "%06d" % summary["children"]),
+            11: ("todo", lambda summary: "%06d" % summary["todo"]),
+        }.get(col)
 
     def get_tag_name(self, tag_handle):
         """
@@ -613,6 +455,24 @@ class PersonListModel(PeopleBaseModel, FlatBaseModel):
         PeopleBaseModel.destroy(self)
         FlatBaseModel.destroy(self)
 
+    def sort_keys(self):
+        """
+        Return the (sort_key, handle) list of all people.
+
+        When sorting on a column kept in the person summaries, the keys are
+        made from one query over the summaries, in the order of the column.
+        """
+        summary_sort = self.summary_sort(self.sort_model_col)
+        if summary_sort is None:
+            return FlatBaseModel.sort_keys(self)
+        field, func = summary_sort
+        srt_keys = [
+            (glocale.sort_key(func(summary)), handle)
+            for handle, summary in self.db.iter_person_summaries(order_by=field)
+        ]
+        srt_keys.sort()
+        return srt_keys
+
 
 class PersonTreeModel(PeopleBaseModel, TreeBaseModel):
     """
@@ -35,10 +35,12 @@ import logging
 #
 # ------------------------------------------------------------------------
 from gramps.gen.db.dbconst import (
+    ARRAYSIZE,
     DBLOGNAME,
     DBBACKEND,
     KEY_TO_NAME_MAP,
     KEY_TO_CLASS_MAP,
+    CLASS_TO_KEY_MAP,
     TXNADD,
     TXNUPD,
     TXNDEL,
@@ -54,7 +56,11 @@ from gramps.gen.db.dbconst import (
     REPOSITORY_KEY,
     REFERENCE_KEY,
 )
+from gramps.gen.config import config
+from gramps.gen.db.closure import compute_closure
 from gramps.gen.db.generic import DbGeneric
+from gramps.gen.db.projection import get_projection_fields, project_object
+from gramps.gen.db.summary import PERSON_SUMMARY_FIELDS, person_summary
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.lib import (
     Tag,
@@ -69,20 +75,48 @@ from gramps.gen.lib import (
     Note,
 )
 from gramps.gen.lib.genderstats import GenderStats
+from gramps.gen.errors import HandleError
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 LOG = logging.getLogger(".dbapi")
 _LOG = logging.getLogger(DBLOGNAME)
 
+# Number of objects written, or handles looked up, by one statement
+COMMIT_CHUNK = 500
+
+# Largest count of paths stored in the closure table, that of an SQL INTEGER.
+# The counts double at each generation of a collapsed pedigree.
+MAX_PATHS = 2**63 - 1
+
 
 class DBAPI(DbGeneric):
     """
     Database backends class for DB-API 2.0 databases
     """
 
+    def __init__(self, directory=None):
+        # People whose summary must be brought up to date, and the events,
+        # families and notes whose people must be, at the next commit
+        self._summary_people = set()
+        self._summary_refs = set()
+        # Whether the closure table is kept, and the people and families
+        # whose links to parents must be brought up to date at the next commit
+        self._use_closure = False
+        self._closure_people = set()
+        self._closure_families = set()
+        super().__init__(directory)
+
     def _initialize(self, directory, username, password):
         raise NotImplementedError
 
+    def load(self, directory, *args, **kwargs):
+        """
+        Open the database, then create or drop the closure table as set by
+        the "database.closure-table" preference.
+        """
+        super().load(directory, *args, **kwargs)
+        self._load_closure_table()
+
     def _schema_exists(self):
         """
         Check to see if the schema exists.
@@ -207,6 +241,8 @@ class DBAPI(DbGeneric):
         )
 
         self._create_secondary_columns()
+        self._create_person_summary_table()
+        self._create_surname_table()
 
         ## Indices:
         self.dbapi.execute("CREATE INDEX person_gramps_id " "ON person(gramps_id)")
@@ -232,7 +268,8 @@ class DBAPI(DbGeneric):
         )
         self.dbapi.execute("CREATE INDEX note_gramps_id " "ON note(gramps_id)")
         self.dbapi.execute(
-            "CREATE INDEX reference_obj_handle " "ON reference(obj_handle)"
+            "CREATE UNIQUE INDEX reference_obj_ref "
+            "ON reference(obj_handle, ref_handle)"
         )
 
         self.dbapi.commit()
@@ -256,6 +293,8 @@ class DBAPI(DbGeneric):
         """
         if self.transaction == None:
             _LOG.debug("    DBAPI %s transaction commit", hex(id(self)))
+            self._update_person_summaries()
+            self._update_closure_table()
             self.dbapi.commit()
 
     def _txn_abort(self):
@@ -264,6 +303,10 @@ class DBAPI(DbGeneric):
         Executes a db ROLLBACK;
         """
         if self.transaction == None:
+            self._summary_people.clear()
+            self._summary_refs.clear()
+            self._closure_people.clear()
+            self._closure_families.clear()
             self.dbapi.rollback()
 
     def _collation(self, locale):
@@ -306,7 +349,11 @@ class DBAPI(DbGeneric):
         )
 
         action = {TXNADD: "-add", TXNUPD: "-update", TXNDEL: "-delete", None: "-delete"}
+        self._update_person_summaries()
+        self._update_closure_table()
         self.dbapi.commit()
+        # Count the change before the listeners look at the data
+        self.has_changed += 1  # Also gives commits since startup
         if not txn.batch:
             # Now, emit signals:
             # do deletes and adds first
@@ -331,12 +378,15 @@ class DBAPI(DbGeneric):
         self.undodb.commit(txn, msg)
         self._after_commit(txn)
         txn.clear()
-        self.has_changed += 1  # Also gives commits since startup
 
     def transaction_abort(self, txn):
         """
         Executed after a batch operation abort.
         """
+        self._summary_people.clear()
+        self._summary_refs.clear()
+        self._closure_people.clear()
+        self._closure_families.clear()
         self.dbapi.rollback()
         self.transaction = None
         txn.clear()
@@ -383,26 +433,30 @@ class DBAPI(DbGeneric):
             )
         self._txn_commit()
 
+    def _get_name_group_map(self):
+        """
+        Return a dictionary mapping the surnames that have a default grouping
+        to that grouping.
+        """
+        self.dbapi.execute("SELECT name, grouping FROM name_group")
+        # not None test below fixes db corrupted by 11011
+        return {
+            name: grouping
+            for (name, grouping) in self.dbapi.fetchall()
+            if grouping is not None
+        }
+
     def get_name_group_keys(self):
         """
         Return the defined names that have been assigned to a default grouping.
         """
-        self.dbapi.execute("SELECT name, grouping FROM name_group " "ORDER BY name")
-        rows = self.dbapi.fetchall()
-        # not None test below fixes db corrupted by 11011 for export
-        return [row[0] for row in rows if row[1] is not None]
+        return sorted(self.name_group)
 
     def get_name_group_mapping(self, key):
         """
         Return the default grouping name for a surname.
         """
-        self.dbapi.execute("SELECT grouping FROM name_group WHERE name = ?", [key])
-        row = self.dbapi.fetchone()
-        if row and row[0] is not None:
-            # not None test fixes db corrupted by 11011
-            return row[0]
-        else:
-            return key
+        return self.name_group.get(key, key)
 
     def get_person_handles(self, sort_handles=False, locale=glocale):
         """
@@ -614,9 +668,7 @@ class DBAPI(DbGeneric):
         """
         Return if a key exists in the name_group table.
         """
-        self.dbapi.execute("SELECT grouping FROM name_group WHERE name = ?", [key])
-        row = self.dbapi.fetchone()
-        return row and row[0] is not None
+        return key in self.name_group
 
     def set_name_group_mapping(self, name, grouping):
         """
@@ -638,7 +690,10 @@ class DBAPI(DbGeneric):
             )
         self._txn_commit()
         if grouping is None:
+            self.name_group.pop(name, None)
             grouping = ""
+        else:
+            self.name_group[name] = grouping
         self.emit("person-groupname-rebuild", (name, grouping))
 
     def _commit_base(self, obj, obj_key, trans, change_time):
@@ -646,28 +701,92 @@ class DBAPI(DbGeneric):
         Commit the specified object to the database, storing the changes as
         part of the transaction.
         """
-        old_data = None
-        obj.change = int(change_time or time.time())
+        return self._commit_base_many([obj], obj_key, trans, change_time)[0]
+
+    def _commit_base_many(self, objs, obj_key, trans, change_time):
+        """
+        Commit a list of objects of the same class to the database, storing
+        the changes as part of the transaction.  Return the list of their
+        old serialized data, None for new objects.
+
+        Each object is serialized once.  The objects are written in chunks,
+        with one statement for the blobs and secondary columns and one for
+        the references of a whole chunk.
+        """
+        change = int(change_time or time.time())
+        old_list = []
+        chunk = []
+        handles = set()
+        for obj in objs:
+            # A chunk holds each handle once, so that an object committed
+            # twice sees the first commit as its old data.
+            if len(chunk) == COMMIT_CHUNK or obj.handle in handles:
+                old_list.extend(self._commit_chunk(chunk, obj_key, trans))
+                chunk = []
+                handles.clear()
+            obj.change = change
+            chunk.append(obj)
+            handles.add(obj.handle)
+        if chunk:
+            old_list.extend(self._commit_chunk(chunk, obj_key, trans))
+        return old_list
+
+    def _commit_chunk(self, objs, obj_key, trans):
+        """
+        Write a list of objects with distinct handles.  Return the list of
+        their old serialized data.
+        """
         table = KEY_TO_NAME_MAP[obj_key]
+        old_data = self._get_raw_data_many(obj_key, [obj.handle for obj in objs])
+        new_data = [obj.serialize() for obj in objs]
+
+        if obj_key == PERSON_KEY:
+            old_surnames = self._get_surnames([obj.handle for obj in objs])
+            new_surnames = {}
+
+        columns = None
+        rows = []
+        for obj, data in zip(objs, new_data):
+            values = self._get_secondary_values(obj)
+            if obj_key == PERSON_KEY:
+                new_surnames[obj.handle] = values["surname"]
+            if columns is None:
+                columns = list(values)
+            rows.append(
+                [obj.handle, pickle.dumps(data)]
+                + self._sql_cast_list([values[column] for column in columns])
+            )
+        columns = ["blob_data"] + columns
+        self.dbapi.executemany(
+            "INSERT INTO %s (handle, %s) VALUES (?, %s) "
+            "ON CONFLICT (handle) DO UPDATE SET %s"
+            % (
+                table,
+                ", ".join(columns),
+                ", ".join(["?"] * len(columns)),
+                ", ".join("%s = excluded.%s" % (col, col) for col in columns),
+            ),
+            rows,
+        )
+        if obj_key == PERSON_KEY:
+            self._update_surname_counts(old_surnames, new_surnames)
+        if obj_key == EVENT_KEY:
+            for event in objs:
+                self._update_event_sortval(
+                    event.handle, event.get_date_object().get_sort_value()
+                )
+        self._update_backlinks_many(objs, trans)
+        self._mark_person_summaries(obj_key, [obj.handle for obj in objs])
+        self._mark_closure(obj_key, [obj.handle for obj in objs])
 
-        if self._has_handle(obj_key, obj.handle):
-            old_data = self._get_raw_data(obj_key, obj.handle)
-            # update the object:
-            sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
-            self.dbapi.execute(sql, [pickle.dumps(obj.serialize()), obj.handle])
-        else:
-            # Insert the object:
-            sql = ("INSERT INTO %s (handle, blob_data) VALUES (?, ?)") % table
-            self.dbapi.execute(sql, [obj.handle, pickle.dumps(obj.serialize())])
-        self._update_secondary_values(obj)
-        self._update_backlinks(obj, trans)
+        old_list = [old_data.get(obj.handle) for obj in objs]
         if not trans.batch:
-            if old_data:
-                trans.add(obj_key, TXNUPD, obj.handle, old_data, obj.serialize())
-            else:
-                trans.add(obj_key, TXNADD, obj.handle, None, obj.serialize())
-
-        return old_data
+            for obj, old, new in zip(objs, old_list, new_data):
+                if old:
+                    trans.add(obj_key, TXNUPD, obj.handle, old, new)
+                else:
+                    trans.add(obj_key, TXNADD, obj.handle, None, new)
+        return old_list
 
     def _commit_raw(self, data, obj_key):
         """
@@ -689,13 +808,31 @@ class DBAPI(DbGeneric):
         return
 
     def _update_backlinks(self, obj, transaction):
-        if not transaction.batch:
-            # Find existing references
-            sql = (
-                "SELECT ref_class, ref_handle " + "FROM reference WHERE obj_handle = ?"
+        self._update_backlinks_many([obj], transaction)
+
+    def _update_backlinks_many(self, objs, transaction):
+        """
+        Bring the references of a list of objects with distinct handles up
+        to date.
+        """
+        # Find existing references
+        existing = {obj.handle: set() for obj in objs}
+        handles = list(existing)
+        for index in range(0, len(handles), COMMIT_CHUNK):
+            part = handles[index : index + COMMIT_CHUNK]
+            self.dbapi.execute(
+                "SELECT obj_handle, ref_class, ref_handle FROM reference "
+                "WHERE obj_handle IN (%s)" % ", ".join(["?"] * len(part)),
+                part,
             )
-            self.dbapi.execute(sql, [obj.handle])
-            existing_references = set(self.dbapi.fetchall())
+            for obj_handle, ref_class, ref_handle in self.dbapi.fetchall():
+                existing[obj_handle].add((ref_class, ref_handle))
+
+        deleted = []
+        inserted = []
+        for obj in objs:
+            obj_class = obj.__class__.__name__
+            existing_references = existing[obj.handle]
 
             # Once we have the list of rows that already have a reference
             # we need to compare it with the list of objects that are
@@ -706,58 +843,60 @@ class DBAPI(DbGeneric):
             )
             new_references = current_references.difference(existing_references)
 
-            # Delete the existing references
-            self.dbapi.execute(
-                "DELETE FROM reference WHERE obj_handle = ?", [obj.handle]
+            deleted.extend(
+                (obj.handle, obj_class, ref_handle, ref_class_name)
+                for ref_class_name, ref_handle in no_longer_required_references
+            )
+            inserted.extend(
+                (obj.handle, obj_class, ref_handle, ref_class_name)
+                for ref_class_name, ref_handle in new_references
             )
 
-            # Now, add the current ones
-            for ref_class_name, ref_handle in current_references:
-                sql = (
-                    "INSERT INTO reference "
-                    + "(obj_handle, obj_class, ref_handle, ref_class)"
-                    + "VALUES(?, ?, ?, ?)"
-                )
-                self.dbapi.execute(
-                    sql,
-                    [obj.handle, obj.__class__.__name__, ref_handle, ref_class_name],
-                )
+        # Apply only the difference to the reference table
+        self._delete_references([(row[0], row[2]) for row in deleted])
+        self._insert_references(inserted)
 
+        if not transaction.batch:
             # Add new references to the transaction
-            for ref_class_name, ref_handle in new_references:
-                key = (obj.handle, ref_handle)
-                data = (obj.handle, obj.__class__.__name__, ref_handle, ref_class_name)
+            for data in inserted:
+                key = (data[0], data[2])
                 transaction.add(REFERENCE_KEY, TXNADD, key, None, data)
 
             # Add old references to the transaction
-            for ref_class_name, ref_handle in no_longer_required_references:
-                key = (obj.handle, ref_handle)
-                old_data = (
-                    obj.handle,
-                    obj.__class__.__name__,
-                    ref_handle,
-                    ref_class_name,
-                )
+            for old_data in deleted:
+                key = (old_data[0], old_data[2])
                 transaction.add(REFERENCE_KEY, TXNDEL, key, old_data, None)
-        else:  # batch mode
-            current_references = set(obj.get_referenced_handles_recursively())
 
-            # Delete the existing references
-            self.dbapi.execute(
-                "DELETE FROM reference WHERE obj_handle = ?", [obj.handle]
+    def _insert_references(self, rows):
+        """
+        Insert rows into the reference table using a single prepared
+        statement.  Rows that already exist are left unchanged.
+
+        :param rows: list of (obj_handle, obj_class, ref_handle, ref_class)
+        :type rows: list
+        """
+        if rows:
+            self.dbapi.executemany(
+                "INSERT INTO reference "
+                "(obj_handle, obj_class, ref_handle, ref_class) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (obj_handle, ref_handle) DO NOTHING",
+                rows,
             )
 
-            # Now, add the current ones
-            for ref_class_name, ref_handle in current_references:
-                sql = (
-                    "INSERT INTO reference "
-                    + "(obj_handle, obj_class, ref_handle, ref_class)"
-                    + "VALUES(?, ?, ?, ?)"
-                )
-                self.dbapi.execute(
-                    sql,
-                    [obj.handle, obj.__class__.__name__, ref_handle, ref_class_name],
-                )
+    def _delete_references(self, keys):
+        """
+        Delete rows from the reference table using a single prepared
+        statement.
+
+        :param keys: list of (obj_handle, ref_handle)
+        :type keys: list
+        """
+        if keys:
+            self.dbapi.executemany(
+                "DELETE FROM reference WHERE obj_handle = ? AND ref_handle = ?",
+                keys,
+            )
 
     def _do_remove(self, handle, transaction, obj_key):
         if self.readonly or not handle:
@@ -766,9 +905,15 @@ class DBAPI(DbGeneric):
             data = self._get_raw_data(obj_key, handle)
             obj_class = KEY_TO_CLASS_MAP[obj_key]
             self._remove_backlinks(obj_class, handle, transaction)
+            if obj_key == PERSON_KEY:
+                self._update_surname_counts(self._get_surnames([handle]), {})
             table = KEY_TO_NAME_MAP[obj_key]
             sql = "DELETE FROM %s WHERE handle = ?" % table
             self.dbapi.execute(sql, [handle])
+            if obj_key == EVENT_KEY:
+                self._update_event_sortval(handle, 0)
+            self._mark_person_summaries(obj_key, [handle])
+            self._mark_closure(obj_key, [handle])
             if not transaction.batch:
                 transaction.add(obj_key, TXNDEL, handle, data, None)
 
@@ -808,14 +953,58 @@ class DBAPI(DbGeneric):
 
             result_list = list(find_backlink_handles(handle))
         """
+        sql = "SELECT obj_class, obj_handle FROM reference WHERE ref_handle = ?"
+        args = [handle]
+        if include_classes is not None:
+            include_classes = list(include_classes)
+            sql += " AND obj_class IN (%s)" % ", ".join("?" * len(include_classes))
+            args += include_classes
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(sql, args)
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    yield (row[0], row[1])
+                rows = cursor.fetchmany()
+
+    def _cursor_order(self):
+        """
+        Return the ORDER BY clause which reads the rows of a table in the
+        order of its cursor, or None if the backend cannot tell it.
+        """
+        return None
+
+    def get_cursor_handles(self, class_name):
+        """
+        Return the handles of the primary objects of a class, in the order
+        of the cursor of the class, without reading their data if possible.
+        """
+        order = self._cursor_order()
+        if order is None:
+            return super().get_cursor_handles(class_name)
+        self.dbapi.execute("SELECT handle FROM %s %s" % (class_name.lower(), order))
+        return [row[0] for row in self.dbapi.fetchall()]
+
+    def select_handles(self, class_name, where, args):
+        """
+        Return the handles of the primary objects of a class whose table row
+        satisfies an SQL condition, in the order of the cursor of the class.
+        """
+        order = self._cursor_order()
         self.dbapi.execute(
-            "SELECT obj_class, obj_handle " "FROM reference " "WHERE ref_handle = ?",
-            [handle],
+            "SELECT handle FROM %s WHERE %s %s"
+            % (class_name.lower(), where, order or ""),
+            args,
         )
-        rows = self.dbapi.fetchall()
-        for row in rows:
-            if (include_classes is None) or (row[0] in include_classes):
-                yield (row[0], row[1])
+        handles = [row[0] for row in self.dbapi.fetchall()]
+        if order is None:
+            selected = set(handles)
+            handles = [
+                handle
+                for handle in self.get_cursor_handles(class_name)
+                if handle in selected
+            ]
+        return handles
 
     def find_initial_person(self):
         """
@@ -838,10 +1027,13 @@ class DBAPI(DbGeneric):
         """
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT handle FROM %s" % table
-        self.dbapi.execute(sql)
-        rows = self.dbapi.fetchall()
-        for row in rows:
-            yield row[0]
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(sql)
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    yield row[0]
+                rows = cursor.fetchmany()
 
     def _iter_raw_data(self, obj_key):
         """
@@ -857,19 +1049,42 @@ class DBAPI(DbGeneric):
                     yield (row[0], pickle.loads(row[1]))
                 rows = cursor.fetchmany()
 
+    def _iter_sorted_raw_data(self, obj_key):
+        """
+        Return an iterator over raw data in the order of the handles, read
+        along the index of the primary key.
+        """
+        table = KEY_TO_NAME_MAP[obj_key]
+        sql = "SELECT handle, blob_data FROM %s ORDER BY handle" % table
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(sql)
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    yield (row[0], pickle.loads(row[1]))
+                rows = cursor.fetchmany()
+
     def _iter_raw_place_tree_data(self):
         """
         Return an iterator over raw data in the place hierarchy.
         """
-        to_do = [""]
-        sql = "SELECT handle, blob_data FROM place WHERE enclosed_by = ?"
-        while to_do:
-            handle = to_do.pop()
-            self.dbapi.execute(sql, [handle])
-            rows = self.dbapi.fetchall()
-            for row in rows:
-                to_do.append(row[0])
-                yield (row[0], pickle.loads(row[1]))
+        # Places are returned level by level, so a place always follows
+        # the place that encloses it.
+        sql = (
+            "WITH RECURSIVE tree(handle, blob_data) AS ("
+            "SELECT handle, blob_data FROM place WHERE enclosed_by = '' "
+            "UNION ALL "
+            "SELECT place.handle, place.blob_data FROM place "
+            "JOIN tree ON place.enclosed_by = tree.handle) "
+            "SELECT handle, blob_data FROM tree"
+        )
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(sql)
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    yield (row[0], pickle.loads(row[1]))
+                rows = cursor.fetchmany()
 
     def reindex_reference_map(self, callback):
         """
@@ -909,24 +1124,20 @@ class DBAPI(DbGeneric):
         # to loop through each of the primary object tables.
         for cursor_func, class_func in primary_table:
             logging.info("Rebuilding %s reference map", class_func.__name__)
+            obj_class = class_func.__name__
+            rows = []
             with cursor_func() as cursor:
                 for found_handle, val in cursor:
                     obj = class_func.create(val)
                     references = set(obj.get_referenced_handles_recursively())
                     # handle addition of new references
                     for ref_class_name, ref_handle in references:
-                        self.dbapi.execute(
-                            "INSERT INTO reference "
-                            "(obj_handle, obj_class, ref_handle, ref_class) "
-                            "VALUES (?, ?, ?, ?)",
-                            [
-                                obj.handle,
-                                obj.__class__.__name__,
-                                ref_handle,
-                                ref_class_name,
-                            ],
-                        )
+                        rows.append((obj.handle, obj_class, ref_handle, ref_class_name))
+                    if len(rows) >= ARRAYSIZE:
+                        self._insert_references(rows)
+                        rows = []
                     self.update()
+            self._insert_references(rows)
         self._txn_commit()
 
     def rebuild_secondary(self, callback=None):
@@ -971,6 +1182,18 @@ class DBAPI(DbGeneric):
                 obj = self.method("get_%s_from_handle", obj_type)(handle)
                 self._update_secondary_values(obj)
                 self.update()
+        self._fill_surname_table()
+        self._txn_commit()
+        self.surname_list = self.get_surname_list()
+
+        # Then the summaries and the ancestors of the people:
+        self._txn_begin()
+        self.dbapi.execute("DELETE FROM person_summary")
+        self._summary_people.update(self.get_person_handles())
+        if self._use_closure:
+            self.dbapi.execute("DELETE FROM person_link")
+            self.dbapi.execute("DELETE FROM person_closure")
+            self._closure_people.update(self.get_person_handles())
         self._txn_commit()
 
         # Next, rebuild stats:
@@ -992,9 +1215,14 @@ class DBAPI(DbGeneric):
     def _get_gramps_ids(self, obj_key):
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT gramps_id FROM %s" % table
-        self.dbapi.execute(sql)
-        rows = self.dbapi.fetchall()
-        return [row[0] for row in rows]
+        gramps_ids = []
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(sql)
+            rows = cursor.fetchmany()
+            while rows:
+                gramps_ids.extend(row[0] for row in rows)
+                rows = cursor.fetchmany()
+        return gramps_ids
 
     def _get_raw_data(self, obj_key, handle):
         table = KEY_TO_NAME_MAP[obj_key]
@@ -1004,6 +1232,24 @@ class DBAPI(DbGeneric):
         if row:
             return pickle.loads(row[0])
 
+    def _get_raw_data_many(self, obj_key, handles):
+        """
+        Return a dictionary of the serialized data of the objects with the
+        given handles that exist.
+        """
+        table = KEY_TO_NAME_MAP[obj_key]
+        result = {}
+        for index in range(0, len(handles), COMMIT_CHUNK):
+            part = handles[index : index + COMMIT_CHUNK]
+            self.dbapi.execute(
+                "SELECT handle, blob_data FROM %s WHERE handle IN (%s)"
+                % (table, ", ".join(["?"] * len(part))),
+                part,
+            )
+            for handle, blob_data in self.dbapi.fetchall():
+                result[handle] = pickle.loads(blob_data)
+        return result
+
     def _get_raw_from_id_data(self, obj_key, gramps_id):
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT blob_data FROM %s WHERE gramps_id = ?" % table
@@ -1026,32 +1272,41 @@ class DBAPI(DbGeneric):
         return gstats
 
     def save_gender_stats(self, gstats):
+        """
+        Save the statistics of the names counted since the last save, or all
+        of them if they were cleared.
+        """
+        cleared, changes = gstats.get_changes()
+        if cleared:
+            changes = gstats.stats
+        elif not changes:
+            return
         self._txn_begin()
-        self.dbapi.execute("DELETE FROM gender_stats")
-        for key in gstats.stats:
-            female, male, unknown = gstats.stats[key]
-            self.dbapi.execute(
-                "INSERT INTO gender_stats "
-                "(given_name, female, male, unknown) "
-                "VALUES (?, ?, ?, ?)",
-                [key, female, male, unknown],
-            )
+        if cleared:
+            self.dbapi.execute("DELETE FROM gender_stats")
+        self.dbapi.executemany(
+            "INSERT INTO gender_stats "
+            "(given_name, female, male, unknown) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (given_name) DO UPDATE SET "
+            "female = excluded.female, male = excluded.male, "
+            "unknown = excluded.unknown",
+            [
+                [key, female, male, unknown]
+                for key, (female, male, unknown) in changes.items()
+            ],
+        )
         self._txn_commit()
+        gstats.mark_saved()
 
     def undo_reference(self, data, handle):
         """
         Helper method to undo a reference map entry
         """
         if data is None:
-            sql = "DELETE FROM reference " + "WHERE obj_handle = ? AND ref_handle = ?"
-            self.dbapi.execute(sql, [handle[0], handle[1]])
+            self._delete_references([handle])
         else:
-            sql = (
-                "INSERT INTO reference "
-                + "(obj_handle, obj_class, ref_handle, ref_class) "
-                + "VALUES(?, ?, ?, ?)"
-            )
-            self.dbapi.execute(sql, data)
+            self._insert_references([data])
 
     def undo_data(self, data, handle, obj_key):
         """
@@ -1059,9 +1314,13 @@ class DBAPI(DbGeneric):
         """
         cls = KEY_TO_CLASS_MAP[obj_key]
         table = cls.lower()
+        if obj_key == PERSON_KEY:
+            old_surnames = self._get_surnames([handle])
         if data is None:
             sql = "DELETE FROM %s WHERE handle = ?" % table
             self.dbapi.execute(sql, [handle])
+            if obj_key == EVENT_KEY:
+                self._update_event_sortval(handle, 0)
         else:
             if self._has_handle(obj_key, handle):
                 sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
@@ -1071,12 +1330,16 @@ class DBAPI(DbGeneric):
                 self.dbapi.execute(sql, [handle, pickle.dumps(data)])
             obj = self._get_table_func(cls)["class_func"].create(data)
             self._update_secondary_values(obj)
+        if obj_key == PERSON_KEY:
+            self._update_surname_counts(old_surnames, self._get_surnames([handle]))
+        self._mark_person_summaries(obj_key, [handle])
+        self._mark_closure(obj_key, [handle])
 
     def get_surname_list(self):
         """
         Return the list of locale-sorted surnames contained in the database.
         """
-        self.dbapi.execute("SELECT DISTINCT surname " "FROM person " "ORDER BY surname")
+        self.dbapi.execute("SELECT surname FROM surname ORDER BY surname")
         surname_list = []
         for row in self.dbapi.fetchall():
             surname_list.append(row[0])
@@ -1096,6 +1359,8 @@ class DBAPI(DbGeneric):
             return "INTEGER"
         elif schema_type == "number":
             return "REAL"
+        elif schema_type == "array":
+            return "TEXT"
         else:
             return "BLOB"
 
@@ -1124,39 +1389,628 @@ class DBAPI(DbGeneric):
                         "ALTER TABLE %s ADD COLUMN %s %s"
                         % (table_name, field, sql_type)
                     )
+        self._create_projection_columns()
 
-    def _update_secondary_values(self, obj):
+    def _create_projection_columns(self):
         """
-        Given a primary object update its secondary field values
-        in the database.
-        Does not commit.
+        Create the columns holding projected fields, and their indices.
+
+        Columns that already exist are left unchanged.
+        """
+        LOG.info("Creating projection columns...")
+        for class_name in CLASS_TO_KEY_MAP:
+            table_name = class_name.lower()
+            for field, schema_type in get_projection_fields(class_name):
+                if not self.dbapi.column_exists(table_name, field):
+                    sql_type = self._sql_type(schema_type, None)
+                    self.dbapi.execute(
+                        "ALTER TABLE %s ADD COLUMN %s %s"
+                        % (table_name, field, sql_type)
+                    )
+        for table_name, field in (
+            ("person", "birth_ref_handle"),
+            ("person", "death_ref_handle"),
+            ("person", "birth_sortval"),
+            ("person", "death_sortval"),
+            ("event", "date_sortval"),
+        ):
+            self.dbapi.execute(
+                "CREATE INDEX IF NOT EXISTS %s_%s ON %s(%s)"
+                % (table_name, field, table_name, field)
+            )
+
+    def _get_secondary_values(self, obj):
+        """
+        Given a primary object return a dictionary of its secondary field
+        values, including the derived and projected fields.
         """
         table = obj.__class__.__name__
-        fields = [field[0] for field in obj.get_secondary_fields()]
-        sets = []
-        values = []
-        for field in fields:
-            sets.append("%s = ?" % field)
-            values.append(getattr(obj, field))
+        values = {}
+        for field in obj.get_secondary_fields():
+            values[field[0]] = getattr(obj, field[0])
 
         # Derived fields
         if table == "Person":
-            given_name, surname = self._get_person_data(obj)
-            sets.append("given_name = ?")
-            values.append(given_name)
-            sets.append("surname = ?")
-            values.append(surname)
+            values["given_name"], values["surname"] = self._get_person_data(obj)
         if table == "Place":
-            handle = self._get_place_data(obj)
-            sets.append("enclosed_by = ?")
-            values.append(handle)
+            values["enclosed_by"] = self._get_place_data(obj)
+
+        # Projected fields
+        for field, value in project_object(self, obj).items():
+            if isinstance(value, list):
+                value = " ".join(value)
+            values[field] = value
+        return values
+
+    def _update_secondary_values(self, obj):
+        """
+        Given a primary object update its secondary field values
+        in the database.
+        Does not commit.
+        """
+        table = obj.__class__.__name__
+        values = self._get_secondary_values(obj)
 
         if len(values) > 0:
             table_name = table.lower()
             self.dbapi.execute(
-                "UPDATE %s SET %s where handle = ?" % (table_name, ", ".join(sets)),
-                self._sql_cast_list(values) + [obj.handle],
+                "UPDATE %s SET %s where handle = ?"
+                % (table_name, ", ".join("%s = ?" % field for field in values)),
+                self._sql_cast_list(list(values.values())) + [obj.handle],
+            )
+
+        if table == "Event":
+            self._update_event_sortval(
+                obj.handle, obj.get_date_object().get_sort_value()
+            )
+
+    def _update_event_sortval(self, handle, sortval):
+        """
+        Copy the sort value of an event into the birth and death sort
+        values of the people that use it as their birth or death event.
+        """
+        self.dbapi.execute(
+            "UPDATE person SET birth_sortval = ? WHERE birth_ref_handle = ?",
+            [sortval, handle],
+        )
+        self.dbapi.execute(
+            "UPDATE person SET death_sortval = ? WHERE death_ref_handle = ?",
+            [sortval, handle],
+        )
+
+    def get_projected_values(self, class_name, handle):
+        """
+        Return a dictionary of the projected field values of a primary object,
+        read from the projection columns.
+        """
+        fields = get_projection_fields(class_name)
+        if not fields:
+            return {}
+        self.dbapi.execute(
+            "SELECT %s FROM %s WHERE handle = ?"
+            % (", ".join(field for field, schema_type in fields), class_name.lower()),
+            [handle],
+        )
+        row = self.dbapi.fetchone()
+        if row is None:
+            raise HandleError("Handle %s not found" % handle)
+        values = {}
+        for (field, schema_type), value in zip(fields, row):
+            if schema_type == "array":
+                value = value.split() if value else []
+            values[field] = value
+        return values
+
+    def _create_surname_table(self):
+        """
+        Create the table counting the people with each surname, and the
+        unique index that lets gender statistics be saved by name.
+        """
+        self.dbapi.execute(
+            "CREATE TABLE IF NOT EXISTS surname "
+            "("
+            "surname TEXT PRIMARY KEY NOT NULL, "
+            "count INTEGER"
+            ")"
+        )
+        self.dbapi.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS gender_stats_given_name "
+            "ON gender_stats(given_name)"
+        )
+
+    def _fill_surname_table(self):
+        """
+        Count the surnames of the people again.  Does not commit.
+        """
+        self.dbapi.execute("DELETE FROM surname")
+        self.dbapi.execute(
+            "INSERT INTO surname (surname, count) "
+            "SELECT surname, count(1) FROM person "
+            "WHERE surname IS NOT NULL GROUP BY surname"
+        )
+
+    def _get_surnames(self, handles):
+        """
+        Return a dictionary of the surname column of the people with the
+        given handles that exist.
+        """
+        result = {}
+        for index in range(0, len(handles), COMMIT_CHUNK):
+            part = handles[index : index + COMMIT_CHUNK]
+            self.dbapi.execute(
+                "SELECT handle, surname FROM person WHERE handle IN (%s)"
+                % ", ".join(["?"] * len(part)),
+                part,
+            )
+            result.update(self.dbapi.fetchall())
+        return result
+
+    def _update_surname_counts(self, old, new):
+        """
+        Update the surname counts, given dictionaries of the surnames of
+        people before and after a change.  Does not commit.
+        """
+        deltas = {}
+        for surname in old.values():
+            deltas[surname] = deltas.get(surname, 0) - 1
+        for surname in new.values():
+            deltas[surname] = deltas.get(surname, 0) + 1
+        rows = [
+            [surname, delta]
+            for surname, delta in deltas.items()
+            if delta and surname is not None
+        ]
+        if not rows:
+            return
+        self.dbapi.executemany(
+            "INSERT INTO surname (surname, count) VALUES (?, ?) "
+            "ON CONFLICT (surname) DO UPDATE SET count = count + excluded.count",
+            rows,
+        )
+        if any(delta < 0 for surname, delta in rows):
+            self.dbapi.execute("DELETE FROM surname WHERE count <= 0")
+
+    def _create_person_summary_table(self):
+        """
+        Create the table holding the summaries of the people, and the
+        indices of its sort columns.
+        """
+        self.dbapi.execute(
+            "CREATE TABLE IF NOT EXISTS person_summary "
+            "("
+            "handle VARCHAR(50) PRIMARY KEY NOT NULL, "
+            + ", ".join(
+                "%s %s" % (field, self._sql_type(schema_type, None))
+                for field, schema_type in PERSON_SUMMARY_FIELDS
+            )
+            + ")"
+        )
+        for field in (
+            "birth_sortval",
+            "death_sortval",
+            "parents",
+            "marriages",
+            "children",
+            "todo",
+        ):
+            self.dbapi.execute(
+                "CREATE INDEX IF NOT EXISTS person_summary_%s "
+                "ON person_summary(%s)" % (field, field)
+            )
+
+    def _mark_person_summaries(self, obj_key, handles):
+        """
+        Note that the summaries depending on the objects with the handles
+        must be updated at the next commit.
+        """
+        if obj_key == PERSON_KEY:
+            self._summary_people.update(handles)
+        elif obj_key in (EVENT_KEY, FAMILY_KEY, NOTE_KEY):
+            self._summary_refs.update(handles)
+
+    def _update_person_summaries(self):
+        """
+        Bring the summaries of the people marked by _mark_person_summaries
+        up to date.  Does not commit.
+        """
+        people = self._summary_people
+        refs = list(self._summary_refs)
+        for index in range(0, len(refs), COMMIT_CHUNK):
+            part = refs[index : index + COMMIT_CHUNK]
+            self.dbapi.execute(
+                "SELECT obj_handle FROM reference "
+                "WHERE obj_class = 'Person' AND ref_handle IN (%s)"
+                % ", ".join(["?"] * len(part)),
+                part,
+            )
+            people.update(row[0] for row in self.dbapi.fetchall())
+        self._summary_refs.clear()
+        if not people:
+            return
+
+        fields = [field for field, schema_type in PERSON_SUMMARY_FIELDS]
+        sql = (
+            "INSERT INTO person_summary (handle, %s) VALUES (?, %s) "
+            "ON CONFLICT (handle) DO UPDATE SET %s"
+            % (
+                ", ".join(fields),
+                ", ".join(["?"] * len(fields)),
+                ", ".join("%s = excluded.%s" % (field, field) for field in fields),
+            )
+        )
+        handles = list(people)
+        people.clear()
+        for index in range(0, len(handles), COMMIT_CHUNK):
+            part = handles[index : index + COMMIT_CHUNK]
+            data = self._get_raw_data_many(PERSON_KEY, part)
+            rows = []
+            for handle, person_data in data.items():
+                summary = person_summary(self, Person.create(person_data))
+                rows.append(
+                    [handle] + self._sql_cast_list([summary[key] for key in fields])
+                )
+            if rows:
+                self.dbapi.executemany(sql, rows)
+            removed = [[handle] for handle in part if handle not in data]
+            if removed:
+                self.dbapi.executemany(
+                    "DELETE FROM person_summary WHERE handle = ?", removed
+                )
+
+    def _make_person_summary(self, row):
+        """
+        Return a summary dictionary from a row of the person_summary table,
+        without the handle.
+        """
+        summary = {}
+        for (field, schema_type), value in zip(PERSON_SUMMARY_FIELDS, row):
+            if schema_type == "boolean":
+                value = bool(value)
+            summary[field] = value
+        return summary
+
+    def get_person_summary(self, handle):
+        """
+        Return a dictionary of the vital summary of a person, read from the
+        person_summary table.
+        """
+        self.dbapi.execute(
+            "SELECT %s FROM person_summary WHERE handle = ?"
+            % ", ".join(field for field, schema_type in PERSON_SUMMARY_FIELDS),
+            [handle],
+        )
+        row = self.dbapi.fetchone()
+        if row is None:
+            # Not written yet, during a transaction
+            return super().get_person_summary(handle)
+        return self._make_person_summary(row)
+
+    def iter_person_summaries(self, order_by=None):
+        """
+        Return an iterator over (handle, summary) tuples of all the people,
+        sorted by the summary field order_by, if given.
+        """
+        fields = [field for field, schema_type in PERSON_SUMMARY_FIELDS]
+        sql = "SELECT handle, %s FROM person_summary" % ", ".join(fields)
+        if order_by is not None:
+            if order_by not in fields:
+                raise ValueError("Unknown summary field: %s" % order_by)
+            sql += " ORDER BY %s" % order_by
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(sql)
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    yield (row[0], self._make_person_summary(row[1:]))
+                rows = cursor.fetchmany()
+
+    def _load_closure_table(self):
+        """
+        Create and fill the closure table if it is wanted and missing, or
+        drop it if it is no longer wanted, so that it is never out of date.
+        """
+        exists = self.dbapi.table_exists("person_closure")
+        if self.readonly:
+            self._use_closure = exists
+            return
+        self._use_closure = config.get("database.closure-table")
+        if self._use_closure and not exists:
+            self._txn_begin()
+            self._create_closure_table()
+            self._closure_people.update(self.get_person_handles())
+            self._txn_commit()
+        elif exists and not self._use_closure:
+            self._txn_begin()
+            self.dbapi.execute("DROP TABLE person_link")
+            self.dbapi.execute("DROP TABLE person_closure")
+            self._txn_commit()
+
+    def _create_closure_table(self):
+        """
+        Create the table of the links from people to their parents, and the
+        closure table holding the ancestors of each person.
+        """
+        self.dbapi.execute(
+            "CREATE TABLE IF NOT EXISTS person_link "
+            "("
+            "child VARCHAR(50) NOT NULL, "
+            "parent VARCHAR(50) NOT NULL, "
+            "family VARCHAR(50) NOT NULL, "
+            "main INTEGER"
+            ")"
+        )
+        for column in ("child", "parent", "family"):
+            self.dbapi.execute(
+                "CREATE INDEX IF NOT EXISTS person_link_%s "
+                "ON person_link(%s)" % (column, column)
+            )
+        self.dbapi.execute(
+            "CREATE TABLE IF NOT EXISTS person_closure "
+            "("
+            "descendant VARCHAR(50) NOT NULL, "
+            "ancestor VARCHAR(50) NOT NULL, "
+            "generation INTEGER NOT NULL, "
+            "paths INTEGER, "
+            "main_paths INTEGER, "
+            "PRIMARY KEY (descendant, ancestor, generation)"
+            ")"
+        )
+        self.dbapi.execute(
+            "CREATE INDEX IF NOT EXISTS person_closure_ancestor "
+            "ON person_closure(ancestor, generation)"
+        )
+
+    def _fetch_in(self, sql, handles):
+        """
+        Return the rows selected by a statement with an IN (%s) condition
+        on a list of handles.
+        """
+        rows = []
+        for index in range(0, len(handles), COMMIT_CHUNK):
+            part = handles[index : index + COMMIT_CHUNK]
+            self.dbapi.execute(sql % ", ".join(["?"] * len(part)), part)
+            rows.extend(self.dbapi.fetchall())
+        return rows
+
+    def _mark_closure(self, obj_key, handles):
+        """
+        Note that the links to the parents of the people, or of the children
+        of the families, with the handles must be updated at the next commit.
+        """
+        if not self._use_closure:
+            return
+        if obj_key == PERSON_KEY:
+            self._closure_people.update(handles)
+        elif obj_key == FAMILY_KEY:
+            self._closure_families.update(handles)
+
+    def _update_closure_table(self):
+        """
+        Bring the links of the people marked by _mark_closure, and the
+        ancestors of these people and of their descendants, up to date.
+        Does not commit.
+        """
+        people = self._closure_people
+        families = self._closure_families
+        if not people and not families:
+            return
+        self._closure_people = set()
+        self._closure_families = set()
+
+        # A person added or removed may be the parent of linked children
+        for data in self._get_raw_data_many(PERSON_KEY, list(people)).values():
+            families.update(Person.create(data).get_family_handle_list())
+        people.update(
+            row[0]
+            for row in self._fetch_in(
+                "SELECT child FROM person_link WHERE parent IN (%s)", list(people)
+            )
+        )
+        # The children of the families, before and after the change
+        families = list(families)
+        people.update(
+            row[0]
+            for row in self._fetch_in(
+                "SELECT child FROM person_link WHERE family IN (%s)", families
             )
+        )
+        for data in self._get_raw_data_many(FAMILY_KEY, families).values():
+            people.update(
+                child_ref.ref for child_ref in Family.create(data).get_child_ref_list()
+            )
+
+        self._update_person_links(list(people))
+
+        # The ancestors of the descendants change with those of the people
+        changed = set(people)
+        changed.update(
+            row[0]
+            for row in self._fetch_in(
+                "SELECT DISTINCT descendant FROM person_closure "
+                "WHERE ancestor IN (%s)",
+                list(people),
+            )
+        )
+        changed = list(changed)
+        self.dbapi.executemany(
+            "DELETE FROM person_closure WHERE descendant = ?",
+            [[handle] for handle in changed],
+        )
+        links = {}
+        for child, parent, main in self._fetch_in(
+            "SELECT child, parent, main FROM person_link WHERE child IN (%s)", changed
+        ):
+            links.setdefault(child, []).append((parent, bool(main)))
+        changed = set(changed)
+        outside = list(
+            {
+                parent
+                for parent_links in links.values()
+                for parent, main in parent_links
+                if parent not in changed
+            }
+        )
+        known = {}
+        for descendant, ancestor, generation, paths, main_paths in self._fetch_in(
+            "SELECT descendant, ancestor, generation, paths, main_paths "
+            "FROM person_closure WHERE descendant IN (%s)",
+            outside,
+        ):
+            known.setdefault(descendant, {})[(ancestor, generation)] = [
+                paths,
+                main_paths,
+            ]
+
+        rows = [
+            [
+                handle,
+                ancestor,
+                generation,
+                min(paths, MAX_PATHS),
+                min(main_paths, MAX_PATHS),
+            ]
+            for handle, ancestors in compute_closure(changed, links, known).items()
+            for (ancestor, generation), (paths, main_paths) in ancestors.items()
+        ]
+        for index in range(0, len(rows), COMMIT_CHUNK):
+            self.dbapi.executemany(
+                "INSERT INTO person_closure "
+                "(descendant, ancestor, generation, paths, main_paths) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows[index : index + COMMIT_CHUNK],
+            )
+
+    def _update_person_links(self, handles):
+        """
+        Write the links of the people with the handles to their parents.
+        """
+        self.dbapi.executemany(
+            "DELETE FROM person_link WHERE child = ?", [[handle] for handle in handles]
+        )
+        people = {
+            handle: Person.create(data)
+            for handle, data in self._get_raw_data_many(PERSON_KEY, handles).items()
+        }
+        family_handles = list(
+            {
+                family_handle
+                for person in people.values()
+                for family_handle in person.get_parent_family_handle_list()
+            }
+        )
+        parents = {}
+        for handle, data in self._get_raw_data_many(FAMILY_KEY, family_handles).items():
+            family = Family.create(data)
+            parents[handle] = [
+                parent
+                for parent in (family.get_father_handle(), family.get_mother_handle())
+                if parent
+            ]
+        existing = {
+            row[0]
+            for row in self._fetch_in(
+                "SELECT handle FROM person WHERE handle IN (%s)",
+                list({parent for pair in parents.values() for parent in pair}),
+            )
+        }
+        rows = []
+        for handle, person in people.items():
+            for index, family_handle in enumerate(
+                person.get_parent_family_handle_list()
+            ):
+                for parent in parents.get(family_handle, []):
+                    if parent in existing:
+                        rows.append([handle, parent, family_handle, index == 0])
+        if rows:
+            self.dbapi.executemany(
+                "INSERT INTO person_link (child, parent, family, main) "
+                "VALUES (?, ?, ?, ?)",
+                [self._sql_cast_list(row) for row in rows],
+            )
+
+    def _closure_is_current(self):
+        """
+        Return True if the closure table is kept and holds no pending
+        changes.
+        """
+        return (
+            self._use_closure
+            and not self._closure_people
+            and not self._closure_families
+        )
+
+    def _iter_closure(self, column, key, handle, main_only, max_generations):
+        """
+        Return an iterator over the rows of the closure table for one
+        person.
+        """
+        sql = "SELECT %s, generation, %s FROM person_closure WHERE %s = ?" % (
+            column,
+            "main_paths" if main_only else "paths",
+            key,
+        )
+        args = [handle]
+        if main_only:
+            sql += " AND main_paths > 0"
+        if max_generations is not None:
+            sql += " AND generation <= ?"
+            args.append(max_generations)
+        sql += " ORDER BY generation"
+        self.dbapi.execute(sql, args)
+        return iter(self.dbapi.fetchall())
+
+    def iter_ancestors(self, handle, main_only=False, max_generations=None):
+        """
+        Return an iterator over (handle, generation, paths) tuples of the
+        ancestors of a person, read from the closure table if it is kept.
+        """
+        if not self._closure_is_current():
+            return super().iter_ancestors(handle, main_only, max_generations)
+        return self._iter_closure(
+            "ancestor", "descendant", handle, main_only, max_generations
+        )
+
+    def iter_descendants(self, handle, main_only=False, max_generations=None):
+        """
+        Return an iterator over (handle, generation, paths) tuples of the
+        descendants of a person, read from the closure table if it is kept.
+        """
+        if not self._closure_is_current():
+            return super().iter_descendants(handle, main_only, max_generations)
+        return self._iter_closure(
+            "descendant", "ancestor", handle, main_only, max_generations
+        )
+
+    def _reach_links(self, handles, column, key):
+        """
+        Return the set of the people reached by following the links of the
+        person_link table from some people, one generation at a time.
+        """
+        sql = "SELECT DISTINCT %s FROM person_link WHERE %s IN (%%s)" % (column, key)
+        found = set()
+        todo = list(handles)
+        while todo:
+            todo = [row[0] for row in self._fetch_in(sql, todo) if row[0] not in found]
+            found.update(todo)
+        return found
+
+    def get_ancestor_handles(self, handles):
+        """
+        Return the set of the handles of the ancestors of some people, read
+        from the table of the links to the parents if it is kept.
+        """
+        if not self._closure_is_current():
+            return super().get_ancestor_handles(handles)
+        return self._reach_links(handles, "parent", "child")
+
+    def get_descendant_handles(self, handles):
+        """
+        Return the set of the handles of the descendants of some people,
+        read from the table of the links to the parents if it is kept.
+        """
+        if not self._closure_is_current():
+            return super().get_descendant_handles(handles)
+        return self._reach_links(handles, "child", "parent")
 
     def _sql_cast_list(self, values):
         """
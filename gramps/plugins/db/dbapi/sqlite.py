@@ -40,12 +40,47 @@ import logging
 # -------------------------------------------------------------------------
 from gramps.plugins.db.dbapi.dbapi import DBAPI
 from gramps.gen.db.dbconst import ARRAYSIZE
+from gramps.gen.db.utils import get_profile_from_path
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
+LOG = logging.getLogger(".sqlite")
 
 sqlite3.paramstyle = "qmark"
 
+# -------------------------------------------------------------------------
+#
+# Tuning profiles
+#
+# -------------------------------------------------------------------------
+# Pragmas set when a tree is opened.  "default" restores the SQLite defaults,
+# which matters for the journal mode as it is stored in the database file.
+PROFILES = {
+    "default": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,  # KiB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+    # WAL with synchronous NORMAL cannot corrupt the database; a power loss
+    # may only lose the last transactions.
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,  # KiB
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+}
+
+# Pragmas changed for the duration of a batch transaction, on top of the
+# profile of the tree.  They do not touch durability.
+BULK_PROFILE = {
+    "cache_size": -262144,  # KiB
+    "temp_store": "MEMORY",
+}
+
 
 # -------------------------------------------------------------------------
 #
@@ -63,6 +98,7 @@ class SQLite(DBAPI):
                 _("Database version"): sqlite3.sqlite_version,
                 _("Database module version"): sqlite3.version,
                 _("Database module location"): sqlite3.__file__,
+                _("Tuning profile"): self.profile,
             }
         )
         return summary
@@ -73,6 +109,78 @@ class SQLite(DBAPI):
         else:
             path_to_db = os.path.join(directory, "sqlite.db")
         self.dbapi = Connection(path_to_db)
+        self.profile = None
+        self.__bulk_restore = None
+        self.set_profile(get_profile_from_path(directory))
+
+    def get_profiles(self):
+        """
+        Return the names of the tuning profiles.
+        """
+        return list(PROFILES)
+
+    def set_profile(self, profile):
+        """
+        Apply a tuning profile to the open database.
+
+        An unknown profile is replaced by "default".  This does not change
+        the profile stored for the tree; see
+        :func:`~gramps.gen.db.utils.set_profile_for_path`.
+        """
+        if profile not in PROFILES:
+            LOG.warning("Unknown tuning profile '%s', using 'default'", profile)
+            profile = "default"
+        self.dbapi.set_pragmas(PROFILES[profile])
+        self.profile = profile
+
+    def transaction_begin(self, transaction):
+        """
+        Use the bulk pragmas for a batch transaction.
+        """
+        if transaction.batch:
+            # Pragmas must be set outside of a transaction
+            self.__bulk_restore = self.dbapi.set_pragmas(BULK_PROFILE)
+        return super().transaction_begin(transaction)
+
+    def transaction_commit(self, txn):
+        """
+        Restore the pragmas of the profile after a batch transaction.
+        """
+        try:
+            super().transaction_commit(txn)
+        finally:
+            self.__restore_pragmas()
+
+    def transaction_abort(self, txn):
+        """
+        Restore the pragmas of the profile after a batch transaction.
+        """
+        try:
+            super().transaction_abort(txn)
+        finally:
+            self.__restore_pragmas()
+
+    def __restore_pragmas(self):
+        if self.__bulk_restore:
+            self.dbapi.set_pragmas(self.__bulk_restore)
+            self.__bulk_restore = None
+
+    def _cursor_order(self):
+        # The cursors scan the tables, in the order of their rowid
+        return "ORDER BY rowid"
+
+    def get_reader_source(self):
+        """
+        Return the backend id and directory of the database, if it is stored
+        on disk and has no uncommitted changes.
+        """
+        if (
+            self._directory
+            and self._directory != ":memory:"
+            and self.transaction is None
+        ):
+            return ("sqlite", self._directory)
+        return None
 
 
 # -------------------------------------------------------------------------
@@ -135,6 +243,41 @@ class Connection:
         self.log.debug(args)
         self.__cursor.execute(*args, **kwargs)
 
+    def executemany(self, sql, seq_of_params):
+        """
+        Executes an SQL statement once for each set of parameters.
+
+        :param sql: the SQL statement to be executed
+        :type sql: str
+        :param seq_of_params: sequence or iterator of parameter lists
+        :type seq_of_params: iterable
+        """
+        self.log.debug(sql)
+        self.__cursor.executemany(sql, seq_of_params)
+
+    def set_pragmas(self, pragmas):
+        """
+        Set pragmas of the connection.  A pragma that cannot be set is logged
+        and skipped.
+
+        :param pragmas: pragma names and values
+        :type pragmas: dict
+        :returns: the previous values of the pragmas that were set
+        :rtype: dict
+        """
+        previous = {}
+        for name, value in pragmas.items():
+            try:
+                self.__cursor.execute("PRAGMA %s;" % name)
+                row = self.__cursor.fetchone()
+                self.__cursor.execute("PRAGMA %s = %s;" % (name, value))
+            except sqlite3.Error as err:
+                self.log.warning("Cannot set pragma %s to %s: %s", name, value, err)
+                continue
+            if row is not None:
+                previous[name] = row[0]
+        return previous
+
     def fetchone(self):
         """
         Fetches the next row of a query result set, returning a single sequence,
@@ -187,6 +330,20 @@ class Connection:
         )
         return self.fetchone()[0] != 0
 
+    def column_exists(self, table, column):
+        """
+        Test whether the specified SQL database table column exists.
+
+        :param table: table name to check.
+        :type table: str
+        :param column: column name to check.
+        :type column: str
+        :returns: True if the column exists, false otherwise.
+        :rtype: bool
+        """
+        self.execute("PRAGMA table_info(%s);" % table)
+        return column in [row[1] for row in self.fetchall()]
+
     def close(self):
         """
         Close the current database.
@@ -0,0 +1,269 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Tests of the closure table of ancestors.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import tempfile
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.config import config
+from gramps.gen.db import DbTxn
+from gramps.gen.db import closure
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import ChildRef, Family, Person
+from gramps.plugins.db.dbapi.dbapi import MAX_PATHS
+
+
+# -------------------------------------------------------------------------
+#
+# ClosureTest class
+#
+# -------------------------------------------------------------------------
+class ClosureTest(unittest.TestCase):
+    """
+    Tests of the closure table kept by the DBAPI backend.
+    """
+
+    def setUp(self):
+        self.addCleanup(
+            config.set, "database.closure-table", config.get("database.closure-table")
+        )
+        config.set("database.closure-table", True)
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.addCleanup(self.db.close)
+
+    def add_family(self, father, mother, children, trans):
+        family = Family()
+        family.set_father_handle(father.handle if father else None)
+        family.set_mother_handle(mother.handle if mother else None)
+        for child in children:
+            ref = ChildRef()
+            ref.ref = child.handle
+            family.add_child_ref(ref)
+        self.db.add_family(family, trans)
+        for parent in (father, mother):
+            if parent:
+                parent.add_family_handle(family.handle)
+                self.db.commit_person(parent, trans)
+        for child in children:
+            child.add_parent_family_handle(family.handle)
+            self.db.commit_person(child, trans)
+        return family
+
+    def make_tree(self):
+        """
+        Two cousins who married: their child has its great-grandparents
+        twice.  The child also has a second, adoptive, family.
+        """
+        people = {}
+        with DbTxn("Add", self.db) as trans:
+            for name in (
+                "grandfather",
+                "grandmother",
+                "father",
+                "aunt",
+                "uncle",
+                "mother",
+                "child",
+                "adopter",
+            ):
+                people[name] = Person()
+                self.db.add_person(people[name], trans)
+            self.add_family(
+                people["grandfather"],
+                people["grandmother"],
+                [people["father"], people["aunt"]],
+                trans,
+            )
+            self.add_family(people["uncle"], people["aunt"], [people["mother"]], trans)
+            self.add_family(
+                people["father"], people["mother"], [people["child"]], trans
+            )
+            self.add_family(people["adopter"], None, [people["child"]], trans)
+        return people
+
+    def ancestors(self, handle, main_only=False, max_generations=None):
+        return sorted(self.db.iter_ancestors(handle, main_only, max_generations))
+
+    def walked(self, handle, main_only=False, max_generations=None):
+        return sorted(
+            closure.iter_ancestors(self.db, handle, main_only, max_generations)
+        )
+
+    def check_all(self):
+        for handle in self.db.get_person_handles():
+            for main_only in (False, True):
+                self.assertEqual(
+                    self.ancestors(handle, main_only),
+                    self.walked(handle, main_only),
+                )
+                self.assertEqual(
+                    sorted(self.db.iter_descendants(handle, main_only)),
+                    sorted(closure.iter_descendants(self.db, handle, main_only)),
+                )
+        handles = self.db.get_person_handles()[::3]
+        self.assertEqual(
+            self.db.get_ancestor_handles(handles),
+            closure.find_ancestors(self.db, handles),
+        )
+        self.assertEqual(
+            self.db.get_descendant_handles(handles),
+            closure.find_descendants(self.db, handles),
+        )
+        for handle in handles:
+            self.assertEqual(
+                self.db.get_ancestor_handles([handle]),
+                {row[0] for row in self.walked(handle)},
+            )
+            self.assertEqual(
+                self.db.get_descendant_handles([handle]),
+                {row[0] for row in closure.iter_descendants(self.db, handle)},
+            )
+
+    def test_ancestors(self):
+        people = self.make_tree()
+        child = people["child"].handle
+        self.assertEqual(
+            self.ancestors(child, max_generations=1),
+            sorted(
+                [
+                    (people["father"].handle, 1, 1),
+                    (people["mother"].handle, 1, 1),
+                    (people["adopter"].handle, 1, 1),
+                ]
+            ),
+        )
+        self.assertNotIn(
+            people["adopter"].handle,
+            [row[0] for row in self.ancestors(child, main_only=True)],
+        )
+        # The grandparents are reached through the father and the mother
+        self.assertIn((people["grandfather"].handle, 2, 1), self.ancestors(child))
+        self.assertIn((people["grandfather"].handle, 3, 1), self.ancestors(child))
+        self.assertIn(
+            (child, 3, 1), list(self.db.iter_descendants(people["grandmother"].handle))
+        )
+        self.check_all()
+
+    def test_changes(self):
+        people = self.make_tree()
+        child = people["child"].handle
+        family = self.db.get_family_from_handle(
+            people["child"].get_main_parents_family_handle()
+        )
+        father = people["father"]
+        with DbTxn("Remove father", self.db) as trans:
+            family.set_father_handle(None)
+            self.db.commit_family(family, trans)
+            father.remove_family_handle(family.handle)
+            self.db.commit_person(father, trans)
+        self.assertNotIn((people["grandfather"].handle, 2, 1), self.ancestors(child))
+        self.check_all()
+
+        with DbTxn("Remove aunt", self.db) as trans:
+            self.db.remove_person(people["aunt"].handle, trans)
+        self.assertEqual(
+            self.ancestors(child, main_only=True),
+            sorted([(people["mother"].handle, 1, 1), (people["uncle"].handle, 2, 1)]),
+        )
+        self.check_all()
+
+        self.db.undo()
+        self.db.undo()
+        self.assertIn((people["grandfather"].handle, 2, 1), self.ancestors(child))
+        self.check_all()
+
+    def test_batch(self):
+        with DbTxn("Add", self.db, batch=True) as trans:
+            people = [Person() for dummy in range(50)]
+            for person in people:
+                self.db.add_person(person, trans)
+            for index in range(1, len(people)):
+                self.add_family(people[index - 1], None, [people[index]], trans)
+        self.assertEqual(
+            self.ancestors(people[-1].handle, max_generations=3),
+            sorted((people[-1 - gen].handle, gen, 1) for gen in range(1, 4)),
+        )
+        self.assertEqual(len(self.ancestors(people[-1].handle)), 49)
+        self.check_all()
+
+    def test_collapse(self):
+        """
+        The counts of paths saturate in a pedigree which collapses at each
+        generation.
+        """
+        with DbTxn("Add", self.db, batch=True) as trans:
+            couple = [Person(), Person()]
+            for person in couple:
+                self.db.add_person(person, trans)
+            first = couple[0].handle
+            for dummy in range(70):
+                children = [Person(), Person()]
+                for person in children:
+                    self.db.add_person(person, trans)
+                self.add_family(couple[0], couple[1], children, trans)
+                couple = children
+        handle = couple[0].handle
+        for ancestor, generation, paths in self.walked(handle):
+            self.assertIn(
+                (ancestor, generation, min(paths, MAX_PATHS)),
+                self.ancestors(handle, max_generations=generation),
+            )
+        self.assertIn((first, 70, MAX_PATHS), self.ancestors(handle))
+
+    def test_disabled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.db = make_database("sqlite")
+            self.db.load(directory)
+            people = self.make_tree()
+            child = people["child"].handle
+            self.db.close()
+
+            config.set("database.closure-table", False)
+            self.db = make_database("sqlite")
+            self.db.load(directory)
+            self.assertFalse(self.db.dbapi.table_exists("person_closure"))
+            self.assertEqual(self.ancestors(child), self.walked(child))
+            self.db.close()
+
+            config.set("database.closure-table", True)
+            self.db = make_database("sqlite")
+            self.db.load(directory)
+            self.assertTrue(self.db.dbapi.table_exists("person_closure"))
+            self.assertEqual(len({row[0] for row in self.ancestors(child)}), 7)
+            self.check_all()
+            self.db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Tests of the bulk commit API.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Event, EventRef, Note, Person, Surname
+from gramps.gen.utils.id import create_id
+
+
+# -------------------------------------------------------------------------
+#
+# CommitManyTest class
+#
+# -------------------------------------------------------------------------
+class CommitManyTest(unittest.TestCase):
+    """
+    Tests of commit_many.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.signals = []
+        for signal in ("person-add", "person-update", "note-add"):
+            self.db.connect(
+                signal, lambda handles, signal=signal: self.signals.append(signal)
+            )
+
+    def tearDown(self):
+        self.db.close()
+
+    def make_person(self, surname):
+        person = Person()
+        name = Surname()
+        name.set_surname(surname)
+        person.primary_name.add_surname(name)
+        return person
+
+    def test_add_and_update(self):
+        note = Note("text")
+        people = [self.make_person("Smith") for dummy in range(3)]
+        with DbTxn("Add", self.db) as trans:
+            self.db.add_note(note, trans)
+            for person in people:
+                person.set_handle(create_id())
+                person.set_gramps_id(self.db.find_next_person_gramps_id())
+                person.set_note_list([note.handle])
+            self.db.commit_many(people, trans)
+        self.assertEqual(self.db.get_number_of_people(), 3)
+        self.assertEqual(
+            self.db.get_person_from_gramps_id("I0001").handle, people[1].handle
+        )
+        self.assertEqual(len(list(self.db.find_backlink_handles(note.handle))), 3)
+        self.assertIn("Smith", self.db.get_surname_list())
+        self.assertIn("person-add", self.signals)
+
+        for person in people:
+            person.set_note_list([])
+        people[0].primary_name.get_surname_list()[0].set_surname("Jones")
+        with DbTxn("Update", self.db) as trans:
+            self.db.commit_many(people, trans)
+        self.assertEqual(list(self.db.find_backlink_handles(note.handle)), [])
+        self.assertIn("person-update", self.signals)
+        self.assertEqual(
+            self.db.get_person_from_handle(people[0].handle)
+            .get_primary_name()
+            .get_surname(),
+            "Jones",
+        )
+
+        self.db.undo()
+        self.assertEqual(len(list(self.db.find_backlink_handles(note.handle))), 3)
+        self.db.undo()
+        self.assertEqual(self.db.get_number_of_people(), 0)
+
+    def test_mixed_and_repeated(self):
+        event = Event()
+        event.set_handle(create_id())
+        person = self.make_person("Brown")
+        person.set_handle(create_id())
+        ref = EventRef()
+        ref.ref = event.handle
+        person.add_event_ref(ref)
+        person.set_birth_ref(ref)
+        with DbTxn("Mixed", self.db) as trans:
+            # The same person twice: the second commit is an update
+            self.db.commit_many([event, person, person], trans)
+        self.assertEqual(self.db.get_number_of_events(), 1)
+        self.assertEqual(self.db.get_number_of_people(), 1)
+        self.assertEqual(
+            sorted(self.db.find_backlink_handles(event.handle)),
+            [("Person", person.handle)],
+        )
+
+    def test_batch(self):
+        people = [self.make_person("Green") for dummy in range(1200)]
+        for person in people:
+            person.set_handle(create_id())
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            self.db.commit_many(people, trans)
+        self.assertEqual(self.db.get_number_of_people(), 1200)
+        self.assertEqual(self.signals, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
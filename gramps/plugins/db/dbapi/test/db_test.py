@@ -24,6 +24,7 @@
 #
 # -------------------------------------------------------------------------
 import unittest
+from unittest.mock import patch
 
 # -------------------------------------------------------------------------
 #
@@ -45,6 +46,9 @@ from gramps.gen.lib import (
     Tag,
     Researcher,
     Surname,
+    Date,
+    EventRef,
+    EventType,
 )
 
 
@@ -296,6 +300,35 @@ class DbRandomTest(unittest.TestCase):
             sort_handles=True,
         )
 
+    ################################################################
+    #
+    # Test get_cursor_handles and select_handles methods
+    #
+    ################################################################
+
+    def test_get_cursor_handles(self):
+        # handles which sort in the reverse order of the rows
+        with DbTxn("Add reversed people", self.db) as trans:
+            for i in range(5):
+                person = Person()
+                person.set_handle("z%d" % (9 - i))
+                person.set_gender(i % 2)
+                self.handles["Person"].append(self.db.add_person(person, trans))
+        for obj_type in self.handles:
+            with self.db.method("get_%s_cursor", obj_type)() as cursor:
+                in_cursor = [handle for handle, dummy in cursor]
+            with patch.object(self.db, "_iter_raw_data", side_effect=AssertionError):
+                handles = self.db.get_cursor_handles(obj_type)
+            self.assertEqual(handles, in_cursor)
+        males = [
+            handle
+            for handle in self.db.get_cursor_handles("Person")
+            if self.db.get_person_from_handle(handle).gender == Person.MALE
+        ]
+        self.assertEqual(
+            self.db.select_handles("Person", "gender = ?", [Person.MALE]), males
+        )
+
     ################################################################
     #
     # Test get_*_gramps_ids methods
@@ -614,6 +647,14 @@ class DbRandomTest(unittest.TestCase):
     def test_get_tag_cursor(self):
         self.__get_cursor_test(self.db.get_tag_cursor, self.db.get_raw_tag_data)
 
+    def test_iter_sorted_raw_data(self):
+        for class_name, handles in self.handles.items():
+            pairs = list(self.db.iter_sorted_raw_data(class_name))
+            self.assertEqual([handle for handle, data in pairs], sorted(handles))
+            raw_func = self.db.method("get_raw_%s_data", class_name)
+            for handle, data in pairs:
+                self.assertEqual(data, raw_func(handle))
+
     ################################################################
     #
     # Test iter_*_handles methods
@@ -817,6 +858,95 @@ class DbEmptyTest(unittest.TestCase):
 
         mapping = self.db.get_name_group_mapping("Clark")
         self.assertEqual(mapping, "Clarke")
+        self.assertEqual(self.db.get_name_group_mapping("Baker"), "Baker")
+
+        # the names in memory match the table
+        self.assertEqual(self.db.name_group, self.db._get_name_group_map())
+
+        self.db.set_name_group_mapping("Clark", None)
+        self.assertFalse(self.db.has_name_group_key("Clark"))
+        self.assertEqual(self.db.get_name_group_mapping("Clark"), "Clark")
+        self.assertEqual(self.db.name_group, self.db._get_name_group_map())
+
+    ################################################################
+    #
+    # Test reference map maintenance
+    #
+    ################################################################
+
+    def test_reference_delta(self):
+        note1 = Note()
+        note2 = Note()
+        person = Person()
+        with DbTxn("Add objects", self.db) as trans:
+            self.db.add_note(note1, trans)
+            self.db.add_note(note2, trans)
+            person.add_note(note1.handle)
+            self.db.add_person(person, trans)
+
+        with DbTxn("Edit person", self.db) as trans:
+            person.set_note_list([note2.handle])
+            self.db.commit_person(person, trans)
+        self.assertEqual(list(self.db.find_backlink_handles(note1.handle)), [])
+        self.assertEqual(
+            list(self.db.find_backlink_handles(note2.handle)),
+            [("Person", person.handle)],
+        )
+
+        self.db.undo()
+        self.assertEqual(
+            list(self.db.find_backlink_handles(note1.handle)),
+            [("Person", person.handle)],
+        )
+        self.assertEqual(list(self.db.find_backlink_handles(note2.handle)), [])
+
+        self.db.redo()
+        self.assertEqual(list(self.db.find_backlink_handles(note1.handle)), [])
+        self.assertEqual(
+            list(self.db.find_backlink_handles(note2.handle)),
+            [("Person", person.handle)],
+        )
+
+        with DbTxn("Remove objects", self.db) as trans:
+            self.db.remove_person(person.handle, trans)
+            self.db.remove_note(note1.handle, trans)
+            self.db.remove_note(note2.handle, trans)
+
+    ################################################################
+    #
+    # Test projected values
+    #
+    ################################################################
+
+    def test_projected_values(self):
+        event = Event()
+        event.set_type(EventType.BIRTH)
+        event.set_date_object(Date(1900, 1, 1))
+        person = Person()
+        with DbTxn("Add objects", self.db) as trans:
+            self.db.add_event(event, trans)
+            event_ref = EventRef()
+            event_ref.ref = event.handle
+            person.add_event_ref(event_ref)
+            person.set_birth_ref(event_ref)
+            self.db.add_person(person, trans)
+
+        values = self.db.get_projected_values("Person", person.handle)
+        self.assertEqual(values["birth_ref_handle"], event.handle)
+        self.assertEqual(values["death_ref_handle"], "")
+        self.assertEqual(values["birth_sortval"], Date(1900, 1, 1).get_sort_value())
+        self.assertEqual(values["family_list"], [])
+
+        # Changing the event updates the people that refer to it
+        with DbTxn("Edit event", self.db) as trans:
+            event.set_date_object(Date(1901, 2, 3))
+            self.db.commit_event(event, trans)
+        values = self.db.get_projected_values("Person", person.handle)
+        self.assertEqual(values["birth_sortval"], Date(1901, 2, 3).get_sort_value())
+
+        with DbTxn("Remove objects", self.db) as trans:
+            self.db.remove_person(person.handle, trans)
+            self.db.remove_event(event.handle, trans)
 
     ################################################################
     #
@@ -883,6 +1013,22 @@ class DbPersonTest(unittest.TestCase):
         for surname in surname_list:
             self.assertIn(surname, self.all_surnames)
 
+    def test_surname_counts(self):
+        allen = [
+            handle
+            for handle in self.db.get_person_handles()
+            if self.db.get_person_from_handle(handle).get_primary_name().get_surname()
+            == "Allen"
+        ]
+        with DbTxn("Remove Allen", self.db) as trans:
+            self.db.remove_person(allen[0], trans)
+        self.assertIn("Allen", self.db.get_surname_list())
+        with DbTxn("Remove Allen", self.db) as trans:
+            self.db.remove_person(allen[1], trans)
+        self.assertNotIn("Allen", self.db.get_surname_list())
+        self.db.undo()
+        self.assertIn("Allen", self.db.get_surname_list())
+
     ################################################################
     #
     # Test gender stats
@@ -897,6 +1043,19 @@ class DbPersonTest(unittest.TestCase):
         saved = self.db.get_gender_stats()
         self.assertEqual(saved["John"], (3, 1, 1))
         self.assertEqual(saved["Mary"], (1, 3, 1))
+        self.assertEqual(stats.get_changes(), (False, {}))
+
+        # Only the changed names are saved
+        stats.count_name("Anne", Person.FEMALE)
+        self.assertEqual(stats.get_changes(), (False, {"Anne": (0, 1, 0)}))
+        self.db.save_gender_stats(stats)
+        saved = self.db.get_gender_stats()
+        self.assertEqual(saved["Anne"], (0, 1, 0))
+        self.assertEqual(saved["John"], (3, 1, 1))
+
+        stats.clear_stats()
+        self.db.save_gender_stats(stats)
+        self.assertEqual(self.db.get_gender_stats(), {})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Tests of the tuning profiles of the SQLite backend.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import tempfile
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database, set_profile_for_path
+from gramps.gen.lib import Person
+from gramps.plugins.db.dbapi.sqlite import BULK_PROFILE, PROFILES
+
+
+# -------------------------------------------------------------------------
+#
+# ProfileTest class
+#
+# -------------------------------------------------------------------------
+class ProfileTest(unittest.TestCase):
+    """
+    Tests of the tuning profiles.
+    """
+
+    def setUp(self):
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.directory = tempdir.name
+
+    def open(self, profile=None):
+        if profile is not None:
+            set_profile_for_path(self.directory, profile)
+        db = make_database("sqlite")
+        db.load(self.directory)
+        self.addCleanup(db.close)
+        return db
+
+    def pragma(self, db, name):
+        db.dbapi.execute("PRAGMA %s;" % name)
+        return db.dbapi.fetchone()[0]
+
+    def test_performance(self):
+        db = self.open("performance")
+        self.assertEqual(db.profile, "performance")
+        self.assertEqual(self.pragma(db, "journal_mode"), "wal")
+        self.assertEqual(
+            self.pragma(db, "cache_size"), PROFILES["performance"]["cache_size"]
+        )
+
+    def test_unknown(self):
+        db = self.open("no such profile")
+        self.assertEqual(db.profile, "default")
+        self.assertEqual(self.pragma(db, "journal_mode"), "delete")
+
+    def test_set_profile(self):
+        db = self.open()
+        db.set_profile("performance")
+        self.assertEqual(self.pragma(db, "journal_mode"), "wal")
+        db.set_profile("default")
+        self.assertEqual(self.pragma(db, "journal_mode"), "delete")
+
+    def test_bulk(self):
+        db = self.open("performance")
+        with DbTxn("Add people", db, batch=True) as trans:
+            self.assertEqual(self.pragma(db, "cache_size"), BULK_PROFILE["cache_size"])
+            db.add_person(Person(), trans)
+        self.assertEqual(
+            self.pragma(db, "cache_size"), PROFILES["performance"]["cache_size"]
+        )
+        self.assertEqual(db.get_number_of_people(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
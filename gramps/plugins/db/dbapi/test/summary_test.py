@@ -0,0 +1,199 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Tests of the person summary table.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db import DbTxn
+from gramps.gen.db.summary import person_summary
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import (
+    ChildRef,
+    Date,
+    Event,
+    EventRef,
+    EventType,
+    Family,
+    FamilyRelType,
+    Note,
+    NoteType,
+    Person,
+    Place,
+)
+
+
+# -------------------------------------------------------------------------
+#
+# PersonSummaryTest class
+#
+# -------------------------------------------------------------------------
+class PersonSummaryTest(unittest.TestCase):
+    """
+    Tests of the person summaries kept by the DBAPI backend.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.addCleanup(self.db.close)
+
+    def add_event(self, etype, year, trans, place=None):
+        event = Event()
+        event.set_type(etype)
+        event.set_date_object(Date(year))
+        if place:
+            event.set_place_handle(place.handle)
+        self.db.add_event(event, trans)
+        return event
+
+    def add_person(self, events, trans, birth=None):
+        person = Person()
+        for event in events:
+            ref = EventRef()
+            ref.ref = event.handle
+            person.add_event_ref(ref)
+            if event is birth:
+                person.set_birth_ref(ref)
+        self.db.add_person(person, trans)
+        return person
+
+    def check(self, handle):
+        """
+        Check the stored summary against the one computed from the objects.
+        """
+        summary = self.db.get_person_summary(handle)
+        person = self.db.get_person_from_handle(handle)
+        self.assertEqual(summary, person_summary(self.db, person))
+        return summary
+
+    def test_vitals(self):
+        with DbTxn("Add", self.db) as trans:
+            place = Place()
+            self.db.add_place(place, trans)
+            birth = self.add_event(EventType.BIRTH, 1900, trans)
+            baptism = self.add_event(EventType.BAPTISM, 1901, trans, place)
+            burial = self.add_event(EventType.BURIAL, 1980, trans)
+            person = self.add_person([birth, baptism, burial], trans, birth)
+
+        summary = self.check(person.handle)
+        self.assertEqual(summary["birth_handle"], birth.handle)
+        self.assertFalse(summary["birth_fallback"])
+        self.assertEqual(summary["birth_sortval"], Date(1900).get_sort_value())
+        self.assertEqual(summary["birth_place_handle"], place.handle)
+        self.assertTrue(summary["birth_place_fallback"])
+        self.assertEqual(summary["death_handle"], burial.handle)
+        self.assertTrue(summary["death_fallback"])
+
+        # Changing an event updates the people who use it
+        burial.set_date_object(Date(1990))
+        with DbTxn("Edit", self.db) as trans:
+            self.db.commit_event(burial, trans)
+        summary = self.check(person.handle)
+        self.assertEqual(summary["death_sortval"], Date(1990).get_sort_value())
+
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_event(burial.handle, trans)
+        self.assertEqual(self.check(person.handle)["death_handle"], "")
+
+        self.db.undo()
+        self.assertEqual(self.check(person.handle)["death_handle"], burial.handle)
+
+    def test_counts(self):
+        with DbTxn("Add", self.db) as trans:
+            father = self.add_person([], trans)
+            child = self.add_person([], trans)
+            note = Note("to do")
+            note.set_type(NoteType.TODO)
+            self.db.add_note(note, trans)
+            father.add_note(note.handle)
+            family = Family()
+            family.set_father_handle(father.handle)
+            family.set_relationship(FamilyRelType.MARRIED)
+            ref = ChildRef()
+            ref.ref = child.handle
+            family.add_child_ref(ref)
+            self.db.add_family(family, trans)
+            father.add_family_handle(family.handle)
+            child.add_parent_family_handle(family.handle)
+            self.db.commit_person(father, trans)
+            self.db.commit_person(child, trans)
+
+        summary = self.check(father.handle)
+        self.assertEqual(summary["marriages"], 1)
+        self.assertEqual(summary["children"], 1)
+        self.assertEqual(summary["todo"], 1)
+        self.assertEqual(self.check(child.handle)["parents"], 1)
+
+        family.set_relationship(FamilyRelType.UNMARRIED)
+        with DbTxn("Edit", self.db) as trans:
+            self.db.commit_family(family, trans)
+        self.assertEqual(self.check(father.handle)["marriages"], 0)
+
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_person(child.handle, trans)
+        self.assertEqual(
+            [handle for handle, summary in self.db.iter_person_summaries()],
+            [father.handle],
+        )
+
+    def test_order(self):
+        with DbTxn("Add", self.db, batch=True) as trans:
+            people = []
+            for year in (1950, 1850, 1900):
+                birth = self.add_event(EventType.BIRTH, year, trans)
+                people.append(self.add_person([birth], trans, birth))
+        handles = [
+            handle
+            for handle, summary in self.db.iter_person_summaries(
+                order_by="birth_sortval"
+            )
+        ]
+        self.assertEqual(
+            handles, [people[1].handle, people[2].handle, people[0].handle]
+        )
+        with self.assertRaises(ValueError):
+            list(self.db.iter_person_summaries(order_by="handle; DROP TABLE person"))
+
+    def test_rebuild(self):
+        with DbTxn("Add", self.db) as trans:
+            birth = self.add_event(EventType.BIRTH, 1900, trans)
+            person = self.add_person([birth], trans, birth)
+        self.db.dbapi.begin()
+        self.db.dbapi.execute("DELETE FROM person_summary")
+        self.db.dbapi.commit()
+        self.db.rebuild_secondary()
+        self.assertEqual(self.check(person.handle)["birth_handle"], birth.handle)
+
+
+if __name__ == "__main__":
+    unittest.main()
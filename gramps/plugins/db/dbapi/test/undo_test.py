@@ -0,0 +1,135 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Tests of the undo history of the generic backend.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import os
+import tempfile
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.config import config
+from gramps.gen.db import DbTxn, DBUNDOFN
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Note
+
+
+# -------------------------------------------------------------------------
+#
+# UndoTest class
+#
+# -------------------------------------------------------------------------
+class UndoTest(unittest.TestCase):
+    """
+    Tests of the spill file and the depth of the undo history.
+    """
+
+    def setUp(self):
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.directory = tempdir.name
+        for key in ("database.undo-memory", "database.undo-depth"):
+            self.addCleanup(config.set, key, config.get(key))
+
+    def open(self, memory, depth):
+        config.set("database.undo-memory", memory)
+        config.set("database.undo-depth", depth)
+        db = make_database("sqlite")
+        db.load(self.directory)
+        self.addCleanup(self.close, db)
+        return db
+
+    def close(self, db):
+        if db.is_open():
+            db.close()
+
+    def add_notes(self, db, count):
+        notes = []
+        for index in range(count):
+            note = Note("note %d" % index)
+            with DbTxn("Add note", db) as trans:
+                db.add_note(note, trans)
+            notes.append(note)
+        return notes
+
+    def test_spill(self):
+        db = self.open(0, 0)
+        notes = self.add_notes(db, 5)
+        spill = os.path.join(self.directory, DBUNDOFN)
+        self.assertTrue(os.path.exists(spill))
+        self.assertEqual(db.undodb.memory_size, 0)
+
+        note = notes[0]
+        note.set("changed")
+        with DbTxn("Edit note", db) as trans:
+            db.commit_note(note, trans)
+        self.assertTrue(db.undo())
+        self.assertEqual(db.get_note_from_handle(note.handle).get(), "note 0")
+        self.assertTrue(db.redo())
+        self.assertEqual(db.get_note_from_handle(note.handle).get(), "changed")
+        while db.undo():
+            pass
+        self.assertEqual(db.get_number_of_notes(), 0)
+
+        db.close()
+        self.assertFalse(os.path.exists(spill))
+
+    def test_memory(self):
+        db = self.open(64, 0)
+        self.add_notes(db, 5)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, DBUNDOFN)))
+        self.assertEqual(len(db.undodb.undodb), 5)
+        self.assertTrue(db.undo())
+        self.assertEqual(db.get_number_of_notes(), 4)
+
+    def test_depth(self):
+        db = self.open(64, 3)
+        self.add_notes(db, 5)
+        self.assertEqual(db.undodb.undo_count, 3)
+        self.assertEqual(len(db.undodb.undodb), 3)
+        while db.undo():
+            pass
+        self.assertEqual(db.get_number_of_notes(), 2)
+        while db.redo():
+            pass
+        self.assertEqual(db.get_number_of_notes(), 5)
+
+    def test_clear(self):
+        db = self.open(0, 0)
+        self.add_notes(db, 3)
+        db.undodb.clear()
+        self.assertEqual(db.undodb.undo_count, 0)
+        self.assertFalse(db.undo())
+        self.assertEqual(db.get_number_of_notes(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
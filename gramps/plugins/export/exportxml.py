@@ -35,10 +35,12 @@ Gramps' XML file format.
 # Standard python modules
 #
 # -------------------------------------------------------------------------
+import io
 import time
 import shutil
 import os
-import codecs
+import multiprocessing
+from collections import deque
 from xml.sax.saxutils import escape
 
 # ------------------------------------------------------------------------
@@ -59,7 +61,20 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
 from gramps.gen.const import URL_HOMEPAGE
-from gramps.gen.lib import Date, Person
+from gramps.gen.config import config
+from gramps.gen.lib import (
+    Citation,
+    Date,
+    Event,
+    Family,
+    Media,
+    Note,
+    Person,
+    Place,
+    Repository,
+    Source,
+    Tag,
+)
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.db.exceptions import DbWriteFailure
 from gramps.version import VERSION
@@ -83,6 +98,14 @@ except:
 # table for skipping control chars from XML except 09, 0A, 0D
 strip_dict = dict.fromkeys(list(range(9)) + list(range(11, 13)) + list(range(14, 32)))
 
+# Number of objects sent to a worker at a time
+SHARD_SIZE = 500
+# Fewer objects are written without starting worker processes
+MIN_PARALLEL_OBJECTS = 20000
+
+# State of a worker process
+_WORKER = {}
+
 
 def escxml(d):
     return (
@@ -109,7 +132,15 @@ class GrampsXmlWriter(UpdateCallback):
     Writes a database to the XML file.
     """
 
-    def __init__(self, db, strip_photos=0, compress=1, version="unknown", user=None):
+    def __init__(
+        self,
+        db,
+        strip_photos=0,
+        compress=1,
+        version="unknown",
+        user=None,
+        processes=1,
+    ):
         """
         Initialize, but does not write, an XML file.
 
@@ -119,9 +150,13 @@ class GrampsXmlWriter(UpdateCallback):
         >              1: remove everything expect the filename (eg gpkg)
         >              2: remove leading slash (quick write)
         compress - attempt to compress the database
+        processes - number of worker processes rendering the objects of a
+                    large database
         """
-        UpdateCallback.__init__(self, user.callback)
+        UpdateCallback.__init__(self, user.callback if user else None)
         self.user = user
+        self.processes = processes
+        self.pool = None
         self.compress = compress
         if not _gzip_ok:
             self.compress = False
@@ -196,9 +231,10 @@ class GrampsXmlWriter(UpdateCallback):
                 raise DbWriteFailure(_("Failure writing %s") % filename, str(msg))
                 return 0
 
-        self.g = codecs.getwriter("utf8")(g)
+        self.g = io.TextIOWrapper(g, encoding="utf-8", newline="")
 
         self.write_xml_data()
+        self.g.detach()
         if filename != "-":
             g.close()
         return 1
@@ -216,9 +252,10 @@ class GrampsXmlWriter(UpdateCallback):
         else:
             g = handle
 
-        self.g = codecs.getwriter("utf8")(g)
+        self.g = io.TextIOWrapper(g, encoding="utf-8", newline="")
 
         self.write_xml_data()
+        self.g.detach()
         g.close()
         return 1
 
@@ -289,103 +326,77 @@ class GrampsXmlWriter(UpdateCallback):
         # by the time we get to person's names
         self.write_name_formats()
 
-        # Write table objects
-        if tag_len > 0:
-            self.g.write("  <tags>\n")
-            for key in sorted(self.db.get_tag_handles()):
-                tag = self.db.get_tag_from_handle(key)
-                if tag:
-                    self.write_tag(tag, 2)
-                self.update()
-            self.g.write("  </tags>\n")
-
-        # Write primary objects
-        if event_len > 0:
-            self.g.write("  <events>\n")
-            for handle in sorted(self.db.get_event_handles()):
-                event = self.db.get_event_from_handle(handle)
-                if event:
-                    self.write_event(event, 2)
-                self.update()
-            self.g.write("  </events>\n")
-
-        if person_len > 0:
-            self.g.write("  <people")
-            person = self.db.get_default_person()
-            if person:
-                self.g.write(' home="_%s"' % person.handle)
-            self.g.write(">\n")
-
-            for handle in sorted(self.db.get_person_handles()):
-                person = self.db.get_person_from_handle(handle)
+        if self.processes > 1 and total_steps >= MIN_PARALLEL_OBJECTS:
+            try:
+                # Forking a process that runs a GUI is unsafe
+                context = multiprocessing.get_context("spawn")
+                self.pool = context.Pool(
+                    self.processes,
+                    initializer=_init_worker,
+                    initargs=(self.strip_photos,),
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                LOG.warning("no worker processes, writing serially: %s", err)
+        try:
+            # Write table objects
+            if tag_len > 0:
+                self.g.write("  <tags>\n")
+                self.write_objects(Tag, "write_tag")
+                self.g.write("  </tags>\n")
+
+            # Write primary objects
+            if event_len > 0:
+                self.g.write("  <events>\n")
+                self.write_objects(Event, "write_event")
+                self.g.write("  </events>\n")
+
+            if person_len > 0:
+                self.g.write("  <people")
+                person = self.db.get_default_person()
                 if person:
-                    self.write_person(person, 2)
-                self.update()
-            self.g.write("  </people>\n")
-
-        if family_len > 0:
-            self.g.write("  <families>\n")
-            for handle in sorted(self.db.iter_family_handles()):
-                family = self.db.get_family_from_handle(handle)
-                if family:
-                    self.write_family(family, 2)
-                self.update()
-            self.g.write("  </families>\n")
-
-        if citation_len > 0:
-            self.g.write("  <citations>\n")
-            for handle in sorted(self.db.get_citation_handles()):
-                citation = self.db.get_citation_from_handle(handle)
-                if citation:
-                    self.write_citation(citation, 2)
-                self.update()
-            self.g.write("  </citations>\n")
-
-        if source_len > 0:
-            self.g.write("  <sources>\n")
-            for handle in sorted(self.db.get_source_handles()):
-                source = self.db.get_source_from_handle(handle)
-                if source:
-                    self.write_source(source, 2)
-                self.update()
-            self.g.write("  </sources>\n")
-
-        if place_len > 0:
-            self.g.write("  <places>\n")
-            for key in sorted(self.db.get_place_handles()):
-                # try:
-                place = self.db.get_place_from_handle(key)
-                if place:
-                    self.write_place_obj(place, 2)
-                self.update()
-            self.g.write("  </places>\n")
-
-        if obj_len > 0:
-            self.g.write("  <objects>\n")
-            for handle in sorted(self.db.get_media_handles()):
-                obj = self.db.get_media_from_handle(handle)
-                if obj:
-                    self.write_object(obj, 2)
-                self.update()
-            self.g.write("  </objects>\n")
-
-        if repo_len > 0:
-            self.g.write("  <repositories>\n")
-            for key in sorted(self.db.get_repository_handles()):
-                repo = self.db.get_repository_from_handle(key)
-                if repo:
-                    self.write_repository(repo, 2)
-                self.update()
-            self.g.write("  </repositories>\n")
-
-        if note_len > 0:
-            self.g.write("  <notes>\n")
-            for key in sorted(self.db.get_note_handles()):
-                note = self.db.get_note_from_handle(key)
-                if note:
-                    self.write_note(note, 2)
-                self.update()
-            self.g.write("  </notes>\n")
+                    self.g.write(' home="_%s"' % person.handle)
+                self.g.write(">\n")
+                self.write_objects(Person, "write_person")
+                self.g.write("  </people>\n")
+
+            if family_len > 0:
+                self.g.write("  <families>\n")
+                self.write_objects(Family, "write_family")
+                self.g.write("  </families>\n")
+
+            if citation_len > 0:
+                self.g.write("  <citations>\n")
+                self.write_objects(Citation, "write_citation")
+                self.g.write("  </citations>\n")
+
+            if source_len > 0:
+                self.g.write("  <sources>\n")
+                self.write_objects(Source, "write_source")
+                self.g.write("  </sources>\n")
+
+            if place_len > 0:
+                self.g.write("  <places>\n")
+                self.write_objects(Place, "write_place_obj")
+                self.g.write("  </places>\n")
+
+            if obj_len > 0:
+                self.g.write("  <objects>\n")
+                self.write_objects(Media, "write_object")
+                self.g.write("  </objects>\n")
+
+            if repo_len > 0:
+                self.g.write("  <repositories>\n")
+                self.write_objects(Repository, "write_repository")
+                self.g.write("  </repositories>\n")
+
+            if note_len > 0:
+                self.g.write("  <notes>\n")
+                self.write_objects(Note, "write_note")
+                self.g.write("  </notes>\n")
+        finally:
+            if self.pool is not None:
+                self.pool.terminate()
+                self.pool = None
 
         # Data is written, now write bookmarks.
         self.write_bookmarks()
@@ -396,6 +407,60 @@ class GrampsXmlWriter(UpdateCallback):
     #        self.status.end()
     #        self.status = None
 
+    def write_objects(self, obj_class, func_name):
+        """
+        Write the objects of a primary class in the order of their handles,
+        as read from the cursor of the database.  With a pool of worker
+        processes, the objects are sent to the workers in shards and their
+        XML is written back in the same order.
+        """
+        write_func = getattr(self, func_name)
+        pending = deque()
+        shard = []
+        for dummy, data in self.db.iter_sorted_raw_data(obj_class.__name__):
+            if self.pool is None:
+                write_func(obj_class.create(data), 2)
+                self.update()
+                continue
+            shard.append(data)
+            if len(shard) == SHARD_SIZE:
+                pending.append((shard, self.render_shard(obj_class, func_name, shard)))
+                shard = []
+                if len(pending) > 2 * self.processes:
+                    self.write_shard(obj_class, func_name, *pending.popleft())
+        if shard:
+            pending.append((shard, self.render_shard(obj_class, func_name, shard)))
+        while pending:
+            self.write_shard(obj_class, func_name, *pending.popleft())
+
+    def render_shard(self, obj_class, func_name, shard):
+        """
+        Send a shard of raw data to the pool, if it still runs.
+        """
+        if self.pool is None:
+            return None
+        return self.pool.apply_async(_render_shard, ((obj_class, func_name, shard),))
+
+    def write_shard(self, obj_class, func_name, shard, result):
+        """
+        Write the XML rendered by a worker for a shard, or render it here if
+        the pool failed.
+        """
+        if result is not None and self.pool is not None:
+            try:
+                self.g.write(result.get())
+                for dummy in shard:
+                    self.update()
+                return
+            except Exception as err:  # pylint: disable=broad-except
+                LOG.warning("parallel export failed, writing serially: %s", err)
+                self.pool.terminate()
+                self.pool = None
+        write_func = getattr(self, func_name)
+        for data in shard:
+            write_func(obj_class.create(data), 2)
+            self.update()
+
     def write_metadata(self):
         """Method to write out metadata of the database"""
         mediapath = self.db.get_mediapath()
@@ -1441,6 +1506,32 @@ def conf_priv(obj):
         return ""
 
 
+# -------------------------------------------------------------------------
+#
+# Worker functions
+#
+# -------------------------------------------------------------------------
+def _init_worker(strip_photos):
+    """
+    Create the writer that renders the objects in a worker process.
+    """
+    _WORKER.clear()
+    _WORKER["writer"] = GrampsXmlWriter(None, strip_photos)
+
+
+def _render_shard(args):
+    """
+    Return the XML of the objects of a shard of raw data.
+    """
+    obj_class, func_name, shard = args
+    writer = _WORKER["writer"]
+    writer.g = io.StringIO()
+    write_func = getattr(writer, func_name)
+    for data in shard:
+        write_func(obj_class.create(data), 2)
+    return writer.g.getvalue()
+
+
 # -------------------------------------------------------------------------
 #
 # export_data
@@ -1464,7 +1555,13 @@ def export_data(database, filename, user, option_box=None):
         database = option_box.get_filtered_database(database)
         compress = compress and option_box.get_use_compression()
 
-    g = XmlWriter(database, user, 0, compress)
+    g = XmlWriter(
+        database,
+        user,
+        0,
+        compress,
+        processes=config.get("behavior.export-processes"),
+    )
     return g.write(filename)
 
 
@@ -1478,8 +1575,10 @@ class XmlWriter(GrampsXmlWriter):
     Writes a database to the XML file.
     """
 
-    def __init__(self, dbase, user, strip_photos, compress=1):
-        GrampsXmlWriter.__init__(self, dbase, strip_photos, compress, VERSION, user)
+    def __init__(self, dbase, user, strip_photos, compress=1, processes=1):
+        GrampsXmlWriter.__init__(
+            self, dbase, strip_photos, compress, VERSION, user, processes
+        )
         self.user = user
 
     def write(self, filename):
@@ -63,6 +63,14 @@ class Events(Gramplet, DbGUIElement):
     Displays the events for a person or family.
     """
 
+    def update_cache(self):
+        """
+        Keep a cached view of the database for displaying; it follows the
+        changes of the database.  Changes are made through self.dbstate.db.
+        """
+        if self.db is None or self.db.db is not self.dbstate.db:
+            self.db = CacheProxyDb(self.dbstate.db)
+
     def init(self):
         self.gui.WIDGET = self.build_gui()
         self.gui.get_container_widget().remove(self.gui.textview)
@@ -224,14 +232,13 @@ class PersonEvents(Events):
     def main(self):  # return false finishes
         active_handle = self.get_active("Person")
 
-        self.db = CacheProxyDb(self.dbstate.db)
+        self.update_cache()
         self.model.clear()
         self.callman.unregister_all()
         if active_handle:
             self.display_person(active_handle)
         else:
             self.set_has_data(False)
-        self.db = None
 
     def display_person(self, active_handle):
         """
@@ -301,14 +308,13 @@ class FamilyEvents(Events):
     def main(self):  # return false finishes
         active_handle = self.get_active("Family")
 
-        self.db = CacheProxyDb(self.dbstate.db)
+        self.update_cache()
         self.model.clear()
         self.callman.unregister_all()
         if active_handle:
             self.display_family(active_handle)
         else:
             self.set_has_data(False)
-        self.db = None
 
     def display_family(self, active_handle):
         """
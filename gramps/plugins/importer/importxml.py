@@ -135,7 +135,8 @@ try:
 except:
     GZIP_OK = False
 
-PERSON_RE = re.compile(r"\s*\<person\s(.*)$")
+# Number of bytes of XML read and parsed at once
+CHUNK_SIZE = 1 << 20
 
 CHILD_REL_MAP = {
     "Birth": ChildRefType(ChildRefType.BIRTH),
@@ -167,8 +168,6 @@ def importData(database, filename, user):
     database.smap = {}
     database.pmap = {}
     database.fmap = {}
-    line_cnt = 1
-    person_cnt = 0
 
     with ImportOpenFileContextManager(filename, user) as xml_file:
         if xml_file is None:
@@ -192,16 +191,11 @@ def importData(database, filename, user):
                 ),
             )
 
-        if filename != "-":
-            linecounter = LineParser(filename)
-            line_cnt = linecounter.get_count()
-            person_cnt = linecounter.get_person_count()
-
         read_only = database.readonly
         database.readonly = False
 
         try:
-            info = parser.parse(xml_file, line_cnt, person_cnt)
+            info = parser.parse(xml_file)
         except GrampsImportError as err:  # version error
             user.notify_error(*err.messages())
             return
@@ -408,61 +402,6 @@ class ImportInfo:
         return txt
 
 
-class LineParser:
-    def __init__(self, filename):
-        self.count = 0
-        self.person_count = 0
-
-        if GZIP_OK:
-            use_gzip = 1
-            try:
-                with gzip.open(filename, "r") as f:
-                    f.read(1)
-            except IOError as msg:
-                use_gzip = 0
-            except ValueError as msg:
-                use_gzip = 1
-        else:
-            use_gzip = 0
-
-        try:
-            if use_gzip:
-                import io
-
-                # Bug 6255. TextIOWrapper is required for python3 to
-                #           present file contents as text, otherwise they
-                #           are read as binary. However due to a missing
-                #           method (read1) in early python3 versions this
-                #           try block will fail.
-                #           Gramps will still import XML files using python
-                #           versions < 3.3.0 but the file progress meter
-                #           will not work properly, going immediately to
-                #           100%.
-                #           It should work correctly from version 3.3.
-                ofile = io.TextIOWrapper(
-                    gzip.open(filename, "rb"), encoding="utf8", errors="replace"
-                )
-            else:
-                ofile = open(filename, "r", encoding="utf8", errors="replace")
-
-            for line in ofile:
-                self.count += 1
-                if PERSON_RE.match(line):
-                    self.person_count += 1
-        except:
-            self.count = 0
-            self.person_count = 0
-        finally:
-            # Ensure the file handle is always closed
-            ofile.close()
-
-    def get_count(self):
-        return self.count
-
-    def get_person_count(self):
-        return self.person_count
-
-
 # -------------------------------------------------------------------------
 #
 # ImportOpenFileContextManager
@@ -803,8 +742,10 @@ class GrampsParser(UpdateCallback):
         This method can be called with an object instance or with a
         class object. Be aware that in the first case the side effect of this
         function is to fill the object instance with the data read from the db.
+        A new object instance is not added, as the stop_<primary_object> method
+        commits it when all its data is read.
         In the second case, an empty object with the correct handle will be
-        created.
+        created and added.
 
         :param handle: The handle of the primary object, typically as read
                        directly from the XML attributes.
@@ -877,7 +818,10 @@ class GrampsParser(UpdateCallback):
         if isinstance(prim_obj, abc.Callable):
             prim_obj = prim_obj()
         else:
+            # The stop_<primary_object> method commits the object once read.
             self.import_handles[orig_handle][target][INSTANTIATED] = True
+            prim_obj.set_handle(handle)
+            return handle
         prim_obj.set_handle(handle)
         if target == "tag":
             self.db.add_tag(prim_obj, self.trans)
@@ -1041,14 +985,24 @@ class GrampsParser(UpdateCallback):
                 gramps_ids[id_] = gramps_id
         return gramps_ids[id_]
 
-    def parse(self, ifile, linecount=1, personcount=0):
+    def parse(self, ifile):
         """
         Parse the xml file
         :param ifile: must be a file handle that is already open, with position
                       at the start of the file
+
+        The file is read once, in chunks of CHUNK_SIZE bytes.  The progress is
+        the offset in the file on disk, which is that of the compressed data
+        for a gzipped file, so no pass is needed to count its lines.
         """
+        raw_file = getattr(ifile, "fileobj", ifile)
+        try:
+            size = os.fstat(raw_file.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            size = 0
         with DbTxn(_("Gramps XML import"), self.db, batch=True) as self.trans:
-            self.set_total(linecount)
+            if size:
+                self.set_total(size)
 
             self.db.disable_signals()
 
@@ -1059,7 +1013,13 @@ class GrampsParser(UpdateCallback):
             self.p.StartElementHandler = self.startElement
             self.p.EndElementHandler = self.endElement
             self.p.CharacterDataHandler = self.characters
-            self.p.ParseFile(ifile)
+            data = ifile.read(CHUNK_SIZE)
+            while data:
+                self.p.Parse(data, False)
+                if size:
+                    self.update(raw_file.tell())
+                data = ifile.read(CHUNK_SIZE)
+            self.p.Parse(b"", True)
 
             if len(self.name_formats) > 0:
                 # add new name formats to the existing table
@@ -1289,7 +1249,6 @@ class GrampsParser(UpdateCallback):
         # Gramps LEGACY: title in the placeobj tag
         self.placeobj.title = attrs.get("title", "")
         self.locations = 0
-        self.update(self.p.CurrentLineNumber)
         if self.default_tag:
             self.placeobj.add_tag(self.default_tag.handle)
         return self.placeobj
@@ -1400,7 +1359,6 @@ class GrampsParser(UpdateCallback):
             self.info.add("new-object", EVENT_KEY, self.event)
         else:
             # This is new event, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
             self.event = Event()
             if "handle" in attrs:
                 orig_handle = attrs["handle"].replace("_", "")
@@ -1623,7 +1581,6 @@ class GrampsParser(UpdateCallback):
         Add a person to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.person = Person()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
@@ -1759,7 +1716,6 @@ class GrampsParser(UpdateCallback):
         Add a family object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.family = Family()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
@@ -2047,7 +2003,6 @@ class GrampsParser(UpdateCallback):
         self.in_note = 0
         if "handle" in attrs:
             # This is new note, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
             self.note = Note()
             if "handle" in attrs:
                 orig_handle = attrs["handle"].replace("_", "")
@@ -2252,7 +2207,6 @@ class GrampsParser(UpdateCallback):
         Add a citation object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.citation = Citation()
         orig_handle = attrs["handle"].replace("_", "")
         is_merge_candidate = self.replace_import_handle and self.db.has_citation_handle(
@@ -2311,7 +2265,6 @@ class GrampsParser(UpdateCallback):
         Add a source object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.source = Source()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
@@ -2471,7 +2424,7 @@ class GrampsParser(UpdateCallback):
         pass
 
     def stop_database(self, *tag):
-        self.update(self.p.CurrentLineNumber)
+        pass
 
     def stop_media(self, *tag):
         self.db.commit_media(self.object, self.trans, self.object.get_change_time())
@@ -3454,7 +3407,14 @@ class GrampsParser(UpdateCallback):
     def fix_families(self):
         # Fix any imported families where there is a link from the family to an
         # individual, but no corresponding link from the individual to the
-        # family.
+        # family.  The people are committed together at the end.
+        changed = {}
+
+        def get_person(handle):
+            if handle in changed:
+                return changed[handle]
+            return self.db.get_person_from_handle(handle)
+
         for orig_handle in list(self.import_handles.keys()):
             for target in list(self.import_handles[orig_handle].keys()):
                 if target == "family":
@@ -3464,13 +3424,13 @@ class GrampsParser(UpdateCallback):
                     mother_handle = family.get_mother_handle()
 
                     if father_handle:
-                        father = self.db.get_person_from_handle(father_handle)
+                        father = get_person(father_handle)
                         if (
                             father
                             and family_handle not in father.get_family_handle_list()
                         ):
                             father.add_family_handle(family_handle)
-                            self.db.commit_person(father, self.trans)
+                            changed[father_handle] = father
                             txt = _(
                                 "Error: family '%(family)s'"
                                 " father '%(father)s'"
@@ -3486,13 +3446,13 @@ class GrampsParser(UpdateCallback):
                             LOG.warning(txt)
 
                     if mother_handle:
-                        mother = self.db.get_person_from_handle(mother_handle)
+                        mother = get_person(mother_handle)
                         if (
                             mother
                             and family_handle not in mother.get_family_handle_list()
                         ):
                             mother.add_family_handle(family_handle)
-                            self.db.commit_person(mother, self.trans)
+                            changed[mother_handle] = mother
                             txt = _(
                                 "Error: family '%(family)s'"
                                 " mother '%(mother)s'"
@@ -3509,7 +3469,7 @@ class GrampsParser(UpdateCallback):
 
                     for child_ref in family.get_child_ref_list():
                         child_handle = child_ref.ref
-                        child = self.db.get_person_from_handle(child_handle)
+                        child = get_person(child_handle)
                         if child:
                             if (
                                 family_handle
@@ -3520,7 +3480,7 @@ class GrampsParser(UpdateCallback):
                                 # to the child, but no FAMC link from the child
                                 # to the FAM.
                                 child.add_parent_family_handle(family_handle)
-                                self.db.commit_person(child, self.trans)
+                                changed[child_handle] = child
                                 txt = _(
                                     "Error: family '%(family)s'"
                                     " child '%(child)s'"
@@ -3534,6 +3494,7 @@ class GrampsParser(UpdateCallback):
                                 )
                                 self.info.add("unlinked-family", txt, None)
                                 LOG.warning(txt)
+        self.db.commit_many(changed.values(), self.trans)
 
 
 def append_value(orig, val):
@@ -0,0 +1,618 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2000-2007  Donald N. Allingham
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Find the people of a database who may be duplicates.
+
+The people are grouped in blocks by gender and by the soundex code of their
+surnames, as two people can only match if their surnames do.  Inside a
+block, the pairs to compare are found with an index of the initials of the
+given names and of the birth years, and are checked against the places of
+birth and death: a pair which differs in any of them can never reach a
+positive score, so it is not compared.
+
+The data compared is read once for each person, so that the comparisons
+need no database and can be spread over a pool of worker processes.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import logging
+import multiprocessing
+import os
+from functools import lru_cache
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.lib import Date, Person
+from gramps.gen.soundex import soundex
+
+_ = glocale.translation.sgettext
+LOG = logging.getLogger(".finddupes")
+
+# Number of people whose pairs are sent to a worker at a time
+SHARD_SIZE = 200
+# Fewer pairs are compared without starting worker processes
+MIN_PARALLEL_PAIRS = 50000
+
+# State of a worker process
+_WORKER = {}
+
+# Indexes in the features of a person
+_HANDLE, _GENDER, _NAME, _BIRTH, _DEATH, _PARENTS, _FAMILIES = range(7)
+
+
+# -------------------------------------------------------------------------
+#
+# Name and place helpers
+#
+# -------------------------------------------------------------------------
+def is_initial(name):
+    if len(name) > 2:
+        return 0
+    elif len(name) == 2:
+        if name[0] == name[0].upper() and name[1] == ".":
+            return 1
+    else:
+        return name[0] == name[0].upper()
+
+
+def get_surnames(name):
+    """Construct a full surname of the surnames"""
+    return " ".join([surn.get_surname() for surn in name.get_surname_list()])
+
+
+# the same names are compared many times
+_soundex = lru_cache(maxsize=None)(soundex)
+
+
+def gen_key(val, use_soundex):
+    if use_soundex:
+        try:
+            return _soundex(val)
+        except UnicodeEncodeError:
+            return val
+    else:
+        return val
+
+
+def name_compare(s1, s2, use_soundex):
+    if use_soundex:
+        try:
+            return _soundex(s1) == _soundex(s2)
+        except UnicodeEncodeError:
+            return s1 == s2
+    else:
+        return s1 == s2
+
+
+# -------------------------------------------------------------------------
+#
+# Comparison of the features of two people
+#
+# -------------------------------------------------------------------------
+def date_match(date1, date2):
+    if date1.is_empty() or date2.is_empty():
+        return 0
+    if date1.is_equal(date2):
+        return 1
+
+    if date1.is_compound() or date2.is_compound():
+        return range_compare(date1, date2)
+
+    if date1.get_year() == date2.get_year():
+        if date1.get_month() == date2.get_month():
+            return 0.75
+        if not date1.get_month_valid() or not date2.get_month_valid():
+            return 0.75
+        else:
+            return -1
+    else:
+        return -1
+
+
+def range_compare(date1, date2):
+    start_date_1 = date1.get_start_date()[0:3]
+    start_date_2 = date2.get_start_date()[0:3]
+    stop_date_1 = date1.get_stop_date()[0:3]
+    stop_date_2 = date2.get_stop_date()[0:3]
+    if date1.is_compound() and date2.is_compound():
+        if (
+            start_date_2 <= start_date_1 <= stop_date_2
+            or start_date_1 <= start_date_2 <= stop_date_1
+            or start_date_2 <= stop_date_1 <= stop_date_2
+            or start_date_1 <= stop_date_2 <= stop_date_1
+        ):
+            return 0.5
+        else:
+            return -1
+    elif date2.is_compound():
+        if start_date_2 <= start_date_1 <= stop_date_2:
+            return 0.5
+        else:
+            return -1
+    else:
+        if start_date_1 <= start_date_2 <= stop_date_1:
+            return 0.5
+        else:
+            return -1
+
+
+def name_match(name, name1, use_soundex):
+    """
+    Compare two names, given as (surnames, suffix, first name) tuples.
+    """
+    if not name1 or not name:
+        return 0
+
+    srn1, sfx1, first1 = name
+    srn2, sfx2, first2 = name1
+
+    if not name_compare(srn1, srn2, use_soundex):
+        return -1
+    if sfx1 != sfx2:
+        if sfx1 != "" and sfx2 != "":
+            return -1
+
+    if first1 == first2:
+        return 1
+    else:
+        list1 = first1.split()
+        list2 = first2.split()
+
+        if len(list1) < len(list2):
+            return list_reduce(list1, list2, use_soundex)
+        else:
+            return list_reduce(list2, list1, use_soundex)
+
+
+def place_match(place1, place2, use_soundex):
+    """
+    Compare two places, given as (handle, title) tuples.
+    """
+    if place1[0] == place2[0]:
+        return 1
+
+    name1 = place1[1]
+    name2 = place2[1]
+    if not (name1 and name2):
+        return 0
+    if name1 == name2:
+        return 1
+
+    list1 = name1.replace(",", " ").split()
+    list2 = name2.replace(",", " ").split()
+
+    value = 0
+    for name in list1:
+        for name2 in list2:
+            if name == name2:
+                value += 0.5
+            elif name[0] == name2[0] and name_compare(name, name2, use_soundex):
+                value += 0.25
+    return min(value, 1) if value else -1
+
+
+def list_reduce(list1, list2, use_soundex):
+    value = 0
+    for name in list1:
+        for name2 in list2:
+            if is_initial(name) and name[0] == name2[0]:
+                value += 0.25
+            elif is_initial(name2) and name2[0] == name[0]:
+                value += 0.25
+            elif name == name2:
+                value += 0.5
+            elif name[0] == name2[0] and name_compare(name, name2, use_soundex):
+                value += 0.25
+    return min(value, 1) if value else -1
+
+
+def compare_features(features1, features2, use_soundex):
+    """
+    Return the chance that two people are the same, from their features,
+    or -1 if they cannot be.  Whether one is an ancestor of the other is
+    not checked here.
+    """
+    chance = name_match(features1[_NAME], features2[_NAME], use_soundex)
+    if chance == -1:
+        return -1
+
+    for index in (_BIRTH, _DEATH):
+        value = date_match(features1[index][0], features2[index][0])
+        if value == -1:
+            return -1
+        chance += value
+
+    for index in (_BIRTH, _DEATH):
+        value = place_match(features1[index][1], features2[index][1], use_soundex)
+        if value == -1:
+            return -1
+        chance += value
+
+    if features1[_PARENTS] and features2[_PARENTS]:
+        for name1, name2 in zip(features1[_PARENTS], features2[_PARENTS]):
+            value = name_match(name1, name2, use_soundex)
+            if value == -1:
+                return -1
+            chance += value
+
+    # the other parent of the families of the people
+    if features1[_GENDER] == Person.FEMALE:
+        spouse = slice(0, 2)
+    else:
+        spouse = slice(2, 4)
+    for family1 in features1[_FAMILIES]:
+        handle1, name1 = family1[spouse]
+        for family2 in features2[_FAMILIES]:
+            handle2, name2 = family2[spouse]
+            if handle1 and handle2:
+                if handle1 == handle2:
+                    chance += 1
+                else:
+                    value = name_match(name1, name2, use_soundex)
+                    if value != -1:
+                        chance += value
+    return chance
+
+
+# -------------------------------------------------------------------------
+#
+# Features of the people
+#
+# -------------------------------------------------------------------------
+def _get_names(db):
+    """
+    Return the (surnames, suffix, first name) tuple of the primary name of
+    each person, by handle.
+    """
+    names = {}
+    for person in db.iter_people():
+        name = person.get_primary_name()
+        names[person.handle] = (
+            get_surnames(name),
+            name.get_suffix(),
+            name.get_first_name(),
+        )
+    return names
+
+
+def _get_event(db, event_ref, places):
+    """
+    Return the (date, (place handle, place title)) of an event.
+    """
+    if not event_ref:
+        return (Date(), ("", ""))
+    event = db.get_event_from_handle(event_ref.ref)
+    place_handle = event.get_place_handle()
+    if place_handle and place_handle not in places:
+        places[place_handle] = db.get_place_from_handle(place_handle).get_title()
+    return (event.get_date_object(), (place_handle, places.get(place_handle, "")))
+
+
+def get_features(db, person, names, families, places):
+    """
+    Return the data of a person that is compared, as a tuple.
+
+    :param names: the name tuples of the people, by handle
+    :param families: the (father handle, mother handle) of the families,
+                     by handle
+    :param places: the titles of the places, by handle, filled as needed
+    """
+    parents = None
+    family_handle = person.get_main_parents_family_handle()
+    if family_handle:
+        father, mother = families.get(family_handle, (None, None))
+        parents = (names.get(father), names.get(mother))
+    spouses = []
+    for family_handle in person.get_family_handle_list():
+        father, mother = families.get(family_handle, (None, None))
+        spouses.append((father, names.get(father), mother, names.get(mother)))
+    return (
+        person.handle,
+        person.get_gender(),
+        names[person.handle],
+        _get_event(db, person.get_birth_ref(), places),
+        _get_event(db, person.get_death_ref(), places),
+        parents,
+        spouses,
+    )
+
+
+def _get_blocking_keys(features, use_soundex):
+    """
+    Return the initials of the given names, the birth year, and the
+    keys of the places of birth and death of a person.  None matches any
+    year or place.
+    """
+    first_name = features[_NAME][2]
+    return (
+        {name[0] for name in first_name.split()} or {""},
+        _get_year_key(features[_BIRTH][0]),
+        _get_year_key(features[_DEATH][0]),
+        _get_place_key(features[_BIRTH][1], use_soundex),
+        _get_place_key(features[_DEATH][1], use_soundex),
+    )
+
+
+def _get_year_key(date):
+    if date.is_empty() or date.is_compound():
+        return None
+    return date.get_year()
+
+
+def _get_place_key(place, use_soundex):
+    handle, title = place
+    if not title:
+        return None
+    words = title.replace(",", " ").split()
+    return (handle, title, {gen_key(word, use_soundex) for word in words})
+
+
+def _places_compatible(key1, key2):
+    if key1 is None or key2 is None:
+        return True
+    return key1[0] == key2[0] or key1[1] == key2[1] or not key1[2].isdisjoint(key2[2])
+
+
+def _compatible(keys1, keys2):
+    """
+    Return False if two people cannot match, from their blocking keys.  The
+    initials and birth year are already known to match.
+    """
+    return (
+        (keys1[2] is None or keys2[2] is None or keys1[2] == keys2[2])
+        and _places_compatible(keys1[3], keys2[3])
+        and _places_compatible(keys1[4], keys2[4])
+    )
+
+
+# -------------------------------------------------------------------------
+#
+# Candidate pairs
+#
+# -------------------------------------------------------------------------
+def _iter_candidates(block, keys, exhaustive):
+    """
+    Iterate over (index, indexes) tuples: the people of the block, and
+    those after them in the block to compare with them.
+
+    :param block: the indexes of the people of a block, in order
+    :param keys: the blocking keys of the people, by index
+    :param exhaustive: compare all the pairs of the block
+    """
+    if exhaustive:
+        for position, index in enumerate(block):
+            yield index, block[position + 1 :]
+        return
+
+    # initial -> birth year -> positions in the block
+    lookup = {}
+    for position, index in enumerate(block):
+        for initial in keys[index][0]:
+            lookup.setdefault(initial, {}).setdefault(keys[index][1], []).append(
+                position
+            )
+    for position, index in enumerate(block):
+        initials, year = keys[index][:2]
+        found = set()
+        for initial in initials:
+            years = lookup[initial]
+            if year is None:
+                buckets = years.values()
+            else:
+                buckets = (years.get(year, ()), years.get(None, ()))
+            for bucket in buckets:
+                for other in bucket:
+                    if (
+                        other > position
+                        and other not in found
+                        and _compatible(keys[index], keys[block[other]])
+                    ):
+                        found.add(other)
+        yield index, [block[other] for other in sorted(found)]
+
+
+# -------------------------------------------------------------------------
+#
+# Comparison of the candidate pairs
+#
+# -------------------------------------------------------------------------
+def _score_candidates(features, candidates, threshold, use_soundex):
+    """
+    Return the (index, other index, chance) tuples of the pairs that reach
+    the threshold, in both directions, and the number of people done.
+    """
+    matches = []
+    for index, others in candidates:
+        features1 = features[index]
+        for other in others:
+            features2 = features[other]
+            chance = compare_features(features1, features2, use_soundex)
+            if chance >= threshold:
+                matches.append((index, other, chance))
+            # the spouses looked at depend on the gender of the first person
+            if features1[_GENDER] != features2[_GENDER]:
+                chance = compare_features(features2, features1, use_soundex)
+            if chance >= threshold:
+                matches.append((other, index, chance))
+    return len(candidates), matches
+
+
+def _init_worker(features, threshold, use_soundex):
+    """
+    Remember what the worker needs.
+    """
+    _WORKER.clear()
+    _WORKER.update(features=features, threshold=threshold, use_soundex=use_soundex)
+
+
+def _score_shard(candidates):
+    return _score_candidates(
+        _WORKER["features"],
+        candidates,
+        _WORKER["threshold"],
+        _WORKER["use_soundex"],
+    )
+
+
+def _iter_scores(features, candidates, threshold, use_soundex, processes):
+    """
+    Iterate over the results of _score_candidates for shards of the
+    candidates, computed by a pool of worker processes if there are many.
+    """
+    shards = [
+        candidates[index : index + SHARD_SIZE]
+        for index in range(0, len(candidates), SHARD_SIZE)
+    ]
+    count = sum(len(others) for dummy, others in candidates)
+    done = 0
+    if processes > 1 and len(shards) > 1 and count >= MIN_PARALLEL_PAIRS:
+        try:
+            # Forking a process that runs a GUI is unsafe
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(
+                min(processes, len(shards)),
+                initializer=_init_worker,
+                initargs=(features, threshold, use_soundex),
+            ) as pool:
+                for result in pool.imap(_score_shard, shards):
+                    done += 1
+                    yield result
+        except Exception as err:  # pylint: disable=broad-except
+            LOG.warning("parallel comparison failed, comparing serially: %s", err)
+    for shard in shards[done:]:
+        yield _score_candidates(features, shard, threshold, use_soundex)
+
+
+# -------------------------------------------------------------------------
+#
+# find_duplicates
+#
+# -------------------------------------------------------------------------
+def find_duplicates(db, threshold, use_soundex=True, processes=0, user=None):
+    """
+    Return a dictionary which maps the handle of each person with a likely
+    duplicate to a (handle of the duplicate, chance) tuple.
+
+    :param threshold: the lowest chance of a match
+    :type threshold: float
+    :param use_soundex: compare the soundex codes of the names
+    :type use_soundex: bool
+    :param processes: the number of worker processes comparing the people;
+                      one per processor if 0
+    :type processes: int
+    :param user: to show the progress
+    :type user: User
+    """
+    if not processes:
+        processes = os.cpu_count() or 1
+    length = db.get_number_of_people()
+    if user:
+        user.begin_progress(
+            _("Find Duplicates"), _("Pass 1: Building preliminary lists"), length
+        )
+
+    names = _get_names(db)
+    families = {
+        family.handle: (family.get_father_handle(), family.get_mother_handle())
+        for family in db.iter_families()
+    }
+    places = {}
+    features = []
+    for person in db.iter_people():
+        if user:
+            user.step_progress()
+        features.append(get_features(db, person, names, families, places))
+    if user:
+        user.end_progress()
+
+    # the first of the best matches is kept, so the people are compared in
+    # the order of their handles, as the tool always did; the cursor of the
+    # people may follow another order
+    position = {handle: index for index, handle in enumerate(db.iter_person_handles())}
+    features.sort(key=lambda item: position[item[_HANDLE]])
+    blocks = {}
+    for index, item in enumerate(features):
+        key = gen_key(item[_NAME][0], use_soundex)
+        blocks.setdefault((item[_GENDER] == Person.MALE, key), []).append(index)
+
+    # a pair which cannot match has a chance of -1
+    exhaustive = threshold <= -1
+    keys = [_get_blocking_keys(item, use_soundex) for item in features]
+    candidates = sorted(
+        candidate
+        for block in blocks.values()
+        for candidate in _iter_candidates(block, keys, exhaustive)
+    )
+
+    if user:
+        user.begin_progress(
+            _("Find Duplicates"), _("Pass 2: Calculating potential matches"), length
+        )
+    matches = []
+    for count, found in _iter_scores(
+        features, candidates, threshold, use_soundex, processes
+    ):
+        matches.extend(found)
+        if user:
+            for dummy in range(count):
+                user.step_progress()
+    if user:
+        user.end_progress()
+
+    # keep the pairs in the order in which the people used to be compared
+    ancestors = {}
+    dupes = {}
+    for index, other, chance in sorted(matches):
+        handle = features[index][_HANDLE]
+        other_handle = features[other][_HANDLE]
+        if other_handle in dupes and dupes[other_handle][0] == handle:
+            continue
+        if _is_ancestor(db, handle, other_handle, ancestors):
+            chance = -1
+            if chance < threshold:
+                continue
+        if handle not in dupes or dupes[handle][1] > chance:
+            dupes[handle] = (other_handle, chance)
+    return dupes
+
+
+def _is_ancestor(db, handle1, handle2, ancestors):
+    """
+    Return True if one person is an ancestor of the other, through the main
+    parent families.
+    """
+    for handle, other in ((handle1, handle2), (handle2, handle1)):
+        if handle not in ancestors:
+            ancestors[handle] = {
+                ancestor for ancestor, dummy, dummy in db.iter_ancestors(handle, True)
+            }
+        if other in ancestors[handle]:
+            return True
+    return False
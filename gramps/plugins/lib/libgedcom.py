@@ -96,7 +96,7 @@ import time
 from collections import defaultdict, OrderedDict
 import string
 import mimetypes
-from io import StringIO, TextIOWrapper
+from io import BytesIO, StringIO, TextIOWrapper
 from urllib.parse import urlparse
 
 # ------------------------------------------------------------------------
@@ -1319,6 +1319,21 @@ _MAP_DATA = {
 # File Readers
 #
 # -------------------------------------------------------------------------
+def _iter_lines(text):
+    """
+    Return an iterator over the lines of a text, with their terminators,
+    like the lines read from a file opened with universal newlines.
+    """
+    start = 0
+    end = text.find("\n") + 1
+    while end:
+        yield text[start:end]
+        start = end
+        end = text.find("\n", start) + 1
+    if start < len(text):
+        yield text[start:]
+
+
 class BaseReader:
     """base char level reader"""
 
@@ -1345,6 +1360,22 @@ class BaseReader:
         self.__add_msg(message)
 
 
+class TextReader(BaseReader):
+    """Reads the text of the file, already decoded by GedcomStageOne"""
+
+    def __init__(self, text, __add_msg):
+        BaseReader.__init__(self, None, "text", __add_msg)
+        self.text = text
+        self.lines = _iter_lines(text)
+
+    def reset(self):
+        self.lines = _iter_lines(self.text)
+
+    def readline(self):
+        line = next(self.lines, "")
+        return line.translate(STRIP_DICT)
+
+
 class UTF8Reader(BaseReader):
     """The main UTF-8 reader, uses Python for char handling"""
 
@@ -3067,8 +3098,11 @@ class GedcomParser(UpdateCallback):
         cursor.close()
 
         enc = stage_one.get_encoding()
+        text = stage_one.get_text()
 
-        if enc == "ANSEL":
+        if text is not None:
+            rdr = TextReader(text, self.__add_msg)
+        elif enc == "ANSEL":
             rdr = AnselReader(ifile, self.__add_msg)
         elif enc in ("UTF-8", "UTF8", "UTF_8_SIG"):
             rdr = UTF8Reader(ifile, self.__add_msg, enc)
@@ -3372,7 +3406,9 @@ class GedcomParser(UpdateCallback):
                 location = sub_state.pf.load_place(
                     self.place_import, place, place_title
                 )
-                self.dbase.commit_place(place, self.trans)
+                # most events refer to a place unchanged since it was written
+                if place.serialize() != self.dbase.get_raw_place_data(place.handle):
+                    self.dbase.commit_place(place, self.trans)
                 if location:
                     self.place_import.store_location(location, place.handle)
                 event.set_place_handle(place.get_handle())
@@ -3683,6 +3719,8 @@ class GedcomParser(UpdateCallback):
                 if val == gramps_id:
                     return key
 
+        # The people to fix are committed together at the end of each pass
+        changed = {}
         for input_id, gramps_id in self.pid_map.map().items():
             person_handle = self.__find_from_handle(gramps_id, self.gid2id)
             person = self.dbase.get_person_from_handle(person_handle)
@@ -3694,7 +3732,7 @@ class GedcomParser(UpdateCallback):
                     and family.get_mother_handle() != person_handle
                 ):
                     person.remove_family_handle(family_handle)
-                    self.dbase.commit_person(person, self.trans)
+                    changed[person_handle] = person
                     self.__add_msg(
                         _(
                             "Error: family '%(family)s' (input as"
@@ -3711,11 +3749,19 @@ class GedcomParser(UpdateCallback):
                         }
                     )
 
+        self.dbase.commit_many(changed.values(), self.trans)
+
         def __input_pid(gramps_id):
             for key, val in self.pid_map.map().items():
                 if val == gramps_id:
                     return key
 
+        def __get_person(handle):
+            if handle in changed:
+                return changed[handle]
+            return self.dbase.get_person_from_handle(handle)
+
+        changed = {}
         for input_id, gramps_id in self.fid_map.map().items():
             family_handle = self.__find_from_handle(gramps_id, self.fid2id)
             family = self.dbase.get_family_from_handle(family_handle)
@@ -3723,10 +3769,10 @@ class GedcomParser(UpdateCallback):
             mother_handle = family.get_mother_handle()
 
             if father_handle:
-                father = self.dbase.get_person_from_handle(father_handle)
+                father = __get_person(father_handle)
                 if father and family_handle not in father.get_family_handle_list():
                     father.add_family_handle(family_handle)
-                    self.dbase.commit_person(father, self.trans)
+                    changed[father_handle] = father
                     self.__add_msg(
                         "Error: family '%(family)s' (input as"
                         " @%(orig_family)s@) father '%(father)s'"
@@ -3741,10 +3787,10 @@ class GedcomParser(UpdateCallback):
                     )
 
             if mother_handle:
-                mother = self.dbase.get_person_from_handle(mother_handle)
+                mother = __get_person(mother_handle)
                 if mother and family_handle not in mother.get_family_handle_list():
                     mother.add_family_handle(family_handle)
-                    self.dbase.commit_person(mother, self.trans)
+                    changed[mother_handle] = mother
                     self.__add_msg(
                         "Error: family '%(family)s' (input as"
                         " @%(orig_family)s@) mother '%(mother)s'"
@@ -3760,14 +3806,14 @@ class GedcomParser(UpdateCallback):
 
             for child_ref in family.get_child_ref_list():
                 child_handle = child_ref.ref
-                child = self.dbase.get_person_from_handle(child_handle)
+                child = __get_person(child_handle)
                 if child:
                     if family_handle not in child.get_parent_family_handle_list():
                         # The referenced child has no reference to the family.
                         # There was a link from the FAM record to the child,
                         # but no FAMC link from the child to the FAM.
                         child.add_parent_family_handle(family_handle)
-                        self.dbase.commit_person(child, self.trans)
+                        changed[child_handle] = child
                         self.__add_msg(
                             "Error: family '%(family)s' (input as"
                             " @%(orig_family)s@) child '%(child)s'"
@@ -3781,6 +3827,7 @@ class GedcomParser(UpdateCallback):
                                 "orig_child": __input_pid(child.gramps_id),
                             }
                         )
+        self.dbase.commit_many(changed.values(), self.trans)
 
         if self.missing_references:
             self.dbase.commit_note(self.explanation, self.trans, time.time())
@@ -8358,7 +8405,8 @@ class GedcomParser(UpdateCallback):
 
         if description and description != "Y":
             event.set_description(description)
-        self.dbase.add_event(event, self.trans)
+        # the event is written once, when it is complete
+        event.set_handle(create_id())
 
         sub_state = CurrentState()
         sub_state.level = state.level + 1
@@ -8392,7 +8440,8 @@ class GedcomParser(UpdateCallback):
         if description and description != "Y":
             event.set_description(description)
 
-        self.dbase.add_event(event, self.trans)
+        # the event is written once, when it is complete
+        event.set_handle(create_id())
 
         sub_state = CurrentState()
         sub_state.family = state.family
@@ -8590,6 +8639,9 @@ class GedcomStageOne:
         self.enc = ""
         self.pcnt = 0
         self.lcnt = 0
+        # The text of the file, and the codec with which it was decoded
+        self.text = None
+        self.codec = None
 
     def __detect_file_decoder(self, input_file):
         """
@@ -8606,24 +8658,21 @@ class GedcomStageOne:
         if line == b"\xef\xbb":
             input_file.read(1)
             self.enc = "utf_8_sig"
-            return TextIOWrapper(
-                input_file, encoding="utf_8_sig", errors="replace", newline=None
-            )
+            self.codec = "utf_8_sig"
         elif line == b"\xff\xfe" or line == b"\xfe\xff":
             self.enc = "UTF16"
             input_file.seek(0)
-            return TextIOWrapper(
-                input_file, encoding="utf_16", errors="replace", newline=None
-            )
+            self.codec = "utf_16"
         elif not line:
             raise GedcomError(self.__EMPTY_GED)
         elif line == b"\x30\x00" or line == b"\x00\x30":
             raise GedcomError(self.__BAD_UTF16)
         else:
             input_file.seek(0)
-            return TextIOWrapper(
-                input_file, encoding="utf-8", errors="replace", newline=None
-            )
+            self.codec = "utf_8"
+        return TextIOWrapper(
+            input_file, encoding=self.codec, errors="replace", newline=None
+        )
 
     def parse(self):
         """
@@ -8631,9 +8680,11 @@ class GedcomStageOne:
         """
         current_family_id = ""
 
-        reader = self.__detect_file_decoder(self.ifile)
+        # The file is read and decoded once, the second stage reuses the text
+        reader = self.__detect_file_decoder(BytesIO(self.ifile.read()))
+        self.text = reader.read()
 
-        for line in reader:
+        for line in _iter_lines(self.text):
             # Scan for a few items, keep counts.  Also look for actual CHAR
             # Keyword to figure out actual encodeing for non-unicode file types
             line = line.strip()
@@ -8665,7 +8716,6 @@ class GedcomStageOne:
         LOG.debug("parse pcnt %d", self.pcnt)
         LOG.debug("parse famc %s", dict(self.famc))
         LOG.debug("parse fams %s", dict(self.fams))
-        self.ifile = reader  # need this to keep python from autoclosing file
 
     def get_famc_map(self):
         """
@@ -8685,6 +8735,22 @@ class GedcomStageOne:
         """
         return self.enc.upper()
 
+    def get_text(self):
+        """
+        Return the text of the file, if it was decoded with the codec of the
+        encoding, or None if the file must be decoded again.
+        """
+        enc = self.get_encoding()
+        if enc in ("UTF-8", "UTF8"):
+            codec = "utf_8"
+        elif enc == "UTF_8_SIG":
+            codec = "utf_8_sig"
+        elif enc in ("UTF-16LE", "UTF-16BE", "UTF16", "UNICODE"):
+            codec = "utf_16"
+        else:
+            return None
+        return self.text if codec == self.codec else None
+
     def set_encoding(self, enc):
         """
         Forces the encoding
@@ -0,0 +1,380 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the search of duplicate people.
+"""
+
+import random
+import unittest
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import (
+    ChildRef,
+    Date,
+    Event,
+    EventRef,
+    EventType,
+    Family,
+    Person,
+    Place,
+    Surname,
+)
+from gramps.gen.soundex import compare
+from .. import libduplicates
+from ..libduplicates import date_match, find_duplicates, get_surnames, is_initial
+
+SURNAMES = ["Smith", "Smyth", "Jones", "Brown"]
+FIRST_NAMES = ["John", "J.", "John Paul", "Paul", "Mary", "Maria", ""]
+PLACES = ["Paris, France", "Lyon, France", "London", ""]
+
+
+class OldDuplicates:
+    """
+    The search of the Find Possible Duplicate People tool before it was
+    moved to libduplicates: every pair of people of the same gender and
+    surname is compared, from the database objects.  The functions on dates
+    and initials did not change.
+    """
+
+    def __init__(self, db, use_soundex):
+        self.db = db
+        self.use_soundex = use_soundex
+
+    def find_potentials(self, thresh):
+        males = {}
+        females = {}
+        dupes = {}
+        for p1_id in self.db.iter_person_handles():
+            p1 = self.db.get_person_from_handle(p1_id)
+            key = self.gen_key(get_surnames(p1.get_primary_name()))
+            if p1.get_gender() == Person.MALE:
+                males.setdefault(key, []).append(p1_id)
+            else:
+                females.setdefault(key, []).append(p1_id)
+
+        for p1key in self.db.iter_person_handles():
+            p1 = self.db.get_person_from_handle(p1key)
+            key = self.gen_key(get_surnames(p1.get_primary_name()))
+            if p1.get_gender() == Person.MALE:
+                remaining = males[key]
+            else:
+                remaining = females[key]
+            for p2key in remaining:
+                if p1key == p2key:
+                    continue
+                p2 = self.db.get_person_from_handle(p2key)
+                if p2key in dupes and dupes[p2key][0] == p1key:
+                    continue
+                chance = self.compare_people(p1, p2)
+                if chance >= thresh:
+                    if p1key not in dupes or dupes[p1key][1] > chance:
+                        dupes[p1key] = (p2key, chance)
+        return dupes
+
+    def gen_key(self, val):
+        return libduplicates.gen_key(val, self.use_soundex)
+
+    def ancestors_of(self, p1_id, id_list):
+        if (not p1_id) or (p1_id in id_list):
+            return
+        id_list.append(p1_id)
+        p1 = self.db.get_person_from_handle(p1_id)
+        f1_id = p1.get_main_parents_family_handle()
+        if f1_id:
+            f1 = self.db.get_family_from_handle(f1_id)
+            self.ancestors_of(f1.get_father_handle(), id_list)
+            self.ancestors_of(f1.get_mother_handle(), id_list)
+
+    def get_event(self, event_ref):
+        if event_ref:
+            return self.db.get_event_from_handle(event_ref.ref)
+        return Event()
+
+    def get_name(self, handle):
+        if handle:
+            return self.db.get_person_from_handle(handle).get_primary_name()
+        return None
+
+    def compare_people(self, p1, p2):
+        chance = self.name_match(p1.get_primary_name(), p2.get_primary_name())
+        if chance == -1:
+            return -1
+
+        birth1 = self.get_event(p1.get_birth_ref())
+        death1 = self.get_event(p1.get_death_ref())
+        birth2 = self.get_event(p2.get_birth_ref())
+        death2 = self.get_event(p2.get_death_ref())
+        for event1, event2 in ((birth1, birth2), (death1, death2)):
+            value = date_match(event1.get_date_object(), event2.get_date_object())
+            if value == -1:
+                return -1
+            chance += value
+        for event1, event2 in ((birth1, birth2), (death1, death2)):
+            value = self.place_match(
+                event1.get_place_handle(), event2.get_place_handle()
+            )
+            if value == -1:
+                return -1
+            chance += value
+
+        ancestors = []
+        self.ancestors_of(p1.get_handle(), ancestors)
+        if p2.get_handle() in ancestors:
+            return -1
+        ancestors = []
+        self.ancestors_of(p2.get_handle(), ancestors)
+        if p1.get_handle() in ancestors:
+            return -1
+
+        f1_id = p1.get_main_parents_family_handle()
+        f2_id = p2.get_main_parents_family_handle()
+        if f1_id and f2_id:
+            f1 = self.db.get_family_from_handle(f1_id)
+            f2 = self.db.get_family_from_handle(f2_id)
+            value = self.name_match(
+                self.get_name(f1.get_father_handle()),
+                self.get_name(f2.get_father_handle()),
+            )
+            if value == -1:
+                return -1
+            chance += value
+            value = self.name_match(
+                self.get_name(f1.get_mother_handle()),
+                self.get_name(f2.get_mother_handle()),
+            )
+            if value == -1:
+                return -1
+            chance += value
+
+        for f1_id in p1.get_family_handle_list():
+            f1 = self.db.get_family_from_handle(f1_id)
+            for f2_id in p2.get_family_handle_list():
+                f2 = self.db.get_family_from_handle(f2_id)
+                if p1.get_gender() == Person.FEMALE:
+                    spouse1_id = f1.get_father_handle()
+                    spouse2_id = f2.get_father_handle()
+                else:
+                    spouse1_id = f1.get_mother_handle()
+                    spouse2_id = f2.get_mother_handle()
+                if spouse1_id and spouse2_id:
+                    if spouse1_id == spouse2_id:
+                        chance += 1
+                    else:
+                        value = self.name_match(
+                            self.get_name(spouse1_id), self.get_name(spouse2_id)
+                        )
+                        if value != -1:
+                            chance += value
+        return chance
+
+    def name_compare(self, s1, s2):
+        if self.use_soundex:
+            try:
+                return compare(s1, s2)
+            except UnicodeEncodeError:
+                return s1 == s2
+        else:
+            return s1 == s2
+
+    def name_match(self, name, name1):
+        if not name1 or not name:
+            return 0
+
+        srn1 = get_surnames(name)
+        sfx1 = name.get_suffix()
+        srn2 = get_surnames(name1)
+        sfx2 = name1.get_suffix()
+
+        if not self.name_compare(srn1, srn2):
+            return -1
+        if sfx1 != sfx2:
+            if sfx1 != "" and sfx2 != "":
+                return -1
+
+        if name.get_first_name() == name1.get_first_name():
+            return 1
+        else:
+            list1 = name.get_first_name().split()
+            list2 = name1.get_first_name().split()
+
+            if len(list1) < len(list2):
+                return self.list_reduce(list1, list2)
+            else:
+                return self.list_reduce(list2, list1)
+
+    def place_match(self, p1_id, p2_id):
+        if p1_id == p2_id:
+            return 1
+
+        if not p1_id:
+            name1 = ""
+        else:
+            name1 = self.db.get_place_from_handle(p1_id).get_title()
+        if not p2_id:
+            name2 = ""
+        else:
+            name2 = self.db.get_place_from_handle(p2_id).get_title()
+
+        if not (name1 and name2):
+            return 0
+        if name1 == name2:
+            return 1
+
+        list1 = name1.replace(",", " ").split()
+        list2 = name2.replace(",", " ").split()
+
+        value = 0
+        for name in list1:
+            for name2 in list2:
+                if name == name2:
+                    value += 0.5
+                elif name[0] == name2[0] and self.name_compare(name, name2):
+                    value += 0.25
+        return min(value, 1) if value else -1
+
+    def list_reduce(self, list1, list2):
+        value = 0
+        for name in list1:
+            for name2 in list2:
+                if is_initial(name) and name[0] == name2[0]:
+                    value += 0.25
+                elif is_initial(name2) and name2[0] == name[0]:
+                    value += 0.25
+                elif name == name2:
+                    value += 0.5
+                elif name[0] == name2[0] and self.name_compare(name, name2):
+                    value += 0.25
+        return min(value, 1) if value else -1
+
+
+class DuplicatesTest(unittest.TestCase):
+    """
+    Compare the search of duplicates with the search of the old tool.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.addCleanup(self.db.close)
+
+    def add_event(self, person, event_type, year, place, trans):
+        event = Event()
+        event.set_type(event_type)
+        if year:
+            date = Date()
+            date.set_yr_mon_day(year, random.choice([0, 1, 2]), 0)
+            event.set_date_object(date)
+        event.set_place_handle(place)
+        self.db.add_event(event, trans)
+        ref = EventRef()
+        ref.ref = event.handle
+        person.add_event_ref(ref)
+        return ref
+
+    def make_tree(self, count):
+        random.seed(2)
+        with DbTxn("Add", self.db) as trans:
+            places = []
+            for title in PLACES:
+                place = Place()
+                place.set_title(title)
+                self.db.add_place(place, trans)
+                places.append(place.handle)
+            people = []
+            # the handles are not in the order in which the people are added
+            for handle in random.sample(range(10 * count), count):
+                person = Person()
+                person.set_handle("P%06d" % handle)
+                person.set_gender(random.choice([Person.MALE, Person.FEMALE]))
+                name = person.get_primary_name()
+                name.set_first_name(random.choice(FIRST_NAMES))
+                surname = Surname()
+                surname.set_surname(random.choice(SURNAMES))
+                name.add_surname(surname)
+                year = random.choice([None, 1850, 1851, 1852])
+                if random.random() < 0.8:
+                    person.set_birth_ref(
+                        self.add_event(
+                            person,
+                            EventType.BIRTH,
+                            year,
+                            random.choice(places),
+                            trans,
+                        )
+                    )
+                if random.random() < 0.3:
+                    person.set_death_ref(
+                        self.add_event(
+                            person,
+                            EventType.DEATH,
+                            year and year + 60,
+                            random.choice(places),
+                            trans,
+                        )
+                    )
+                self.db.add_person(person, trans)
+                people.append(person)
+            for index in range(0, count - 2, 3):
+                father, mother, child = people[index : index + 3]
+                family = Family()
+                family.set_father_handle(father.handle)
+                family.set_mother_handle(mother.handle)
+                ref = ChildRef()
+                ref.ref = child.handle
+                family.add_child_ref(ref)
+                self.db.add_family(family, trans)
+                for parent in (father, mother):
+                    parent.add_family_handle(family.handle)
+                    self.db.commit_person(parent, trans)
+                child.add_parent_family_handle(family.handle)
+                self.db.commit_person(child, trans)
+
+    def test_same_matches(self):
+        self.make_tree(300)
+        for use_soundex in (True, False):
+            for threshold in (-1, 0.25, 1.0, 2.0):
+                expected = OldDuplicates(self.db, use_soundex).find_potentials(
+                    threshold
+                )
+                self.assertEqual(
+                    find_duplicates(self.db, threshold, use_soundex, processes=1),
+                    expected,
+                )
+                if threshold == 0.25:
+                    self.assertTrue(expected)
+
+    def test_parallel(self):
+        self.make_tree(200)
+        min_pairs = libduplicates.MIN_PARALLEL_PAIRS
+        shard_size = libduplicates.SHARD_SIZE
+        self.addCleanup(setattr, libduplicates, "MIN_PARALLEL_PAIRS", min_pairs)
+        self.addCleanup(setattr, libduplicates, "SHARD_SIZE", shard_size)
+        libduplicates.MIN_PARALLEL_PAIRS = 0
+        libduplicates.SHARD_SIZE = 20
+        self.assertEqual(
+            find_duplicates(self.db, 0.25, processes=2),
+            find_duplicates(self.db, 0.25, processes=1),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
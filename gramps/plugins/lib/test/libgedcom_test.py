@@ -0,0 +1,90 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the text shared by the two stages of the GEDCOM import.
+"""
+
+import os
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from ..libgedcom import GedcomStageOne, TextReader, UTF16Reader, UTF8Reader
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+
+
+class StageOneTextTest(unittest.TestCase):
+    """
+    Compare the lines read from the text of the first stage with those read
+    from the file again.
+    """
+
+    def stage_one(self, name):
+        with open(os.path.join(TEST_DIR, name), "rb") as ifile:
+            stage_one = GedcomStageOne(ifile)
+            stage_one.parse()
+        return stage_one
+
+    def read_lines(self, reader):
+        lines = []
+        line = reader.readline()
+        while line:
+            lines.append(line)
+            line = reader.readline()
+        return lines
+
+    def test_same_lines(self):
+        for name, reader_class in (
+            ("imp_UTF_8_NOBOM_CR.ged", UTF8Reader),
+            ("imp_UTF_8_NOBOM_CRLF.ged", UTF8Reader),
+            ("imp_UTF_8_BOM_LF.ged", UTF8Reader),
+            ("imp_UTF_16_LE_BOM_CRLF.ged", UTF16Reader),
+            ("imp_UTF_16_BE_BOM_CR.ged", UTF16Reader),
+        ):
+            stage_one = self.stage_one(name)
+            text = stage_one.get_text()
+            self.assertIsNotNone(text, name)
+            with open(os.path.join(TEST_DIR, name), "rb") as ifile:
+                if reader_class is UTF8Reader:
+                    reader = UTF8Reader(ifile, None, stage_one.get_encoding())
+                else:
+                    reader = UTF16Reader(ifile, None)
+                expected = self.read_lines(reader)
+            self.assertEqual(self.read_lines(TextReader(text, None)), expected)
+            self.assertEqual(
+                len([line for line in expected if line.strip()]),
+                stage_one.get_line_count(),
+            )
+
+    def test_decoded_again(self):
+        self.assertIsNone(self.stage_one("imp_ANSEL_LF.ged").get_text())
+        self.assertIsNone(self.stage_one("imp_cp1252_LF.ged").get_text())
+        stage_one = self.stage_one("imp_UTF_8_NOBOM_LF.ged")
+        stage_one.set_encoding("ANSEL")
+        self.assertIsNone(stage_one.get_text())
+
+    def test_last_line(self):
+        reader = TextReader("0 HEAD\x01\n0 TRLR", None)
+        self.assertEqual(self.read_lines(reader), ["0 HEAD\n", "0 TRLR"])
+
+
+if __name__ == "__main__":
+    unittest.main()
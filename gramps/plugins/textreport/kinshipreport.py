@@ -118,6 +118,7 @@ class KinshipReport(Report):
 
         self.kinship_map = {}
         self.spouse_map = {}
+        self.traversed = set()
 
     def write_report(self):
         """
@@ -188,6 +189,8 @@ class KinshipReport(Report):
            to skip the descendant that brought you this generation in the first
            place.
         """
+        if self.__done("down", person_handle, Ga, Gb, skip_handle):
+            return
         for child_handle in self.get_children_handles(person_handle):
             if child_handle != skip_handle:
                 self.add_kin(child_handle, Ga, Gb)
@@ -221,6 +224,18 @@ class KinshipReport(Report):
             if Ga < self.max_ascend:
                 self.traverse_up(parent_handle, Ga + 1, 0)
 
+    def __done(self, *call):
+        """
+        Return True if the traversal was already called with the same
+        arguments, and note the call otherwise.  In a tree where people are
+        reached through several lines, a repeated call would only add the
+        people already added, in the same order.
+        """
+        if call in self.traversed:
+            return True
+        self.traversed.add(call)
+        return False
+
     def add_kin(self, person_handle, Ga, Gb):
         """
         Add a person handle to the kin map.
@@ -100,10 +100,18 @@ class NumberOfAncestorsReport(Report):
         The routine that actually creates the report.
         At this point, the document is opened and ready for writing.
         """
-        thisgen = {}
         all_people = {}
         total_theoretical = 0
-        thisgen[self.__person.get_handle()] = 1
+        # The number of paths to the ancestors of each generation, the
+        # person being generation 1
+        generations = [{self.__person.get_handle(): 1}]
+        for handle, gen, paths in self.__db.iter_ancestors(
+            self.__person.get_handle(), main_only=True
+        ):
+            if gen == len(generations):
+                generations.append({})
+            generations[gen][handle] = paths
+            all_people[handle] = all_people.get(handle, 0) + paths
         ngettext = self._locale.translation.ngettext  # to see "nearby" comments
 
         self.doc.start_paragraph("NOA-Title")
@@ -114,55 +122,28 @@ class NumberOfAncestorsReport(Report):
         self.doc.write_text(title, mark)
         self.doc.end_paragraph()
 
-        thisgensize = 1
         gen = 0
-        while thisgensize > 0:
-            thisgensize = 0
-            if thisgen != {}:
-                thisgensize = len(thisgen)
-                gen += 1
-                theoretical = math.pow(2, (gen - 1))
-                total_theoretical += theoretical
-                percent = "(%s%%)" % self._locale.format_string(
-                    "%3.2f", ((sum(thisgen.values()) / theoretical) * 100)
-                )
-
-                # TC # English return something like:
-                # Generation 3 has 2 individuals. (50.00%)
-                # Translators: leave all/any {...} untranslated
-                text = ngettext(
-                    "Generation {number} has {count} individual. {percent}",
-                    "Generation {number} has {count} individuals. {percent}",
-                    thisgensize,
-                ).format(number=gen, count=thisgensize, percent=percent)
-
-                self.doc.start_paragraph("NOA-Normal")
-                self.doc.write_text(text)
-                self.doc.end_paragraph()
-
-            temp = thisgen
-            thisgen = {}
-            for person_handle, person_data in temp.items():
-                person = self.__db.get_person_from_handle(person_handle)
-                family_handle = person.get_main_parents_family_handle()
-                if family_handle:
-                    family = self.__db.get_family_from_handle(family_handle)
-                    father_handle = family.get_father_handle()
-                    mother_handle = family.get_mother_handle()
-                    if father_handle:
-                        thisgen[father_handle] = (
-                            thisgen.get(father_handle, 0) + person_data
-                        )
-                        all_people[father_handle] = (
-                            all_people.get(father_handle, 0) + person_data
-                        )
-                    if mother_handle:
-                        thisgen[mother_handle] = (
-                            thisgen.get(mother_handle, 0) + person_data
-                        )
-                        all_people[mother_handle] = (
-                            all_people.get(mother_handle, 0) + person_data
-                        )
+        for thisgen in generations:
+            thisgensize = len(thisgen)
+            gen += 1
+            theoretical = math.pow(2, (gen - 1))
+            total_theoretical += theoretical
+            percent = "(%s%%)" % self._locale.format_string(
+                "%3.2f", ((sum(thisgen.values()) / theoretical) * 100)
+            )
+
+            # TC # English return something like:
+            # Generation 3 has 2 individuals. (50.00%)
+            # Translators: leave all/any {...} untranslated
+            text = ngettext(
+                "Generation {number} has {count} individual. {percent}",
+                "Generation {number} has {count} individuals. {percent}",
+                thisgensize,
+            ).format(number=gen, count=thisgensize, percent=percent)
+
+            self.doc.start_paragraph("NOA-Normal")
+            self.doc.write_text(text)
+            self.doc.end_paragraph()
 
         if total_theoretical != 1:
             percent = "(%3.2f%%)" % (
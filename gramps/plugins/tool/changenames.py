@@ -273,6 +273,7 @@ class ChangeNames(tool.BatchTool, ManagedWindow):
 
             # with self.db.get_person_cursor(update=True, commit=True) as cursor:
             #  for handle, data in cursor:
+            changed = []
             for handle in self.db.get_person_handles(False):
                 person = self.db.get_person_from_handle(handle)
                 # person = Person(data)
@@ -286,7 +287,8 @@ class ChangeNames(tool.BatchTool, ManagedWindow):
                             surn.set_surname(sname)
                 if change:
                     # cursor.update(handle, person.serialize())
-                    self.db.commit_person(person, self.trans)
+                    changed.append(person)
+            self.db.commit_many(changed, self.trans)
 
         self.db.enable_signals()
         self.db.request_rebuild()
@@ -1696,6 +1696,7 @@ class CheckIntegrity:
         self.progress.set_pass(_("Looking for citation reference problems"), total)
         logging.info("Looking for citation reference problems")
 
+        changed = {}
         for handle in self.db.get_person_handles():
             self.progress.step()
             person = self.db.get_person_from_handle(handle)
@@ -1705,11 +1706,13 @@ class CheckIntegrity:
                     if not item[1]:
                         new_handle = create_id()
                         person.replace_citation_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
+                        changed[handle] = person
                         self.invalid_citation_references.add(new_handle)
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
+        self.db.commit_many(changed.values(), self.trans)
 
+        changed = {}
         for handle in self.db.get_family_handles():
             self.progress.step()
             family = self.db.get_family_from_handle(handle)
@@ -1719,11 +1722,13 @@ class CheckIntegrity:
                     if not item[1]:
                         new_handle = create_id()
                         family.replace_citation_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
+                        changed[handle] = family
                         self.invalid_citation_references.add(new_handle)
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
+        self.db.commit_many(changed.values(), self.trans)
 
+        changed = {}
         for handle in self.db.get_place_handles():
             self.progress.step()
             place = self.db.get_place_from_handle(handle)
@@ -1733,11 +1738,13 @@ class CheckIntegrity:
                     if not item[1]:
                         new_handle = create_id()
                         place.replace_citation_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
+                        changed[handle] = place
                         self.invalid_citation_references.add(new_handle)
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
+        self.db.commit_many(changed.values(), self.trans)
 
+        changed = {}
         for handle in self.db.get_citation_handles():
             self.progress.step()
             citation = self.db.get_citation_from_handle(handle)
@@ -1747,11 +1754,13 @@ class CheckIntegrity:
                     if not item[1]:
                         new_handle = create_id()
                         citation.replace_citation_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
+                        changed[handle] = citation
                         self.invalid_citation_references.add(new_handle)
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
+        self.db.commit_many(changed.values(), self.trans)
 
+        changed = {}
         for handle in self.db.get_repository_handles():
             self.progress.step()
             repository = self.db.get_repository_from_handle(handle)
@@ -1761,11 +1770,13 @@ class CheckIntegrity:
                     if not item[1]:
                         new_handle = create_id()
                         repository.replace_citation_references(None, new_handle)
-                        self.db.commit_repository(repository, self.trans)
+                        changed[handle] = repository
                         self.invalid_citation_references.add(new_handle)
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
+        self.db.commit_many(changed.values(), self.trans)
 
+        changed = {}
         for handle in self.db.get_media_handles():
             self.progress.step()
             obj = self.db.get_media_from_handle(handle)
@@ -1775,11 +1786,13 @@ class CheckIntegrity:
                     if not item[1]:
                         new_handle = create_id()
                         obj.replace_citation_references(None, new_handle)
-                        self.db.commit_media(obj, self.trans)
+                        changed[handle] = obj
                         self.invalid_citation_references.add(new_handle)
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
+        self.db.commit_many(changed.values(), self.trans)
 
+        changed = {}
         for handle in self.db.get_event_handles():
             self.progress.step()
             event = self.db.get_event_from_handle(handle)
@@ -1789,10 +1802,11 @@ class CheckIntegrity:
                     if not item[1]:
                         new_handle = create_id()
                         event.replace_citation_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
+                        changed[handle] = event
                         self.invalid_citation_references.add(new_handle)
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
+        self.db.commit_many(changed.values(), self.trans)
 
         for bad_handle in self.invalid_citation_references:
             created = make_unknown(
@@ -2369,13 +2383,14 @@ class CheckIntegrity:
         self.progress.set_pass(_("Looking for Duplicated Gramps ID " "problems"), total)
         logging.info("Looking for Duplicated Gramps ID problems")
         gid_list = []
+        changed = []
         for citation in self.db.iter_citations():
             self.progress.step()
             ogid = gid = citation.get_gramps_id()
             if gid in gid_list:
                 gid = self.db.find_next_citation_gramps_id()
                 citation.set_gramps_id(gid)
-                self.db.commit_citation(citation, self.trans)
+                changed.append(citation)
                 logging.warning(
                     "    FAIL: Duplicated Gramps ID found, "
                     'Original: "%s" changed to: "%s"',
@@ -2384,14 +2399,16 @@ class CheckIntegrity:
                 )
                 self.duplicated_gramps_ids += 1
             gid_list.append(gid)
+        self.db.commit_many(changed, self.trans)
         gid_list = []
+        changed = []
         for event in self.db.iter_events():
             self.progress.step()
             ogid = gid = event.get_gramps_id()
             if gid in gid_list:
                 gid = self.db.find_next_event_gramps_id()
                 event.set_gramps_id(gid)
-                self.db.commit_event(event, self.trans)
+                changed.append(event)
                 logging.warning(
                     "    FAIL: Duplicated Gramps ID found, "
                     'Original: "%s" changed to: "%s"',
@@ -2400,14 +2417,16 @@ class CheckIntegrity:
                 )
                 self.duplicated_gramps_ids += 1
             gid_list.append(gid)
+        self.db.commit_many(changed, self.trans)
         gid_list = []
+        changed = []
         for family in self.db.iter_families():
             self.progress.step()
             ogid = gid = family.get_gramps_id()
             if gid in gid_list:
                 gid = self.db.find_next_family_gramps_id()
                 family.set_gramps_id(gid)
-                self.db.commit_family(family, self.trans)
+                changed.append(family)
                 logging.warning(
                     "    FAIL: Duplicated Gramps ID found, "
                     'Original: "%s" changed to: "%s"',
@@ -2416,14 +2435,16 @@ class CheckIntegrity:
                 )
                 self.duplicated_gramps_ids += 1
             gid_list.append(gid)
+        self.db.commit_many(changed, self.trans)
         gid_list = []
+        changed = []
         for media in self.db.iter_media():
             self.progress.step()
             ogid = gid = media.get_gramps_id()
             if gid in gid_list:
                 gid = self.db.find_next_media_gramps_id()
                 media.set_gramps_id(gid)
-                self.db.commit_media(media, self.trans)
+                changed.append(media)
                 logging.warning(
                     "    FAIL: Duplicated Gramps ID found, "
                     'Original: "%s" changed to: "%s"',
@@ -2432,14 +2453,16 @@ class CheckIntegrity:
                 )
                 self.duplicated_gramps_ids += 1
             gid_list.append(gid)
+        self.db.commit_many(changed, self.trans)
         gid_list = []
+        changed = []
         for note in self.db.iter_notes():
             self.progress.step()
             ogid = gid = note.get_gramps_id()
             if gid in gid_list:
                 gid = self.db.find_next_note_gramps_id()
                 note.set_gramps_id(gid)
-                self.db.commit_note(note, self.trans)
+                changed.append(note)
                 logging.warning(
                     "    FAIL: Duplicated Gramps ID found, "
                     'Original: "%s" changed to: "%s"',
@@ -2448,14 +2471,16 @@ class CheckIntegrity:
                 )
                 self.duplicated_gramps_ids += 1
             gid_list.append(gid)
+        self.db.commit_many(changed, self.trans)
         gid_list = []
+        changed = []
         for person in self.db.iter_people():
             self.progress.step()
             ogid = gid = person.get_gramps_id()
             if gid in gid_list:
                 gid = self.db.find_next_person_gramps_id()
                 person.set_gramps_id(gid)
-                self.db.commit_person(person, self.trans)
+                changed.append(person)
                 logging.warning(
                     "    FAIL: Duplicated Gramps ID found, "
                     'Original: "%s" changed to: "%s"',
@@ -2464,14 +2489,16 @@ class CheckIntegrity:
                 )
                 self.duplicated_gramps_ids += 1
             gid_list.append(gid)
+        self.db.commit_many(changed, self.trans)
         gid_list = []
+        changed = []
         for place in self.db.iter_places():
             self.progress.step()
             ogid = gid = place.get_gramps_id()
             if gid in gid_list:
                 gid = self.db.find_next_place_gramps_id()
                 place.set_gramps_id(gid)
-                self.db.commit_place(place, self.trans)
+                changed.append(place)
                 logging.warning(
                     "    FAIL: Duplicated Gramps ID found, "
                     'Original: "%s" changed to: "%s"',
@@ -2480,14 +2507,16 @@ class CheckIntegrity:
                 )
                 self.duplicated_gramps_ids += 1
             gid_list.append(gid)
+        self.db.commit_many(changed, self.trans)
         gid_list = []
+        changed = []
         for repository in self.db.iter_repositories():
             self.progress.step()
             ogid = gid = repository.get_gramps_id()
             if gid in gid_list:
                 gid = self.db.find_next_repository_gramps_id()
                 repository.set_gramps_id(gid)
-                self.db.commit_repository(repository, self.trans)
+                changed.append(repository)
                 logging.warning(
                     "    FAIL: Duplicated Gramps ID found, "
                     'Original: "%s" changed to: "%s"',
@@ -2496,14 +2525,16 @@ class CheckIntegrity:
                 )
                 self.duplicated_gramps_ids += 1
             gid_list.append(gid)
+        self.db.commit_many(changed, self.trans)
         gid_list = []
+        changed = []
         for source in self.db.iter_sources():
             self.progress.step()
             ogid = gid = source.get_gramps_id()
             if gid in gid_list:
                 gid = self.db.find_next_source_gramps_id()
                 source.set_gramps_id(gid)
-                self.db.commit_source(source, self.trans)
+                changed.append(source)
                 logging.warning(
                     "    FAIL: Duplicated Gramps ID found, "
                     'Original: "%s" changed to: "%s"',
@@ -2512,6 +2543,7 @@ class CheckIntegrity:
                 )
                 self.duplicated_gramps_ids += 1
             gid_list.append(gid)
+        self.db.commit_many(changed, self.trans)
 
     def check_note_links(self):
         """
@@ -86,6 +86,8 @@ DB_INDXES = {
     "media": "o",
     "note": "n",
 }
+# Number of changed objects committed together
+COMMIT_CHUNK = 1000
 # -------------------------------------------------------------------------
 #
 # Actual tool
@@ -631,10 +633,11 @@ class ReorderIds(tool.BatchTool, ManagedWindow, UpdateCallback):
 
         dup_ids = []  # list of duplicate identifiers
         new_ids = {}  # list of new identifiers
+        changed = {}  # objects with a new identifier, not yet committed
 
         (
             get_handles,
-            commit,
+            dummy,
             get_from_id,
             get_from_handle,
             next_from_id,
@@ -655,6 +658,19 @@ class ReorderIds(tool.BatchTool, ManagedWindow, UpdateCallback):
         handles = get_handles()
         handles.sort()
 
+        def commit_changed(limit=0):
+            """Commit the changed objects once there are more than limit."""
+            if len(changed) > limit:
+                self.db.commit_many(changed.values(), self.trans)
+                changed.clear()
+
+        def id_in_use(gramps_id):
+            """Tell if an identifier is used, including uncommitted changes."""
+            if gramps_id in new_ids:
+                return True
+            obj = get_from_id(gramps_id)
+            return obj is not None and obj.handle not in changed
+
         for handle in handles:
             # Update progress
             if self.uistate:
@@ -724,7 +740,8 @@ class ReorderIds(tool.BatchTool, ManagedWindow, UpdateCallback):
                     or not keep_fmt
                 ):
                     obj.set_gramps_id(new_id)
-                    commit(obj, self.trans)
+                    changed[handle] = obj
+                    commit_changed(COMMIT_CHUNK)
                     new_id = self.obj_values[prim_obj].succ_id()
             else:
                 # attempt to extract integer - if we can't, treat it as a
@@ -747,16 +764,18 @@ class ReorderIds(tool.BatchTool, ManagedWindow, UpdateCallback):
                                 dup_ids.append(obj.get_handle())
                             else:
                                 new_ids[new_id] = act_id
-                        elif get_from_id(new_id) is not None:
+                        elif id_in_use(new_id):
                             dup_ids.append(obj.get_handle())
                         else:
                             obj.set_gramps_id(new_id)
-                            commit(obj, self.trans)
+                            changed[handle] = obj
+                            commit_changed(COMMIT_CHUNK)
                             new_ids[new_id] = act_id
                     else:
                         dup_ids.append(handle)
                 except:
                     dup_ids.append(handle)
+        commit_changed()
 
         # go through the duplicates, looking for the first available
         # handle that matches the new scheme.
@@ -768,7 +787,9 @@ class ReorderIds(tool.BatchTool, ManagedWindow, UpdateCallback):
             for handle in dup_ids:
                 obj = get_from_handle(handle)
                 obj.set_gramps_id(next_from_id())
-                commit(obj, self.trans)
+                changed[handle] = obj
+                commit_changed(COMMIT_CHUNK)
+            commit_changed()
 
 
 # ------------------------------------------------------------------------
@@ -177,7 +177,7 @@ register(
     category=TOOL_DBPROC,
     toolclass="DuplicatePeopleTool",
     optionclass="DuplicatePeopleToolOptions",
-    tool_modes=[TOOL_MODE_GUI],
+    tool_modes=[TOOL_MODE_GUI, TOOL_MODE_CLI],
 )
 
 # ------------------------------------------------------------------------
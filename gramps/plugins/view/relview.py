@@ -69,6 +69,7 @@ from gramps.gen.lib import (
 )
 from gramps.gen.lib.date import Today
 from gramps.gen.db import DbTxn
+from gramps.gen.proxy import CacheProxyDb
 from gramps.gui.views.navigationview import NavigationView
 from gramps.gui.uimanager import ActionGroup
 from gramps.gui.editors import EditPerson, EditFamily
@@ -153,6 +154,8 @@ class RelationshipView(NavigationView):
             nav_group,
         )
 
+        # cached lookups for displaying; make changes through self.dbstate.db
+        self.db = CacheProxyDb(dbstate.db)
         dbstate.connect("database-changed", self.change_db)
         uistate.connect("nameformat-changed", self.build_tree)
         uistate.connect("placeformat-changed", self.build_tree)
@@ -596,6 +599,7 @@ class RelationshipView(NavigationView):
     def change_db(self, db):
         # reset the connects
         self._change_db(db)
+        self.db = CacheProxyDb(db)
         if self.child:
             list(map(self.vbox.remove, self.vbox.get_children()))
             list(map(self.header.remove, self.header.get_children()))
@@ -606,7 +610,7 @@ class RelationshipView(NavigationView):
 
     def get_name(self, handle, use_gender=False):
         if handle:
-            person = self.dbstate.db.get_person_from_handle(handle)
+            person = self.db.get_person_from_handle(handle)
             name = name_displayer.display(person)
             if use_gender:
                 gender = self.symbols.get_symbol_for_string(person.gender)
@@ -661,7 +665,7 @@ class RelationshipView(NavigationView):
 
         person = None
         if obj:
-            person = self.dbstate.db.get_person_from_handle(obj)
+            person = self.db.get_person_from_handle(obj)
         if not person:
             self.uimanager.set_actions_sensitive(self.family_action, False)
             self.uimanager.set_actions_sensitive(self.order_action, False)
@@ -752,7 +756,7 @@ class RelationshipView(NavigationView):
         subgrid.attach(label, 2, 0, 1, 1)
 
         # Birth event.
-        birth = get_birth_or_fallback(self.dbstate.db, person)
+        birth = get_birth_or_fallback(self.db, person)
         if birth:
             if birth.get_type() == EventType.BAPTISM:
                 birth_title = self.bptsm
@@ -766,7 +770,7 @@ class RelationshipView(NavigationView):
         birthwidget.set_selectable(True)
         subgrid.attach(birthwidget, 2, 1, 1, 1)
 
-        death = get_death_or_fallback(self.dbstate.db, person)
+        death = get_death_or_fallback(self.db, person)
         if death:
             if death.get_type() == EventType.BURIAL:
                 death_title = self.burial
@@ -799,7 +803,7 @@ class RelationshipView(NavigationView):
                         showed_death = True
                 if not showed_death:
                     age = (Today() - birth_date).format(precision=self.age_precision)
-                    if probably_alive(person, self.dbstate.db):
+                    if probably_alive(person, self.db):
                         subgrid.attach(
                             widgets.BasicLabel(_("%s:") % _("Alive")), 1, 2, 1, 1
                         )
@@ -837,10 +841,10 @@ class RelationshipView(NavigationView):
         # image
         image_list = person.get_media_list()
         if image_list:
-            mobj = self.dbstate.db.get_media_from_handle(image_list[0].ref)
+            mobj = self.db.get_media_from_handle(image_list[0].ref)
             if mobj and mobj.get_mime_type()[0:5] == "image":
                 pixbuf = get_thumbnail_image(
-                    media_path_full(self.dbstate.db, mobj.get_path()),
+                    media_path_full(self.db, mobj.get_path()),
                     rectangle=image_list[0].get_rectangle(),
                 )
                 image = Gtk.Image()
@@ -857,7 +861,7 @@ class RelationshipView(NavigationView):
         """
         Open this picture in the default picture viewer.
         """
-        photo_path = media_path_full(self.dbstate.db, photo.get_path())
+        photo_path = media_path_full(self.db, photo.get_path())
         open_file_with_default_application(photo_path, self.uistate)
 
     def write_person_event(self, ename, event):
@@ -865,7 +869,7 @@ class RelationshipView(NavigationView):
             dobj = event.get_date_object()
             phandle = event.get_place_handle()
             if phandle:
-                pname = place_displayer.display_event(self.dbstate.db, event)
+                pname = place_displayer.display_event(self.db, event)
             else:
                 pname = None
 
@@ -892,7 +896,7 @@ class RelationshipView(NavigationView):
             dobj = event.get_date_object()
             phandle = event.get_place_handle()
             if phandle:
-                pname = place_displayer.display_event(self.dbstate.db, event)
+                pname = place_displayer.display_event(self.db, event)
             else:
                 pname = None
 
@@ -936,10 +940,10 @@ class RelationshipView(NavigationView):
             father = mother = None
             hdl1 = family.get_father_handle()
             if hdl1:
-                father = self.dbstate.db.get_person_from_handle(hdl1).gender
+                father = self.db.get_person_from_handle(hdl1).gender
             hdl2 = family.get_mother_handle()
             if hdl2:
-                mother = self.dbstate.db.get_person_from_handle(hdl2).gender
+                mother = self.db.get_person_from_handle(hdl2).gender
             if father != mother:
                 symbol = self.marr
             elif father == Person.MALE:
@@ -1027,7 +1031,7 @@ class RelationshipView(NavigationView):
                 call_fcn = self.add_family
                 del_fcn = self.delete_family
 
-            if not self.dbstate.db.readonly:
+            if not self.db.readonly:
                 # Show edit-Buttons only if db is not readonly
                 if self.reorder_sensitive:
                     add = widgets.IconButton(
@@ -1049,7 +1053,7 @@ class RelationshipView(NavigationView):
                 edit = widgets.IconButton(self.edit_family, family.handle, "gtk-edit")
                 edit.set_tooltip_text(edit_msg)
                 hbox.pack_start(edit, False, True, 0)
-                if not self.dbstate.db.readonly:
+                if not self.db.readonly:
                     delete = widgets.IconButton(del_fcn, family.handle, "list-remove")
                     delete.set_tooltip_text(del_msg)
                     hbox.pack_start(delete, False, True, 0)
@@ -1064,7 +1068,7 @@ class RelationshipView(NavigationView):
     ######################################################################
 
     def write_parents(self, family_handle, person=None):
-        family = self.dbstate.db.get_family_from_handle(family_handle)
+        family = self.db.get_family_from_handle(family_handle)
         if not family:
             return
         if person and self.check_collapsed(person.handle, family_handle):
@@ -1085,7 +1089,7 @@ class RelationshipView(NavigationView):
                     " ({number_of} sibling)", " ({number_of} siblings)", count
                 ).format(number_of=count)
             elif count == 1:
-                gender = self.dbstate.db.get_person_from_handle(child_list[0]).gender
+                gender = self.db.get_person_from_handle(child_list[0]).gender
                 if gender == Person.MALE:
                     childmsg = _(" (1 brother)")
                 elif gender == Person.FEMALE:
@@ -1146,7 +1150,7 @@ class RelationshipView(NavigationView):
                             " ({number_of} sibling)", " ({number_of} siblings)", count
                         ).format(number_of=count)
                     elif count == 1:
-                        gender = self.dbstate.db.get_person_from_handle(
+                        gender = self.db.get_person_from_handle(
                             child_list[0]
                         ).gender
                         if gender == Person.MALE:
@@ -1262,7 +1266,7 @@ class RelationshipView(NavigationView):
         eventbox = widgets.ShadeBox(self.use_shade)
         if handle:
             name = self.get_name(handle, True)
-            person = self.dbstate.db.get_person_from_handle(handle)
+            person = self.db.get_person_from_handle(handle)
             parent = len(person.get_parent_family_handle_list()) > 0
             format = ""
             relation_display_theme = self._config.get(
@@ -1374,7 +1378,7 @@ class RelationshipView(NavigationView):
             original_vbox.pack_start(ev, True, True, 0)
 
         parent = has_children(
-            self.dbstate.db, self.dbstate.db.get_person_from_handle(handle)
+            self.db, self.db.get_person_from_handle(handle)
         )
 
         format = ""
@@ -1426,11 +1430,11 @@ class RelationshipView(NavigationView):
         box.add(label)
 
     def info_string(self, handle):
-        person = self.dbstate.db.get_person_from_handle(handle)
+        person = self.db.get_person_from_handle(handle)
         if not person:
             return None
 
-        birth = get_birth_or_fallback(self.dbstate.db, person)
+        birth = get_birth_or_fallback(self.db, person)
         if birth:
             if birth.get_type() == EventType.BAPTISM:
                 s_birth = self.bptsm
@@ -1447,7 +1451,7 @@ class RelationshipView(NavigationView):
         else:
             bdate = ""
 
-        death = get_death_or_fallback(self.dbstate.db, person)
+        death = get_death_or_fallback(self.db, person)
         if death:
             if death.get_type() == EventType.BURIAL:
                 s_death = self.burial
@@ -1515,7 +1519,7 @@ class RelationshipView(NavigationView):
             self.my_menu.popup_at_pointer(event)
 
     def build_menu_item(self, handle):
-        person = self.dbstate.db.get_person_from_handle(handle)
+        person = self.db.get_person_from_handle(handle)
         name = name_displayer.display(person)
 
         item = Gtk.MenuItem()
@@ -1544,7 +1548,7 @@ class RelationshipView(NavigationView):
         value = False
         for event_ref in family.get_event_ref_list():
             handle = event_ref.ref
-            event = self.dbstate.db.get_event_from_handle(handle)
+            event = self.db.get_event_from_handle(handle)
             if (
                 event
                 and event.get_type().is_relationship_event()
@@ -1570,7 +1574,7 @@ class RelationshipView(NavigationView):
             dobj = event.get_date_object()
             phandle = event.get_place_handle()
             if phandle:
-                pname = place_displayer.display_event(self.dbstate.db, event)
+                pname = place_displayer.display_event(self.db, event)
             else:
                 pname = None
 
@@ -1605,7 +1609,7 @@ class RelationshipView(NavigationView):
             self.write_data(vbox, "%(event_type)s" % value, start_col, stop_col)
 
     def write_family(self, family_handle, person=None):
-        family = self.dbstate.db.get_family_from_handle(family_handle)
+        family = self.db.get_family_from_handle(family_handle)
         if family is None:
             from gramps.gui.dialog import WarningDialog
 
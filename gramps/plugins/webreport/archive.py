@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Narrative Web Page generator.
+
+The archive of the web site: the files are streamed into a .tar.gz, .tar.zst
+or .zip file as they are written, and the names already in the archive are
+kept in a set, so that writing N files takes a time linear in N.
+
+Classes:
+    WebArchive
+    TarArchive
+    ZipArchive
+    ParallelGzipWriter
+"""
+# ------------------------------------------------
+# python modules
+# ------------------------------------------------
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+from io import BytesIO
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+
+# ------------------------------------------------
+# Gramps module
+# ------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.constfunc import win
+
+HAVE_ZSTD = False
+try:
+    import zstandard
+
+    HAVE_ZSTD = True
+except ImportError:
+    pass
+
+_ = glocale.translation.sgettext
+
+# The formats of the archive, given by their extension
+ARCHIVE_FORMATS = [".tar.gz"] + ([".tar.zst"] if HAVE_ZSTD else []) + [".zip"]
+
+# Size of the blocks compressed by the threads of a ParallelGzipWriter
+BLOCK_SIZE = 1 << 20
+
+
+def open_archive(filename, fmt=".tar.gz", threads=0):
+    """
+    Create the archive of the web site.
+
+    @param: filename -- The name of the archive file
+    @param: fmt      -- The format of the archive, from ARCHIVE_FORMATS
+    @param: threads  -- The number of threads compressing the archive;
+                        0 or 1 compresses it in the calling thread
+    """
+    if fmt == ".zip":
+        return ZipArchive(filename)
+    if fmt == ".tar.zst" and not HAVE_ZSTD:
+        raise ValueError(_("The zstandard module is needed for a .tar.zst archive"))
+    if fmt not in (".tar.gz", ".tar.zst"):
+        raise ValueError(_("Unknown archive format: %s") % fmt)
+    return TarArchive(filename, fmt, threads)
+
+
+# ------------------------------------------------
+# WebArchive
+# ------------------------------------------------
+class WebArchive:
+    """
+    The archive of the web site.  A file is only added once: the names of
+    the files added are kept, and "name in archive" tells whether a file is
+    already there.
+    """
+
+    def __init__(self):
+        self.names = set()
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def add_data(self, name, data, mtime=None):
+        """
+        Add a file given by its content, unless it is already there.
+
+        @param: name  -- The name of the file in the archive
+        @param: data  -- The content of the file, as bytes
+        @param: mtime -- The last modification time; None for the current time
+        """
+        if name not in self.names:
+            self.names.add(name)
+            self._add_data(name, data, time.time() if mtime is None else mtime)
+
+    def add_file(self, fname, name, mtime=None):
+        """
+        Add a file of the file system, unless it is already there.
+
+        @param: fname -- The path of the file to add
+        @param: name  -- The name of the file in the archive
+        @param: mtime -- The last modification time; None for the one of
+                         the file
+        """
+        if name not in self.names:
+            self.names.add(name)
+            self._add_file(fname, name, mtime)
+
+    def _add_data(self, name, data, mtime):
+        raise NotImplementedError
+
+    def _add_file(self, fname, name, mtime):
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Write the end of the archive and close the file.
+        """
+        raise NotImplementedError
+
+
+# ------------------------------------------------
+# TarArchive
+# ------------------------------------------------
+class TarArchive(WebArchive):
+    """
+    A compressed tar archive, written as a stream.
+    """
+
+    def __init__(self, filename, fmt=".tar.gz", threads=0):
+        """
+        @param: filename -- The name of the archive file
+        @param: fmt      -- ".tar.gz" or ".tar.zst"
+        @param: threads  -- The number of threads compressing the archive
+        """
+        WebArchive.__init__(self)
+        self.compressor = None
+        if fmt == ".tar.gz" and threads <= 1:
+            self.tar = tarfile.open(filename, "w:gz")
+            return
+        self.fileobj = open(filename, "wb")
+        try:
+            if fmt == ".tar.zst":
+                compressor = zstandard.ZstdCompressor(
+                    threads=threads if threads > 1 else 0
+                )
+                self.compressor = compressor.stream_writer(self.fileobj)
+            else:
+                self.compressor = ParallelGzipWriter(self.fileobj, threads)
+            self.tar = tarfile.open(fileobj=self.compressor, mode="w|")
+        except Exception:
+            self.fileobj.close()
+            raise
+
+    def _tarinfo(self, tarinfo, mtime):
+        """
+        Set the owner and the modification time of a member.
+        """
+        if mtime is not None:
+            tarinfo.mtime = mtime
+        if not win():
+            tarinfo.uid = os.getuid()
+            tarinfo.gid = os.getgid()
+        return tarinfo
+
+    def _add_data(self, name, data, mtime):
+        tarinfo = self._tarinfo(tarfile.TarInfo(name), mtime)
+        tarinfo.size = len(data)
+        self.tar.addfile(tarinfo, BytesIO(data))
+
+    def _add_file(self, fname, name, mtime):
+        tarinfo = self._tarinfo(self.tar.gettarinfo(fname, name), mtime)
+        with open(fname, "rb") as fileobj:
+            self.tar.addfile(tarinfo, fileobj)
+
+    def close(self):
+        self.tar.close()
+        if self.compressor is not None:
+            # the zstandard writer also closes the file
+            self.compressor.close()
+            if not self.fileobj.closed:
+                self.fileobj.close()
+
+
+# ------------------------------------------------
+# ZipArchive
+# ------------------------------------------------
+class ZipArchive(WebArchive):
+    """
+    A zip archive, each file compressed with deflate.
+    """
+
+    def __init__(self, filename):
+        """
+        @param: filename -- The name of the archive file
+        """
+        WebArchive.__init__(self)
+        self.zip = zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED)
+
+    @staticmethod
+    def _zipinfo(name, mtime):
+        """
+        Return the header of a file; a zip file has no date before 1980.
+        """
+        date_time = time.localtime(mtime)[:6]
+        if date_time[0] < 1980:
+            date_time = (1980, 1, 1, 0, 0, 0)
+        zipinfo = zipfile.ZipInfo(name, date_time)
+        zipinfo.compress_type = zipfile.ZIP_DEFLATED
+        zipinfo.external_attr = 0o644 << 16
+        return zipinfo
+
+    def _add_data(self, name, data, mtime):
+        self.zip.writestr(self._zipinfo(name, mtime), data)
+
+    def _add_file(self, fname, name, mtime):
+        if mtime is None:
+            mtime = os.stat(fname).st_mtime
+        with open(fname, "rb") as source:
+            with self.zip.open(self._zipinfo(name, mtime), "w") as dest:
+                shutil.copyfileobj(source, dest)
+
+    def close(self):
+        self.zip.close()
+
+
+# ------------------------------------------------
+# ParallelGzipWriter
+# ------------------------------------------------
+class ParallelGzipWriter:
+    """
+    A gzip file compressed by threads: the data is cut in blocks, and each
+    block is compressed as a gzip member of its own.  The members follow one
+    another in the file, which is read as one gzip file.  zlib releases the
+    GIL, so the blocks are compressed at the same time.
+    """
+
+    def __init__(self, fileobj, threads):
+        """
+        @param: fileobj -- The file the gzip file is written to
+        @param: threads -- The number of threads compressing the blocks
+        """
+        self.fileobj = fileobj
+        self.threads = max(threads, 1)
+        self.executor = ThreadPoolExecutor(self.threads)
+        self.pending = deque()
+        self.buffer = bytearray()
+
+    def write(self, data):
+        """
+        Write data; full blocks are given to the threads.
+        """
+        self.buffer += data
+        while len(self.buffer) >= BLOCK_SIZE:
+            block = bytes(self.buffer[:BLOCK_SIZE])
+            del self.buffer[:BLOCK_SIZE]
+            self._compress(block)
+        return len(data)
+
+    def _compress(self, block):
+        """
+        Give a block to the threads, and write the compressed blocks in
+        order, keeping the number of blocks in memory bounded.
+        """
+        self.pending.append(self.executor.submit(gzip.compress, block, 9, mtime=0))
+        while len(self.pending) > 2 * self.threads:
+            self.fileobj.write(self.pending.popleft().result())
+
+    def close(self):
+        """
+        Compress the last block, and write the blocks left.
+        """
+        if self.buffer:
+            self._compress(bytes(self.buffer))
+            self.buffer = bytearray()
+        while self.pending:
+            self.fileobj.write(self.pending.popleft().result())
+        self.executor.shutdown()
@@ -127,11 +127,16 @@ class EventPages(BasePage):
             for event_handle in event_handle_list:
                 step()
                 index += 1
-                self.eventpage(self.report, the_lang, the_title, event_handle)
+                self.report.write_page(
+                    Event, event_handle, None, "Event.eventpage", event_handle
+                )
             step()
-        self.eventlistpage(
-            self.report, the_lang, the_title, event_types, event_handle_list
-        )
+        refs = (sorted(event_handle_list), event_types)
+        if not self.report.is_current("EventList", "", refs):
+            with self.report.recording("EventList", "", refs):
+                self.eventlistpage(
+                    self.report, the_lang, the_title, event_types, event_handle_list
+                )
 
     def __output_event(
         self,
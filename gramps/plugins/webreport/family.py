@@ -121,11 +121,38 @@ class FamilyPages(BasePage):
             for family_handle in self.report.obj_dict[Family]:
                 step()
                 index += 1
-                self.familypage(self.report, the_lang, the_title, family_handle)
+                family = self.r_db.get_family_from_handle(family_handle)
+                # the family maps of the parents, found by their pages
+                refs = (
+                    self.report.page_refs(Family, family_handle),
+                    self.report.fam_link.get(family.get_father_handle()),
+                    self.report.fam_link.get(family.get_mother_handle()),
+                )
+                self.report.write_page(
+                    Family,
+                    family_handle,
+                    refs,
+                    "Family.familypage",
+                    family_handle,
+                    fam_link={
+                        handle: self.report.fam_link[handle]
+                        for handle in (
+                            family.get_father_handle(),
+                            family.get_mother_handle(),
+                        )
+                        if handle in self.report.fam_link
+                    },
+                )
             step()
-            self.familylistpage(
-                self.report, the_lang, the_title, self.report.obj_dict[Family].keys()
-            )
+            fam_handle_list = sorted(self.report.obj_dict[Family])
+            if not self.report.is_current("FamilyList", "", fam_handle_list):
+                with self.report.recording("FamilyList", "", fam_handle_list):
+                    self.familylistpage(
+                        self.report,
+                        the_lang,
+                        the_title,
+                        self.report.obj_dict[Family].keys(),
+                    )
 
     def __output_family(
         self,
@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Narrative Web Page generator.
+
+Incremental regeneration of the web site: the pages written by a run are
+kept in a manifest with the objects and queries each one was made from, so
+that the next run only writes again the pages whose inputs changed.
+
+Classes:
+    RecordingDb
+    RecordingDict
+    PageManifest
+"""
+# ------------------------------------------------
+# python modules
+# ------------------------------------------------
+from collections import defaultdict
+from contextlib import contextmanager
+import hashlib
+import json
+import logging
+import os
+
+# ------------------------------------------------
+# Gramps module
+# ------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.proxy import CacheProxyDb
+from gramps.version import VERSION
+
+LOG = logging.getLogger(".NarrativeWeb")
+
+# The manifest, in the top directory of the web site
+MANIFEST = ".narrativeweb-manifest.json"
+
+
+def digest(value):
+    """
+    Return a short digest of the representation of a value.
+    """
+    return hashlib.sha1(repr(value).encode("utf-8")).hexdigest()
+
+
+# ------------------------------------------------
+# RecordingDb
+# ------------------------------------------------
+class RecordingDb(CacheProxyDb):
+    """
+    A cache proxy that records the objects read and the queries made while
+    a page is written.
+
+    While :attr:`record` is set, the change time of each object read is
+    stored in its "objects" dictionary, and the digest of the result of each
+    query in its "queries" dictionary.  The results of the queries are kept
+    for the whole run: the database must not change while the report runs.
+    """
+
+    def __init__(self, database):
+        CacheProxyDb.__init__(self, database)
+        self.record = None
+        self._queries = {}
+
+    def _get_from_handle(self, obj_type, handle):
+        obj = CacheProxyDb._get_from_handle(self, obj_type, handle)
+        if self.record is not None and handle:
+            self.record["objects"][obj_type + ":" + handle] = (
+                obj.change if obj else None
+            )
+        return obj
+
+    def add_input(self, obj_type, handle):
+        """
+        Record an object as read, if it is not already.
+        """
+        if self.record is not None and handle:
+            name = obj_type + ":" + handle
+            if name not in self.record["objects"]:
+                self._get_from_handle(obj_type, handle)
+
+    def query(self, name, *args):
+        """
+        Run a query, and return its result and the digest of its result.
+        """
+        key = (name,) + args
+        if key not in self._queries:
+            if name == "find_backlink_handles":
+                result = list(self.db.find_backlink_handles(*args))
+                value = digest(result)
+            elif name.endswith("_from_gramps_id"):
+                obj = getattr(self.db, name)(*args)
+                result = obj.handle if obj else None
+                value = digest(result)
+            else:
+                result = getattr(self.db, name)(*args)
+                value = digest(sorted(result))
+            self._queries[key] = result, value
+        result, value = self._queries[key]
+        if self.record is not None:
+            self.record["queries"][key] = value
+        return result, value
+
+    def find_backlink_handles(self, handle, include_classes=None):
+        if include_classes is not None:
+            include_classes = tuple(include_classes)
+        result = self.query("find_backlink_handles", handle, include_classes)[0]
+        return iter(result)
+
+    def _from_gramps_id(self, obj_type, gramps_id):
+        """
+        Return the object with a Gramps ID, through the cache.
+        """
+        name = "get_%s_from_gramps_id" % obj_type.lower()
+        handle = self.query(name, gramps_id)[0]
+        if handle is None:
+            return None
+        return self._get_from_handle(obj_type, handle)
+
+    def get_person_from_gramps_id(self, gramps_id):
+        return self._from_gramps_id("Person", gramps_id)
+
+    def get_media_from_gramps_id(self, gramps_id):
+        return self._from_gramps_id("Media", gramps_id)
+
+    def get_note_from_gramps_id(self, gramps_id):
+        return self._from_gramps_id("Note", gramps_id)
+
+    def _handles(self, name, sort_handles, locale):
+        """
+        Return a list of handles, recording the query if it is not sorted.
+        """
+        if sort_handles:
+            return getattr(self.db, name)(sort_handles, locale)
+        return list(self.query(name)[0])
+
+    def get_media_handles(self, sort_handles=False, locale=glocale):
+        return self._handles("get_media_handles", sort_handles, locale)
+
+    def get_note_handles(self):
+        return list(self.query("get_note_handles")[0])
+
+    def get_place_handles(self, sort_handles=False, locale=glocale):
+        return self._handles("get_place_handles", sort_handles, locale)
+
+    def get_repository_handles(self):
+        return list(self.query("get_repository_handles")[0])
+
+
+# ------------------------------------------------
+# RecordingDict
+# ------------------------------------------------
+class RecordingDict(defaultdict):
+    """
+    The entries of the objects of a type in the report: reading the entry of
+    an object records the object as read by the page being written.
+    """
+
+    def __init__(self, database, obj_type):
+        """
+        @param: database -- The RecordingDb used to write the pages
+        @param: obj_type -- The type of the objects
+        """
+        defaultdict.__init__(self, set)
+        self.database = database
+        self.obj_type = obj_type
+
+    def __getitem__(self, handle):
+        self.database.add_input(self.obj_type, handle)
+        return defaultdict.__getitem__(self, handle)
+
+    def __contains__(self, handle):
+        self.database.add_input(self.obj_type, handle)
+        return defaultdict.__contains__(self, handle)
+
+    def get(self, handle, default=None):
+        self.database.add_input(self.obj_type, handle)
+        return defaultdict.get(self, handle, default)
+
+
+# ------------------------------------------------
+# PageManifest
+# ------------------------------------------------
+class PageManifest:
+    """
+    The pages written by the last run of the report in a directory, with the
+    inputs each one was made from: the change time of the objects it read
+    and their entries in the report, the digests of the queries it made, and
+    the digest of the references given by the report.
+
+    The manifest is only used if the options of the report and the version
+    of Gramps are the same as in the last run.
+    """
+
+    def __init__(self, dirname, options, database, entry, previous=True):
+        """
+        @param: dirname  -- The top directory of the web site
+        @param: options  -- The options of the report
+        @param: database -- The RecordingDb used to write the pages
+        @param: entry    -- A function returning what the report knows of an
+                            object given by its type and handle, as a list,
+                            or None if the object has no page
+        @param: previous -- Whether to read the manifest of the last run
+        """
+        self.dirname = dirname
+        self.filename = os.path.join(dirname, MANIFEST)
+        self.database = database
+        self.entry = entry
+        self.options = digest((VERSION, sorted(options.items())))
+        self.old_pages = self.load() if previous else {}
+        self.pages = {}
+        self.written = set()
+        self.page = None
+        self._states = {}
+
+    def load(self):
+        """
+        Return the pages of the last run, if it used the same options.
+        """
+        try:
+            with open(self.filename, encoding="utf-8") as manifest:
+                data = json.load(manifest)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            LOG.warning("Cannot read %s: %s", self.filename, err)
+            return {}
+        if not isinstance(data, dict) or data.get("options") != self.options:
+            return {}
+        return data.get("pages", {})
+
+    def _state(self, name):
+        """
+        Return the change time of an object and its entry in the report.
+        """
+        if name not in self._states:
+            obj_type, handle = name.split(":", 1)
+            obj = CacheProxyDb._get_from_handle(self.database, obj_type, handle)
+            self._states[name] = [
+                obj.change if obj else None,
+                self.entry(obj_type, handle),
+            ]
+        return self._states[name]
+
+    def is_current(self, key, refs):
+        """
+        Return the page of the last run if none of its inputs changed and
+        its files are still there, and keep it in the manifest; otherwise
+        return None.
+
+        @param: key  -- The name of the page
+        @param: refs -- The references given to the page by the report
+        """
+        page = self.old_pages.get(key)
+        if page is None or page["refs"] != digest(refs):
+            return None
+        for name, state in page["objects"].items():
+            if self._state(name) != state:
+                return None
+        for query in page["queries"]:
+            args = [tuple(arg) if isinstance(arg, list) else arg for arg in query[1]]
+            if self.database.query(query[0], *args)[1] != query[2]:
+                return None
+        for fname in page["files"]:
+            if not os.path.exists(os.path.join(self.dirname, fname)):
+                return None
+        self.pages[key] = page
+        return page
+
+    @contextmanager
+    def recording(self, key, refs):
+        """
+        Record the inputs and the files of a page while it is written.
+
+        @param: key  -- The name of the page
+        @param: refs -- The references given to the page by the report
+        """
+        self.page = {"refs": digest(refs), "objects": {}, "queries": {}, "files": []}
+        self.database.record = self.page
+        try:
+            yield self.page
+        finally:
+            self.database.record = None
+            page, self.page = self.page, None
+        page["objects"] = {
+            name: [change, self.entry(*name.split(":", 1))]
+            for name, change in page["objects"].items()
+        }
+        page["queries"] = [
+            [key[0], list(key[1:]), value] for key, value in page["queries"].items()
+        ]
+        self.pages[key] = page
+
+    def add_file(self, fname):
+        """
+        Record a file written in the web site.
+        """
+        fname = os.path.relpath(fname, self.dirname)
+        if self.page is not None:
+            self.page["files"].append(fname)
+        else:
+            self.written.add(fname)
+
+    def close(self):
+        """
+        Delete the files of the pages of the last run that were not written
+        again, and save the manifest.
+        """
+        kept = set(self.written)
+        for page in self.pages.values():
+            kept.update(page["files"])
+        for page in self.old_pages.values():
+            for fname in page["files"]:
+                if fname not in kept:
+                    kept.add(fname)
+                    try:
+                        os.remove(os.path.join(self.dirname, fname))
+                    except FileNotFoundError:
+                        pass
+                    except OSError as err:
+                        LOG.warning("Cannot delete %s: %s", fname, err)
+        tmp_name = self.filename + ".tmp"
+        try:
+            with open(tmp_name, "w", encoding="utf-8") as manifest:
+                manifest.write(
+                    json.dumps({"options": self.options, "pages": self.pages})
+                )
+            os.replace(tmp_name, self.filename)
+        except OSError as err:
+            LOG.warning("Cannot write %s: %s", self.filename, err)
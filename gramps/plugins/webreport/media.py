@@ -150,7 +150,6 @@ class MediaPages(BasePage):
             total = len(sorted_media_handles)
             index = 1
             for handle in sorted_media_handles:
-                gc.collect()  # Reduce memory usage when there are many images.
                 if index == media_count:
                     next_ = None
                 elif index < total:
@@ -159,12 +158,10 @@ class MediaPages(BasePage):
                     next_ = self.unused_media_handles[0]
                 else:
                     next_ = None
-                self.mediapage(
-                    self.report,
-                    the_lang,
-                    the_title,
-                    handle,
-                    (prev, next_, index, media_count),
+                info = (prev, next_, index, media_count)
+                refs = (self.report.page_refs(Media, handle), info)
+                self.report.write_page(
+                    Media, handle, refs, "Media.mediapage", handle, info
                 )
                 prev = handle
                 step()
@@ -176,24 +173,26 @@ class MediaPages(BasePage):
             prev = sorted_media_handles[total_m - 1] if total_m > 0 else 0
             if total > 0:
                 for media_handle in self.unused_media_handles:
-                    gc.collect()  # Reduce memory usage when many images.
                     if index == media_count:
                         next_ = None
                     else:
                         next_ = self.unused_media_handles[idx]
-                    self.mediapage(
-                        self.report,
-                        the_lang,
-                        the_title,
-                        media_handle,
-                        (prev, next_, index, media_count),
+                    info = (prev, next_, index, media_count)
+                    refs = (self.report.page_refs(Media, media_handle), info)
+                    self.report.write_page(
+                        Media, media_handle, refs, "Media.mediapage", media_handle, info
                     )
                     prev = media_handle
                     step()
                     index += 1
                     idx += 1
 
-        self.medialistpage(self.report, the_lang, the_title, sorted_media_handles)
+        refs = (sorted_media_handles, self.unused_media_handles)
+        if not self.report.is_current("MediaList", "", refs):
+            with self.report.recording("MediaList", "", refs):
+                self.medialistpage(
+                    self.report, the_lang, the_title, sorted_media_handles
+                )
 
     def medialistpage(self, report, the_lang, the_title, sorted_media_handles):
         """
@@ -389,6 +388,7 @@ class MediaPages(BasePage):
                                 next and previous media, the current page
                                 number, and the total number of media pages
         """
+        gc.collect()  # Reduce memory usage when many images.
         media = report.database.get_media_from_handle(media_handle)
         BasePage.__init__(self, report, the_lang, the_title, media.gramps_id)
         (prev, next_, page_number, total_pages) = info
@@ -753,9 +753,8 @@ class MediaPages(BasePage):
         try:
             mtime = os.stat(fullpath).st_mtime
             if self.report.archive:
-                if str(newpath) not in self.report.archive.getnames():
-                    # The current file not already archived.
-                    self.report.archive.add(fullpath, str(newpath))
+                # The file is not added if it is already archived.
+                self.report.archive.add_file(fullpath, str(newpath))
             else:
                 to_dir = os.path.join(self.html_dir, to_dir)
                 if not os.path.isdir(to_dir):
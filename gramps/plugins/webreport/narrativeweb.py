@@ -47,12 +47,11 @@ Classes:
 # python modules
 # ------------------------------------------------
 import logging
+from contextlib import contextmanager
 from functools import partial
 import os
 import sys
-import time
 import shutil
-import tarfile
 from io import BytesIO, TextIOWrapper
 from collections import defaultdict
 from decimal import getcontext
@@ -127,6 +126,13 @@ from gramps.plugins.webreport.introduction import IntroductionPage
 from gramps.plugins.webreport.addressbook import AddressBookPage
 from gramps.plugins.webreport.addressbooklist import AddressBookListPage
 from gramps.plugins.webreport.calendar import CalendarPage
+from gramps.plugins.webreport.incremental import (
+    RecordingDb,
+    RecordingDict,
+    PageManifest,
+)
+from gramps.plugins.webreport.parallel import ArchiveMembers, PagePool
+from gramps.plugins.webreport.archive import ARCHIVE_FORMATS, open_archive
 
 from gramps.plugins.webreport.common import (
     get_gendex_data,
@@ -147,6 +153,24 @@ getcontext().prec = 8
 # ------------------------------------------------
 # constants
 # ------------------------------------------------
+# The classes of the objects which have pages, by type
+_OBJ_CLASSES = {
+    obj_class.__name__: obj_class
+    for obj_class in (
+        Person,
+        Family,
+        Event,
+        Place,
+        Source,
+        Citation,
+        Media,
+        Repository,
+    )
+}
+
+# The pages which are written by a class rather than by a tab
+_PAGE_CLASSES = {"SurnamePage": SurnamePage}
+
 _DEFAULT_MAX_IMG_WIDTH = 800  # resize images that are wider than this
 _DEFAULT_MAX_IMG_HEIGHT = 600  # resize images that are taller than this
 
@@ -165,6 +189,8 @@ class NavWebReport(Report):
         """
         Report.__init__(self, database, options, user)
         self.user = user
+        # where worker processes can open their own copy of the database
+        self.reader_source = database.get_reader_source()
         menu = options.menu
         self.link_prefix_up = True
         self.options = {}
@@ -180,8 +206,14 @@ class NavWebReport(Report):
 
         stdoptions.run_private_data_option(self, menu)
         stdoptions.run_living_people_option(self, menu)
-        self.database = CacheProxyDb(self.database)
+        # Only write the pages that changed since the last run?
+        self.incremental = self.options["incremental"] and not self.options["archive"]
+        if self.incremental:
+            self.database = RecordingDb(self.database)
+        else:
+            self.database = CacheProxyDb(self.database)
         self._db = self.database
+        self.manifest = None
 
         filters_option = menu.get_option_by_name("filter")
         self.filter = filters_option.get_filter()
@@ -241,6 +273,7 @@ class NavWebReport(Report):
         self.encoding = self.options["encoding"]
 
         self.use_archive = self.options["archive"]
+        self.archive_format = self.options["archive_format"]
         self.use_intro = self.options["intronote"] or self.options["introimg"]
         self.use_home = self.options["homenote"] or self.options["homeimg"]
         self.use_contact = self.opts["contactnote"] or self.opts["contactimg"]
@@ -311,6 +344,7 @@ class NavWebReport(Report):
         self.rel_class = None
         self.tab = None
         self.fam_link = {}
+        self.page_pool = None
         if self.options["securesite"]:
             self.secure_mode = HTTPS
         else:
@@ -395,8 +429,12 @@ class NavWebReport(Report):
                 )
                 return
             try:
-                self.archive = tarfile.open(self.target_path, "w:gz")
-            except (OSError, IOError) as value:
+                self.archive = open_archive(
+                    self.target_path,
+                    self.archive_format,
+                    config.get("behavior.report-processes"),
+                )
+            except (OSError, IOError, ValueError) as value:
                 self.user.notify_error(
                     _("Could not create %s") % self.target_path, str(value)
                 )
@@ -417,46 +455,7 @@ class NavWebReport(Report):
         #
         #################################################
 
-        # FIXME: The whole of this section of code should be implemented by the
-        # registration process for the Web Page plugins.
-
-        # Note that by use of a dictionary we ensure that at most one Web Page
-        # plugin is provided for any object class
-
-        self.tab = {}
-        # FIXME: Initialising self.tab in this way means that this code has to
-        # run before the Web Page registration - I am not sure whether this is
-        # possible, in which case an alternative approach to providing the
-        # mapping of object class to Web Page plugin will be needed.
-        for obj_class in (
-            "Person",
-            "Family",
-            "Source",
-            "Citation",
-            "Place",
-            "Event",
-            "Media",
-            "Repository",
-        ):
-            # FIXME: Would it be better if the Web Page plugins used a different
-            # base class rather than BasePage, which is really just for each web
-            # page
-            self.tab[obj_class] = BasePage(self, None, None)
-
-        # Note that by not initialising any Web Page plugins that are not going
-        # to generate pages, we ensure that there is not performance implication
-        # for such plugins.
-        self.tab["Person"] = PersonPages(self, None, None)
-        if self.inc_families:
-            self.tab["Family"] = FamilyPages(self, None, None)
-        if self.inc_events:
-            self.tab["Event"] = EventPages(self, None, None)
-        if self.inc_gallery:
-            self.tab["Media"] = MediaPages(self, None, None)
-        self.tab["Place"] = PlacePages(self, None, None)
-        self.tab["Source"] = SourcePages(self, None, None)
-        self.tab["Repository"] = RepositoryPages(self, None, None)
-        self.tab["Citation"] = CitationPages(self, None, None)
+        self.init_tabs()
 
         # FIXME: The following routines that are not run in two passes have not
         # yet been converted to a form suitable for separation into Web Page
@@ -517,6 +516,57 @@ class NavWebReport(Report):
                     cur_title = self.options[titl]
                     self.languages.append((cur_lang, cur_title))
 
+        if self.incremental:
+            self.manifest = PageManifest(
+                self.html_dir, self.options, self.database, self._page_entry
+            )
+
+        processes = config.get("behavior.report-processes")
+        if processes > 1 and self.reader_source is not None:
+            self.page_pool = PagePool(self, processes, self.reader_source)
+            # the worker processes are given the objects of the report
+            # when they start
+            if self.options["inc_uplaces"]:
+                self.tab["Place"].add_unused_places()
+
+        try:
+            self.write_pages()
+        finally:
+            if self.page_pool is not None:
+                self.page_pool.close()
+                self.page_pool = None
+
+        # copy all of the necessary files
+        self.copy_narrated_files()
+
+        # delete the pages that were not written again
+        if self.manifest:
+            self.manifest.close()
+
+        # if an archive is being used, close it?
+        if self.archive:
+            self.archive.close()
+
+        if _WRONGMEDIAPATH:
+            error = "\n".join(
+                [
+                    _("ID=%(grampsid)s, path=%(dir)s") % {"grampsid": x[0], "dir": x[1]}
+                    for x in _WRONGMEDIAPATH[:10]
+                ]
+            )
+            if len(_WRONGMEDIAPATH) > 10:
+                error += "\n ..."
+            self.user.warn(_("Missing media objects:"), error)
+        self.database.clear_cache()
+        # begin print performance check
+        # pr.disable()
+        # pr.print_stats()
+        # end print performance check
+
+    def write_pages(self):
+        """
+        Write the pages of each language.
+        """
         self.visited = []
         if len(self.languages) > 1:
             IndexPage(self, self.languages)
@@ -533,6 +583,8 @@ class NavWebReport(Report):
 
             # build classes IndividualListPage and IndividualPage
             self.tab["Person"].display_pages(the_lang, the_title)
+            # the family pages need the family maps of the person pages
+            self.write_queued_pages()
 
             self.build_gendex(self.obj_dict[Person], the_lang)
 
@@ -582,28 +634,52 @@ class NavWebReport(Report):
             if self.inc_updates:
                 self.updates_preview_page()
 
-        # copy all of the necessary files
-        self.copy_narrated_files()
+            self.write_queued_pages()
 
-        # if an archive is being used, close it?
-        if self.archive:
-            self.archive.close()
+    def init_tabs(self):
+        """
+        Initialise the plug-ins writing the pages of each class of objects.
+        """
+        # FIXME: The whole of this section of code should be implemented by the
+        # registration process for the Web Page plugins.
 
-        if _WRONGMEDIAPATH:
-            error = "\n".join(
-                [
-                    _("ID=%(grampsid)s, path=%(dir)s") % {"grampsid": x[0], "dir": x[1]}
-                    for x in _WRONGMEDIAPATH[:10]
-                ]
-            )
-            if len(_WRONGMEDIAPATH) > 10:
-                error += "\n ..."
-            self.user.warn(_("Missing media objects:"), error)
-        self.database.clear_cache()
-        # begin print performance check
-        # pr.disable()
-        # pr.print_stats()
-        # end print performance check
+        # Note that by use of a dictionary we ensure that at most one Web Page
+        # plugin is provided for any object class
+
+        self.tab = {}
+        # FIXME: Initialising self.tab in this way means that this code has to
+        # run before the Web Page registration - I am not sure whether this is
+        # possible, in which case an alternative approach to providing the
+        # mapping of object class to Web Page plugin will be needed.
+        for obj_class in (
+            "Person",
+            "Family",
+            "Source",
+            "Citation",
+            "Place",
+            "Event",
+            "Media",
+            "Repository",
+        ):
+            # FIXME: Would it be better if the Web Page plugins used a different
+            # base class rather than BasePage, which is really just for each web
+            # page
+            self.tab[obj_class] = BasePage(self, None, None)
+
+        # Note that by not initialising any Web Page plugins that are not going
+        # to generate pages, we ensure that there is not performance implication
+        # for such plugins.
+        self.tab["Person"] = PersonPages(self, None, None)
+        if self.inc_families:
+            self.tab["Family"] = FamilyPages(self, None, None)
+        if self.inc_events:
+            self.tab["Event"] = EventPages(self, None, None)
+        if self.inc_gallery:
+            self.tab["Media"] = MediaPages(self, None, None)
+        self.tab["Place"] = PlacePages(self, None, None)
+        self.tab["Source"] = SourcePages(self, None, None)
+        self.tab["Repository"] = RepositoryPages(self, None, None)
+        self.tab["Citation"] = CitationPages(self, None, None)
 
     def _build_obj_dict(self):
         """
@@ -619,6 +695,34 @@ class NavWebReport(Report):
         For the bkref_dict, the value is a tuple containing the class of object
         and the handle for the object that refers to the 'key' object.
         """
+        self._init_obj_dict()
+
+        ind_list = self._db.iter_person_handles()
+        ind_list = self.filter.apply(self._db, ind_list, user=self.user)
+
+        message = _("Constructing list of other objects...")
+        pgr_title = self.pgrs_title(None)
+        with self.user.progress(pgr_title, message, sum(1 for _ in ind_list)) as step:
+            index = 1
+            for handle in ind_list:
+                self._add_person(handle, "", "")
+                step()
+                index += 1
+
+        LOG.debug(
+            "final object dictionary \n"
+            + "".join(("%s: %s\n" % item) for item in self.obj_dict.items())
+        )
+
+        LOG.debug(
+            "final backref dictionary \n"
+            + "".join(("%s: %s\n" % item) for item in self.bkref_dict.items())
+        )
+
+    def _init_obj_dict(self):
+        """
+        Set up the dictionaries of objects, empty.
+        """
         _obj_class_list = (
             Person,
             Family,
@@ -640,29 +744,55 @@ class NavWebReport(Report):
         # initialise the dictionary to empty in case no objects of any
         # particular class are included in the web report
         for obj_class in _obj_class_list:
-            self.obj_dict[obj_class] = defaultdict(set)
-
-        ind_list = self._db.iter_person_handles()
-        ind_list = self.filter.apply(self._db, ind_list, user=self.user)
+            if self.incremental and obj_class in _OBJ_CLASSES.values():
+                # the entries of other objects read by a page are its inputs
+                self.obj_dict[obj_class] = RecordingDict(
+                    self.database, obj_class.__name__
+                )
+            else:
+                self.obj_dict[obj_class] = defaultdict(set)
 
-        message = _("Constructing list of other objects...")
-        pgr_title = self.pgrs_title(None)
-        with self.user.progress(pgr_title, message, sum(1 for _ in ind_list)) as step:
-            index = 1
-            for handle in ind_list:
-                self._add_person(handle, "", "")
-                step()
-                index += 1
+    def worker_state(self):
+        """
+        Return what the worker processes writing the pages need to know of
+        the report, apart from its options.
+        """
+        return {
+            "obj_dict": {
+                obj_class: dict(entries) for obj_class, entries in self.obj_dict.items()
+            },
+            "bkref_dict": {
+                obj_class: dict(refs) for obj_class, refs in self.bkref_dict.items()
+            },
+            "languages": self.languages,
+            "default_lang": self.default_lang,
+        }
 
-        LOG.debug(
-            "final object dictionary \n"
-            + "".join(("%s: %s\n" % item) for item in self.obj_dict.items())
-        )
+    def load_worker_state(self, state):
+        """
+        Make the report of a worker process ready to write pages.
 
-        LOG.debug(
-            "final backref dictionary \n"
-            + "".join(("%s: %s\n" % item) for item in self.bkref_dict.items())
-        )
+        @param: state -- The worker_state of the report of the main process
+        """
+        self.rel_class = get_relationship_calculator(reinit=True, clocale=self.rlocale)
+        self._init_obj_dict()
+        for obj_class, entries in state["obj_dict"].items():
+            self.obj_dict[obj_class].update(entries)
+        for obj_class, refs in state["bkref_dict"].items():
+            self.bkref_dict[obj_class].update(refs)
+        self.languages = state["languages"]
+        self.default_lang = state["default_lang"]
+        self.visited = []
+        if self.use_archive:
+            self.archive = ArchiveMembers()
+        elif self.incremental:
+            self.manifest = PageManifest(
+                self.html_dir,
+                self.options,
+                self.database,
+                self._page_entry,
+                previous=False,
+            )
 
     def _add_person(self, person_handle, bkref_class, bkref_handle):
         """
@@ -1372,27 +1502,22 @@ class NavWebReport(Report):
         message = _("Creating surname pages")
         pgr_title = self.pgrs_title(the_lang)
         with self.user.progress(pgr_title, message, len(local_list)) as step:
-            SurnameListPage(
-                self,
-                the_lang,
-                the_title,
-                ind_list,
-                SurnameListPage.ORDER_BY_NAME,
-                self.surname_fname,
-            )
-
-            SurnameListPage(
-                self,
-                the_lang,
-                the_title,
-                ind_list,
-                SurnameListPage.ORDER_BY_COUNT,
-                "surnames_count",
-            )
+            refs = sorted(ind_list)
+            for order, fname in (
+                (SurnameListPage.ORDER_BY_NAME, self.surname_fname),
+                (SurnameListPage.ORDER_BY_COUNT, "surnames_count"),
+            ):
+                if self.is_current("SurnameList", fname, refs):
+                    continue
+                with self.recording("SurnameList", fname, refs):
+                    SurnameListPage(self, the_lang, the_title, ind_list, order, fname)
 
             index = 1
             for surname, handle_list in local_list:
-                SurnamePage(self, the_lang, the_title, surname, sorted(handle_list))
+                handle_list = sorted(handle_list)
+                self.write_page(
+                    "Surname", surname, handle_list, "SurnamePage", surname, handle_list
+                )
                 step()
                 index += 1
 
@@ -1808,9 +1933,10 @@ class NavWebReport(Report):
                     fname = os.path.join(self.html_dir, self.the_lang, self.cur_fname)
             else:
                 fname = os.path.join(self.html_dir, self.cur_fname)
-            dir_name = os.path.dirname(fname)
-            if not os.path.isdir(dir_name):
-                os.makedirs(dir_name)
+            # the worker processes may make the same directory
+            os.makedirs(os.path.dirname(fname), exist_ok=True)
+            if self.manifest:
+                self.manifest.add_file(fname)
             output_file = open(
                 fname, "w", encoding=self.encoding, errors="xmlcharrefreplace"
             )
@@ -1828,17 +1954,12 @@ class NavWebReport(Report):
                                when we use rsync.
         """
         if self.archive:
-            if self.cur_fname not in self.archive.getnames():
+            if self.cur_fname not in self.archive:
                 # The current file not already archived.
                 output_file.flush()
-                tarinfo = tarfile.TarInfo(self.cur_fname)
-                tarinfo.size = len(string_io.getvalue())
-                tarinfo.mtime = date if date != 0 else time.time()
-                if not win():
-                    tarinfo.uid = os.getuid()
-                    tarinfo.gid = os.getgid()
-                string_io.seek(0)
-                self.archive.addfile(tarinfo, string_io)
+                self.archive.add_data(
+                    self.cur_fname, string_io.getvalue(), date if date else None
+                )
             output_file.close()
         else:
             output_file.close()
@@ -1878,29 +1999,12 @@ class NavWebReport(Report):
         LOG.debug("copying '%s' to '%s/%s'", from_fname, to_dir, to_fname)
         mtime = os.stat(from_fname).st_mtime
         if self.archive:
-
-            def set_mtime(tarinfo):
-                """
-                For each file, we set the last modification time.
-
-                We could also set uid, gid, uname, gname and mode
-                #tarinfo.uid = os.getuid()
-                #tarinfo.mode = 0660
-                #tarinfo.uname = tarinfo.gname = "www-data"
-                """
-                tarinfo.mtime = mtime
-                return tarinfo
-
-            dest = os.path.join(to_dir, to_fname)
-            if dest not in self.archive.getnames():
-                # The current file not already archived.
-                self.archive.add(from_fname, dest, filter=set_mtime)
+            # The file is not added if it is already archived.
+            self.archive.add_file(from_fname, os.path.join(to_dir, to_fname), mtime)
         else:
             dest = os.path.join(self.html_dir, to_dir, to_fname)
 
-            destdir = os.path.dirname(dest)
-            if not os.path.isdir(destdir):
-                os.makedirs(destdir)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
 
             if from_fname != dest:
                 if not os.path.exists(dest):
@@ -1911,6 +2015,8 @@ class NavWebReport(Report):
                         LOG.exception(exception)
                         print("Copying error: %s" % sys.exc_info()[1])
                         print("Continuing...")
+                if self.manifest:
+                    self.manifest.add_file(dest)
             elif self.warn_dir:
                 self.user.warn(
                     _("Possible destination error")
@@ -1926,6 +2032,148 @@ class NavWebReport(Report):
                 )
                 self.warn_dir = False
 
+    def _page_entry(self, obj_type, handle):
+        """
+        Return the entry of an object in the object dictionary as a list, or
+        None if it has no page.
+
+        @param: obj_type -- The type of the object, or its class
+        @param: handle   -- The handle of the object
+        """
+        obj_class = _OBJ_CLASSES.get(obj_type, obj_type)
+        entry = self.obj_dict.get(obj_class, {}).get(handle)
+        if not isinstance(entry, tuple):
+            return None
+        # The place entries hold the event
+        return [getattr(item, "handle", item) for item in entry]
+
+    def page_refs(self, obj_class, handle):
+        """
+        Return what the report knows about an object, apart from the object
+        itself: its entry in the object dictionary and its back references.
+
+        @param: obj_class -- The class of the object
+        @param: handle    -- The handle of the object
+        """
+        bkrefs = sorted(repr(ref) for ref in self.bkref_dict[obj_class].get(handle, ()))
+        return self._page_entry(obj_class, handle), bkrefs
+
+    def _page_key(self, kind, name):
+        """
+        Return the name of a page in the manifest.
+        """
+        if isinstance(kind, type):
+            kind = kind.__name__
+        return "|".join((self.the_lang or "", kind, str(name)))
+
+    def is_current(self, kind, name, refs=None):
+        """
+        Return True if the page was written by the last run and none of
+        its inputs changed since, when only the pages that changed are
+        written.
+
+        @param: kind -- The class of the object of the page, or the name
+                        of a kind of page
+        @param: name -- The handle of the object, or the name of the page
+        @param: refs -- What the report gives to the page, defaults to the
+                        page_refs of the object
+        """
+        if self.manifest is None:
+            return False
+        if refs is None:
+            refs = self.page_refs(kind, name)
+        page = self.manifest.is_current(self._page_key(kind, name), refs)
+        if page is None:
+            return False
+        # The family maps found by the person page
+        self.fam_link.update(page.get("fam_link", {}))
+        return True
+
+    @contextmanager
+    def recording(self, kind, name, refs=None):
+        """
+        Record the inputs and the files of a page while it is written, when
+        only the pages that changed are written.
+
+        @param: kind -- The class of the object of the page, or the name
+                        of a kind of page
+        @param: name -- The handle of the object, or the name of the page
+        @param: refs -- What the report gives to the page, defaults to the
+                        page_refs of the object
+        """
+        if self.manifest is None:
+            yield
+            return
+        if refs is None:
+            refs = self.page_refs(kind, name)
+        fam_link = dict(self.fam_link)
+        with self.manifest.recording(self._page_key(kind, name), refs) as page:
+            yield
+            page["fam_link"] = {
+                handle: url
+                for handle, url in self.fam_link.items()
+                if fam_link.get(handle) != url
+            }
+
+    def write_page(self, kind, name, refs, writer, *args, fam_link=None):
+        """
+        Write a page, unless only the pages that changed are written and it
+        did not change.  With worker processes, the page is queued, and
+        written by write_queued_pages.
+
+        @param: kind     -- The class of the object of the page, or the name
+                            of a kind of page
+        @param: name     -- The handle of the object, or the name of the page
+        @param: refs     -- What the report gives to the page, or None for
+                            the page_refs of the object
+        @param: writer   -- The name of the tab and of its method writing the
+                            page, separated by a dot, or the name of the class
+                            of the page
+        @param: args     -- The arguments of the writer after the language
+                            and the title
+        @param: fam_link -- The family maps of other pages read by the page
+        """
+        if self.manifest is not None and refs is None:
+            refs = self.page_refs(kind, name)
+        if self.is_current(kind, name, refs):
+            return
+        if self.page_pool is None:
+            self.render_page(kind, name, refs, writer, args)
+            return
+        self.page_pool.add(
+            (
+                kind,
+                name,
+                refs,
+                self.the_lang,
+                self.the_title,
+                writer,
+                args,
+                fam_link or {},
+            )
+        )
+
+    def render_page(self, kind, name, refs, writer, args):
+        """
+        Write a page now, in the current language.
+
+        See write_page for the parameters.
+        """
+        tab, dummy_sep, method = writer.rpartition(".")
+        if tab:
+            write = getattr(self.tab[tab], method)
+        else:
+            write = _PAGE_CLASSES[writer]
+        with self.recording(kind, name, refs):
+            write(self, self.the_lang, self.the_title, *args)
+
+    def write_queued_pages(self):
+        """
+        Write the pages queued by write_page.
+        """
+        if self.page_pool is not None:
+            self.page_pool.write(self.pgrs_title(self.the_lang))
+
     def person_in_webreport(self, person_handle):
         """
         Return the handle if we created a page for this person.
@@ -1965,7 +2213,9 @@ class NavWebOptions(MenuReportOptions):
         """
         self.__db = dbase
         self.__archive = None
+        self.__archive_format = None
         self.__target = None
+        self.__incremental = None
         self.__target_uri = None
         self.__pid = None
         self.__filter = None
@@ -2064,11 +2314,18 @@ class NavWebOptions(MenuReportOptions):
         category_name = _("Report Options")
         addopt = partial(menu.add_option, category_name)
 
-        self.__archive = BooleanOption(_("Store website in .tar.gz archive"), False)
+        self.__archive = BooleanOption(_("Store website in an archive"), False)
         self.__archive.set_help(_("Whether to store the website in an " "archive file"))
         addopt("archive", self.__archive)
         self.__archive.connect("value-changed", self.__archive_changed)
 
+        self.__archive_format = EnumeratedListOption(_("Archive format"), ".tar.gz")
+        for fmt in ARCHIVE_FORMATS:
+            self.__archive_format.add_item(fmt, fmt)
+        self.__archive_format.set_help(_("The format of the archive file"))
+        addopt("archive_format", self.__archive_format)
+        self.__archive_format.connect("value-changed", self.__archive_changed)
+
         dbname = self.__db.get_dbname()
         default_dir = dbname + "_" + "NAVWEB"
         self.__target = DestinationOption(
@@ -2078,6 +2335,19 @@ class NavWebOptions(MenuReportOptions):
         self.__target.set_help(_("The destination directory for the web " "files"))
         addopt("target", self.__target)
 
+        self.__incremental = BooleanOption(
+            _("Only write the pages that changed"), False
+        )
+        self.__incremental.set_help(
+            _(
+                "Keep a list of the pages written in the destination directory,"
+                " and only write again the pages whose data changed since the"
+                " last time. The pages of the objects no longer on the website"
+                " are deleted."
+            )
+        )
+        addopt("incremental", self.__incremental)
+
         self.__archive_changed()
 
         title = StringOption(_("Website title"), _("My Family Tree"))
@@ -2923,10 +3193,14 @@ class NavWebOptions(MenuReportOptions):
         Update the change of storage: archive or directory
         """
         if self.__archive.get_value() is True:
-            self.__target.set_extension(".tar.gz")
+            self.__target.set_extension(self.__archive_format.get_value())
             self.__target.set_directory_entry(False)
+            self.__archive_format.set_available(True)
+            self.__incremental.set_available(False)
         else:
             self.__target.set_directory_entry(True)
+            self.__archive_format.set_available(False)
+            self.__incremental.set_available(True)
             # We don't use an archive. If usecms is True, set it to False
             if self.__usecms:
                 self.__usecms.set_value(False)
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Narrative Web Page generator.
+
+Parallel writing of the pages: once the objects of the report are known, the
+pages of the objects do not depend on each other.  The report queues them,
+and a pool of worker processes writes them, each worker with its own
+read-only copy of the database and its own report.  When the web site is an
+archive, the workers give the files back to the report, which adds them to
+the archive.
+
+Classes:
+    WorkerUser
+    ArchiveMembers
+    PagePool
+"""
+# ------------------------------------------------
+# python modules
+# ------------------------------------------------
+import logging
+import multiprocessing
+
+# ------------------------------------------------
+# Gramps module
+# ------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.user import User
+from gramps.plugins.webreport.archive import WebArchive
+
+_ = glocale.translation.sgettext
+LOG = logging.getLogger(".NarrativeWeb")
+
+# Number of pages sent to a worker at a time
+SHARD_SIZE = 50
+# Fewer pages are written without starting worker processes
+MIN_PARALLEL_PAGES = 500
+
+# State of a worker process
+_WORKER = {}
+
+
+# ------------------------------------------------
+# WorkerUser
+# ------------------------------------------------
+class WorkerUser(User):
+    """
+    The user of the report of a worker process: the warnings are kept, to be
+    given to the user of the report.
+    """
+
+    def __init__(self):
+        User.__init__(self)
+        self.warnings = []
+
+    def warn(self, title, warning=""):
+        self.warnings.append((title, warning))
+
+
+# ------------------------------------------------
+# ArchiveMembers
+# ------------------------------------------------
+class ArchiveMembers(WebArchive):
+    """
+    Stands for the archive in a worker process: the files added by the
+    pages are kept, to be added to the archive by the report.
+    """
+
+    def __init__(self):
+        WebArchive.__init__(self)
+        self.members = []
+
+    def _add_data(self, name, data, mtime):
+        self.members.append((name, data, None, mtime))
+
+    def _add_file(self, fname, name, mtime):
+        self.members.append((name, None, fname, mtime))
+
+    def pop(self):
+        """
+        Return the files added since the last call.
+        """
+        members, self.members = self.members, []
+        return members
+
+    def close(self):
+        pass
+
+
+def add_members(archive, members):
+    """
+    Add the files kept by an ArchiveMembers to the archive, unless they are
+    already there.
+    """
+    for name, data, fname, mtime in members:
+        if fname is None:
+            archive.add_data(name, data, mtime)
+        else:
+            archive.add_file(fname, name, mtime)
+
+
+# ------------------------------------------------
+# Worker functions
+# ------------------------------------------------
+def _init_worker(dbid, directory, values, state):
+    """
+    Remember what the worker needs.  The report is made on the first shard,
+    so that an error reaches the parent instead of killing the worker.
+    """
+    _WORKER.clear()
+    _WORKER.update(dbid=dbid, directory=directory, values=values, state=state)
+
+
+def _open_worker():
+    """
+    Open the database and make the report of a worker process.
+    """
+    # pylint: disable=import-outside-toplevel
+    from gramps.gen.db.dbconst import DBMODE_R
+    from gramps.gen.db.utils import make_database
+    from gramps.gen.filters import reload_custom_filters
+
+    # the options of the report list the custom filters
+    reload_custom_filters()
+    # this registers the plugins, whose style sheets the report uses
+    database = make_database(_WORKER["dbid"])
+    database.load(_WORKER["directory"], mode=DBMODE_R, update=False)
+    from gramps.plugins.webreport.narrativeweb import NavWebOptions, NavWebReport
+
+    options = NavWebOptions("navwebpage", database)
+    options.load_previous_values()
+    for name, value in _WORKER["values"].items():
+        option = options.menu.get_option_by_name(name)
+        if option is not None:
+            option.set_value(value)
+    report = NavWebReport(database, options, WorkerUser())
+    report.load_worker_state(_WORKER.pop("state"))
+    _WORKER["db"] = database
+    _WORKER["report"] = report
+
+
+def _write_shard(shard):
+    """
+    Write the pages of a shard.  For each page, return the records of the
+    manifest, the family maps found, the files for the archive and the
+    warnings.
+    """
+    if "report" not in _WORKER:
+        _open_worker()
+    report = _WORKER["report"]
+    results = []
+    for kind, name, refs, the_lang, the_title, writer, args, fam_link in shard:
+        if (the_lang, the_title) != (report.the_lang, report.the_title):
+            report.the_lang = the_lang
+            report.the_title = the_title
+            report.init_tabs()
+        report.fam_link = dict(fam_link)
+        report.render_page(kind, name, refs, writer, args)
+        pages = {}
+        if report.manifest is not None:
+            pages, report.manifest.pages = report.manifest.pages, {}
+        links = {
+            handle: url
+            for handle, url in report.fam_link.items()
+            if fam_link.get(handle) != url
+        }
+        members = report.archive.pop() if report.archive is not None else []
+        warnings, report.user.warnings = report.user.warnings, []
+        results.append((pages, links, members, warnings))
+    return results
+
+
+# ------------------------------------------------
+# PagePool
+# ------------------------------------------------
+class PagePool:
+    """
+    The pages queued by the report, and the pool of worker processes that
+    writes them.  The pool is started by the first batch of pages large
+    enough; if it fails, the pages left are written by the report.
+    """
+
+    def __init__(self, report, processes, source):
+        """
+        @param: report    -- The instance of the main report class
+        @param: processes -- The number of worker processes
+        @param: source    -- The backend id and the directory from which a
+                             worker opens the database
+        """
+        self.report = report
+        self.processes = processes
+        self.source = source
+        self.jobs = []
+        self.pool = None
+        self.failed = False
+
+    def add(self, job):
+        """
+        Queue a page.
+        """
+        self.jobs.append(job)
+
+    def start(self):
+        """
+        Start the worker processes.
+        """
+        try:
+            # Forking a process that runs a GUI is unsafe
+            context = multiprocessing.get_context("spawn")
+            self.pool = context.Pool(
+                self.processes,
+                initializer=_init_worker,
+                initargs=(
+                    self.source[0],
+                    self.source[1],
+                    self.report.options,
+                    self.report.worker_state(),
+                ),
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            LOG.warning("no worker processes, writing the pages serially: %s", err)
+            self.failed = True
+
+    def write(self, progress_title):
+        """
+        Write the queued pages.
+
+        @param: progress_title -- The title of the progress meter
+        """
+        jobs, self.jobs = self.jobs, []
+        if not jobs:
+            return
+        if self.pool is None and not self.failed and len(jobs) >= MIN_PARALLEL_PAGES:
+            self.start()
+        report = self.report
+        done = 0
+        message = _("Writing pages")
+        with report.user.progress(progress_title, message, len(jobs)) as step:
+            if self.pool is not None:
+                shards = [
+                    jobs[index : index + SHARD_SIZE]
+                    for index in range(0, len(jobs), SHARD_SIZE)
+                ]
+                try:
+                    for results in self.pool.imap(_write_shard, shards):
+                        for pages, links, members, warnings in results:
+                            if report.manifest is not None:
+                                report.manifest.pages.update(pages)
+                            report.fam_link.update(links)
+                            if members:
+                                add_members(report.archive, members)
+                            for title, warning in warnings:
+                                report.user.warn(title, warning)
+                            step()
+                        done += len(results)
+                except Exception as err:  # pylint: disable=broad-except
+                    LOG.warning("parallel web pages failed, writing serially: %s", err)
+                    self.close()
+                    self.failed = True
+            for kind, name, refs, dummy, dummy, writer, args, dummy in jobs[done:]:
+                report.render_page(kind, name, refs, writer, args)
+                step()
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
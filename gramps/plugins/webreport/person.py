@@ -150,6 +150,7 @@ class PersonPages(BasePage):
         self.person = None
         self.familymappages = None
         self.rel_class = None
+        self.center_relations = None
         self.placemappages = None
         self.name = None
         self.gender_map = None
@@ -167,6 +168,8 @@ class PersonPages(BasePage):
             LOG.debug("    %s", str(item))
         message = _("Creating individual pages")
         progress_title = self.report.pgrs_title(the_lang)
+        # the relationships to the center person in this language
+        self.center_relations = None
         with self.r_user.progress(
             progress_title, message, len(self.report.obj_dict[Person]) + 1
         ) as step:
@@ -174,12 +177,19 @@ class PersonPages(BasePage):
             for person_handle in sorted(self.report.obj_dict[Person]):
                 step()
                 index += 1
-                person = self.r_db.get_person_from_handle(person_handle)
-                self.individualpage(self.report, the_lang, the_title, person)
+                self.report.write_page(
+                    Person, person_handle, None, "Person.individualpage", person_handle
+                )
             step()
-            self.individuallistpage(
-                self.report, the_lang, the_title, self.report.obj_dict[Person].keys()
-            )
+            ppl_handle_list = sorted(self.report.obj_dict[Person])
+            if not self.report.is_current("IndividualList", "", ppl_handle_list):
+                with self.report.recording("IndividualList", "", ppl_handle_list):
+                    self.individuallistpage(
+                        self.report,
+                        the_lang,
+                        the_title,
+                        self.report.obj_dict[Person].keys(),
+                    )
 
     #################################################
     #
@@ -520,16 +530,17 @@ class PersonPages(BasePage):
     #    creates an Individual Page
     #
     #################################################
-    def individualpage(self, report, the_lang, the_title, person):
+    def individualpage(self, report, the_lang, the_title, person_handle):
         """
         Creates an individual page
 
-        @param: report    -- The instance of the main report class
-                             for this report
-        @param: the_lang  -- The lang to process
-        @param: the_title -- The title page related to the language
-        @param: person    -- The person to use for this page.
+        @param: report        -- The instance of the main report class
+                                 for this report
+        @param: the_lang      -- The lang to process
+        @param: the_title     -- The title page related to the language
+        @param: person_handle -- The handle of the person to use for this page.
         """
+        person = report.database.get_person_from_handle(person_handle)
         BasePage.__init__(self, report, the_lang, the_title, person.get_gramps_id())
         place_lat_long = []
 
@@ -2226,9 +2237,25 @@ class PersonPages(BasePage):
         if int(self.report.options["living_people"]) != LivingProxyDb.MODE_INCLUDE_ALL:
             if probably_alive(center_person, self.r_db, Today()):
                 return None
-        relationship = self.rel_class.get_one_relationship(
-            self.r_db, center_person, self.person
-        )
+        if self.center_relations is None:
+            # all the people at once, so that the ancestors of the center
+            # person are looked up only once
+            handles = list(self.report.obj_dict[Person])
+            self.center_relations = dict(
+                zip(
+                    handles,
+                    self.rel_class.get_one_relationships(
+                        self.r_db,
+                        center_person,
+                        (self.r_db.get_person_from_handle(hdl) for hdl in handles),
+                    ),
+                )
+            )
+        relationship = self.center_relations.get(self.person.handle)
+        if relationship is None:
+            relationship = self.rel_class.get_one_relationship(
+                self.r_db, center_person, self.person
+            )
         if relationship == "":  # No relation to display
             return None
 
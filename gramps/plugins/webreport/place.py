@@ -137,33 +137,7 @@ class PlacePages(BasePage):
         with self.r_user.progress(progress_title, message, place_count + 1) as step:
             if self.report.options["inc_uplaces"]:
                 # add unused place
-                place_list = self.r_db.get_place_handles()
-                for place_ref in place_list:
-                    if place_ref not in self.report.obj_dict[Place]:
-                        place = self.r_db.get_place_from_handle(place_ref)
-                        if place:
-                            place_name = place.get_title()
-                            p_fname = self.report.build_url_fname(
-                                place_ref, "plc", False, init=True
-                            )
-                            p_fname += self.ext
-                            plc_dict = (p_fname, place_name, place.gramps_id, None)
-                            self.report.obj_dict[Place][place_ref] = plc_dict
-                            p_name = _pd.display(self.r_db, place, fmt=0)
-                            cplace_name = p_name.split()[-1]
-                            if len(place_name.split()) > 1:
-                                splace_name = place_name.split()[-2]
-                            else:
-                                splace_name = cplace_name
-                            plc_dict = (
-                                place_ref,
-                                p_name,
-                                splace_name,
-                                cplace_name,
-                                place.gramps_id,
-                                None,
-                            )
-                            self.report.obj_dict[PlaceName][p_name] = plc_dict
+                self.add_unused_places()
 
         with self.r_user.progress(
             progress_title, message, len(self.report.obj_dict[Place]) + 1
@@ -174,11 +148,59 @@ class PlacePages(BasePage):
                 p_handle = self.report.obj_dict[PlaceName][place_name]
                 index += 1
                 if isinstance(p_handle, tuple):
-                    self.placepage(
-                        self.report, the_lang, the_title, p_handle[0], place_name
+                    refs = (
+                        self.report.page_refs(PlaceName, place_name),
+                        self.report.page_refs(Place, p_handle[0]),
+                    )
+                    self.report.write_page(
+                        PlaceName,
+                        place_name,
+                        refs,
+                        "Place.placepage",
+                        p_handle[0],
+                        place_name,
                     )
             step()
-        self.placelistpage(self.report, the_lang, the_title)
+        refs = [
+            self.report.page_refs(PlaceName, place_name)
+            for place_name in sorted(self.report.obj_dict[PlaceName])
+        ]
+        if not self.report.is_current("PlaceList", "", refs):
+            with self.report.recording("PlaceList", "", refs):
+                self.placelistpage(self.report, the_lang, the_title)
+
+    def add_unused_places(self):
+        """
+        Add the places which are not referenced by the objects of the report
+        to the object dictionary.
+        """
+        place_list = self.r_db.get_place_handles()
+        for place_ref in place_list:
+            if place_ref not in self.report.obj_dict[Place]:
+                place = self.r_db.get_place_from_handle(place_ref)
+                if place:
+                    place_name = place.get_title()
+                    p_fname = self.report.build_url_fname(
+                        place_ref, "plc", False, init=True
+                    )
+                    p_fname += self.ext
+                    plc_dict = (p_fname, place_name, place.gramps_id, None)
+                    self.report.obj_dict[Place][place_ref] = plc_dict
+                    p_name = _pd.display(self.r_db, place, fmt=0)
+                    cplace_name = p_name.split()[-1]
+                    if len(place_name.split()) > 1:
+                        splace_name = place_name.split()[-2]
+                    else:
+                        splace_name = cplace_name
+                    plc_dict = (
+                        place_ref,
+                        p_name,
+                        splace_name,
+                        cplace_name,
+                        place.gramps_id,
+                        None,
+                    )
+                    self.report.obj_dict[PlaceName][p_name] = plc_dict
 
     def __output_place(
         self,
@@ -119,14 +119,21 @@ class RepositoryPages(BasePage):
             keys = sorted(repos_dict, key=self.rlocale.sort_key)
 
             # RepositoryListPage Class
-            self.repositorylistpage(self.report, the_lang, the_title, repos_dict, keys)
+            refs = [repos_dict[key][1] for key in keys]
+            if not self.report.is_current("RepositoryList", "", refs):
+                with self.report.recording("RepositoryList", "", refs):
+                    self.repositorylistpage(
+                        self.report, the_lang, the_title, repos_dict, keys
+                    )
 
             idx = 1
             for dummy_index, key in enumerate(keys):
-                (repo, handle) = repos_dict[key]
+                handle = repos_dict[key][1]
                 step()
                 idx += 1
-                self.repositorypage(self.report, the_lang, the_title, repo, handle)
+                self.report.write_page(
+                    Repository, handle, None, "Repository.repositorypage", handle
+                )
 
     def repositorylistpage(self, report, the_lang, the_title, repos_dict, keys):
         """
@@ -223,7 +230,7 @@ class RepositoryPages(BasePage):
         # and close the file
         self.xhtml_writer(repolistpage, output_file, sio, ldatec)
 
-    def repositorypage(self, report, the_lang, the_title, repo, handle):
+    def repositorypage(self, report, the_lang, the_title, handle):
         """
         Create one page for one repository.
 
@@ -231,9 +238,9 @@ class RepositoryPages(BasePage):
                              for this report
         @param: the_lang  -- The lang to process
         @param: the_title -- The title page related to the language
-        @param: repo      -- the repository to use
-        @param: handle    -- the handle to use
+        @param: handle    -- the handle of the repository to use
         """
+        repo = report.database.get_repository_from_handle(handle)
         gid = repo.get_gramps_id()
         BasePage.__init__(self, report, the_lang, the_title, gid)
         ldatec = repo.get_change_time()
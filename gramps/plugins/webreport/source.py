@@ -109,15 +109,23 @@ class SourcePages(BasePage):
         with self.r_user.progress(
             progress_title, message, len(self.report.obj_dict[Source]) + 1
         ) as step:
-            self.sourcelistpage(
-                self.report, the_lang, the_title, self.report.obj_dict[Source].keys()
-            )
+            src_handle_list = sorted(self.report.obj_dict[Source])
+            if not self.report.is_current("SourceList", "", src_handle_list):
+                with self.report.recording("SourceList", "", src_handle_list):
+                    self.sourcelistpage(
+                        self.report,
+                        the_lang,
+                        the_title,
+                        self.report.obj_dict[Source].keys(),
+                    )
 
             index = 1
             for source_handle in self.report.obj_dict[Source]:
                 step()
                 index += 1
-                self.sourcepage(self.report, the_lang, the_title, source_handle)
+                self.report.write_page(
+                    Source, source_handle, None, "Source.sourcepage", source_handle
+                )
 
     def sourcelistpage(self, report, the_lang, the_title, source_handles):
         """
@@ -0,0 +1,131 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the archive of the Narrated Web Site.
+"""
+
+from io import BytesIO
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+from .. import archive
+from ..archive import ARCHIVE_FORMATS, HAVE_ZSTD, open_archive
+
+
+class WebArchiveTest(unittest.TestCase):
+    """
+    Write the same files in each format, and read them back.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.image = os.path.join(self.tmpdir.name, "image.jpg")
+        with open(self.image, "wb") as image:
+            image.write(b"an image")
+        os.utime(self.image, (1000000000, 1000000000))
+        # pages of different sizes, some larger than a compressed block
+        self.pages = {
+            "ppl/%d.html" % index: (b"<p>person %d</p>" % index) * (index * 997)
+            for index in range(40)
+        }
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, fmt, threads=0):
+        """
+        Write the pages and the image twice in an archive, and return its
+        name.
+        """
+        filename = os.path.join(self.tmpdir.name, "site%d%s" % (threads, fmt))
+        web_archive = open_archive(filename, fmt, threads)
+        for dummy in range(2):
+            for name, data in self.pages.items():
+                web_archive.add_data(name, data, 1200000000)
+            web_archive.add_file(self.image, "images/image.jpg")
+        self.assertIn("ppl/1.html", web_archive)
+        self.assertNotIn("ppl/40.html", web_archive)
+        web_archive.close()
+        return filename
+
+    def read(self, filename, fmt):
+        """
+        Return the content and the modification time of the files of an
+        archive.
+        """
+        files = {}
+        if fmt == ".zip":
+            with zipfile.ZipFile(filename) as zip_file:
+                for info in zip_file.infolist():
+                    mtime = zipfile.ZipInfo.from_file(self.image).date_time
+                    files[info.filename] = (
+                        zip_file.read(info),
+                        info.date_time == mtime,
+                    )
+            return files
+        if fmt == ".tar.zst":
+            with open(filename, "rb") as compressed:
+                data = archive.zstandard.ZstdDecompressor().decompress(
+                    compressed.read(), max_output_size=1 << 30
+                )
+            tar_file = tarfile.open(fileobj=BytesIO(data))
+        else:
+            tar_file = tarfile.open(filename)
+        with tar_file:
+            for info in tar_file.getmembers():
+                files[info.name] = (
+                    tar_file.extractfile(info).read(),
+                    info.mtime == 1000000000,
+                )
+        return files
+
+    def check(self, fmt, threads=0):
+        files = self.read(self.write(fmt, threads), fmt)
+        self.assertEqual(len(files), len(self.pages) + 1)
+        for name, data in self.pages.items():
+            self.assertEqual(files[name][0], data)
+        self.assertEqual(files["images/image.jpg"], (b"an image", True))
+
+    def test_tar_gz(self):
+        self.check(".tar.gz")
+
+    def test_parallel_gzip(self):
+        self.check(".tar.gz", threads=3)
+
+    @unittest.skipUnless(HAVE_ZSTD, "zstandard is not installed")
+    def test_tar_zst(self):
+        self.check(".tar.zst")
+        self.check(".tar.zst", threads=2)
+
+    def test_zip(self):
+        self.check(".zip")
+
+    def test_formats(self):
+        self.assertEqual(".tar.zst" in ARCHIVE_FORMATS, HAVE_ZSTD)
+        filename = os.path.join(self.tmpdir.name, "site.rar")
+        self.assertRaises(ValueError, open_archive, filename, ".rar")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the manifest of the pages written by the Narrated Web Site.
+"""
+
+import os
+import tempfile
+import unittest
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Note, NoteType, Person
+from ..incremental import PageManifest, RecordingDb, RecordingDict
+
+
+class PageManifestTest(unittest.TestCase):
+    """
+    Write pages that read a person, and check which pages are current in
+    the next run.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.person = Person()
+        self.person.set_gramps_id("I0001")
+        self.note = Note("a note")
+        with DbTxn("Add test objects", self.db) as trans:
+            self.db.add_person(self.person, trans)
+            self.db.add_note(self.note, trans)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.entries = {"Person": {self.person.handle: ["I0001.html", "I0001"]}}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        self.db.close()
+
+    def entry(self, obj_type, handle):
+        return self.entries.get(obj_type, {}).get(handle)
+
+    def open(self, options=None):
+        return PageManifest(
+            self.tmpdir.name, options or {}, RecordingDb(self.db), self.entry
+        )
+
+    def write(self, manifest, key, reader):
+        """
+        Write a page whose content is made by a reader of the database.
+        """
+        with manifest.recording(key, ["refs"]):
+            fname = os.path.join(self.tmpdir.name, key + ".html")
+            with open(fname, "w", encoding="utf-8") as page:
+                page.write(str(reader(manifest.database)))
+            manifest.add_file(fname)
+
+    def first_run(self, reader):
+        manifest = self.open()
+        self.assertIsNone(manifest.is_current("page", ["refs"]))
+        self.write(manifest, "page", reader)
+        manifest.close()
+        return self.open()
+
+    def person_name(self, database):
+        return database.get_person_from_handle(self.person.handle).gramps_id
+
+    def test_unchanged(self):
+        manifest = self.first_run(self.person_name)
+        self.assertIsNotNone(manifest.is_current("page", ["refs"]))
+        self.assertIsNone(manifest.is_current("page", ["other refs"]))
+        self.assertIsNone(self.open({"title": "other"}).is_current("page", ["refs"]))
+
+    def test_changed_object(self):
+        manifest = self.first_run(self.person_name)
+        with DbTxn("Edit person", self.db) as trans:
+            self.db.commit_person(self.person, trans, self.person.change + 1)
+        self.assertIsNone(manifest.is_current("page", ["refs"]))
+
+    def test_changed_entry(self):
+        manifest = self.first_run(self.person_name)
+        self.entries["Person"][self.person.handle] = ["I0001.html", "Renamed"]
+        self.assertIsNone(manifest.is_current("page", ["refs"]))
+
+    def test_entry_read(self):
+        def read_entry(database):
+            entries = RecordingDict(database, "Person")
+            entries[self.person.handle] = ("I0001.html", "I0001")
+            return entries[self.person.handle][1]
+
+        manifest = self.first_run(read_entry)
+        self.assertIsNotNone(manifest.is_current("page", ["refs"]))
+        with DbTxn("Edit person", self.db) as trans:
+            self.db.commit_person(self.person, trans, self.person.change + 1)
+        self.assertIsNone(self.open().is_current("page", ["refs"]))
+
+    def test_changed_query(self):
+        def read_note(database):
+            return database.get_note_from_gramps_id("N0001")
+
+        manifest = self.first_run(read_note)
+        self.assertIsNotNone(manifest.is_current("page", ["refs"]))
+        note = Note("another note")
+        note.set_type(NoteType.GENERAL)
+        note.set_gramps_id("N0001")
+        with DbTxn("Add note", self.db) as trans:
+            self.db.add_note(note, trans)
+        self.assertIsNone(self.open().is_current("page", ["refs"]))
+
+    def test_stale_files(self):
+        manifest = self.first_run(self.person_name)
+        fname = os.path.join(self.tmpdir.name, "page.html")
+        self.assertTrue(os.path.exists(fname))
+        # The page is not written again: its object left the report
+        manifest.close()
+        self.assertFalse(os.path.exists(fname))
+        self.assertIsNone(self.open().is_current("page", ["refs"]))
+
+    def test_missing_file(self):
+        manifest = self.first_run(self.person_name)
+        os.remove(os.path.join(self.tmpdir.name, "page.html"))
+        self.assertIsNone(manifest.is_current("page", ["refs"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the files given back by the worker processes of the Narrated
+Web Site.
+"""
+
+import os
+import tarfile
+import tempfile
+import unittest
+
+from ..archive import open_archive
+from ..parallel import ArchiveMembers, add_members
+
+
+class ArchiveMembersTest(unittest.TestCase):
+    """
+    Keep the files of a worker, and add them to a tar archive.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_add_members(self):
+        fname = os.path.join(self.tmpdir.name, "image.jpg")
+        with open(fname, "wb") as image:
+            image.write(b"an image")
+        os.utime(fname, (1000000000, 1000000000))
+
+        members = ArchiveMembers()
+        members.add_data("index.html", b"page", 1200000000)
+        members.add_file(fname, "images/image.jpg")
+        members.add_data("index.html", b"again")
+        self.assertIn("index.html", members)
+        kept = members.pop()
+        self.assertEqual(len(kept), 2)
+        self.assertEqual(members.pop(), [])
+
+        archive_name = os.path.join(self.tmpdir.name, "site.tar.gz")
+        archive = open_archive(archive_name)
+        add_members(archive, kept)
+        # the files already in the archive are not added again
+        add_members(archive, kept)
+        archive.close()
+        with tarfile.open(archive_name) as archive:
+            self.assertEqual(archive.getnames(), ["index.html", "images/image.jpg"])
+            self.assertEqual(archive.extractfile("index.html").read(), b"page")
+            self.assertEqual(archive.getmember("index.html").mtime, 1200000000)
+            image = archive.getmember("images/image.jpg")
+            self.assertEqual(image.mtime, 1000000000)
+            self.assertEqual(archive.extractfile(image).read(), b"an image")
+
+
+if __name__ == "__main__":
+    unittest.main()
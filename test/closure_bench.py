@@ -0,0 +1,158 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the relationship filters with the closure table.
+
+A synthetic tree of GENERATIONS generations is built, in which every couple
+is chosen from the previous generation, so that the pedigrees collapse.  The
+ancestral and descendant filters are then run for a person of the last and
+of the first generation, with the closure table and by walking the families.
+The time taken to build the tree with and without the closure table is also
+shown.
+
+Run from the top directory:  python test/closure_bench.py [GENERATIONS]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.gen.config import config
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.filters import GenericFilter
+from gramps.gen.filters.rules.person import (
+    HasCommonAncestorWith,
+    IsAncestorOf,
+    IsDescendantOf,
+    IsDuplicatedAncestorOf,
+    IsLessThanNthGenerationAncestorOf,
+    IsMoreThanNthGenerationDescendantOf,
+)
+from gramps.gen.lib import ChildRef, Family, Person
+
+WIDTH = 500
+CHILDREN = 2
+
+
+def build(db, generations):
+    """
+    Add WIDTH people per generation, each the child of a random couple of
+    the previous generation.  Return the first person of the first and of
+    the last generations.
+    """
+    random.seed(0)
+    with DbTxn("Build benchmark tree", db, batch=True) as trans:
+        previous = []
+        first = None
+        for gen in range(generations):
+            current = []
+            for index in range(WIDTH):
+                person = Person()
+                db.add_person(person, trans)
+                current.append(person)
+            if previous:
+                for index in range(0, WIDTH, CHILDREN):
+                    father, mother = random.sample(previous, 2)
+                    family = Family()
+                    family.set_father_handle(father.handle)
+                    family.set_mother_handle(mother.handle)
+                    children = current[index : index + CHILDREN]
+                    for child in children:
+                        ref = ChildRef()
+                        ref.ref = child.handle
+                        family.add_child_ref(ref)
+                    db.add_family(family, trans)
+                    for parent in (father, mother):
+                        parent.add_family_handle(family.handle)
+                        db.commit_person(parent, trans)
+                    for child in children:
+                        child.add_parent_family_handle(family.handle)
+                        db.commit_person(child, trans)
+            else:
+                first = current[0]
+            previous = current
+    return first, previous[0]
+
+
+def run_filters(db, first, last):
+    """Return the time taken by each filter."""
+    rules = [
+        IsAncestorOf([last.gramps_id, "1"]),
+        IsLessThanNthGenerationAncestorOf([last.gramps_id, "5"]),
+        IsDuplicatedAncestorOf([last.gramps_id]),
+        IsDescendantOf([first.gramps_id, "1"]),
+        IsMoreThanNthGenerationDescendantOf([first.gramps_id, "5"]),
+        HasCommonAncestorWith([last.gramps_id]),
+    ]
+    times = []
+    for rule in rules:
+        filt = GenericFilter()
+        filt.add_rule(rule)
+        start = time.perf_counter()
+        matches = filt.apply(db)
+        times.append((rule.__class__.__name__, time.perf_counter() - start, matches))
+    return times
+
+
+def main():
+    generations = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    saved = config.get("database.closure-table")
+    results = {}
+    try:
+        for use_closure in (False, True):
+            config.set("database.closure-table", use_closure)
+            with tempfile.TemporaryDirectory() as directory:
+                db = make_database("sqlite")
+                db.load(directory)
+                start = time.perf_counter()
+                first, last = build(db, generations)
+                built = time.perf_counter() - start
+                first = db.get_person_from_handle(first.handle)
+                last = db.get_person_from_handle(last.handle)
+                results[use_closure] = (built, run_filters(db, first, last))
+                db.close()
+    finally:
+        config.set("database.closure-table", saved)
+
+    print("%d generations of %d people" % (generations, WIDTH))
+    print("%-40s %12s %12s" % ("", "walk", "closure"))
+    print(
+        "%-40s %10.2f s %10.2f s"
+        % ("build the tree", results[False][0], results[True][0])
+    )
+    for (name, walked, matches), (dummy, indexed, same) in zip(
+        results[False][1], results[True][1]
+    ):
+        assert len(matches) == len(same), name
+        print(
+            "%-40s %10.1f ms %9.1f ms  (%d people)"
+            % (name, walked * 1000, indexed * 1000, len(matches))
+        )
+
+
+if __name__ == "__main__":
+    main()
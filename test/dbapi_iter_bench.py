@@ -0,0 +1,167 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the DBAPI iterators on a large synthetic tree.
+
+For each iterator the time to the first row, the total time and the growth
+of the peak RSS are printed, next to the same query materialized with
+fetchall(), as the iterators did before.  Each case runs in its own
+process, so that the peak RSS of one case does not hide the next.
+
+Run from the top directory:  python test/dbapi_iter_bench.py [PEOPLE]
+"""
+
+import os
+import pickle
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.dbconst import DBMODE_R
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Note, Person, Place, PlaceRef
+
+PLACE_FANOUT = 10
+
+
+def build(directory, people):
+    """
+    Create a tree with people who all refer to one note, and a place
+    hierarchy with a tenth as many places.
+    """
+    db = make_database("sqlite")
+    db.load(directory)
+    with DbTxn("Build benchmark tree", db, batch=True) as trans:
+        note = Note("shared")
+        db.add_note(note, trans)
+        for dummy in range(people):
+            person = Person()
+            person.add_note(note.handle)
+            db.add_person(person, trans)
+        parents = [""]
+        for index in range(people // 10):
+            place = Place()
+            parent = parents[index // PLACE_FANOUT]
+            if parent:
+                placeref = PlaceRef()
+                placeref.ref = parent
+                place.add_placeref(placeref)
+            db.add_place(place, trans)
+            parents.append(place.handle)
+    db.close()
+
+
+def fetchall(db, sql, args=None):
+    """Iterate over a query materialized with fetchall()."""
+    db.dbapi.execute(sql, args or [])
+    for row in db.dbapi.fetchall():
+        yield row
+
+
+def place_tree_per_node(db):
+    """Iterate over the place tree with one query per place."""
+    to_do = [""]
+    sql = "SELECT handle, blob_data FROM place WHERE enclosed_by = ?"
+    while to_do:
+        handle = to_do.pop()
+        db.dbapi.execute(sql, [handle])
+        for row in db.dbapi.fetchall():
+            to_do.append(row[0])
+            yield (row[0], pickle.loads(row[1]))
+
+
+def cases(db):
+    """Return a list of (label, iterator function) of the cases."""
+    note = db.get_note_handles()[0]
+    return [
+        ("iter_person_handles", lambda: db.iter_person_handles()),
+        ("  with fetchall", lambda: fetchall(db, "SELECT handle FROM person")),
+        ("find_backlink_handles", lambda: db.find_backlink_handles(note)),
+        (
+            "  with fetchall",
+            lambda: fetchall(
+                db,
+                "SELECT obj_class, obj_handle FROM reference WHERE ref_handle = ?",
+                [note],
+            ),
+        ),
+        ("get_person_gramps_ids", lambda: iter(db.get_person_gramps_ids())),
+        ("  with fetchall", lambda: fetchall(db, "SELECT gramps_id FROM person")),
+        ("get_place_tree_cursor", lambda: iter(db.get_place_tree_cursor())),
+        ("  query per place", lambda: place_tree_per_node(db)),
+    ]
+
+
+def run_case(directory, index):
+    """Measure one case; print the results as one line."""
+    db = make_database("sqlite")
+    db.load(directory, mode=DBMODE_R)
+    name, iterator_func = cases(db)[index]
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    iterator = iterator_func()
+    first = None
+    count = 0
+    for dummy in iterator:
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    total = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss
+    print(
+        "%-24s %8d rows  first %8.2f ms  total %8.1f ms  peak RSS +%7d kB"
+        % (name, count, (first or 0) * 1000, total * 1000, peak)
+    )
+    db.close(update=False)
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--case":
+        run_case(sys.argv[2], int(sys.argv[3]))
+        return
+    people = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        build(directory, people)
+        db = make_database("sqlite")
+        db.load(directory, mode=DBMODE_R)
+        count = len(cases(db))
+        db.close(update=False)
+        for index in range(count):
+            subprocess.run(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "--case",
+                    directory,
+                    str(index),
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
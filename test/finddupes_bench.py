@@ -0,0 +1,118 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the search of duplicate people.
+
+A synthetic tree of PEOPLE people with a few common surnames is built.  The
+duplicates are then searched comparing every pair of people with the same
+surname, as the tool used to, with the pairs found by the index, and with
+the comparisons spread over the processors.
+
+Run from the top directory:  python test/finddupes_bench.py [PEOPLE]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Date, Event, EventRef, EventType, Person, Surname
+from gramps.plugins.lib import libduplicates
+
+SURNAMES = ["Smith", "Jones", "Brown", "Martin", "Miller", "Davis"]
+FIRST_NAMES = ["John", "Mary", "William", "Elizabeth", "James", "Anna", "Paul"]
+
+
+def build(db, count):
+    """
+    Add count people, most with a birth year.
+    """
+    random.seed(0)
+    with DbTxn("Build benchmark tree", db, batch=True) as trans:
+        for dummy in range(count):
+            person = Person()
+            person.set_gender(random.choice([Person.MALE, Person.FEMALE]))
+            name = person.get_primary_name()
+            name.set_first_name(
+                " ".join(random.sample(FIRST_NAMES, random.randint(1, 2)))
+            )
+            surname = Surname()
+            surname.set_surname(random.choice(SURNAMES))
+            name.add_surname(surname)
+            if random.random() < 0.8:
+                event = Event()
+                event.set_type(EventType.BIRTH)
+                date = Date()
+                date.set_yr_mon_day(random.randint(1700, 1900), 0, 0)
+                event.set_date_object(date)
+                db.add_event(event, trans)
+                ref = EventRef()
+                ref.ref = event.handle
+                person.add_event_ref(ref)
+                person.set_birth_ref(ref)
+            db.add_person(person, trans)
+
+
+def timed(func):
+    """Return the time taken by func and its result."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    db = make_database("sqlite")
+    db.load(":memory:")
+    build(db, count)
+
+    iter_candidates = libduplicates._iter_candidates
+    libduplicates._iter_candidates = lambda block, keys, exhaustive: (
+        iter_candidates(block, keys, True)
+    )
+    blocks, expected = timed(
+        lambda: libduplicates.find_duplicates(db, 0.25, processes=1)
+    )
+    libduplicates._iter_candidates = iter_candidates
+    indexed, result = timed(
+        lambda: libduplicates.find_duplicates(db, 0.25, processes=1)
+    )
+    assert result == expected
+    parallel, result = timed(lambda: libduplicates.find_duplicates(db, 0.25))
+    assert result == expected
+    db.close()
+
+    print("%d people, %d potential duplicates" % (count, len(expected)))
+    for label, seconds in (
+        ("all pairs of each surname", blocks),
+        ("pairs found by the index", indexed),
+        ("pairs found by the index, %d processes" % os.cpu_count(), parallel),
+    ):
+        print("%-45s %10.2f s" % (label, seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the throughput of the GEDCOM import.
+
+A synthetic GEDCOM file of about LINES lines is written, with generations of
+WIDTH people who have a name, a birth and a death with a date and a place,
+and a note.  It is then imported into an SQLite database in memory, and the
+time and the lines per second of both stages of the import are reported.
+
+Run from the top directory:  python test/gedcom_bench.py [LINES]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.cli.user import User
+from gramps.gen.db.utils import make_database
+from gramps.plugins.lib import libgedcom
+from gramps.plugins.lib.libmixin import DbMixin
+
+WIDTH = 1000
+# Lines written for each person and the half of its family
+LINES_PER_PERSON = 16
+
+
+def write(ofile, people):
+    """
+    Write the people in generations of WIDTH, each couple of a generation
+    being the parents of a couple of the next one.
+    """
+    ofile.write(
+        "0 HEAD\n1 SOUR Benchmark\n1 GEDC\n2 VERS 5.5.1\n"
+        "2 FORM LINEAGE-LINKED\n1 CHAR UTF-8\n"
+    )
+    for index in range(1, people + 1):
+        ofile.write(
+            "0 @I%d@ INDI\n1 NAME John%d /Smith%d/\n1 SEX %s\n"
+            % (index, index % 97, index % 113, "MF"[index % 2])
+        )
+        ofile.write(
+            "1 BIRT\n2 DATE %d JAN %d\n2 PLAC Town%d, County%d, England\n"
+            % (1 + index % 28, 1700 + index % 250, index % 300, index % 30)
+        )
+        ofile.write(
+            "1 DEAT\n2 DATE ABT %d\n2 PLAC Town%d, County%d, England\n"
+            % (1760 + index % 250, index % 300, index % 30)
+        )
+        ofile.write("1 NOTE A note about person %d\n2 CONT on two lines\n" % index)
+        if index > WIDTH:
+            ofile.write("1 FAMC @F%d@\n" % ((index - WIDTH + 1) // 2))
+        ofile.write("1 FAMS @F%d@\n" % ((index + 1) // 2))
+    for family in range(1, (people + 1) // 2 + 1):
+        ofile.write(
+            "0 @F%d@ FAM\n1 HUSB @I%d@\n1 WIFE @I%d@\n1 MARR\n2 DATE %d\n"
+            % (family, 2 * family - 1, 2 * family, 1730 + family % 250)
+        )
+        for child in (2 * family - 1 + WIDTH, 2 * family + WIDTH):
+            if child <= people:
+                ofile.write("1 CHIL @I%d@\n" % child)
+    ofile.write("0 TRLR\n")
+
+
+def timed(func):
+    """Return the time taken by func and its result."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    db = make_database("sqlite")
+    db.load(":memory:")
+    if DbMixin not in db.__class__.__bases__:
+        db.__class__.__bases__ = (DbMixin,) + db.__class__.__bases__
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "bench.ged")
+        with open(filename, "w", encoding="utf-8") as ofile:
+            write(ofile, max(lines // LINES_PER_PERSON, 2))
+        with open(filename, "rb") as ifile:
+            stage_one = libgedcom.GedcomStageOne(ifile)
+            first, dummy = timed(stage_one.parse)
+            ifile.seek(0)
+            parser = libgedcom.GedcomParser(
+                db, ifile, filename, User(quiet=True), stage_one, None, None
+            )
+            second, dummy = timed(lambda: parser.parse_gedcom_file(False))
+    count = stage_one.get_line_count()
+    people = db.get_number_of_people()
+    db.close()
+
+    print("%d lines, %d people" % (count, people))
+    for label, seconds in (("first stage", first), ("second stage", second)):
+        print("%-20s %10.1f s %10d lines/s" % (label, seconds, count / seconds))
+
+
+if __name__ == "__main__":
+    main()
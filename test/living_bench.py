@@ -0,0 +1,175 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the probably alive computations over a whole tree.
+
+A synthetic tree of GENERATIONS generations is built, in which few people
+have a birth or a death date.  Whether each person is probably alive is then
+computed one person at a time, as it used to be, and with the dates of
+everybody computed once.  Finally all the people are read through the living
+proxy, as an export that excludes the living does, checking each person on
+its own as the proxy used to, and with the dates of everybody.
+
+Run from the top directory:  python test/living_bench.py [GENERATIONS]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import ChildRef, Date, Event, EventRef, EventType, Family, Person
+from gramps.gen.proxy import LivingProxyDb
+from gramps.gen.utils.alive import ProbablyAliveRanges, probably_alive
+
+WIDTH = 200
+CHILDREN = 2
+
+
+class PerPersonLivingProxyDb(LivingProxyDb):
+    """
+    The living proxy as it used to be, checking each person on its own.
+    """
+
+    def _LivingProxyDb__is_living(self, person):
+        unfil_person = self.get_unfiltered_person(person.get_handle())
+        return probably_alive(
+            unfil_person, self.db, self.current_date, self.years_after_death
+        )
+
+
+def add_event(db, person, event_type, year, trans):
+    """Add an event of the given type and year to the person."""
+    event = Event()
+    event.set_type(event_type)
+    date = Date()
+    date.set_yr_mon_day(year, 1, 1)
+    event.set_date_object(date)
+    db.add_event(event, trans)
+    ref = EventRef()
+    ref.ref = event.handle
+    person.add_event_ref(ref)
+    if event_type == EventType.BIRTH:
+        person.set_birth_ref(ref)
+    else:
+        person.set_death_ref(ref)
+
+
+def build(db, generations):
+    """
+    Add WIDTH people per generation, each the child of a random couple of
+    the previous generation.  One person in ten has a birth date, one in
+    twenty a death date.
+    """
+    random.seed(0)
+    with DbTxn("Build benchmark tree", db, batch=True) as trans:
+        previous = []
+        for gen in range(generations):
+            year = 2000 - 25 * (generations - gen)
+            current = []
+            for index in range(WIDTH):
+                person = Person()
+                person.set_gender(index % 2)
+                if random.random() < 0.1:
+                    add_event(db, person, EventType.BIRTH, year, trans)
+                if random.random() < 0.05:
+                    add_event(db, person, EventType.DEATH, year + 70, trans)
+                db.add_person(person, trans)
+                current.append(person)
+            if previous:
+                for index in range(0, WIDTH, CHILDREN):
+                    father = random.choice(previous[1::2])
+                    mother = random.choice(previous[0::2])
+                    family = Family()
+                    family.set_father_handle(father.handle)
+                    family.set_mother_handle(mother.handle)
+                    children = current[index : index + CHILDREN]
+                    for child in children:
+                        ref = ChildRef()
+                        ref.ref = child.handle
+                        family.add_child_ref(ref)
+                    db.add_family(family, trans)
+                    for parent in (father, mother):
+                        parent.add_family_handle(family.handle)
+                        db.commit_person(parent, trans)
+                    for child in children:
+                        child.add_parent_family_handle(family.handle)
+                        db.commit_person(child, trans)
+            previous = current
+
+
+def timed(func):
+    """Return the time taken by func and its result."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    generations = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    db = make_database("sqlite")
+    db.load(":memory:")
+    build(db, generations)
+    people = list(db.iter_people())
+
+    single, expected = timed(lambda: [probably_alive(person, db) for person in people])
+    engine, result = timed(
+        lambda: [
+            ranges.probably_alive(person)
+            for ranges in [ProbablyAliveRanges(db)]
+            for person in people
+        ]
+    )
+    assert result == expected
+    results = {}
+    for label, proxy_class in (
+        ("living proxy, one person at a time", PerPersonLivingProxyDb),
+        ("living proxy, everybody at once", LivingProxyDb),
+    ):
+        results[label], living = timed(
+            lambda: [
+                person.handle
+                for person in proxy_class(
+                    db, LivingProxyDb.MODE_EXCLUDE_ALL
+                ).iter_people()
+            ]
+        )
+        assert len(living) == len(people) - sum(expected)
+    db.close()
+
+    print(
+        "%d generations of %d people, %d probably alive"
+        % (generations, WIDTH, sum(expected))
+    )
+    for label, seconds in (
+        ("one person at a time", single),
+        ("everybody at once", engine),
+    ) + tuple(results.items()):
+        print("%-45s %10.1f ms" % (label, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Microbenchmark of the LRU cache used by the tree models.
+
+Replays the access pattern of a list view being scrolled: every visible
+cell asks the cache for its value and stores it on a miss.  The linked
+list LRU used before Gramps 5.3 is timed as a reference.
+
+Run from the top directory:  python test/lru_bench.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.gen.utils.lru import LRU
+
+CACHE_SIZE = 1000  # default of interface.treemodel-cache-size
+ROWS = 50000
+VISIBLE = 40
+COLUMNS = 10
+STEPS = 5000
+REPEAT = 7
+
+
+class Node:
+    """Node of the linked list LRU."""
+
+    def __init__(self, prev, value):
+        self.prev = prev
+        self.value = value
+        self.next = None
+
+
+class LinkedLRU:
+    """The linked list LRU, reduced to the methods used by the models."""
+
+    def __init__(self, count):
+        self.count = count
+        self.data = {}
+        self.first = None
+        self.last = None
+
+    def __contains__(self, obj):
+        return obj in self.data
+
+    def __getitem__(self, obj):
+        return self.data[obj].value[1]
+
+    def __setitem__(self, obj, val):
+        if self.count <= 1:
+            return
+        if obj in self.data:
+            del self[obj]
+        nobj = Node(self.last, (obj, val))
+        if self.first is None:
+            self.first = nobj
+        if self.last:
+            self.last.next = nobj
+        self.last = nobj
+        self.data[obj] = nobj
+        if len(self.data) > self.count:
+            if self.first == self.last:
+                self.first = None
+                self.last = None
+                return
+            lnk = self.first
+            lnk.next.prev = None
+            self.first = lnk.next
+            lnk.next = None
+            if lnk.value[0] in self.data:
+                del self.data[lnk.value[0]]
+
+    def __delitem__(self, obj):
+        nobj = self.data[obj]
+        if nobj.prev:
+            nobj.prev.next = nobj.next
+        else:
+            self.first = nobj.next
+        if nobj.next:
+            nobj.next.prev = nobj.prev
+        else:
+            self.last = nobj.prev
+        del self.data[obj]
+
+
+def visible_rows(handles):
+    """
+    Yield the rows visible after each scroll step: mostly small scrolls,
+    sometimes a jump.
+    """
+    top = 0
+    for step in range(STEPS):
+        top = (top + (step * 7919) % 23 + (500 if step % 97 == 0 else 0)) % (
+            ROWS - VISIBLE
+        )
+        yield handles[top : top + VISIBLE]
+
+
+def scroll_linked(lru, handles):
+    """
+    Scroll through the rows, as BaseModel.get_cached_value and
+    set_cached_value did with the linked list LRU.
+    """
+    for rows in visible_rows(handles):
+        for handle in rows:
+            for col in range(COLUMNS):
+                if handle in lru and col in lru[handle]:
+                    continue
+                if handle not in lru:
+                    lru[handle] = {}
+                lru[handle][col] = handle
+
+
+def scroll(lru, handles):
+    """
+    Scroll through the rows, as BaseModel.get_cached_value and
+    set_cached_value do.
+    """
+    for rows in visible_rows(handles):
+        for handle in rows:
+            for col in range(COLUMNS):
+                data = lru.get(handle)
+                if data is not None and col in data:
+                    continue
+                values = lru.get(handle)
+                if values is None:
+                    values = lru[handle] = {}
+                values[col] = handle
+
+
+def measure(lru_class, scroll_func, handles):
+    """Return the time taken to scroll through the rows."""
+    lru = lru_class(CACHE_SIZE)
+    start = time.perf_counter()
+    scroll_func(lru, handles)
+    return time.perf_counter() - start
+
+
+def memory(lru_class, handles):
+    """Return the memory used by a full cache."""
+    tracemalloc.start()
+    lru = lru_class(CACHE_SIZE)
+    for handle in handles[: CACHE_SIZE * 2]:
+        lru[handle] = None
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+
+def main():
+    handles = ["%032x" % index for index in range(ROWS)]
+    candidates = (
+        ("linked list", LinkedLRU, scroll_linked),
+        ("OrderedDict", LRU, scroll),
+    )
+    best = {}
+    # alternate the candidates, so that both see the same machine load
+    for dummy in range(REPEAT):
+        for name, lru_class, scroll_func in candidates:
+            elapsed = measure(lru_class, scroll_func, handles)
+            best[name] = min(best.get(name, elapsed), elapsed)
+    for name, lru_class, scroll_func in candidates:
+        print(
+            "%-12s %7.1f ns/lookup %9d bytes for %d entries"
+            % (
+                name,
+                best[name] / (STEPS * VISIBLE * COLUMNS) * 1e9,
+                memory(lru_class, handles),
+                CACHE_SIZE,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
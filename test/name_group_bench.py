@@ -0,0 +1,101 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the name group lookups of the person tree view.
+
+A synthetic tree is built, with a default grouping for one surname in ten.
+The loop of PersonTreeModel.add_row() that finds the group of every person
+is then timed with the name groups in memory, and with one query per
+lookup, as get_name_group_mapping() did before.
+
+Run from the top directory:  python test/name_group_bench.py [PEOPLE]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.display.name import displayer as name_displayer
+from gramps.gen.lib import Person, Surname
+
+SURNAMES = 5000
+COLUMN_NAME = 3
+
+
+def build(db, people):
+    """
+    Add people with SURNAMES different surnames, and group one surname in
+    ten under another.
+    """
+    with DbTxn("Build benchmark tree", db, batch=True) as trans:
+        for index in range(people):
+            person = Person()
+            surname = Surname()
+            surname.set_surname("Surname%d" % (index % SURNAMES))
+            person.primary_name.add_surname(surname)
+            db.add_person(person, trans)
+    for index in range(0, SURNAMES, 10):
+        db.set_name_group_mapping("Surname%d" % index, "Group%d" % (index // 100))
+
+
+def query_mapping(db, key):
+    """Look up a grouping with a query, as before."""
+    db.dbapi.execute("SELECT grouping FROM name_group WHERE name = ?", [key])
+    row = db.dbapi.fetchone()
+    if row and row[0] is not None:
+        return row[0]
+    return key
+
+
+def group_all(db):
+    """Find the group of every person, as PersonTreeModel.add_row() does."""
+    ngn = name_displayer.name_grouping_data
+    groups = set()
+    start = time.perf_counter()
+    with db.get_person_cursor() as cursor:
+        for handle, data in cursor:
+            groups.add(ngn(db, data[COLUMN_NAME]))
+    return time.perf_counter() - start, len(groups)
+
+
+def main():
+    people = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        db = make_database("sqlite")
+        db.load(directory)
+        build(db, people)
+        in_memory, groups = group_all(db)
+        db.get_name_group_mapping = lambda key: query_mapping(db, key)
+        queried, dummy = group_all(db)
+        db.close()
+    print("%d people, %d groups" % (people, groups))
+    print("%-24s %10.1f ms" % ("one query per lookup", queried * 1000))
+    print("%-24s %10.1f ms" % ("name groups in memory", in_memory * 1000))
+
+
+if __name__ == "__main__":
+    main()
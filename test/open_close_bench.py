@@ -0,0 +1,126 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of opening and closing a large tree.
+
+A synthetic tree is built with many given names and surnames.  The tree is
+then opened, one person is edited, and the tree is closed, several times.
+The surname list and the gender statistics are also saved and loaded the
+way they were before they were kept incrementally, for comparison.
+
+Run from the top directory:  python test/open_close_bench.py [PEOPLE]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Person, Surname
+
+ROUNDS = 5
+
+
+def build(directory, people):
+    """
+    Create a tree with a given name and a surname in every ten people.
+    """
+    db = make_database("sqlite")
+    db.load(directory)
+    with DbTxn("Build benchmark tree", db, batch=True) as trans:
+        for index in range(people):
+            person = Person()
+            person.set_gender(index % 2)
+            person.primary_name.set_first_name("Given%d" % (index // 10))
+            surname = Surname()
+            surname.set_surname("Surname%d" % (index // 10))
+            person.primary_name.add_surname(surname)
+            db.add_person(person, trans)
+    db.close()
+
+
+def edit_one(db):
+    """Change the given name of one person."""
+    handle = next(db.iter_person_handles())
+    person = db.get_person_from_handle(handle)
+    person.primary_name.set_first_name("Edited")
+    with DbTxn("Edit", db) as trans:
+        db.commit_person(person, trans)
+
+
+def old_save_gender_stats(db):
+    """Save the gender statistics by rewriting the table."""
+    db.dbapi.begin()
+    db.dbapi.execute("DELETE FROM gender_stats")
+    for key, (female, male, unknown) in db.genderStats.stats.items():
+        db.dbapi.execute(
+            "INSERT INTO gender_stats (given_name, female, male, unknown) "
+            "VALUES (?, ?, ?, ?)",
+            [key, female, male, unknown],
+        )
+    db.dbapi.commit()
+
+
+def old_surname_list(db):
+    """Read the surname list from the person table."""
+    db.dbapi.execute("SELECT DISTINCT surname FROM person ORDER BY surname")
+    return [row[0] for row in db.dbapi.fetchall()]
+
+
+def main():
+    people = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        build(directory, people)
+        opened = closed = old_saved = old_listed = 0
+        for dummy in range(ROUNDS):
+            db = make_database("sqlite")
+            start = time.perf_counter()
+            db.load(directory)
+            opened += time.perf_counter() - start
+            edit_one(db)
+            start = time.perf_counter()
+            old_surname_list(db)
+            old_listed += time.perf_counter() - start
+            start = time.perf_counter()
+            old_save_gender_stats(db)
+            old_saved += time.perf_counter() - start
+            start = time.perf_counter()
+            db.close()
+            closed += time.perf_counter() - start
+    print("%d people, %d rounds, mean times" % (people, ROUNDS))
+    print("%-36s %10.1f ms" % ("open", opened * 1000 / ROUNDS))
+    print("%-36s %10.1f ms" % ("close after one edit", closed * 1000 / ROUNDS))
+    print(
+        "%-36s %10.1f ms"
+        % ("surname list from person table", old_listed * 1000 / ROUNDS)
+    )
+    print(
+        "%-36s %10.1f ms" % ("gender statistics rewritten", old_saved * 1000 / ROUNDS)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#! /bin/sh
+#
+# Performance test for GRAMPS: time database operations on a large tree.
+#
+# The tree is built from the file given as the first argument (defaults
+# to the example XML data).  Compare the timings printed here before and
+# after a change to the database layer.
+
+TOP_DIR=`dirname $PWD`
+TEST_DIR=$TOP_DIR/test
+SRC_DIR=$TOP_DIR/gramps
+PRG="python ../Gramps.py --yes --quiet"
+EXAMPLE_XML=$TOP_DIR/example/gramps/example.gramps
+TEST_DATA=${1:-$EXAMPLE_XML}
+
+PERF_DIR=$TEST_DIR/perf
+mkdir -p $PERF_DIR
+GRAMPSHOME=$PERF_DIR/grampshome
+export GRAMPSHOME
+
+if [ -d $GRAMPSHOME/. ]; then
+    rm -rf $GRAMPSHOME
+fi
+
+echo ""
+echo "+--------------------------------------------------------------"
+echo "| Import $TEST_DATA, create Gramps DB 'perf'"
+echo "+--------------------------------------------------------------"
+OPTS="-i $TEST_DATA -C perf"
+(cd $SRC_DIR; time $PRG $OPTS)
+
+echo ""
+echo "+--------------------------------------------------------------"
+echo "| Tool: rebuild_refmap"
+echo "+--------------------------------------------------------------"
+OPTS="-O perf -a tool -p name=rebuild_refmap"
+(cd $SRC_DIR; time $PRG $OPTS)
@@ -0,0 +1,161 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the sorted person handles and of the person list view.
+
+A synthetic tree is built in which every person has a birth and a death
+event, and belongs to a family of two parents and two children.  The time
+to get the person handles sorted by name, to sort them by birth date, and
+to load the person list view sorted on the name and on the birth date
+columns is then printed, as the best of REPEAT runs.
+
+Run from the top directory:  python test/person_view_bench.py [PEOPLE]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import (
+    ChildRef,
+    Date,
+    Event,
+    EventRef,
+    EventType,
+    Family,
+    Name,
+    Person,
+    Surname,
+)
+from gramps.gen.sort import Sort
+from gramps.gui.views.treemodels.peoplemodel import PersonListModel
+
+REPEAT = 3
+BIRTH_COLUMN = 3
+
+
+def add_event(db, person, etype, year, trans):
+    """Add an event of a type and year to a person."""
+    event = Event()
+    event.set_type(etype)
+    event.set_date_object(Date(year, random.randint(1, 12), random.randint(1, 28)))
+    db.add_event(event, trans)
+    ref = EventRef()
+    ref.ref = event.handle
+    person.add_event_ref(ref)
+    return ref
+
+
+def build(db, people):
+    """
+    Add the people, four by four, as the parents and children of a family.
+    """
+    random.seed(0)
+    with DbTxn("Build benchmark tree", db, batch=True) as trans:
+        for index in range(0, people, 4):
+            members = []
+            for gender in (Person.MALE, Person.FEMALE, Person.MALE, Person.FEMALE):
+                person = Person()
+                person.set_gender(gender)
+                name = Name()
+                name.set_first_name("Given%d" % random.randint(0, 500))
+                surname = Surname()
+                surname.set_surname("Surname%d" % random.randint(0, 2000))
+                name.add_surname(surname)
+                person.set_primary_name(name)
+                year = random.randint(1600, 1950)
+                person.set_birth_ref(
+                    add_event(db, person, EventType.BIRTH, year, trans)
+                )
+                person.set_death_ref(
+                    add_event(db, person, EventType.DEATH, year + 60, trans)
+                )
+                db.add_person(person, trans)
+                members.append(person)
+            family = Family()
+            family.set_father_handle(members[0].handle)
+            family.set_mother_handle(members[1].handle)
+            for child in members[2:]:
+                ref = ChildRef()
+                ref.ref = child.handle
+                family.add_child_ref(ref)
+            db.add_family(family, trans)
+            for person in members[:2]:
+                person.add_family_handle(family.handle)
+            for person in members[2:]:
+                person.add_parent_family_handle(family.handle)
+            for person in members:
+                db.commit_person(person, trans)
+
+
+def best(func):
+    """Return the best time taken by func over REPEAT runs."""
+    times = []
+    for dummy in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    people = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    uistate = SimpleNamespace(window=None)
+    with tempfile.TemporaryDirectory() as directory:
+        db = make_database("sqlite")
+        db.load(directory)
+        build(db, people)
+        handles = db.get_person_handles()
+        sort = Sort(db)
+        cases = (
+            (
+                "get_person_handles(sort_handles=True)",
+                lambda: db.get_person_handles(sort_handles=True),
+            ),
+            (
+                "sort by Sort.by_birthdate_key",
+                lambda: sorted(handles, key=sort.by_birthdate_key),
+            ),
+            (
+                "person list view, sorted on the name",
+                lambda: PersonListModel(db, uistate).destroy(),
+            ),
+            (
+                "person list view, sorted on the birth date",
+                lambda: PersonListModel(db, uistate, scol=BIRTH_COLUMN).destroy(),
+            ),
+        )
+        print("%d people" % db.get_number_of_people())
+        for label, func in cases:
+            print("%-45s %10.1f ms" % (label, best(func) * 1000))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
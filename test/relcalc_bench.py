@@ -0,0 +1,150 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the relationship calculator over a whole tree.
+
+A synthetic tree of GENERATIONS generations is built, in which every couple
+is chosen from the previous generation.  The relationships of a person of the
+last generation to everybody are then computed as the Relationship
+Calculator tool does, with the ancestor map computed for each person and
+with the kept map, and as a batch.  The shortest relationships are also
+computed for every person, with the search from both sides.
+
+Run from the top directory:  python test/relcalc_bench.py [GENERATIONS]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import ChildRef, Family, Person
+from gramps.gen.relationship import RelationshipCalculator
+
+WIDTH = 100
+CHILDREN = 2
+
+
+def build(db, generations):
+    """
+    Add WIDTH people per generation, each the child of a random couple of
+    the previous generation.  Return the first person of the last generation.
+    """
+    random.seed(0)
+    with DbTxn("Build benchmark tree", db, batch=True) as trans:
+        previous = []
+        for gen in range(generations):
+            current = []
+            for index in range(WIDTH):
+                person = Person()
+                person.set_gender(index % 2)
+                db.add_person(person, trans)
+                current.append(person)
+            if previous:
+                for index in range(0, WIDTH, CHILDREN):
+                    father = random.choice(previous[1::2])
+                    mother = random.choice(previous[0::2])
+                    family = Family()
+                    family.set_father_handle(father.handle)
+                    family.set_mother_handle(mother.handle)
+                    children = current[index : index + CHILDREN]
+                    for child in children:
+                        ref = ChildRef()
+                        ref.ref = child.handle
+                        family.add_child_ref(ref)
+                    db.add_family(family, trans)
+                    for parent in (father, mother):
+                        parent.add_family_handle(family.handle)
+                        db.commit_person(parent, trans)
+                    for child in children:
+                        child.add_parent_family_handle(family.handle)
+                        db.commit_person(child, trans)
+            previous = current
+    return previous[0]
+
+
+def timed(func):
+    """Return the time taken by func and its result."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    generations = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    db = make_database("sqlite")
+    db.load(":memory:")
+    home = build(db, generations)
+    home = db.get_person_from_handle(home.handle)
+    people = list(db.iter_people())
+
+    # without a result cache, the map of the home person is computed for
+    # each person, as it used to be
+    get_result_cache = db.get_result_cache
+    db.get_result_cache = lambda: None
+    calc = RelationshipCalculator()
+    rebuilt, expected = timed(
+        lambda: [calc.get_all_relationships(db, home, other) for other in people]
+    )
+    full, ranks = timed(
+        lambda: [
+            calc.get_relationship_distance_new(db, home, other, all_dist=True)[0][0][0]
+            for other in people
+        ]
+    )
+    db.get_result_cache = get_result_cache
+
+    calc = RelationshipCalculator()
+    kept, result = timed(
+        lambda: [calc.get_all_relationships(db, home, other) for other in people]
+    )
+    assert result == expected
+    batch, dummy = timed(lambda: calc.get_one_relationships(db, home, people))
+    shortest, result = timed(
+        lambda: [
+            calc.get_relationship_distance_new(db, home, other)[0][0]
+            for other in people
+        ]
+    )
+    assert result == ranks
+    db.close()
+
+    print(
+        "%d generations of %d people, %d related to the home person"
+        % (generations, WIDTH, sum(1 for rels, commons in expected if rels))
+    )
+    for label, seconds in (
+        ("all relationships, map for each person", rebuilt),
+        ("all relationships, kept map", kept),
+        ("one relationship, batch", batch),
+        ("shortest, map for each person", full),
+        ("shortest, from both sides", shortest),
+    ):
+        print("%-45s %10.1f ms" % (label, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
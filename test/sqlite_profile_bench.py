@@ -0,0 +1,94 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the tuning profiles of the SQLite backend.
+
+For each profile, a GEDCOM file is imported into a new tree on disk and the
+whole tree is exported to Gramps XML.  The import is timed with and without
+the bulk pragmas that are used for batch transactions.
+
+Run from the top directory:  python test/sqlite_profile_bench.py [GEDCOM]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.cli.user import User
+from gramps.gen.db.utils import (
+    import_from_filename,
+    make_database,
+    set_profile_for_path,
+)
+from gramps.plugins.db.dbapi import sqlite
+from gramps.plugins.export.exportxml import export_data
+
+GEDCOM = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "example",
+    "gedcom",
+    "sample.ged",
+)
+
+
+def run(directory, profile, filename, bulk):
+    """
+    Import and export a tree with a profile; return the times taken.
+    """
+    set_profile_for_path(directory, profile)
+    saved = dict(sqlite.BULK_PROFILE)
+    if not bulk:
+        sqlite.BULK_PROFILE.clear()
+    try:
+        user = User()
+        db = make_database("sqlite")
+        db.load(directory)
+        start = time.perf_counter()
+        import_from_filename(db, filename, user)
+        imported = time.perf_counter() - start
+        start = time.perf_counter()
+        export_data(db, os.path.join(directory, "export.gramps"), user)
+        exported = time.perf_counter() - start
+        db.close()
+    finally:
+        sqlite.BULK_PROFILE.update(saved)
+    return imported, exported
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else GEDCOM
+    print("%-12s %-5s %12s %12s" % ("profile", "bulk", "import", "export"))
+    for profile in sqlite.PROFILES:
+        for bulk in (False, True):
+            with tempfile.TemporaryDirectory() as directory:
+                imported, exported = run(directory, profile, filename, bulk)
+            print(
+                "%-12s %-5s %10.2f s %10.2f s"
+                % (profile, "yes" if bulk else "no", imported, exported)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the archive of the Narrated Web Site.
+
+PAGES synthetic pages of a few kB are written to an archive in each format,
+compressed by one thread and by as many threads as there are processors,
+and the time, the pages per second and the size of the archive are printed.
+For comparison, the tar.gz file is also written the way the report used to
+write it, looking for each page in the list of the names of the archive;
+that case takes a time quadratic in the number of pages, so it is run on
+at most LEGACY_PAGES pages.
+
+Run from the top directory:  python test/webarchive_bench.py [PAGES]
+"""
+
+from io import BytesIO
+import os
+import sys
+import tarfile
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.plugins.webreport.archive import ARCHIVE_FORMATS, open_archive
+
+# Pages written the old way
+LEGACY_PAGES = 10000
+
+
+def page(index):
+    """
+    Return the content of a synthetic person page.
+    """
+    rows = "".join(
+        '<tr><td class="ColumnAttribute">Event %d</td>'
+        '<td class="ColumnDate">%d-%02d-%02d</td>'
+        '<td class="ColumnPlace">Place %d</td></tr>\n'
+        % (row, 1700 + index % 250, 1 + row % 12, 1 + index % 28, index % 997)
+        for row in range(20)
+    )
+    return (
+        "<!DOCTYPE html>\n<html><head><title>Person %d</title></head>\n"
+        "<body><h1>Smith%d, John%d</h1>\n<table>\n%s</table></body></html>\n"
+        % (index, index % 113, index % 97, rows)
+    ).encode("utf-8")
+
+
+def name(index):
+    """
+    Return the name of a page in the archive, as the report makes it.
+    """
+    handle = "%020X" % (index * 2654435761)
+    return "ppl/%s/%s/%s.html" % (handle[-1], handle[-2], handle)
+
+
+def report(label, threads, pages, total, filename):
+    """Print one line."""
+    print(
+        "%-9s %2d threads %7d pages %8.1f s %8d pages/s  %7.1f MB"
+        % (
+            label,
+            threads,
+            pages,
+            total,
+            pages / total,
+            os.path.getsize(filename) / 1e6,
+        )
+    )
+
+
+def run_legacy(directory, pages):
+    """Write a tar.gz file as the report used to, looking up each name."""
+    filename = os.path.join(directory, "legacy.tar.gz")
+    start = time.perf_counter()
+    with tarfile.open(filename, "w:gz") as archive:
+        for index in range(pages):
+            if name(index) not in archive.getnames():
+                data = page(index)
+                tarinfo = tarfile.TarInfo(name(index))
+                tarinfo.size = len(data)
+                tarinfo.mtime = time.time()
+                archive.addfile(tarinfo, BytesIO(data))
+    report("legacy", 1, pages, time.perf_counter() - start, filename)
+
+
+def run_case(directory, fmt, threads, pages):
+    """Write an archive in a format with a number of threads."""
+    filename = os.path.join(directory, "site-%d%s" % (threads, fmt))
+    start = time.perf_counter()
+    archive = open_archive(filename, fmt, threads)
+    for index in range(pages):
+        if name(index) not in archive:
+            archive.add_data(name(index), page(index))
+    archive.close()
+    report(fmt, threads, pages, time.perf_counter() - start, filename)
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        run_legacy(directory, min(pages, LEGACY_PAGES))
+        for fmt in ARCHIVE_FORMATS:
+            for threads in (1, max(os.cpu_count() or 1, 2)):
+                if fmt == ".zip" and threads > 1:
+                    # the zip files are compressed one by one
+                    continue
+                run_case(directory, fmt, threads, pages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#! /usr/bin/env python3
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2024       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the Gramps XML export on a large synthetic tree.
+
+A tree of about OBJECTS objects is written to disk: people with a name, a
+birth event and a note.  It is then exported to a compressed .gramps file
+by one process and by a pool of worker processes, and the time, the objects
+per second and the growth of the peak RSS are printed.  Each case runs in
+its own process, so that the peak RSS of one case does not hide the next.
+
+Run from the top directory:  python test/xmlexport_bench.py [OBJECTS]
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gramps.cli.user import User
+from gramps.gen.db import DbTxn
+from gramps.gen.db.dbconst import DBMODE_R
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Date, Event, EventRef, EventType, Note, Person, Surname
+
+# Objects added for each person
+OBJECTS_PER_PERSON = 3
+
+
+def build(directory, people):
+    """
+    Create a tree of people who each have a birth event and a note.
+    """
+    db = make_database("sqlite")
+    db.load(directory)
+    with DbTxn("Build benchmark tree", db, batch=True) as trans:
+        for index in range(people):
+            event = Event()
+            event.set_type(EventType.BIRTH)
+            date = Date()
+            date.set_yr_mon_day(1700 + index % 250, 1 + index % 12, 1 + index % 28)
+            event.set_date_object(date)
+            event.set_description("Birth of person %d" % index)
+            db.add_event(event, trans)
+            note = Note("A note about person %d & <family>" % index)
+            db.add_note(note, trans)
+            person = Person()
+            person.set_gender(index % 2)
+            name = person.get_primary_name()
+            name.set_first_name("John%d" % (index % 97))
+            surname = Surname()
+            surname.set_surname("Smith%d" % (index % 113))
+            name.add_surname(surname)
+            ref = EventRef()
+            ref.ref = event.handle
+            person.add_event_ref(ref)
+            person.set_birth_ref(ref)
+            person.add_note(note.handle)
+            db.add_person(person, trans)
+    db.close()
+
+
+def run_case(directory, processes):
+    """Export the tree with a number of processes; print one line."""
+    from gramps.plugins.export import exportxml
+
+    exportxml.MIN_PARALLEL_OBJECTS = 0
+    db = make_database("sqlite")
+    db.load(directory, mode=DBMODE_R)
+    count = sum(
+        db.method("get_number_of_%s", name)() for name in ("people", "events", "notes")
+    )
+    filename = os.path.join(directory, "export-%d.gramps" % processes)
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    writer = exportxml.XmlWriter(db, User(quiet=True), 0, 1, processes=processes)
+    writer.write(filename)
+    total = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss
+    print(
+        "%2d processes %9d objects %8.1f s %9d objects/s  peak RSS +%7d kB"
+        "  %6.1f MB"
+        % (
+            processes,
+            count,
+            total,
+            count / total,
+            peak,
+            os.path.getsize(filename) / 1e6,
+        )
+    )
+    db.close(update=False)
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--case":
+        run_case(sys.argv[2], int(sys.argv[3]))
+        return
+    objects = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as directory:
+        build(directory, max(objects // OBJECTS_PER_PERSON, 1))
+        for processes in (1, max(os.cpu_count() or 1, 2)):
+            subprocess.run(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "--case",
+                    directory,
+                    str(processes),
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()